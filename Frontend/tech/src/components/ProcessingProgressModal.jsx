@@ -25,46 +25,50 @@ const ProcessingProgressModal = ({ rfpId, onClose, onComplete }) => {
   useEffect(() => {
     if (!rfpId || isCompleted) return;
 
-    // Poll for progress updates
-    const interval = setInterval(async () => {
-      try {
-        // Check progress
-        const progressResponse = await fetch(`http://localhost:8000/api/rfp-workflow/progress/${rfpId}`);
-        if (progressResponse.ok) {
-          const progressData = await progressResponse.json();
-          setProgress(progressData);
+    const finish = () => {
+      setIsCompleted(true);
+      setTimeout(() => {
+        if (onComplete) onComplete();
+      }, 2000);
+    };
 
-          // Check if completed via progress status
-          if (progressData.status === 'completed' || progressData.progress >= 100) {
-            setIsCompleted(true);
-            clearInterval(interval);
-            setTimeout(() => {
-              if (onComplete) onComplete();
-            }, 2000);
-            return;
-          }
-        }
+    // Progress is pushed by the server; EventSource resumes from the last
+    // event id on its own after a dropped connection
+    const eventSource = new EventSource(`http://localhost:8000/api/rfp-workflow/progress/${rfpId}/stream`);
+    eventSource.onmessage = (event) => {
+      const progressEvent = JSON.parse(event.data);
+      setProgress(progressEvent.state);
+      if (progressEvent.type === 'completed') {
+        eventSource.close();
+        finish();
+      } else if (progressEvent.type === 'failed' || progressEvent.type === 'cleared') {
+        eventSource.close();
+      }
+    };
 
-        // Also check RFP status directly (in case progress tracker state is lost)
+    // Fallback: check RFP status directly (in case progress was never recorded)
+    const interval = setInterval(async () => {
+      try {
         const rfpResponse = await fetch(`http://localhost:8000/api/rfp/${rfpId}`);
         if (rfpResponse.ok) {
           const rfpData = await rfpResponse.json();
           if (rfpData.data && (rfpData.data.status === 'reviewed' || rfpData.data.status === 'cancelled')) {
-            setIsCompleted(true);
+            eventSource.close();
             clearInterval(interval);
             // Update progress to show completion
             setProgress(prev => ({ ...prev, status: 'completed', progress: 100 }));
-            setTimeout(() => {
-              if (onComplete) onComplete();
-            }, 2000);
+            finish();
           }
         }
       } catch (error) {
-        console.error('Failed to fetch progress:', error);
+        console.error('Failed to fetch RFP status:', error);
       }
-    }, 2000); // Poll every 2 seconds
+    }, 10000);
 
-    return () => clearInterval(interval);
+    return () => {
+      eventSource.close();
+      clearInterval(interval);
+    };
   }, [rfpId, onComplete, isCompleted]);
 
   // Rotating tips
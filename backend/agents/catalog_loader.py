@@ -0,0 +1,308 @@
+"""
+Bulk Catalog Loader - Loads OEM product CSVs into oem_products in bulk
+
+Reads each manufacturer CSV in chunks, normalizes it column-wise with
+ProductDataLoader.normalize_frame and upserts the rows with batched
+multi-row statements inside a single transaction. A checksum manifest
+records the files already loaded so nightly runs only touch changed files.
+"""
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+import structlog
+from sqlalchemy import select, update, delete, insert, func
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from agents.data_loader import ProductDataLoader
+from db.product_models import OEMProduct
+
+logger = structlog.get_logger()
+
+# Prefix of data_source for rows owned by the CSV import
+CSV_SOURCE_PREFIX = "CSV Import"
+
+# Columns rewritten on conflict (everything the CSV provides)
+UPSERT_COLUMNS = [
+    'manufacturer', 'model_number', 'product_name', 'category', 'specifications',
+    'unit_price', 'currency', 'stock_quantity', 'available_stock', 'delivery_days',
+    'certifications', 'standards', 'voltage_rating', 'conductor_material',
+    'conductor_size', 'no_of_cores', 'insulation_type', 'max_temperature',
+    'current_rating', 'is_active', 'data_source', 'extracted_date'
+]
+
+
+@dataclass
+class CatalogLoadResult:
+    """Outcome of a catalog load run."""
+    files_loaded: List[str] = field(default_factory=list)
+    files_skipped: List[str] = field(default_factory=list)
+    rows_upserted: int = 0
+    rows_deactivated: int = 0
+    elapsed_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'files_loaded': self.files_loaded,
+            'files_skipped': self.files_skipped,
+            'rows_upserted': self.rows_upserted,
+            'rows_deactivated': self.rows_deactivated,
+            'elapsed_seconds': self.elapsed_seconds
+        }
+
+
+def product_to_row(
+    product: Dict[str, Any],
+    data_source: str,
+    extracted_date: datetime
+) -> Dict[str, Any]:
+    """Map a loader product dictionary to oem_products column values.
+
+    Args:
+        product: Product dictionary from ProductDataLoader
+        data_source: Value for the data_source column
+        extracted_date: Load timestamp
+
+    Returns:
+        Column name -> value dictionary
+    """
+    specs = product.get('specifications', {})
+
+    no_of_cores = None
+    if 'cores' in specs:
+        try:
+            no_of_cores = int(specs['cores'])
+        except (TypeError, ValueError):
+            pass
+
+    return {
+        'product_id': product['product_id'],
+        'manufacturer': product['manufacturer'],
+        'model_number': product.get('model_number'),
+        'product_name': product.get('product_name', ''),
+        'category': product.get('category', 'General'),
+        'specifications': specs,
+        'unit_price': product.get('unit_price', 0.0),
+        'currency': 'INR',
+        'stock_quantity': product.get('stock', 1000),
+        'available_stock': product.get('stock', 1000),
+        'delivery_days': product.get('delivery_days', 7),
+        'certifications': product.get('certifications', []),
+        'standards': product.get('standards', []),
+        'voltage_rating': specs.get('voltage_rating'),
+        'conductor_material': specs.get('conductor_material'),
+        'conductor_size': specs.get('conductor_size'),
+        'no_of_cores': no_of_cores,
+        'insulation_type': specs.get('insulation'),
+        'max_temperature': specs.get('temperature_rating'),
+        'current_rating': specs.get('current_rating'),
+        'is_active': True,
+        'data_source': data_source,
+        'extracted_date': extracted_date
+    }
+
+
+def file_checksum(path: Path) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class BulkCatalogLoader:
+    """
+    Bulk loader for the OEM product catalog.
+
+    Each run loads the newest CSV of every manufacturer whose checksum is
+    not in the manifest (or all of them with ``force=True``), upserts its
+    rows on product_id and deactivates CSV-imported rows of that
+    manufacturer that were not part of the new file.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[AsyncEngine] = None,
+        base_path: str = "..",
+        manifest_path: str = "data/catalog_manifest.json",
+        batch_size: int = 500,
+        chunksize: int = 5000
+    ):
+        """Initialize loader.
+
+        Args:
+            engine: Async engine to load into (defaults to db.database.engine)
+            base_path: Base path to data directories
+            manifest_path: JSON file recording loaded file checksums
+            batch_size: Rows per multi-row INSERT statement
+            chunksize: Rows read from a CSV at a time
+        """
+        if engine is None:
+            from db.database import engine as default_engine
+            engine = default_engine
+        self.engine = engine
+        self.data_loader = ProductDataLoader(base_path=base_path)
+        self.manifest_path = Path(manifest_path)
+        self.batch_size = batch_size
+        self.chunksize = chunksize
+        self.logger = logger.bind(component="BulkCatalogLoader")
+
+    async def load(self, force: bool = False) -> CatalogLoadResult:
+        """Load changed manufacturer CSVs into the database.
+
+        Args:
+            force: Reload every file even if its checksum is unchanged
+
+        Returns:
+            CatalogLoadResult
+        """
+        started = time.perf_counter()
+        result = CatalogLoadResult()
+        manifest = self._load_manifest()
+        load_time = datetime.now()
+
+        async with self.engine.begin() as conn:
+            active_counts = dict((await conn.execute(
+                select(OEMProduct.manufacturer, func.count())
+                .where(OEMProduct.is_active.is_(True))
+                .group_by(OEMProduct.manufacturer)
+            )).all())
+
+            for manufacturer, folder in ProductDataLoader.MANUFACTURERS.items():
+                csv_file = self.data_loader.find_manufacturer_csv(manufacturer, folder)
+                if csv_file is None:
+                    continue
+
+                checksum = file_checksum(csv_file)
+                entry = manifest.get(manufacturer, {})
+                unchanged = (
+                    entry.get('file') == csv_file.name
+                    and entry.get('sha256') == checksum
+                    and active_counts.get(manufacturer, 0) > 0
+                )
+                if unchanged and not force:
+                    result.files_skipped.append(csv_file.name)
+                    continue
+
+                rows = await self._load_file(conn, csv_file, manufacturer, load_time)
+                deactivated = await self._deactivate_stale(conn, manufacturer, load_time)
+
+                manifest[manufacturer] = {
+                    'file': csv_file.name,
+                    'sha256': checksum,
+                    'rows': rows,
+                    'loaded_at': load_time.isoformat()
+                }
+                result.files_loaded.append(csv_file.name)
+                result.rows_upserted += rows
+                result.rows_deactivated += deactivated
+                self.logger.info(
+                    f"Loaded {rows} products from {csv_file.name}",
+                    manufacturer=manufacturer,
+                    rows=rows,
+                    deactivated=deactivated
+                )
+
+        # Only record checksums once the transaction has committed
+        if result.files_loaded:
+            self._save_manifest(manifest)
+            self._invalidate_product_index()
+
+        result.elapsed_seconds = round(time.perf_counter() - started, 4)
+        self.logger.info(
+            "Catalog load completed",
+            files_loaded=len(result.files_loaded),
+            files_skipped=len(result.files_skipped),
+            rows_upserted=result.rows_upserted,
+            rows_deactivated=result.rows_deactivated,
+            elapsed_seconds=result.elapsed_seconds
+        )
+        return result
+
+    async def _load_file(self, conn, csv_file: Path, manufacturer: str, load_time: datetime) -> int:
+        """Upsert every row of one CSV file in batches."""
+        data_source = f"{CSV_SOURCE_PREFIX}: {csv_file.name}"
+        total = 0
+        occurrences = {}
+
+        for _, chunk in self.data_loader.iter_csv_chunks(csv_file, self.chunksize):
+            products = self.data_loader.normalize_frame(chunk, manufacturer, occurrences)
+            rows = [product_to_row(p, data_source, load_time) for p in products]
+            for i in range(0, len(rows), self.batch_size):
+                batch = rows[i:i + self.batch_size]
+                await self._upsert(conn, batch)
+                total += len(batch)
+
+        return total
+
+    async def _upsert(self, conn, rows: List[Dict[str, Any]]):
+        """Insert rows, replacing existing products with the same product_id."""
+        if not rows:
+            return
+
+        dialect = conn.dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            if dialect == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            stmt = dialect_insert(OEMProduct).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['product_id'],
+                set_={
+                    **{column: stmt.excluded[column] for column in UPSERT_COLUMNS},
+                    'updated_at': func.now()
+                }
+            )
+            await conn.execute(stmt)
+        else:
+            # Generic fallback: replace in two set-based statements
+            await conn.execute(
+                delete(OEMProduct).where(
+                    OEMProduct.product_id.in_([row['product_id'] for row in rows])
+                )
+            )
+            await conn.execute(insert(OEMProduct), rows)
+
+    async def _deactivate_stale(self, conn, manufacturer: str, load_time: datetime) -> int:
+        """Deactivate CSV-imported rows of a manufacturer not touched by this load."""
+        result = await conn.execute(
+            update(OEMProduct)
+            .where(
+                OEMProduct.manufacturer == manufacturer,
+                OEMProduct.data_source.like(f"{CSV_SOURCE_PREFIX}%"),
+                OEMProduct.is_active.is_(True),
+                (OEMProduct.extracted_date < load_time) | OEMProduct.extracted_date.is_(None)
+            )
+            .values(is_active=False, updated_at=func.now())
+        )
+        return result.rowcount or 0
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            return json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError) as e:
+            self.logger.warning("Ignoring unreadable catalog manifest", error=str(e))
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+        os.replace(tmp_path, self.manifest_path)
+
+    def _invalidate_product_index(self):
+        """Core statements bypass the ORM listeners, so drop the in-process index.
+
+        Other workers notice the load through the catalog version check in
+        ProductRepository and rebuild their own index.
+        """
+        from agents.product_index import get_product_index
+        get_product_index().clear()
@@ -8,17 +8,76 @@ Loads wires and cables data from:
 - Finolex
 - RR Kabel
 """
+import codecs
+import hashlib
 import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterator
 import structlog
 
 logger = structlog.get_logger()
 
+# Bytes read from the head of a CSV to choose its encoding
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+# Ordered (keyword test, category) rules used by _infer_category_type
+CATEGORY_RULES = [
+    (lambda t: 'solar' in t, 'Solar Cables'),
+    (lambda t: 'power' in t and 'lt' in t, 'Power Cables - LT'),
+    (lambda t: 'power' in t and 'ht' in t, 'Power Cables - HT'),
+    (lambda t: 'control' in t, 'Control Cables'),
+    (lambda t: 'signal' in t or 'railway' in t, 'Signaling Cables'),
+    (lambda t: 'submersible' in t, 'Submersible Cables'),
+    (lambda t: 'flexible' in t or 'flex' in t, 'Flexible Cables'),
+    (lambda t: 'armoured' in t, 'Armoured Cables'),
+    (lambda t: 'instrument' in t, 'Instrumentation Cables'),
+    (lambda t: 'telecom' in t or 'telephone' in t, 'Telecom Cables'),
+]
+
+
+def product_key(manufacturer: str, product_code: Optional[str], product_name: str) -> str:
+    """Build the stable product_id of an OEM catalog row.
+    
+    The OEM exports reuse one Product_Code across the size and core variants
+    of a range, so the key is the manufacturer prefix and product code plus a
+    short digest of the cleaned product name. It does not depend on the row's
+    position, so inserting or deleting rows elsewhere in a file keeps the ids
+    of every other row.
+    
+    Args:
+        manufacturer: Manufacturer name
+        product_code: Product_Code from the CSV, or None when missing
+        product_name: Cleaned product name
+        
+    Returns:
+        Product ID
+    """
+    digest = hashlib.sha1(product_name.lower().encode('utf-8')).hexdigest()[:8]
+    prefix = manufacturer[:3].upper()
+    if product_code:
+        return f"{prefix}-{product_code}-{digest}"
+    return f"{prefix}-{digest}"
+
+
+def _disambiguate(key: str, occurrences: Dict[str, int]) -> str:
+    """Suffix repeats of a key within one file with their occurrence number."""
+    count = occurrences.get(key, 0) + 1
+    occurrences[key] = count
+    return key if count == 1 else f"{key}-{count}"
+
 
 class ProductDataLoader:
     """Load OEM product data from CSV files."""
     
+    # Manufacturer display name -> data folder
+    MANUFACTURERS = {
+        'Havells': 'havells',
+        'Polycab': 'polycab',
+        'KEI': 'kei',
+        'Finolex': 'finolex',
+        'RR Kabel': 'rr_kabel'
+    }
+    
     def __init__(self, base_path: str = ".."):
         """Initialize data loader.
         
@@ -38,16 +97,7 @@ class ProductDataLoader:
         """
         all_products = []
         
-        # Load from each manufacturer
-        manufacturers = {
-            'Havells': 'havells',
-            'Polycab': 'polycab',
-            'KEI': 'kei',
-            'Finolex': 'finolex',
-            'RR Kabel': 'rr_kabel'
-        }
-        
-        for manufacturer_name, folder_name in manufacturers.items():
+        for manufacturer_name, folder_name in self.MANUFACTURERS.items():
             products = self._load_manufacturer_data(manufacturer_name, folder_name)
             all_products.extend(products)
             self.logger.info(
@@ -63,19 +113,15 @@ class ProductDataLoader:
         
         return all_products
     
-    def _load_manufacturer_data(
-        self, 
-        manufacturer: str, 
-        folder: str
-    ) -> List[Dict[str, Any]]:
-        """Load data for a specific manufacturer.
+    def find_manufacturer_csv(self, manufacturer: str, folder: str) -> Optional[Path]:
+        """Find the most recent product CSV for a manufacturer.
         
         Args:
             manufacturer: Manufacturer name
             folder: Folder name
             
         Returns:
-            List of products
+            Path to the CSV file, or None if there is none
         """
         manufacturer_path = self.wires_cables_path / folder
         
@@ -84,7 +130,7 @@ class ProductDataLoader:
                 f"Manufacturer directory not found: {manufacturer_path}",
                 manufacturer=manufacturer
             )
-            return []
+            return None
         
         # Look for complete products CSV
         csv_files = list(manufacturer_path.glob(f"{folder}_complete_products_*.csv"))
@@ -102,10 +148,28 @@ class ProductDataLoader:
                 manufacturer=manufacturer,
                 path=str(manufacturer_path)
             )
-            return []
+            return None
         
         # Use the most recent file
-        csv_file = max(csv_files, key=lambda p: p.stat().st_mtime)
+        return max(csv_files, key=lambda p: p.stat().st_mtime)
+    
+    def _load_manufacturer_data(
+        self, 
+        manufacturer: str, 
+        folder: str
+    ) -> List[Dict[str, Any]]:
+        """Load data for a specific manufacturer.
+        
+        Args:
+            manufacturer: Manufacturer name
+            folder: Folder name
+            
+        Returns:
+            List of products
+        """
+        csv_file = self.find_manufacturer_csv(manufacturer, folder)
+        if csv_file is None:
+            return []
         
         try:
             return self._parse_csv_file(csv_file, manufacturer)
@@ -131,49 +195,251 @@ class ProductDataLoader:
         Returns:
             List of products
         """
-        try:
-            df = pd.read_csv(csv_path, encoding='utf-8')
-        except UnicodeDecodeError:
-            df = pd.read_csv(csv_path, encoding='latin-1')
-        
         products = []
+        occurrences = {}
+        for _, chunk in self.iter_csv_chunks(csv_path):
+            products.extend(self.normalize_frame(chunk, manufacturer, occurrences))
+        return products
+    
+    def iter_csv_chunks(
+        self,
+        csv_path: Path,
+        chunksize: Optional[int] = None
+    ) -> Iterator[tuple]:
+        """Read a CSV file in chunks, one chunk in memory at a time.
+        
+        The encoding is sniffed from the head of the file. If a byte past
+        the sample is not valid UTF-8, reading resumes as latin-1 after the
+        rows already yielded.
+        
+        Args:
+            csv_path: Path to CSV file
+            chunksize: Rows per chunk (None reads the whole file at once)
+            
+        Yields:
+            Tuples of (row offset of the chunk, DataFrame)
+        """
+        encoding = self._sniff_encoding(csv_path)
+        offset = 0
         
-        for idx, row in df.iterrows():
+        while True:
             try:
-                product = self._extract_product_from_row(row, manufacturer, idx)
-                if product:
-                    products.append(product)
-            except Exception as e:
+                for chunk in self._read_chunks(csv_path, encoding, chunksize, skip=offset):
+                    yield offset, chunk
+                    offset += len(chunk)
+                return
+            except UnicodeDecodeError:
+                if encoding == 'latin-1':
+                    raise
                 self.logger.warning(
-                    f"Failed to parse row {idx}: {e}",
-                    row_index=idx,
-                    error=str(e)
+                    "Non UTF-8 bytes mid-file, re-reading as latin-1",
+                    file=Path(csv_path).name,
+                    resume_row=offset
                 )
-                continue
+                encoding = 'latin-1'
+    
+    def _sniff_encoding(self, csv_path: Path) -> str:
+        """Pick utf-8 or latin-1 from the first ENCODING_SAMPLE_BYTES of a file."""
+        with open(csv_path, 'rb') as f:
+            sample = f.read(ENCODING_SAMPLE_BYTES)
+        try:
+            # Not final: the sample may end inside a multi-byte character
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            return 'latin-1'
+    
+    def _read_chunks(self, csv_path: Path, encoding: str, chunksize: Optional[int], skip: int = 0):
+        """Yield frames of the file, dropping its first ``skip`` data rows."""
+        if chunksize is None:
+            frame = pd.read_csv(csv_path, encoding=encoding)
+            yield frame.iloc[skip:] if skip else frame
+            return
+        with pd.read_csv(csv_path, encoding=encoding, chunksize=chunksize) as reader:
+            for chunk in reader:
+                if skip >= len(chunk):
+                    skip -= len(chunk)
+                    continue
+                yield chunk.iloc[skip:] if skip else chunk
+                skip = 0
+    
+    def normalize_frame(
+        self,
+        df: pd.DataFrame,
+        manufacturer: str,
+        occurrences: Optional[Dict[str, int]] = None
+    ) -> List[Dict[str, Any]]:
+        """Convert a CSV frame into product dictionaries column-wise.
         
-        return products
+        Produces the same products as calling _extract_product_from_row on
+        every row, but cleans names, infers categories and formats specs
+        once per column instead of once per row.
+        
+        Args:
+            df: Raw CSV rows
+            manufacturer: Manufacturer name
+            occurrences: Product key counts of the rows already normalized
+                from the same file; pass one dict across the chunks of a
+                file so repeated keys get the same suffixes as a single read
+            
+        Returns:
+            List of product dictionaries
+        """
+        n = len(df)
+        if n == 0:
+            return []
+        
+        # Clean product names - ASCII only, normalized whitespace, max 300 chars
+        if 'Product_Name' in df:
+            names = (
+                df['Product_Name'].map(str)
+                .str.encode('ascii', 'ignore').str.decode('ascii')
+                .str.split().str.join(' ')
+            )
+        else:
+            names = pd.Series('Unknown Product', index=df.index)
+        too_long = names.str.len() > 300
+        if too_long.any():
+            names = names.where(~too_long, names.str.slice(0, 297) + '...')
+        
+        # Product IDs: manufacturer + source code + name digest, see product_key
+        if occurrences is None:
+            occurrences = {}
+        if 'Product_Code' in df:
+            codes = [
+                str(code) if present else None
+                for code, present in zip(df['Product_Code'].tolist(), df['Product_Code'].notna().tolist())
+            ]
+        else:
+            codes = [None] * n
+        product_codes = [
+            _disambiguate(product_key(manufacturer, code, name), occurrences)
+            for code, name in zip(codes, names.tolist())
+        ]
+        
+        raw_category = df['Category'].map(str) if 'Category' in df else pd.Series('Unknown', index=df.index)
+        categories = self._infer_category_types(raw_category, names)
+        
+        # Specifications, in the same key order as the row-wise path
+        spec_columns = [
+            ('voltage_rating', self._text_column(df, 'Voltage_Rating')),
+            ('conductor_material', self._text_column(df, 'Conductor_Material')),
+            ('conductor_size', self._text_column(df, 'Conductor_Size_sqmm', suffix=' sq mm')),
+            ('cores', self._text_column(df, 'No_of_Cores')),
+            ('insulation', self._text_column(df, 'Insulation_Type')),
+            ('temperature_rating', self._text_column(df, 'Max_Conductor_Temp_C', suffix='C')),
+        ]
+        armour = self._text_column(df, 'Armour_Type')
+        if armour is not None:
+            armour = armour.where(armour.str.lower() != 'unarmoured', None)
+        spec_columns.append(('armour', armour))
+        if 'Current_Rating_Amps' in df:
+            spec_columns.append(('current_rating', [
+                _format_current_rating(value) for value in df['Current_Rating_Amps'].tolist()
+            ]))
+        spec_columns = [
+            (key, col if isinstance(col, list) else col.tolist())
+            for key, col in spec_columns if col is not None
+        ]
+        
+        specifications = []
+        for i in range(n):
+            specs = {}
+            for key, values in spec_columns:
+                value = values[i]
+                if value is not None:
+                    specs[key] = value
+            specifications.append(specs)
+        
+        # Standards and certifications
+        if 'Standard' in df:
+            standard = df['Standard']
+            standard_text = standard.map(str)
+            standards = [
+                [s.strip() for s in text.split(',')] if present else []
+                for text, present in zip(standard_text.tolist(), standard.notna().tolist())
+            ]
+            has_bis = standard_text.str.contains('BIS', regex=False).tolist()
+            has_iec = standard_text.str.contains('IEC', regex=False).tolist()
+        else:
+            standards = [[] for _ in range(n)]
+            has_bis = has_iec = [False] * n
+        certifications = [
+            (['BIS'] if bis else []) + (['IEC'] if iec else [])
+            for bis, iec in zip(has_bis, has_iec)
+        ]
+        
+        if 'Price_Per_Meter_INR' in df:
+            unit_prices = [_safe_price(value) for value in df['Price_Per_Meter_INR'].tolist()]
+        else:
+            unit_prices = [0.0] * n
+        
+        return [
+            {
+                'product_id': code,
+                'manufacturer': manufacturer,
+                'model_number': code,
+                'product_name': name,
+                'category': category,
+                'specifications': specs,
+                'certifications': certs,
+                'standards': stds,
+                'unit_price': price,
+                'stock': 1000,  # Default stock
+                'delivery_days': 7  # Default delivery
+            }
+            for code, name, category, specs, certs, stds, price in zip(
+                product_codes, names.tolist(), categories, specifications,
+                certifications, standards, unit_prices
+            )
+        ]
+    
+    def _text_column(
+        self,
+        df: pd.DataFrame,
+        column: str,
+        suffix: str = ''
+    ) -> Optional[pd.Series]:
+        """Format a column as spec text, with None where the value is missing."""
+        if column not in df:
+            return None
+        values = df[column]
+        text = values.map(str) + suffix if suffix else values.map(str)
+        return text.astype(object).where(values.notna(), None)
+    
+    def _infer_category_types(self, categories: pd.Series, names: pd.Series) -> List[str]:
+        """Vectorized _infer_category_type over aligned category/name columns."""
+        texts = (categories + ' ' + names).str.lower()
+        result = categories.tolist()
+        # Each unique text is classified once
+        mapping = {}
+        for text in texts.unique():
+            for matches, label in CATEGORY_RULES:
+                if matches(text):
+                    mapping[text] = label
+                    break
+        for i, text in enumerate(texts.tolist()):
+            label = mapping.get(text)
+            if label is not None:
+                result[i] = label
+        return result
     
     def _extract_product_from_row(
         self, 
         row: pd.Series, 
         manufacturer: str,
-        idx: int
+        occurrences: Optional[Dict[str, int]] = None
     ) -> Dict[str, Any]:
         """Extract product data from CSV row.
         
         Args:
             row: DataFrame row
             manufacturer: Manufacturer name
-            idx: Row index
+            occurrences: Product key counts of the previous rows of the file
             
         Returns:
             Product dictionary
         """
-        # Extract basic info and ensure unique product ID
-        base_code = str(row.get('Product_Code', f'{idx:04d}'))
-        # Add manufacturer prefix and row index to ensure complete uniqueness
-        product_code = f"{manufacturer[:3].upper()}-{base_code}-{idx:04d}"
-        
         product_name = str(row.get('Product_Name', 'Unknown Product'))
         
         # Clean product name - remove special characters and Unicode symbols
@@ -183,6 +449,14 @@ class ProductDataLoader:
         if len(product_name) > 300:
             product_name = product_name[:297] + '...'
         
+        # Stable product ID, independent of the row's position in the file
+        base_code = row.get('Product_Code')
+        base_code = str(base_code) if pd.notna(base_code) else None
+        product_code = _disambiguate(
+            product_key(manufacturer, base_code, product_name),
+            occurrences if occurrences is not None else {}
+        )
+        
         category = str(row.get('Category', 'Unknown'))
         
         # Infer category type
@@ -275,26 +549,27 @@ class ProductDataLoader:
         """
         text = (category + ' ' + product_name).lower()
         
-        # Category mapping
-        if 'solar' in text:
-            return 'Solar Cables'
-        elif 'power' in text and 'lt' in text:
-            return 'Power Cables - LT'
-        elif 'power' in text and 'ht' in text:
-            return 'Power Cables - HT'
-        elif 'control' in text:
-            return 'Control Cables'
-        elif 'signal' in text or 'railway' in text:
-            return 'Signaling Cables'
-        elif 'submersible' in text:
-            return 'Submersible Cables'
-        elif 'flexible' in text or 'flex' in text:
-            return 'Flexible Cables'
-        elif 'armoured' in text:
-            return 'Armoured Cables'
-        elif 'instrument' in text:
-            return 'Instrumentation Cables'
-        elif 'telecom' in text or 'telephone' in text:
-            return 'Telecom Cables'
-        else:
-            return category
+        for matches, label in CATEGORY_RULES:
+            if matches(text):
+                return label
+        return category
+
+
+def _safe_price(value: Any) -> float:
+    """Parse a price cell the way the row-wise loader does (0.0 if invalid)."""
+    if pd.isna(value):
+        return 0.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _format_current_rating(value: Any) -> Optional[str]:
+    """Format a current rating cell as e.g. '25A' (None if missing or invalid)."""
+    if pd.isna(value):
+        return None
+    try:
+        return str(int(float(value))) + 'A'
+    except (TypeError, ValueError, OverflowError):
+        return None
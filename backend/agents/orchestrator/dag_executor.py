@@ -0,0 +1,197 @@
+"""
+DAG Executor for Agent Workflows
+Runs interdependent agent tasks concurrently as soon as their inputs are ready.
+"""
+from typing import Dict, Any, List, Optional, Callable
+from dataclasses import dataclass, field
+import asyncio
+import inspect
+import time
+import structlog
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class DAGTask:
+    """A unit of agent work in a workflow graph.
+    
+    ``func`` receives a dict of dependency task_id -> result and may be a
+    coroutine function or a blocking function (run in a worker thread).
+    """
+    task_id: str
+    agent_type: str
+    func: Callable[[Dict[str, Any]], Any]
+    depends_on: List[str] = field(default_factory=list)
+
+
+@dataclass
+class TaskTiming:
+    """Execution window of a task, relative to the start of the run."""
+    task_id: str
+    agent_type: str
+    started: float
+    finished: float
+    
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+
+class DAGExecutionError(Exception):
+    """A task failed; remaining tasks were cancelled."""
+    
+    def __init__(self, task_id: str, agent_type: str, error: BaseException):
+        super().__init__(f"Task {task_id} ({agent_type}) failed: {error}")
+        self.task_id = task_id
+        self.agent_type = agent_type
+        self.error = error
+
+
+class DAGExecutor:
+    """
+    Async DAG executor with per-agent-type concurrency limits.
+    
+    Each task starts as soon as all of its dependencies have finished, so
+    independent chains (e.g. technical -> pricing per line item) pipeline
+    instead of waiting for whole stages. The first failure cancels every
+    task still pending or running.
+    """
+    
+    def __init__(
+        self,
+        concurrency: Optional[Dict[str, int]] = None,
+        default_concurrency: int = 4
+    ):
+        """Initialize executor.
+        
+        Args:
+            concurrency: Max concurrent tasks per agent type
+            default_concurrency: Limit for agent types not listed
+        """
+        self.logger = logger.bind(component="DAGExecutor")
+        self.concurrency = concurrency or {}
+        self.default_concurrency = default_concurrency
+        self.timings: Dict[str, TaskTiming] = {}
+    
+    async def run(self, tasks: List[DAGTask]) -> Dict[str, Any]:
+        """Execute all tasks.
+        
+        Args:
+            tasks: Tasks in any order; dependencies must be in the list
+        
+        Returns:
+            Dictionary of task_id -> result
+        
+        Raises:
+            DAGExecutionError: If any task fails
+            ValueError: On unknown dependencies or cycles
+        """
+        by_id = {task.task_id: task for task in tasks}
+        self._validate(by_id)
+        
+        semaphores = {
+            agent_type: asyncio.Semaphore(
+                self.concurrency.get(agent_type, self.default_concurrency)
+            )
+            for agent_type in {task.agent_type for task in tasks}
+        }
+        futures: Dict[str, asyncio.Task] = {}
+        results: Dict[str, Any] = {}
+        origin = time.perf_counter()
+        self.timings = {}
+        
+        async def execute(task: DAGTask) -> Any:
+            inputs = {}
+            for dep in task.depends_on:
+                inputs[dep] = await futures[dep]
+            
+            async with semaphores[task.agent_type]:
+                started = time.perf_counter() - origin
+                try:
+                    if inspect.iscoroutinefunction(task.func):
+                        result = await task.func(inputs)
+                    else:
+                        result = await asyncio.to_thread(task.func, inputs)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    raise DAGExecutionError(task.task_id, task.agent_type, e) from e
+                finally:
+                    self.timings[task.task_id] = TaskTiming(
+                        task.task_id, task.agent_type,
+                        started, time.perf_counter() - origin
+                    )
+            
+            results[task.task_id] = result
+            return result
+        
+        for task_id in self._topological_order(by_id):
+            futures[task_id] = asyncio.ensure_future(execute(by_id[task_id]))
+        
+        pending = set(futures.values())
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_EXCEPTION)
+                for future in done:
+                    if not future.cancelled() and future.exception() is not None:
+                        raise future.exception()
+        except BaseException as e:
+            for future in futures.values():
+                future.cancel()
+            # Let cancelled tasks unwind before reporting
+            await asyncio.gather(*futures.values(), return_exceptions=True)
+            self.logger.error(
+                "DAG execution failed",
+                task_id=getattr(e, 'task_id', None),
+                error=str(e),
+                completed=len(results),
+                total=len(tasks)
+            )
+            raise
+        
+        self.logger.info(
+            "DAG execution completed",
+            tasks=len(tasks),
+            wall_time=round(time.perf_counter() - origin, 4)
+        )
+        return results
+    
+    def stage_window(self, agent_type: str) -> float:
+        """Wall-clock span covered by all tasks of an agent type."""
+        windows = [t for t in self.timings.values() if t.agent_type == agent_type]
+        if not windows:
+            return 0.0
+        return max(t.finished for t in windows) - min(t.started for t in windows)
+    
+    def _validate(self, by_id: Dict[str, DAGTask]):
+        for task in by_id.values():
+            for dep in task.depends_on:
+                if dep not in by_id:
+                    raise ValueError(f"Task {task.task_id} depends on unknown task {dep}")
+    
+    def _topological_order(self, by_id: Dict[str, DAGTask]) -> List[str]:
+        """Order tasks so every dependency is scheduled before its dependents."""
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+        
+        for root in by_id:
+            if state.get(root) == 2:
+                continue
+            stack = [(root, iter(by_id[root].depends_on))]
+            state[root] = 1
+            while stack:
+                node, deps = stack[-1]
+                for dep in deps:
+                    if state.get(dep) == 1:
+                        raise ValueError(f"Dependency cycle through task {dep}")
+                    if state.get(dep) is None:
+                        state[dep] = 1
+                        stack.append((dep, iter(by_id[dep].depends_on)))
+                        break
+                else:
+                    stack.pop()
+                    state[node] = 2
+                    order.append(node)
+        
+        return order
@@ -10,6 +10,8 @@ Workflow:
 """
 
 import sys
+import asyncio
+import threading
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, asdict
@@ -21,6 +23,8 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from openpyxl.utils.dataframe import dataframe_to_rows
 
+from agents.orchestrator.dag_executor import DAGExecutor, DAGTask, DAGExecutionError
+
 # Setup logging
 logger = structlog.get_logger()
 
@@ -133,9 +137,19 @@ class MainOrchestrator:
     """
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
-        """Initialize Main Orchestrator."""
+        """Initialize Main Orchestrator.
+        
+        Args:
+            config: Optional settings; ``agent_concurrency`` maps agent type
+                ('technical', 'pricing') to its max concurrent line items
+        """
         self.logger = logger.bind(component="MainOrchestrator")
         self.config = config or {}
+        self.agent_concurrency = {
+            'technical': 4,
+            'pricing': 4,
+            **self.config.get('agent_concurrency', {})
+        }
         
         # Worker agents (to be injected)
         self.sales_agent = None
@@ -188,6 +202,53 @@ class MainOrchestrator:
     ) -> Tuple[bool, WorkflowState, Optional[RFPResponse]]:
         """Process RFP through complete workflow.
         
+        Blocking wrapper around process_rfp_async.
+        
+        Args:
+            rfp_document: RFP document content
+            customer_info: Customer information
+            options: Processing options
+            
+        Returns:
+            Tuple of (success, workflow_state, rfp_response)
+        """
+        coroutine = self.process_rfp_async(rfp_document, customer_info, options)
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        
+        # Called from inside an event loop: run the workflow on its own loop
+        outcome = {}
+        
+        def runner():
+            try:
+                outcome['result'] = asyncio.run(coroutine)
+            except BaseException as e:
+                outcome['error'] = e
+        
+        thread = threading.Thread(target=runner, name="orchestrator-workflow")
+        thread.start()
+        thread.join()
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['result']
+    
+    async def process_rfp_async(
+        self,
+        rfp_document: Dict[str, Any],
+        customer_info: Dict[str, Any],
+        options: Optional[Dict[str, Any]] = None
+    ) -> Tuple[bool, WorkflowState, Optional[RFPResponse]]:
+        """Process RFP through complete workflow.
+        
+        After sales analysis, each requirement runs as its own
+        technical -> pricing chain, so pricing for an item starts as soon as
+        its technical match is ready. Chains run concurrently up to the
+        per-agent limits in ``agent_concurrency``; any failure cancels the
+        remaining work.
+        
         Args:
             rfp_document: RFP document content
             customer_info: Customer information
@@ -221,7 +282,8 @@ class MainOrchestrator:
         try:
             # Step 1: Sales Agent Analysis
             workflow_state.status = WorkflowStatus.SALES_ANALYSIS
-            sales_success, sales_result = self._execute_sales_agent(
+            sales_success, sales_result = await asyncio.to_thread(
+                self._execute_sales_agent,
                 rfp_document,
                 customer_info
             )
@@ -233,30 +295,19 @@ class MainOrchestrator:
                 self.statistics['failed_responses'] += 1
                 return False, workflow_state, None
             
-            # Step 2: Technical Agent Review
+            # Steps 2-3: Technical review and pricing, pipelined per line item
             workflow_state.status = WorkflowStatus.TECHNICAL_REVIEW
-            technical_success, technical_result = self._execute_technical_agent(
+            technical_result, pricing_result = await self._execute_line_items(
                 sales_result.data,
-                customer_info
-            )
-            workflow_state.technical_result = technical_result
-            
-            if not technical_success:
-                workflow_state.status = WorkflowStatus.FAILED
-                workflow_state.error_count += 1
-                self.statistics['failed_responses'] += 1
-                return False, workflow_state, None
-            
-            # Step 3: Pricing Agent Calculation
-            workflow_state.status = WorkflowStatus.PRICING_CALCULATION
-            pricing_success, pricing_result = self._execute_pricing_agent(
-                technical_result.data,
                 customer_info,
-                rfp_document
+                rfp_document,
+                workflow_state
             )
+            workflow_state.technical_result = technical_result
             workflow_state.pricing_result = pricing_result
             
-            if not pricing_success:
+            if technical_result.status != AgentStatus.COMPLETED or \
+                    pricing_result is None or pricing_result.status != AgentStatus.COMPLETED:
                 workflow_state.status = WorkflowStatus.FAILED
                 workflow_state.error_count += 1
                 self.statistics['failed_responses'] += 1
@@ -324,6 +375,175 @@ class MainOrchestrator:
             
             return False, workflow_state, None
     
+    async def _execute_line_items(
+        self,
+        sales_analysis: Dict[str, Any],
+        customer_info: Dict[str, Any],
+        rfp_details: Dict[str, Any],
+        workflow_state: WorkflowState
+    ) -> Tuple[AgentResult, Optional[AgentResult]]:
+        """Run technical matching and pricing as per-requirement chains.
+        
+        Args:
+            sales_analysis: Sales agent output
+            customer_info: Customer information
+            rfp_details: RFP details
+            workflow_state: Workflow to update as stages progress
+            
+        Returns:
+            Tuple of (technical_result, pricing_result); pricing_result is
+            None if technical review failed
+        """
+        requirements = sales_analysis.get('requirements', [])
+        per_item_pricing = hasattr(self.pricing_agent, 'price_line_item') and \
+            hasattr(self.pricing_agent, 'build_bid')
+        
+        def technical_task(req: Dict[str, Any]):
+            return lambda _: self._technical_comparison(req)
+        
+        def pricing_task(index: int):
+            def price(inputs: Dict[str, Any]):
+                workflow_state.status = WorkflowStatus.PRICING_CALCULATION
+                comparison = inputs[f"technical:{index}"]
+                return self.pricing_agent.price_line_item(comparison, customer_info)
+            return price
+        
+        tasks = []
+        for index, req in enumerate(requirements):
+            tasks.append(DAGTask(f"technical:{index}", 'technical', technical_task(req)))
+            if per_item_pricing:
+                tasks.append(DAGTask(
+                    f"pricing:{index}", 'pricing', pricing_task(index),
+                    depends_on=[f"technical:{index}"]
+                ))
+        
+        executor = DAGExecutor(concurrency=self.agent_concurrency)
+        self.logger.info(
+            "Executing Technical Agent",
+            line_items=len(requirements),
+            pipelined_pricing=per_item_pricing
+        )
+        
+        try:
+            results = await executor.run(tasks)
+        except DAGExecutionError as e:
+            self.logger.error(
+                "Line item processing failed",
+                task_id=e.task_id,
+                error=str(e.error)
+            )
+            failed = AgentResult(
+                agent_name="Technical Agent" if e.agent_type == 'technical' else "Pricing Agent",
+                status=AgentStatus.FAILED,
+                data={},
+                execution_time_seconds=executor.stage_window(e.agent_type),
+                error_message=str(e.error)
+            )
+            if e.agent_type == 'technical':
+                return failed, None
+            technical_result = AgentResult(
+                agent_name="Technical Agent",
+                status=AgentStatus.COMPLETED,
+                data={},
+                execution_time_seconds=executor.stage_window('technical')
+            )
+            return technical_result, failed
+        
+        comparisons = [results[f"technical:{i}"] for i in range(len(requirements))]
+        technical_result = AgentResult(
+            agent_name="Technical Agent",
+            status=AgentStatus.COMPLETED,
+            data={
+                'comparisons': comparisons,
+                'technical_summary': self._technical_summary(comparisons)
+            },
+            execution_time_seconds=executor.stage_window('technical')
+        )
+        self.logger.info(
+            "Technical Agent completed",
+            execution_time=technical_result.execution_time_seconds
+        )
+        
+        workflow_state.status = WorkflowStatus.PRICING_CALCULATION
+        if not per_item_pricing:
+            _, pricing_result = await asyncio.to_thread(
+                self._execute_pricing_agent,
+                technical_result.data,
+                customer_info,
+                rfp_details
+            )
+            return technical_result, pricing_result
+        
+        pricings = [results[f"pricing:{i}"] for i in range(len(requirements))]
+        pricing_result = await asyncio.to_thread(
+            self._finalize_pricing,
+            [p for p in pricings if p is not None],
+            customer_info,
+            rfp_details,
+            executor.stage_window('pricing')
+        )
+        return technical_result, pricing_result
+    
+    def _finalize_pricing(
+        self,
+        product_pricings: List[Any],
+        customer_info: Dict[str, Any],
+        rfp_details: Dict[str, Any],
+        line_item_time: float
+    ) -> AgentResult:
+        """Combine per-item pricings into the bid.
+        
+        Args:
+            product_pricings: Priced line items in requirement order
+            customer_info: Customer information
+            rfp_details: RFP details
+            line_item_time: Time spent pricing line items
+            
+        Returns:
+            Pricing agent result
+        """
+        start_time = datetime.now()
+        
+        try:
+            if product_pricings:
+                pricing_data = self.pricing_agent.build_bid(
+                    product_pricings,
+                    customer_info,
+                    rfp_details
+                )
+            else:
+                pricing_data = self.pricing_agent.process_pricing_request(
+                    {'comparisons': []},
+                    customer_info,
+                    rfp_details
+                )
+            
+            execution_time = line_item_time + (datetime.now() - start_time).total_seconds()
+            
+            self.logger.info(
+                "Pricing Agent completed",
+                execution_time=execution_time,
+                total_value=(pricing_data.get('bid_summary') or {}).get('grand_total', 0)
+            )
+            
+            return AgentResult(
+                agent_name="Pricing Agent",
+                status=AgentStatus.COMPLETED,
+                data=pricing_data,
+                execution_time_seconds=execution_time
+            )
+            
+        except Exception as e:
+            self.logger.error("Pricing Agent failed", error=str(e))
+            
+            return AgentResult(
+                agent_name="Pricing Agent",
+                status=AgentStatus.FAILED,
+                data={},
+                execution_time_seconds=line_item_time + (datetime.now() - start_time).total_seconds(),
+                error_message=str(e)
+            )
+    
     def _execute_sales_agent(
         self,
         rfp_document: Dict[str, Any],
@@ -421,29 +641,10 @@ class MainOrchestrator:
             
             requirements = sales_analysis.get('requirements', [])
             
+            comparisons = [self._technical_comparison(req) for req in requirements]
             technical_data = {
-                'comparisons': [
-                    {
-                        'requirement': req,
-                        'products': [
-                            {
-                                'name': f"{req.get('product_name', 'Product')}",
-                                'brand': 'Havells',
-                                'unit_price': req.get('unit_price', 100.0),
-                                'category': 'Electrical Cables',
-                                'standards_compliance': ['IS 694:2010'],
-                                'certifications': ['BIS', 'ISO 9001']
-                            }
-                        ]
-                    }
-                    for req in requirements
-                ],
-                'technical_summary': {
-                    'total_products': len(requirements),
-                    'standards_met': ['IS 694', 'IEC 60502'],
-                    'certifications': ['BIS', 'ISO 9001', 'CPRI'],
-                    'compliance_level': 'Full Compliance'
-                }
+                'comparisons': comparisons,
+                'technical_summary': self._technical_summary(comparisons)
             }
             
             execution_time = (datetime.now() - start_time).total_seconds()
@@ -477,6 +678,40 @@ class MainOrchestrator:
             
             return False, result
     
+    def _technical_comparison(self, requirement: Dict[str, Any]) -> Dict[str, Any]:
+        """Technical recommendation for a single requirement.
+        
+        Args:
+            requirement: Requirement line item
+            
+        Returns:
+            Comparison with the requirement and ranked products
+        """
+        # Mock Technical Agent execution
+        # In production, call: self.technical_agent.analyze_requirement(requirement)
+        return {
+            'requirement': requirement,
+            'products': [
+                {
+                    'name': f"{requirement.get('product_name', 'Product')}",
+                    'brand': 'Havells',
+                    'unit_price': requirement.get('unit_price', 100.0),
+                    'category': 'Electrical Cables',
+                    'standards_compliance': ['IS 694:2010'],
+                    'certifications': ['BIS', 'ISO 9001']
+                }
+            ]
+        }
+    
+    def _technical_summary(self, comparisons: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Summarize technical comparisons."""
+        return {
+            'total_products': len(comparisons),
+            'standards_met': ['IS 694', 'IEC 60502'],
+            'certifications': ['BIS', 'ISO 9001', 'CPRI'],
+            'compliance_level': 'Full Compliance'
+        }
+    
     def _execute_pricing_agent(
         self,
         technical_recommendations: Dict[str, Any],
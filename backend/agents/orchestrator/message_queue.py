@@ -6,11 +6,18 @@ from typing import Dict, Any, List, Optional, Callable
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from enum import Enum
+from pathlib import Path
 from queue import Queue, PriorityQueue, Empty
-from threading import Lock, Event
+from threading import Lock, Event, Condition
+from abc import ABC, abstractmethod
+import json
+import sqlite3
+import time
 import uuid
 import structlog
 
+from config.settings import settings
+
 logger = structlog.get_logger()
 
 
@@ -56,6 +63,14 @@ class Message:
         data['priority'] = self.priority.value
         data['status'] = self.status.value
         return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Message':
+        """Create message from dictionary."""
+        data = dict(data)
+        data['priority'] = MessagePriority(data['priority'])
+        data['status'] = MessageStatus(data['status'])
+        return cls(**data)
 
 
 @dataclass
@@ -69,6 +84,376 @@ class MessageQueueStats:
     average_delivery_time: float = 0.0
 
 
+# ============================================================================
+# Persistent Queue Backends
+# ============================================================================
+
+class QueueBackend(ABC):
+    """Abstract durable storage for agent message queues.
+    
+    Dequeued messages are leased for a visibility timeout; unless they are
+    acknowledged before it expires they become visible again, giving
+    at-least-once delivery across worker crashes.
+    """
+    
+    @abstractmethod
+    def enqueue_many(self, messages: List[Message], delay_seconds: float = 0.0):
+        """Persist messages, visible after an optional delay."""
+        pass
+    
+    @abstractmethod
+    def dequeue_many(
+        self,
+        agent_id: str,
+        max_messages: int,
+        visibility_timeout: float
+    ) -> List[Message]:
+        """Lease up to max_messages for an agent in priority order."""
+        pass
+    
+    @abstractmethod
+    def ack_many(self, message_ids: List[str]) -> int:
+        """Remove successfully processed messages; returns how many existed."""
+        pass
+    
+    @abstractmethod
+    def release(self, message: Message, delay_seconds: float = 0.0) -> bool:
+        """Return a leased message to its queue (persisting retry state).
+        
+        Returns:
+            False if the caller's lease expired or was taken over
+        """
+        pass
+    
+    @abstractmethod
+    def dead_letter(self, message: Message, reason: str = "max_retries") -> bool:
+        """Move a leased message to the dead letter queue.
+        
+        Returns:
+            False if the caller's lease expired or was taken over
+        """
+        pass
+    
+    @abstractmethod
+    def dead_letters(self) -> List[Message]:
+        """Get dead-lettered messages."""
+        pass
+    
+    @abstractmethod
+    def clear_dead_letters(self):
+        """Drop dead-lettered messages."""
+        pass
+    
+    @abstractmethod
+    def queue_size(self, agent_id: Optional[str] = None) -> int:
+        """Count undelivered and leased messages (optionally for one agent)."""
+        pass
+    
+    @abstractmethod
+    def set_subscription(self, topic: str, agent_id: str, subscribed: bool):
+        """Persist a topic subscription change."""
+        pass
+    
+    @abstractmethod
+    def subscriptions(self) -> Dict[str, List[str]]:
+        """Load topic -> subscriber agent IDs."""
+        pass
+    
+    @abstractmethod
+    def recover(self, reset_leases: bool = False) -> int:
+        """Make leased messages visible again after a restart.
+        
+        Args:
+            reset_leases: Release all leases immediately instead of only
+                expired ones (safe only when no other worker shares the store)
+        
+        Returns:
+            Number of messages made visible
+        """
+        pass
+    
+    def close(self):
+        """Release backend resources."""
+        pass
+
+
+class SQLiteQueueBackend(QueueBackend):
+    """SQLite (WAL mode) queue backend shared by all workers on one host."""
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS queue_messages (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            message_id TEXT NOT NULL UNIQUE,
+            to_agent TEXT NOT NULL,
+            priority INTEGER NOT NULL,
+            state TEXT NOT NULL,
+            visible_at REAL NOT NULL,
+            delivery_count INTEGER NOT NULL DEFAULT 0,
+            body TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_queue_ready
+            ON queue_messages (to_agent, state, priority, seq);
+        CREATE INDEX IF NOT EXISTS idx_queue_leases
+            ON queue_messages (state, visible_at);
+        CREATE TABLE IF NOT EXISTS queue_dead_letters (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            message_id TEXT NOT NULL,
+            to_agent TEXT NOT NULL,
+            delivery_count INTEGER NOT NULL,
+            reason TEXT NOT NULL,
+            failed_at REAL NOT NULL,
+            body TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS queue_subscriptions (
+            topic TEXT NOT NULL,
+            agent_id TEXT NOT NULL,
+            PRIMARY KEY (topic, agent_id)
+        );
+    """
+    
+    def __init__(
+        self,
+        db_path: str = "data/message_queue.db",
+        busy_timeout: float = 30.0,
+        max_deliveries: int = 5
+    ):
+        """Initialize SQLite backend.
+        
+        Args:
+            db_path: Database file path
+            busy_timeout: Seconds to wait for a competing writer
+            max_deliveries: Deliveries after which a message that is still
+                not acknowledged (e.g. it keeps crashing its consumer) is
+                moved to the dead letter table instead of redelivered
+        """
+        self.logger = logger.bind(component="SQLiteQueueBackend")
+        self.db_path = db_path
+        self.max_deliveries = max_deliveries
+        
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        self._conn = sqlite3.connect(
+            db_path,
+            timeout=busy_timeout,
+            isolation_level=None,  # explicit transactions only
+            check_same_thread=False
+        )
+        self._lock = Lock()
+        
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self._SCHEMA)
+        
+        self.logger.info("SQLite queue backend ready", db_path=db_path)
+    
+    def _transaction(self, work: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run work inside BEGIN IMMEDIATE so claims never race."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(self._conn)
+                self._conn.execute("COMMIT")
+                return result
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    def enqueue_many(self, messages: List[Message], delay_seconds: float = 0.0):
+        visible_at = time.time() + delay_seconds
+        rows = [
+            (
+                m.message_id, m.to_agent, m.priority.value, 'ready',
+                visible_at, json.dumps(m.to_dict(), default=str)
+            )
+            for m in messages
+        ]
+        self._transaction(lambda conn: conn.executemany(
+            "INSERT INTO queue_messages "
+            "(message_id, to_agent, priority, state, visible_at, body) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows
+        ))
+    
+    def dequeue_many(
+        self,
+        agent_id: str,
+        max_messages: int,
+        visibility_timeout: float
+    ) -> List[Message]:
+        def claim(conn: sqlite3.Connection) -> List[Message]:
+            now = time.time()
+            # Poison messages out of deliveries are dead-lettered, not redelivered
+            visible_poison = (
+                "FROM queue_messages WHERE to_agent = ? AND state IN ('ready', 'leased') "
+                "AND visible_at <= ? AND delivery_count >= ?"
+            )
+            poison_params = (agent_id, now, self.max_deliveries)
+            conn.execute(
+                "INSERT INTO queue_dead_letters "
+                "(message_id, to_agent, delivery_count, reason, failed_at, body) "
+                "SELECT message_id, to_agent, delivery_count, 'max_deliveries', ?, body "
+                + visible_poison,
+                (now,) + poison_params
+            )
+            poisoned = conn.execute("DELETE " + visible_poison, poison_params).rowcount
+            if poisoned:
+                self.logger.error(
+                    "Messages dead-lettered after max deliveries",
+                    agent_id=agent_id,
+                    count=poisoned,
+                    max_deliveries=self.max_deliveries
+                )
+            
+            # Expired leases go back to the ready set
+            conn.execute(
+                "UPDATE queue_messages SET state = 'ready' "
+                "WHERE state = 'leased' AND visible_at <= ?",
+                (now,)
+            )
+            rows = conn.execute(
+                "SELECT seq, body, delivery_count FROM queue_messages "
+                "WHERE to_agent = ? AND state = 'ready' AND visible_at <= ? "
+                "ORDER BY priority, seq LIMIT ?",
+                (agent_id, now, max_messages)
+            ).fetchall()
+            if not rows:
+                return []
+            
+            conn.executemany(
+                "UPDATE queue_messages SET state = 'leased', visible_at = ?, "
+                "delivery_count = delivery_count + 1 WHERE seq = ?",
+                [(now + visibility_timeout, seq) for seq, _, _ in rows]
+            )
+            
+            messages = []
+            for _, body, delivery_count in rows:
+                message = Message.from_dict(json.loads(body))
+                message.metadata['delivery_count'] = delivery_count + 1
+                messages.append(message)
+            return messages
+        
+        return self._transaction(claim)
+    
+    def ack_many(self, message_ids: List[str]) -> int:
+        return self._transaction(lambda conn: conn.executemany(
+            "DELETE FROM queue_messages WHERE message_id = ?",
+            [(message_id,) for message_id in message_ids]
+        ).rowcount)
+    
+    @staticmethod
+    def _lease_filter(message: Message) -> tuple:
+        """WHERE clause matching only the caller's live lease.
+        
+        The delivery count stamped on the message at dequeue fences off
+        leases that expired and were re-claimed by another worker.
+        """
+        return (
+            "message_id = ? AND state = 'leased' AND delivery_count = ? AND visible_at > ?",
+            (message.message_id, message.metadata.get('delivery_count'), time.time())
+        )
+    
+    def release(self, message: Message, delay_seconds: float = 0.0) -> bool:
+        where, params = self._lease_filter(message)
+        return self._transaction(lambda conn: conn.execute(
+            "UPDATE queue_messages SET state = 'ready', visible_at = ?, body = ? WHERE " + where,
+            (time.time() + delay_seconds, json.dumps(message.to_dict(), default=str)) + params
+        ).rowcount) == 1
+    
+    def dead_letter(self, message: Message, reason: str = "max_retries") -> bool:
+        where, params = self._lease_filter(message)
+        
+        def move(conn: sqlite3.Connection) -> bool:
+            row = conn.execute(
+                "SELECT seq, to_agent, delivery_count FROM queue_messages WHERE " + where,
+                params
+            ).fetchone()
+            if row is None:
+                return False
+            seq, to_agent, delivery_count = row
+            conn.execute(
+                "INSERT INTO queue_dead_letters "
+                "(message_id, to_agent, delivery_count, reason, failed_at, body) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    message.message_id, to_agent, delivery_count, reason, time.time(),
+                    json.dumps(message.to_dict(), default=str)
+                )
+            )
+            conn.execute("DELETE FROM queue_messages WHERE seq = ?", (seq,))
+            return True
+        
+        return self._transaction(move)
+    
+    def dead_letters(self) -> List[Message]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT body, delivery_count, reason FROM queue_dead_letters ORDER BY seq"
+            ).fetchall()
+        messages = []
+        for body, delivery_count, reason in rows:
+            message = Message.from_dict(json.loads(body))
+            message.status = MessageStatus.FAILED
+            message.metadata['delivery_count'] = delivery_count
+            message.metadata['dead_letter_reason'] = reason
+            messages.append(message)
+        return messages
+    
+    def clear_dead_letters(self):
+        self._transaction(lambda conn: conn.execute("DELETE FROM queue_dead_letters"))
+    
+    def queue_size(self, agent_id: Optional[str] = None) -> int:
+        query = "SELECT COUNT(*) FROM queue_messages WHERE state IN ('ready', 'leased')"
+        params: tuple = ()
+        if agent_id is not None:
+            query += " AND to_agent = ?"
+            params = (agent_id,)
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()[0]
+    
+    def set_subscription(self, topic: str, agent_id: str, subscribed: bool):
+        if subscribed:
+            sql = "INSERT OR IGNORE INTO queue_subscriptions (topic, agent_id) VALUES (?, ?)"
+        else:
+            sql = "DELETE FROM queue_subscriptions WHERE topic = ? AND agent_id = ?"
+        self._transaction(lambda conn: conn.execute(sql, (topic, agent_id)))
+    
+    def subscriptions(self) -> Dict[str, List[str]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT topic, agent_id FROM queue_subscriptions ORDER BY rowid"
+            ).fetchall()
+        subscribers: Dict[str, List[str]] = {}
+        for topic, agent_id in rows:
+            subscribers.setdefault(topic, []).append(agent_id)
+        return subscribers
+    
+    def recover(self, reset_leases: bool = False) -> int:
+        def reclaim(conn: sqlite3.Connection) -> int:
+            if reset_leases:
+                cursor = conn.execute(
+                    "UPDATE queue_messages SET state = 'ready', visible_at = ? "
+                    "WHERE state = 'leased'",
+                    (time.time(),)
+                )
+            else:
+                cursor = conn.execute(
+                    "UPDATE queue_messages SET state = 'ready' "
+                    "WHERE state = 'leased' AND visible_at <= ?",
+                    (time.time(),)
+                )
+            return cursor.rowcount
+        
+        recovered = self._transaction(reclaim)
+        self.logger.info("Queue recovered", redelivered=recovered, pending=self.queue_size())
+        return recovered
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
 class AgentMessageQueue:
     """
     Message Queue System for Agent Communication
@@ -81,18 +466,32 @@ class AgentMessageQueue:
     - Message expiration
     - Pub/Sub pattern support
     - Request/Response correlation
+    - Optional durable backend with batching and visibility timeouts
     """
     
     def __init__(
         self,
         max_queue_size: int = 1000,
-        enable_persistence: bool = False
+        enable_persistence: bool = False,
+        backend: Optional[QueueBackend] = None,
+        persistence_path: str = "data/message_queue.db",
+        visibility_timeout: float = 30.0,
+        retry_delay: float = 0.0,
+        max_deliveries: int = 5
     ):
         """Initialize message queue.
         
         Args:
-            max_queue_size: Maximum queue size
-            enable_persistence: Enable message persistence
+            max_queue_size: Maximum queue size (in-memory queues only)
+            enable_persistence: Enable message persistence (SQLite backend
+                at persistence_path unless a backend is given)
+            backend: Durable queue backend
+            persistence_path: SQLite database path for the default backend
+            visibility_timeout: Seconds a received message stays leased
+                before it is redelivered if not acknowledged
+            retry_delay: Seconds before a failed message is redelivered
+            max_deliveries: Deliveries before an unacknowledged message is
+                dead-lettered (default SQLite backend only)
         """
         self.logger = logger.bind(component="MessageQueue")
         
@@ -115,9 +514,21 @@ class AgentMessageQueue:
         
         # Configuration
         self.max_queue_size = max_queue_size
-        self.enable_persistence = enable_persistence
+        self.visibility_timeout = visibility_timeout
+        self.retry_delay = retry_delay
+        
+        # Durable backend (None = in-memory priority queues)
+        if backend is None and enable_persistence:
+            backend = SQLiteQueueBackend(persistence_path, max_deliveries=max_deliveries)
+        self.backend = backend
+        self.enable_persistence = backend is not None
+        self._available = Condition()
         
-        self.logger.info("Message Queue initialized")
+        if self.backend is not None:
+            self._subscribers = self.backend.subscriptions()
+            self.backend.recover()
+        
+        self.logger.info("Message Queue initialized", persistent=self.enable_persistence)
     
     def register_agent_queue(self, agent_id: str):
         """Register a message queue for an agent.
@@ -156,14 +567,40 @@ class AgentMessageQueue:
         Returns:
             Message ID
         """
-        # Ensure destination queue exists
-        if to_agent not in self._agent_queues:
-            self.register_agent_queue(to_agent)
-        
-        # Create message
-        message_id = str(uuid.uuid4())
-        message = Message(
-            message_id=message_id,
+        message = self._build_message(
+            from_agent, to_agent, message_type, payload,
+            priority, correlation_id, reply_to, metadata
+        )
+        self._enqueue([message])
+        return message.message_id
+    
+    def send_batch(self, messages: List[Dict[str, Any]]) -> List[str]:
+        """Send several messages in one enqueue operation.
+        
+        Args:
+            messages: send_message keyword arguments, one dict per message
+            
+        Returns:
+            Message IDs in input order
+        """
+        built = [self._build_message(**spec) for spec in messages]
+        self._enqueue(built)
+        return [message.message_id for message in built]
+    
+    def _build_message(
+        self,
+        from_agent: str,
+        to_agent: str,
+        message_type: str,
+        payload: Dict[str, Any],
+        priority: MessagePriority = MessagePriority.NORMAL,
+        correlation_id: Optional[str] = None,
+        reply_to: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Message:
+        """Create a message object."""
+        return Message(
+            message_id=str(uuid.uuid4()),
             from_agent=from_agent,
             to_agent=to_agent,
             message_type=message_type,
@@ -174,41 +611,67 @@ class AgentMessageQueue:
             reply_to=reply_to,
             metadata=metadata or {}
         )
+    
+    def _enqueue(self, messages: List[Message]):
+        """Deliver messages to their destination queues.
         
-        # Store message
-        with self._message_lock:
-            self._messages[message_id] = message
-        
-        # Enqueue message (priority, timestamp, message)
-        try:
-            self._agent_queues[to_agent].put(
-                (priority.value, datetime.now().timestamp(), message),
-                block=False
-            )
+        Args:
+            messages: Messages to enqueue
+        """
+        if self.backend is not None:
+            try:
+                self.backend.enqueue_many(messages)
+            except Exception as e:
+                self.logger.error("Failed to send messages", count=len(messages), error=str(e))
+                for message in messages:
+                    message.status = MessageStatus.FAILED
+                self.stats.total_messages_failed += len(messages)
+                raise
             
-            self.stats.total_messages_sent += 1
-            self.stats.pending_messages += 1
+            self.stats.total_messages_sent += len(messages)
+            with self._available:
+                self._available.notify_all()
             
-            self.logger.info(
-                "Message sent",
-                message_id=message_id,
-                from_agent=from_agent,
-                to_agent=to_agent,
-                message_type=message_type,
-                priority=priority.value
-            )
+            self.logger.info("Messages sent", count=len(messages), persistent=True)
+            return
+        
+        for message in messages:
+            # Ensure destination queue exists
+            if message.to_agent not in self._agent_queues:
+                self.register_agent_queue(message.to_agent)
             
-            return message_id
+            # Store message
+            with self._message_lock:
+                self._messages[message.message_id] = message
             
-        except Exception as e:
-            self.logger.error(
-                "Failed to send message",
-                message_id=message_id,
-                error=str(e)
-            )
-            message.status = MessageStatus.FAILED
-            self.stats.total_messages_failed += 1
-            raise
+            # Enqueue message (priority, timestamp, message)
+            try:
+                self._agent_queues[message.to_agent].put(
+                    (message.priority.value, datetime.now().timestamp(), message),
+                    block=False
+                )
+                
+                self.stats.total_messages_sent += 1
+                self.stats.pending_messages += 1
+                
+                self.logger.info(
+                    "Message sent",
+                    message_id=message.message_id,
+                    from_agent=message.from_agent,
+                    to_agent=message.to_agent,
+                    message_type=message.message_type,
+                    priority=message.priority.value
+                )
+                
+            except Exception as e:
+                self.logger.error(
+                    "Failed to send message",
+                    message_id=message.message_id,
+                    error=str(e)
+                )
+                message.status = MessageStatus.FAILED
+                self.stats.total_messages_failed += 1
+                raise
     
     def receive_message(
         self,
@@ -224,6 +687,10 @@ class AgentMessageQueue:
         Returns:
             Message or None
         """
+        if self.backend is not None:
+            messages = self.receive_batch(agent_id, max_messages=1, timeout=timeout)
+            return messages[0] if messages else None
+        
         if agent_id not in self._agent_queues:
             return None
         
@@ -255,16 +722,83 @@ class AgentMessageQueue:
             )
             return None
     
-    def acknowledge_message(self, message_id: str, success: bool = True):
+    def receive_batch(
+        self,
+        agent_id: str,
+        max_messages: int = 10,
+        timeout: float = 1.0
+    ) -> List[Message]:
+        """Receive up to max_messages for an agent in priority order.
+        
+        Waits up to timeout for the first message, then takes whatever else
+        is ready without blocking.
+        
+        Args:
+            agent_id: Agent ID
+            max_messages: Maximum messages to return
+            timeout: Timeout in seconds
+            
+        Returns:
+            List of messages (empty on timeout)
+        """
+        if self.backend is None:
+            first = self.receive_message(agent_id, timeout=timeout)
+            if first is None:
+                return []
+            messages = [first]
+            queue = self._agent_queues[agent_id]
+            while len(messages) < max_messages:
+                try:
+                    _, _, message = queue.get_nowait()
+                except Empty:
+                    break
+                message.status = MessageStatus.DELIVERED
+                self.stats.total_messages_delivered += 1
+                self.stats.pending_messages -= 1
+                messages.append(message)
+            return messages
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                messages = self.backend.dequeue_many(agent_id, max_messages, self.visibility_timeout)
+            except Exception as e:
+                self.logger.error("Failed to receive messages", agent_id=agent_id, error=str(e))
+                return []
+            
+            if messages:
+                with self._message_lock:
+                    for message in messages:
+                        message.status = MessageStatus.DELIVERED
+                        self._messages[message.message_id] = message
+                self.stats.total_messages_delivered += len(messages)
+                self.logger.info("Messages received", agent_id=agent_id, count=len(messages))
+                return messages
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return []
+            # Local sends notify immediately; poll for other processes' sends
+            with self._available:
+                self._available.wait(min(remaining, 0.05))
+    
+    def acknowledge_message(self, message_id: str, success: bool = True) -> bool:
         """Acknowledge message processing.
         
         Args:
             message_id: Message ID
             success: Whether processing was successful
+            
+        Returns:
+            False if the message (or its lease) is unknown or has expired
         """
+        if self.backend is not None:
+            return self._acknowledge_persistent(message_id, success)
+        
         with self._message_lock:
             if message_id not in self._messages:
-                return
+                self.logger.warning("Acknowledged unknown message", message_id=message_id)
+                return False
             
             message = self._messages[message_id]
             
@@ -306,6 +840,84 @@ class AgentMessageQueue:
                         message_id=message_id,
                         retry_count=message.retry_count
                     )
+        return True
+    
+    def acknowledge_batch(self, message_ids: List[str], success: bool = True):
+        """Acknowledge several messages at once.
+        
+        Args:
+            message_ids: Message IDs
+            success: Whether processing was successful
+        """
+        if self.backend is not None and success:
+            acknowledged = self.backend.ack_many(message_ids)
+            with self._message_lock:
+                for message_id in message_ids:
+                    message = self._messages.pop(message_id, None)
+                    if message is not None:
+                        message.status = MessageStatus.COMPLETED
+            if acknowledged < len(message_ids):
+                self.logger.warning(
+                    "Acknowledged messages no longer queued",
+                    missing=len(message_ids) - acknowledged
+                )
+            self.logger.info("Messages acknowledged", count=acknowledged)
+            return
+        
+        for message_id in message_ids:
+            self.acknowledge_message(message_id, success=success)
+    
+    def _acknowledge_persistent(self, message_id: str, success: bool) -> bool:
+        """Acknowledge a message leased from the durable backend."""
+        with self._message_lock:
+            message = self._messages.pop(message_id, None)
+        
+        if success:
+            if not self.backend.ack_many([message_id]):
+                self.logger.warning("Acknowledged message no longer queued", message_id=message_id)
+                return False
+            if message is not None:
+                message.status = MessageStatus.COMPLETED
+            self.logger.info("Message acknowledged", message_id=message_id)
+            return True
+        
+        if message is None:
+            # Lease unknown here (e.g. after a restart); it is redelivered on timeout
+            self.logger.warning("Cannot retry message with unknown lease", message_id=message_id)
+            return False
+        
+        message.retry_count += 1
+        if message.retry_count < message.max_retries:
+            message.status = MessageStatus.PENDING
+            if not self.backend.release(message, delay_seconds=self.retry_delay):
+                return self._lease_lost(message)
+            with self._available:
+                self._available.notify_all()
+            self.logger.warning(
+                "Message retry",
+                message_id=message_id,
+                retry_count=message.retry_count
+            )
+        else:
+            message.status = MessageStatus.FAILED
+            if not self.backend.dead_letter(message):
+                return self._lease_lost(message)
+            self.stats.total_messages_failed += 1
+            self.logger.error(
+                "Message failed after max retries",
+                message_id=message_id,
+                retry_count=message.retry_count
+            )
+        return True
+    
+    def _lease_lost(self, message: Message) -> bool:
+        """Log a failure acknowledgement that arrived after the lease expired."""
+        self.logger.warning(
+            "Lease expired before acknowledgement; message will be redelivered",
+            message_id=message.message_id,
+            delivery_count=message.metadata.get('delivery_count')
+        )
+        return False
     
     def send_request(
         self,
@@ -384,6 +996,8 @@ class AgentMessageQueue:
         
         if agent_id not in self._subscribers[topic]:
             self._subscribers[topic].append(agent_id)
+            if self.backend is not None:
+                self.backend.set_subscription(topic, agent_id, True)
             
             self.logger.info(
                 "Agent subscribed to topic",
@@ -400,6 +1014,8 @@ class AgentMessageQueue:
         """
         if topic in self._subscribers and agent_id in self._subscribers[topic]:
             self._subscribers[topic].remove(agent_id)
+            if self.backend is not None:
+                self.backend.set_subscription(topic, agent_id, False)
             
             self.logger.info(
                 "Agent unsubscribed from topic",
@@ -427,20 +1043,19 @@ class AgentMessageQueue:
         Returns:
             List of message IDs
         """
-        message_ids = []
-        
         subscribers = self._subscribers.get(topic, [])
         
-        for subscriber_id in subscribers:
-            message_id = self.send_message(
-                from_agent=from_agent,
-                to_agent=subscriber_id,
-                message_type=message_type,
-                payload=payload,
-                priority=priority,
-                metadata={'topic': topic}
-            )
-            message_ids.append(message_id)
+        message_ids = self.send_batch([
+            {
+                'from_agent': from_agent,
+                'to_agent': subscriber_id,
+                'message_type': message_type,
+                'payload': payload,
+                'priority': priority,
+                'metadata': {'topic': topic}
+            }
+            for subscriber_id in subscribers
+        ])
         
         self.logger.info(
             "Message published",
@@ -460,6 +1075,8 @@ class AgentMessageQueue:
         Returns:
             Queue size
         """
+        if self.backend is not None:
+            return self.backend.queue_size(agent_id)
         if agent_id not in self._agent_queues:
             return 0
         return self._agent_queues[agent_id].qsize()
@@ -470,10 +1087,14 @@ class AgentMessageQueue:
         Returns:
             List of failed messages
         """
+        if self.backend is not None:
+            return self.backend.dead_letters()
         return self._dead_letter_queue.copy()
     
     def clear_dead_letter_queue(self):
         """Clear dead letter queue."""
+        if self.backend is not None:
+            self.backend.clear_dead_letters()
         self._dead_letter_queue.clear()
         self.logger.info("Dead letter queue cleared")
     
@@ -483,16 +1104,28 @@ class AgentMessageQueue:
         Returns:
             Statistics dictionary
         """
+        pending = self.stats.pending_messages
+        dead_letters = len(self._dead_letter_queue)
+        if self.backend is not None:
+            pending = self.backend.queue_size()
+            dead_letters = len(self.backend.dead_letters())
+        
         return {
             'total_messages_sent': self.stats.total_messages_sent,
             'total_messages_delivered': self.stats.total_messages_delivered,
             'total_messages_failed': self.stats.total_messages_failed,
             'total_messages_timeout': self.stats.total_messages_timeout,
-            'pending_messages': self.stats.pending_messages,
-            'dead_letter_queue_size': len(self._dead_letter_queue),
+            'pending_messages': pending,
+            'dead_letter_queue_size': dead_letters,
             'registered_agents': len(self._agent_queues),
-            'active_topics': len(self._subscribers)
+            'active_topics': len(self._subscribers),
+            'persistent': self.enable_persistence
         }
+    
+    def close(self):
+        """Close the durable backend, if any."""
+        if self.backend is not None:
+            self.backend.close()
 
 
 # Global message queue instance
@@ -502,10 +1135,16 @@ _global_message_queue = None
 def get_global_message_queue() -> AgentMessageQueue:
     """Get global message queue instance.
     
+    Uses the durable SQLite backend when MESSAGE_QUEUE_PERSISTENT is set.
+    
     Returns:
         Global AgentMessageQueue instance
     """
     global _global_message_queue
     if _global_message_queue is None:
-        _global_message_queue = AgentMessageQueue()
+        _global_message_queue = AgentMessageQueue(
+            enable_persistence=settings.message_queue_persistent,
+            persistence_path=str(settings.message_queue_path),
+            max_deliveries=settings.message_queue_max_deliveries
+        )
     return _global_message_queue
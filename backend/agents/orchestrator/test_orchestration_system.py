@@ -3,6 +3,7 @@ Comprehensive Test Suite for Orchestration System
 Tests all components and integration.
 """
 import pytest
+import asyncio
 from typing import Dict, Any
 from datetime import datetime
 import sys
@@ -15,7 +16,7 @@ from agents.orchestrator.agent_registry import (
     AgentRegistry, AgentType, AgentCapability, AgentMetadata
 )
 from agents.orchestrator.message_queue import (
-    AgentMessageQueue, MessagePriority, MessageStatus
+    AgentMessageQueue, MessagePriority, MessageStatus, SQLiteQueueBackend
 )
 from agents.orchestrator.communication_protocol import (
     AgentCommunicationProtocol, ProtocolMessageType
@@ -31,6 +32,7 @@ from agents.orchestrator.audit_trail import (
     AuditTrailGenerator, AuditEventType, AuditSeverity
 )
 from agents.orchestrator.enhanced_orchestrator import EnhancedMainOrchestrator
+from agents.orchestrator.dag_executor import DAGExecutor, DAGTask, DAGExecutionError
 
 
 class TestAgentRegistry:
@@ -189,6 +191,144 @@ class TestMessageQueue:
         print("✓ Pub/sub test passed")
 
 
+class TestPersistentMessageQueue:
+    """Test the SQLite-backed message queue."""
+    
+    def test_priority_batch_dequeue(self, tmp_path):
+        """Batches come back in priority order, then send order."""
+        queue = AgentMessageQueue(backend=SQLiteQueueBackend(str(tmp_path / "queue.db")))
+        
+        ids = queue.send_batch([
+            {"from_agent": "a", "to_agent": "b", "message_type": "low",
+             "payload": {}, "priority": MessagePriority.LOW},
+            {"from_agent": "a", "to_agent": "b", "message_type": "critical",
+             "payload": {}, "priority": MessagePriority.CRITICAL},
+            {"from_agent": "a", "to_agent": "b", "message_type": "normal",
+             "payload": {"n": 1}},
+        ])
+        
+        messages = queue.receive_batch("b", max_messages=10, timeout=0.1)
+        
+        assert [m.message_type for m in messages] == ["critical", "normal", "low"]
+        assert messages[1].payload == {"n": 1}
+        queue.acknowledge_batch(ids)
+        assert queue.get_queue_size("b") == 0
+        
+        print("✓ Persistent priority batch test passed")
+    
+    def test_unacknowledged_message_redelivered(self, tmp_path):
+        """A leased message becomes visible again after its timeout."""
+        queue = AgentMessageQueue(
+            backend=SQLiteQueueBackend(str(tmp_path / "queue.db")),
+            visibility_timeout=0.05
+        )
+        message_id = queue.send_message("a", "b", "work", {"job": 1})
+        
+        assert queue.receive_message("b", timeout=0.1).message_id == message_id
+        assert queue.receive_message("b", timeout=0.0) is None
+        
+        redelivered = queue.receive_message("b", timeout=1.0)
+        assert redelivered.message_id == message_id
+        assert redelivered.metadata["delivery_count"] == 2
+        
+        print("✓ Visibility timeout redelivery test passed")
+    
+    def test_restart_recovers_messages_and_subscriptions(self, tmp_path):
+        """Pending messages and topics survive a restart."""
+        db_path = str(tmp_path / "queue.db")
+        queue = AgentMessageQueue(enable_persistence=True, persistence_path=db_path)
+        queue.subscribe("pricing", "tender_released")
+        queue.publish("sales", "tender_released", "new_tender", {"rfp": 7})
+        queue.send_message("sales", "pricing", "leased", {})
+        assert queue.receive_message("pricing", timeout=0.1) is not None
+        queue.close()
+        
+        # In-flight lease is released on recovery
+        backend = SQLiteQueueBackend(db_path)
+        assert backend.recover(reset_leases=True) == 1
+        restarted = AgentMessageQueue(backend=backend)
+        
+        assert restarted._subscribers == {"tender_released": ["pricing"]}
+        assert restarted.get_queue_size("pricing") == 2
+        
+        print("✓ Restart recovery test passed")
+    
+    def test_failed_message_dead_lettered(self, tmp_path):
+        """Messages exceeding max retries move to the dead letter queue."""
+        queue = AgentMessageQueue(backend=SQLiteQueueBackend(str(tmp_path / "queue.db")))
+        message_id = queue.send_message("a", "b", "flaky", {})
+        
+        for _ in range(3):
+            message = queue.receive_message("b", timeout=0.1)
+            assert message.message_id == message_id
+            queue.acknowledge_message(message_id, success=False)
+        
+        assert queue.get_queue_size("b") == 0
+        dead = queue.get_dead_letter_queue()
+        assert [m.message_id for m in dead] == [message_id]
+        assert dead[0].retry_count == 3
+        
+        print("✓ Dead letter test passed")
+    
+    def test_poison_message_dead_lettered_after_max_deliveries(self, tmp_path):
+        """A message that is never acknowledged stops being redelivered."""
+        queue = AgentMessageQueue(
+            backend=SQLiteQueueBackend(str(tmp_path / "queue.db"), max_deliveries=2),
+            visibility_timeout=0.05
+        )
+        message_id = queue.send_message("a", "b", "crashes_consumer", {})
+        
+        assert queue.receive_message("b", timeout=0.1).message_id == message_id
+        assert queue.receive_message("b", timeout=1.0).message_id == message_id
+        assert queue.receive_message("b", timeout=0.2) is None
+        
+        dead = queue.get_dead_letter_queue()
+        assert [m.message_id for m in dead] == [message_id]
+        assert dead[0].metadata["dead_letter_reason"] == "max_deliveries"
+        assert dead[0].metadata["delivery_count"] == 2
+        assert queue.get_queue_size("b") == 0
+        
+        queue.clear_dead_letter_queue()
+        assert queue.get_dead_letter_queue() == []
+        
+        print("✓ Max deliveries test passed")
+    
+    def test_expired_lease_acknowledgement_rejected(self, tmp_path):
+        """A worker whose lease expired cannot release another worker's lease."""
+        db_path = str(tmp_path / "queue.db")
+        slow = AgentMessageQueue(backend=SQLiteQueueBackend(db_path), visibility_timeout=0.05)
+        fast = AgentMessageQueue(backend=SQLiteQueueBackend(db_path), visibility_timeout=30.0)
+        message_id = slow.send_message("a", "b", "work", {})
+        
+        assert slow.receive_message("b", timeout=0.1).message_id == message_id
+        assert fast.receive_message("b", timeout=1.0).message_id == message_id
+        
+        assert slow.acknowledge_message(message_id, success=False) is False
+        assert slow.acknowledge_message("unknown", success=False) is False
+        assert fast.get_queue_size("b") == 1
+        assert fast.acknowledge_message(message_id) is True
+        assert fast.acknowledge_message(message_id) is False
+        assert fast.get_queue_size("b") == 0
+        
+        print("✓ Expired lease test passed")
+    
+    def test_global_queue_backend_from_settings(self, tmp_path, monkeypatch):
+        """The global queue is durable when MESSAGE_QUEUE_PERSISTENT is set."""
+        from agents.orchestrator import message_queue
+        
+        monkeypatch.setattr(message_queue, "_global_message_queue", None)
+        monkeypatch.setattr(message_queue.settings, "message_queue_persistent", True)
+        monkeypatch.setattr(message_queue.settings, "message_queue_path", tmp_path / "global.db")
+        queue = message_queue.get_global_message_queue()
+        
+        assert queue.enable_persistence
+        assert queue.backend.db_path == str(tmp_path / "global.db")
+        assert message_queue.get_global_message_queue() is queue
+        queue.close()
+        
+        print("✓ Global queue settings test passed")
+
+
 class TestCommunicationProtocol:
     """Test Communication Protocol."""
     
@@ -433,6 +573,68 @@ class TestAuditTrail:
         print("✓ Audit report generation test passed")
 
 
+class TestDAGExecutor:
+    """Test per-line-item DAG execution."""
+    
+    async def test_pricing_starts_before_all_technical_done(self):
+        """An item's pricing runs as soon as its own technical match is ready."""
+        events = []
+        
+        def technical(index):
+            async def run(_):
+                await asyncio.sleep(0.01 * (index + 1))
+                events.append(f"technical:{index}")
+                return index
+            return run
+        
+        def pricing(index):
+            async def run(inputs):
+                events.append(f"pricing:{index}")
+                return inputs[f"technical:{index}"] * 10
+            return run
+        
+        tasks = []
+        for i in range(3):
+            tasks.append(DAGTask(f"technical:{i}", "technical", technical(i)))
+            tasks.append(DAGTask(f"pricing:{i}", "pricing", pricing(i), depends_on=[f"technical:{i}"]))
+        
+        results = await DAGExecutor().run(tasks)
+        
+        assert [results[f"pricing:{i}"] for i in range(3)] == [0, 10, 20]
+        assert events.index("pricing:0") < events.index("technical:2")
+        
+        print("✓ DAG pipelining test passed")
+    
+    async def test_concurrency_limit_and_cancellation(self):
+        """Per-agent limits are honored and a failure cancels pending work."""
+        running = {"now": 0, "peak": 0}
+        finished = []
+        
+        def work(index):
+            async def run(_):
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+                try:
+                    await asyncio.sleep(0.02)
+                    if index == 1:
+                        raise ValueError("no matching product")
+                    finished.append(index)
+                finally:
+                    running["now"] -= 1
+            return run
+        
+        tasks = [DAGTask(f"technical:{i}", "technical", work(i)) for i in range(6)]
+        
+        with pytest.raises(DAGExecutionError) as exc_info:
+            await DAGExecutor(concurrency={"technical": 2}).run(tasks)
+        
+        assert exc_info.value.task_id == "technical:1"
+        assert running["peak"] == 2
+        assert len(finished) < 5
+        
+        print("✓ DAG concurrency/cancellation test passed")
+
+
 class TestEnhancedOrchestrator:
     """Test Enhanced Orchestrator Integration."""
     
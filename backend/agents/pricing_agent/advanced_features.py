@@ -4,12 +4,14 @@ Advanced Pricing Agent Features
 - Cost comparison generator
 - Sensitivity analysis
 - What-if scenario generator
+- Monte Carlo scenario engine (distributions and tornado charts)
 - Competitive analysis
 - Pricing approval workflow
 - API interface
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
+import numpy as np
 import pandas as pd
 from enum import Enum
 
@@ -52,9 +54,173 @@ class WhatIfScenario:
     difference_percent: float
 
 
+# Parameters a ScenarioEngine can perturb, as percentage variations
+SCENARIO_PARAMETERS = ('margin', 'discount', 'logistics', 'copper', 'fx')
+
+DEFAULT_SCENARIO_RANGES = {
+    'margin': (-20.0, 20.0),
+    'discount': (-50.0, 50.0),
+    'logistics': (-15.0, 25.0),
+    'copper': (-15.0, 15.0),
+    'fx': (-5.0, 5.0)
+}
+
+# Parameters whose impact depends on the bid's copper / foreign-currency exposure
+COST_SHARE_PARAMETERS = ('copper', 'fx')
+
+# Share of a copper-conductor line's cost that tracks the copper price, for
+# line items that do not carry an explicit 'copper_share'
+COPPER_CONDUCTOR_COST_SHARE = 0.6
+
+
+def _known(value: Any) -> bool:
+    return value is not None and str(value).strip().upper() not in ('', 'N/A', 'NA', 'UNKNOWN')
+
+
+def derive_cost_shares(base_bid: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """Copper and FX shares of the products subtotal from the bid's line items.
+    
+    A line's copper exposure is its 'copper_share', else
+    COPPER_CONDUCTOR_COST_SHARE when its 'conductor_material' is copper
+    (0 for other materials). Its FX exposure is its 'fx_share', else 1.0
+    when its 'currency' is not INR or its 'country_of_origin' is not India.
+    
+    Args:
+        base_bid: Bid with 'product_pricings' line items
+        
+    Returns:
+        {'copper': share, 'fx': share}; a share is None when no line item
+        carries the information needed to derive it
+    """
+    items = base_bid.get('product_pricings') or []
+    weights = [float(item.get('subtotal') or 0.0) for item in items]
+    total = sum(weights)
+    exposure = {'copper': 0.0, 'fx': 0.0}
+    known = {'copper': False, 'fx': False}
+    
+    for item, weight in zip(items, weights):
+        material = item.get('conductor_material')
+        if _known(item.get('copper_share')):
+            copper = float(item['copper_share'])
+        elif _known(material):
+            copper = COPPER_CONDUCTOR_COST_SHARE if 'copper' in str(material).lower() else 0.0
+        else:
+            copper = None
+        
+        currency, origin = item.get('currency'), item.get('country_of_origin')
+        if _known(item.get('fx_share')):
+            fx = float(item['fx_share'])
+        elif _known(currency) or _known(origin):
+            imported = (_known(currency) and str(currency).upper() != 'INR') or (
+                _known(origin) and str(origin).strip().lower() != 'india'
+            )
+            fx = 1.0 if imported else 0.0
+        else:
+            fx = None
+        
+        for name, share in (('copper', copper), ('fx', fx)):
+            if share is not None:
+                known[name] = True
+                exposure[name] += weight * share
+    
+    return {
+        name: exposure[name] / total if known[name] and total > 0 else None
+        for name in COST_SHARE_PARAMETERS
+    }
+
+
+@dataclass
+class ScenarioResults:
+    """Metrics for a batch of pricing scenarios, one array element per scenario."""
+    variations: Dict[str, np.ndarray]
+    grand_total: np.ndarray
+    margin_amount: np.ndarray
+    margin_percent: np.ndarray
+    win_probability: Optional[np.ndarray]
+    base_total: float
+    
+    def __len__(self) -> int:
+        return len(self.grand_total)
+    
+    @property
+    def expected_margin(self) -> Optional[np.ndarray]:
+        """Margin amount weighted by the chance of winning."""
+        if self.win_probability is None:
+            return None
+        return self.margin_amount * self.win_probability
+    
+    def distribution(
+        self,
+        metric: str = 'grand_total',
+        percentiles: Tuple[float, ...] = (5, 25, 50, 75, 95),
+        bins: int = 20
+    ) -> Dict[str, Any]:
+        """Summary statistics and histogram of one metric.
+        
+        Args:
+            metric: 'grand_total', 'margin_amount', 'margin_percent',
+                'win_probability' or 'expected_margin'
+            percentiles: Percentiles to report
+            bins: Histogram bins
+            
+        Returns:
+            Dictionary with mean, std, min, max, percentiles and histogram
+        """
+        values = getattr(self, metric)
+        if values is None:
+            return {}
+        counts, edges = np.histogram(values, bins=bins)
+        return {
+            'mean': float(values.mean()),
+            'std': float(values.std()),
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'percentiles': {
+                f'p{p:g}': float(v) for p, v in zip(percentiles, np.percentile(values, percentiles))
+            },
+            'histogram': {'counts': counts.tolist(), 'edges': edges.tolist()}
+        }
+    
+    def scenario(self, index: int) -> Dict[str, Any]:
+        """One scenario's variations and metrics."""
+        result = {name: float(values[index]) for name, values in self.variations.items()}
+        result.update({
+            'grand_total': float(self.grand_total[index]),
+            'margin_amount': float(self.margin_amount[index]),
+            'margin_percent': float(self.margin_percent[index])
+        })
+        if self.win_probability is not None:
+            result['win_probability'] = float(self.win_probability[index])
+            result['expected_margin'] = float(self.expected_margin[index])
+        return result
+    
+    def summary(self) -> Dict[str, Any]:
+        """Distributions of every metric, plus the best scenario by expected margin."""
+        metrics = ['grand_total', 'margin_amount', 'margin_percent']
+        if self.win_probability is not None:
+            metrics += ['win_probability', 'expected_margin']
+        result = {
+            'scenarios': len(self),
+            'base_total': self.base_total,
+            'distributions': {metric: self.distribution(metric) for metric in metrics}
+        }
+        if self.win_probability is not None:
+            result['best_scenario'] = self.scenario(int(np.argmax(self.expected_margin)))
+        return result
+
+
 class WinProbabilityEstimator:
     """Estimates win probability for bids."""
     
+    # (price as a fraction of market average, score, description); first match wins
+    PRICE_BANDS = [
+        (0.90, 0.4, 'Excellent (10% below market)'),
+        (0.95, 0.3, 'Good (5% below market)'),
+        (1.00, 0.2, 'Fair (at market)'),
+        (1.05, 0.1, 'Below Average (5% above market)')
+    ]
+    PRICE_BAND_DEFAULT = (0.0, 'Poor (>5% above market)')
+    
     def estimate_win_probability(
         self,
         our_bid: Dict[str, Any],
@@ -77,26 +243,101 @@ class WinProbabilityEstimator:
         # Factor 1: Price competitiveness (40% weight)
         if 'market_average' in market_data:
             our_price = our_bid['bid_summary']['grand_total']
-            market_avg = market_data['market_average']
-            
-            if our_price <= market_avg * 0.90:  # 10% below market
-                price_score = 0.4
-                factors['price_competitiveness'] = 'Excellent (10% below market)'
-            elif our_price <= market_avg * 0.95:  # 5% below market
-                price_score = 0.3
-                factors['price_competitiveness'] = 'Good (5% below market)'
-            elif our_price <= market_avg:
-                price_score = 0.2
-                factors['price_competitiveness'] = 'Fair (at market)'
-            elif our_price <= market_avg * 1.05:
-                price_score = 0.1
-                factors['price_competitiveness'] = 'Below Average (5% above market)'
-            else:
-                price_score = 0.0
-                factors['price_competitiveness'] = 'Poor (>5% above market)'
-            
+            price_score, factors['price_competitiveness'] = self._price_band(
+                our_price, market_data['market_average']
+            )
             probability += price_score
         
+        # Factors 2-5 do not depend on the price
+        for score in self._non_price_scores(our_bid, customer_info, factors):
+            probability += score
+        
+        delivery_days = min(
+            p.get('delivery_days', 30) 
+            for p in our_bid.get('product_pricings', [])
+        )
+        testing_included = our_bid['bid_summary']['testing_costs_total'] > 0
+        
+        # Determine confidence level
+        if probability >= 0.75:
+            confidence = 'High'
+        elif probability >= 0.50:
+            confidence = 'Medium'
+        else:
+            confidence = 'Low'
+        
+        # Generate recommendations
+        recommendations = []
+        if probability < 0.6:
+            if factors.get('price_competitiveness', '').startswith('Poor'):
+                recommendations.append('Consider reducing margin to improve price competitiveness')
+            if not testing_included:
+                recommendations.append('Include testing costs to make bid more complete')
+            if delivery_days > 30:
+                recommendations.append('Explore options to reduce delivery time')
+        
+        return WinProbability(
+            probability=round(probability, 2),
+            confidence=confidence,
+            factors=factors,
+            recommendations=recommendations
+        )
+    
+    def estimate_win_probabilities(
+        self,
+        our_bid: Dict[str, Any],
+        market_data: Dict[str, Any],
+        customer_info: Dict[str, Any],
+        grand_totals: np.ndarray
+    ) -> np.ndarray:
+        """Win probability of the bid at each of many prices.
+        
+        Only the price factor depends on the grand total, so the other
+        factors are scored once and the price bands are applied to the whole
+        array. Each element equals estimate_win_probability() for the bid at
+        that grand total.
+        
+        Args:
+            our_bid: Our bid details
+            market_data: Market pricing data
+            customer_info: Customer information
+            grand_totals: Candidate grand totals
+            
+        Returns:
+            Array of probabilities, rounded to 2 places
+        """
+        grand_totals = np.asarray(grand_totals, dtype=float)
+        probability = np.full(grand_totals.shape, 0.5)
+        
+        if 'market_average' in market_data:
+            market_avg = market_data['market_average']
+            conditions = [grand_totals <= market_avg * upper for upper, _, _ in self.PRICE_BANDS]
+            probability = probability + np.select(
+                conditions, [score for _, score, _ in self.PRICE_BANDS], self.PRICE_BAND_DEFAULT[0]
+            )
+        
+        for score in self._non_price_scores(our_bid, customer_info, {}):
+            probability = probability + score
+        
+        return np.round(probability, 2)
+    
+    def _price_band(self, our_price: float, market_avg: float) -> Tuple[float, str]:
+        """Score and description of a price against the market average."""
+        for upper, score, description in self.PRICE_BANDS:
+            if our_price <= market_avg * upper:
+                return score, description
+        return self.PRICE_BAND_DEFAULT
+    
+    def _non_price_scores(
+        self,
+        our_bid: Dict[str, Any],
+        customer_info: Dict[str, Any],
+        factors: Dict[str, Any]
+    ) -> List[float]:
+        """Scores of the relationship, delivery, payment and completeness factors, in order.
+        
+        Descriptions are added to ``factors``.
+        """
         # Factor 2: Customer relationship (20% weight)
         customer_type = customer_info.get('type', '').lower()
         if 'government' in customer_type:
@@ -110,8 +351,6 @@ class WinProbabilityEstimator:
             relationship_score = 0.0
             factors['relationship'] = 'New customer'
         
-        probability += relationship_score
-        
         # Factor 3: Delivery terms (15% weight)
         delivery_days = min(
             p.get('delivery_days', 30) 
@@ -127,8 +366,6 @@ class WinProbabilityEstimator:
             delivery_score = 0.05
             factors['delivery'] = f'Standard ({delivery_days} days)'
         
-        probability += delivery_score
-        
         # Factor 4: Payment terms (15% weight)
         payment_terms = our_bid['bid_summary']['payment_terms']
         if 'LC' in payment_terms or 'Letter of Credit' in payment_terms:
@@ -141,8 +378,6 @@ class WinProbabilityEstimator:
             payment_score = 0.05
             factors['payment_terms'] = 'Standard (Net terms)'
         
-        probability += payment_score
-        
         # Factor 5: Completeness (10% weight)
         testing_included = our_bid['bid_summary']['testing_costs_total'] > 0
         if testing_included:
@@ -152,32 +387,7 @@ class WinProbabilityEstimator:
             completeness_score = 0.05
             factors['completeness'] = 'Basic (no testing costs)'
         
-        probability += completeness_score
-        
-        # Determine confidence level
-        if probability >= 0.75:
-            confidence = 'High'
-        elif probability >= 0.50:
-            confidence = 'Medium'
-        else:
-            confidence = 'Low'
-        
-        # Generate recommendations
-        recommendations = []
-        if probability < 0.6:
-            if factors.get('price_competitiveness', '').startswith('Poor'):
-                recommendations.append('Consider reducing margin to improve price competitiveness')
-            if not testing_included:
-                recommendations.append('Include testing costs to make bid more complete')
-            if delivery_days > 30:
-                recommendations.append('Explore options to reduce delivery time')
-        
-        return WinProbability(
-            probability=round(probability, 2),
-            confidence=confidence,
-            factors=factors,
-            recommendations=recommendations
-        )
+        return [relationship_score, delivery_score, payment_score, completeness_score]
 
 
 class CostComparisonGenerator:
@@ -240,60 +450,75 @@ class SensitivityAnalyzer:
         self,
         base_bid: Dict[str, Any],
         parameter: str,
-        variation_range: List[float] = [-20, -10, 0, 10, 20]
+        variation_range: List[float] = [-20, -10, 0, 10, 20],
+        copper_share: Optional[float] = None,
+        fx_share: Optional[float] = None
     ) -> SensitivityAnalysis:
         """Analyze sensitivity to parameter changes.
         
+        All variations are evaluated in one ScenarioEngine pass.
+        
         Args:
             base_bid: Base bid details
-            parameter: Parameter to vary ('margin', 'discount', 'logistics', etc.)
+            parameter: Parameter to vary ('margin', 'discount', 'logistics', 'copper', 'fx')
             variation_range: List of percentage variations
+            copper_share: Copper share of products subtotal (default: from line items)
+            fx_share: Foreign-currency share of products subtotal (default: from line items)
             
         Returns:
             SensitivityAnalysis object
+            
+        Raises:
+            ValueError: If copper/fx is varied and its share is unknown
         """
-        base_value = base_bid['bid_summary']['grand_total']
-        base_margin = base_bid['bid_summary']['margin_percent']
+        engine = ScenarioEngine(base_bid, copper_share=copper_share, fx_share=fx_share)
+        base_value = engine.base_total
+        base_margin = engine.base_margin
         
-        variations = []
-        impact_on_total = []
-        impact_on_margin = []
+        variation_pcts = np.asarray(variation_range, dtype=float)
+        multipliers = 1 + (variation_pcts / 100)
+        if parameter in SCENARIO_PARAMETERS:
+            new_totals = engine.evaluate({parameter: variation_pcts}).grand_total
+        else:
+            new_totals = np.full(len(variation_pcts), base_value)
+        new_margins = base_margin * multipliers if parameter == 'margin' else np.full(len(variation_pcts), base_margin)
         
-        for var_pct in variation_range:
-            # Simulate change
-            multiplier = 1 + (var_pct / 100)
-            
-            if parameter == 'margin':
-                new_margin = base_margin * multiplier
-                new_total = base_value * (1 + ((new_margin - base_margin) / 100))
-            elif parameter == 'discount':
-                discount_change = base_bid['bid_summary']['total_discounts'] * (multiplier - 1)
-                new_total = base_value - discount_change
-                new_margin = base_margin
-            elif parameter == 'logistics':
-                logistics_change = base_bid['bid_summary']['logistics_total'] * (multiplier - 1)
-                new_total = base_value + logistics_change
-                new_margin = base_margin
-            else:
-                new_total = base_value
-                new_margin = base_margin
-            
-            variations.append({
-                'variation_pct': var_pct,
-                'multiplier': multiplier,
-                'new_value': new_total
-            })
-            
-            impact_on_total.append(new_total - base_value)
-            impact_on_margin.append(new_margin - base_margin)
+        variations = [
+            {'variation_pct': var_pct, 'multiplier': multiplier, 'new_value': new_total}
+            for var_pct, multiplier, new_total in zip(variation_range, multipliers.tolist(), new_totals.tolist())
+        ]
         
         return SensitivityAnalysis(
             parameter=parameter,
             base_value=base_value,
             variations=variations,
-            impact_on_total=impact_on_total,
-            impact_on_margin=impact_on_margin
+            impact_on_total=(new_totals - base_value).tolist(),
+            impact_on_margin=(new_margins - base_margin).tolist()
         )
+    
+    def tornado(
+        self,
+        base_bid: Dict[str, Any],
+        ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+        metric: str = 'grand_total',
+        copper_share: Optional[float] = None,
+        fx_share: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Tornado chart data: each parameter swung over its range alone.
+        
+        Args:
+            base_bid: Base bid details
+            ranges: Parameter to (low %, high %); defaults to
+                DEFAULT_SCENARIO_RANGES less copper/fx when their share is unknown
+            metric: 'grand_total', 'margin_amount' or 'margin_percent'
+            copper_share: Copper share of products subtotal (default: from line items)
+            fx_share: Foreign-currency share of products subtotal (default: from line items)
+            
+        Returns:
+            One bar per parameter, widest swing first
+        """
+        engine = ScenarioEngine(base_bid, copper_share=copper_share, fx_share=fx_share)
+        return engine.tornado(ranges or engine.default_ranges(), metric=metric)
 
 
 class WhatIfScenarioGenerator:
@@ -315,37 +540,277 @@ class WhatIfScenarioGenerator:
         Returns:
             WhatIfScenario object
         """
-        original_total = base_bid['bid_summary']['grand_total']
-        new_total = original_total
+        return self.generate_scenarios(base_bid, {scenario_name: changes})[0]
+    
+    def generate_scenarios(
+        self,
+        base_bid: Dict[str, Any],
+        scenarios: Dict[str, Dict[str, Any]]
+    ) -> List[WhatIfScenario]:
+        """Generate many what-if scenarios in one vectorized pass.
+        
+        Args:
+            base_bid: Base bid details
+            scenarios: Scenario name to dictionary of changes
+            
+        Returns:
+            WhatIfScenario per scenario, in order
+        """
+        summary = base_bid['bid_summary']
+        original_total = summary['grand_total']
+        changes = list(scenarios.values())
+        
+        def column(key: str, default: float) -> np.ndarray:
+            return np.array([float(c.get(key, default)) for c in changes])
+        
+        new_totals = np.full(len(changes), float(original_total))
         
         # Apply changes
-        if 'margin_adjustment' in changes:
-            margin_change = changes['margin_adjustment']
-            new_total *= (1 + margin_change / 100)
-        
-        if 'additional_discount' in changes:
-            discount = changes['additional_discount']
-            new_total *= (1 - discount / 100)
-        
-        if 'logistics_factor' in changes:
-            logistics_base = base_bid['bid_summary']['logistics_total']
-            logistics_change = logistics_base * (changes['logistics_factor'] - 1)
-            new_total += logistics_change
-        
-        if 'remove_installation' in changes and changes['remove_installation']:
-            new_total -= base_bid['bid_summary']['installation_total']
-        
-        difference = new_total - original_total
-        difference_percent = (difference / original_total * 100) if original_total > 0 else 0
-        
-        return WhatIfScenario(
-            scenario_name=scenario_name,
-            changes=changes,
-            original_total=original_total,
-            new_total=new_total,
-            difference=difference,
-            difference_percent=difference_percent
+        new_totals *= (1 + column('margin_adjustment', 0) / 100)
+        new_totals *= (1 - column('additional_discount', 0) / 100)
+        
+        logistics_factor = column('logistics_factor', 1)
+        if any('logistics_factor' in c for c in changes):
+            new_totals += summary['logistics_total'] * (logistics_factor - 1)
+        
+        remove_installation = np.array([bool(c.get('remove_installation')) for c in changes])
+        if remove_installation.any():
+            new_totals -= np.where(remove_installation, summary['installation_total'], 0.0)
+        
+        differences = new_totals - original_total
+        if original_total > 0:
+            difference_percents = (differences / original_total * 100).tolist()
+        else:
+            difference_percents = [0] * len(changes)
+        
+        return [
+            WhatIfScenario(
+                scenario_name=name,
+                changes=scenario_changes,
+                original_total=original_total,
+                new_total=new_total,
+                difference=difference,
+                difference_percent=difference_percent
+            )
+            for name, scenario_changes, new_total, difference, difference_percent in zip(
+                scenarios, changes, new_totals.tolist(), differences.tolist(), difference_percents
+            )
+        ]
+
+
+class ScenarioEngine:
+    """Evaluates thousands of joint pricing perturbations as NumPy arrays.
+    
+    A bid is reduced once to the handful of summary figures a perturbation
+    touches; every scenario is then a row of percentage variations and
+    all rows are priced together, with no bid rebuilt per scenario:
+    
+    - margin: margin percent scaled by (1 + v/100); the price moves by the
+      change in margin points, as in SensitivityAnalyzer
+    - discount: total discounts scaled by (1 + v/100)
+    - logistics: logistics cost scaled by (1 + v/100)
+    - copper, fx: copper price / INR exchange rate moved by v percent,
+      changing the cost of the copper_share / fx_share of products
+      subtotal; pass_through of that change is recovered in the price
+    
+    Shares not given are derived from the bid's line items
+    (derive_cost_shares). Varying copper or fx with an unknown share raises
+    instead of silently reporting zero impact.
+    """
+    
+    def __init__(
+        self,
+        base_bid: Dict[str, Any],
+        copper_share: Optional[float] = None,
+        fx_share: Optional[float] = None,
+        pass_through: float = 1.0,
+        market_data: Optional[Dict[str, Any]] = None,
+        customer_info: Optional[Dict[str, Any]] = None,
+        win_estimator: Optional[WinProbabilityEstimator] = None
+    ):
+        """Initialize engine.
+        
+        Args:
+            base_bid: Base bid details (with 'bid_summary')
+            copper_share: Fraction of products subtotal that tracks the copper
+                price (default: derived from the line items)
+            fx_share: Fraction of products subtotal priced in foreign currency
+                (default: derived from the line items)
+            pass_through: Fraction of copper/FX cost changes passed on in the price
+            market_data: Market pricing data; enables win probabilities
+            customer_info: Customer information for win probabilities
+            win_estimator: Estimator to use (default WinProbabilityEstimator)
+        """
+        summary = base_bid['bid_summary']
+        self.base_bid = base_bid
+        self.base_total = summary['grand_total']
+        self.base_margin = summary.get('margin_percent', 0.0)
+        self.total_discounts = summary.get('total_discounts', 0.0)
+        self.logistics_total = summary.get('logistics_total', 0.0)
+        self.products_subtotal = summary.get('products_subtotal', 0.0)
+        self.cost_base = summary.get('cost_base', 0.0)
+        self.margin_amount = summary.get('margin_amount', self.cost_base * self.base_margin / 100)
+        derived = derive_cost_shares(base_bid)
+        self.copper_share = derived['copper'] if copper_share is None else copper_share
+        self.fx_share = derived['fx'] if fx_share is None else fx_share
+        self.pass_through = pass_through
+        self.market_data = market_data
+        self.customer_info = customer_info or {}
+        self.win_estimator = win_estimator or WinProbabilityEstimator()
+    
+    def evaluate(self, variations: Dict[str, Any]) -> 'ScenarioResults':
+        """Price every scenario.
+        
+        Args:
+            variations: Parameter name to percentage variations (scalars or
+                arrays, broadcast together); missing parameters stay at 0
+                
+        Returns:
+            ScenarioResults with one element per scenario
+        """
+        unknown = set(variations) - set(SCENARIO_PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown scenario parameters: {sorted(unknown)}")
+        for name in self.unknown_share_parameters:
+            if np.any(np.asarray(variations.get(name, 0.0), dtype=float) != 0):
+                raise ValueError(
+                    f"Cannot vary '{name}': its cost share is unknown; pass {name}_share "
+                    f"or add it to the bid's product_pricings"
+                )
+        
+        arrays = np.broadcast_arrays(*[
+            np.asarray(variations.get(name, 0.0), dtype=float) for name in SCENARIO_PARAMETERS
+        ])
+        margin, discount, logistics, copper, fx = [np.atleast_1d(a).ravel() for a in arrays]
+        
+        margin_multiplier = 1 + (margin / 100)
+        new_margin = self.base_margin * margin_multiplier
+        logistics_change = self.logistics_total * ((1 + (logistics / 100)) - 1)
+        cost_change = self.products_subtotal * (
+            (self.copper_share or 0.0) * copper / 100 + (self.fx_share or 0.0) * fx / 100
+        )
+        
+        pre_margin = (
+            self.base_total
+            - self.total_discounts * ((1 + (discount / 100)) - 1)
+            + logistics_change
+            + self.pass_through * cost_change
         )
+        grand_total = pre_margin * (1 + ((new_margin - self.base_margin) / 100))
+        
+        # Profit moves with the price, less the cost changes behind it
+        margin_amount = self.margin_amount + (grand_total - self.base_total) - cost_change - logistics_change
+        cost = self.cost_base + cost_change + logistics_change
+        with np.errstate(divide='ignore', invalid='ignore'):
+            margin_percent = np.where(cost > 0, margin_amount / cost * 100, 0.0)
+        
+        win_probability = None
+        if self.market_data is not None:
+            win_probability = self.win_estimator.estimate_win_probabilities(
+                self.base_bid, self.market_data, self.customer_info, grand_total
+            )
+        
+        return ScenarioResults(
+            variations={
+                'margin': margin, 'discount': discount, 'logistics': logistics, 'copper': copper, 'fx': fx
+            },
+            grand_total=grand_total,
+            margin_amount=margin_amount,
+            margin_percent=margin_percent,
+            win_probability=win_probability,
+            base_total=self.base_total
+        )
+    
+    @property
+    def unknown_share_parameters(self) -> List[str]:
+        """Cost-share parameters this engine cannot vary."""
+        shares = {'copper': self.copper_share, 'fx': self.fx_share}
+        return [name for name in COST_SHARE_PARAMETERS if shares[name] is None]
+    
+    def default_ranges(self) -> Dict[str, Tuple[float, float]]:
+        """DEFAULT_SCENARIO_RANGES without parameters whose share is unknown."""
+        unknown = self.unknown_share_parameters
+        return {name: bounds for name, bounds in DEFAULT_SCENARIO_RANGES.items() if name not in unknown}
+    
+    def simulate(
+        self,
+        ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+        n_scenarios: int = 10000,
+        distribution: str = 'uniform',
+        seed: Optional[int] = None
+    ) -> 'ScenarioResults':
+        """Monte Carlo: draw every parameter independently over its range.
+        
+        Args:
+            ranges: Parameter to (low %, high %); defaults to default_ranges()
+            n_scenarios: Number of joint scenarios
+            distribution: 'uniform', or 'triangular' (peaked at 0, clipped to the range)
+            seed: Random seed for reproducible runs
+            
+        Returns:
+            ScenarioResults over all draws
+        """
+        ranges = ranges or self.default_ranges()
+        rng = np.random.default_rng(seed)
+        variations = {}
+        for name, (low, high) in ranges.items():
+            if distribution == 'triangular' and low < high:
+                variations[name] = rng.triangular(low, min(max(0.0, low), high), high, n_scenarios)
+            elif distribution in ('uniform', 'triangular'):
+                variations[name] = rng.uniform(low, high, n_scenarios)
+            else:
+                raise ValueError(f"Unknown distribution: {distribution}")
+        return self.evaluate(variations)
+    
+    def grid(self, values: Dict[str, List[float]]) -> 'ScenarioResults':
+        """Every combination of the given variations (e.g. a 10x10 margin/discount grid).
+        
+        Args:
+            values: Parameter to list of percentage variations
+            
+        Returns:
+            ScenarioResults in row-major order of ``values``
+        """
+        mesh = np.meshgrid(*[np.asarray(v, dtype=float) for v in values.values()], indexing='ij')
+        return self.evaluate({name: axis.ravel() for name, axis in zip(values, mesh)})
+    
+    def tornado(
+        self,
+        ranges: Dict[str, Tuple[float, float]],
+        metric: str = 'grand_total'
+    ) -> List[Dict[str, Any]]:
+        """Swing of a metric as each parameter moves alone to its low and high.
+        
+        Args:
+            ranges: Parameter to (low %, high %)
+            metric: 'grand_total', 'margin_amount', 'margin_percent' or 'win_probability'
+            
+        Returns:
+            One bar per parameter, widest swing first
+        """
+        names = list(ranges)
+        count = len(names)
+        variations = {name: np.zeros(2 * count + 1) for name in names}
+        for i, name in enumerate(names):
+            variations[name][2 * i], variations[name][2 * i + 1] = ranges[name]
+        values = getattr(self.evaluate(variations), metric)
+        base = float(values[-1])
+        
+        bars = [
+            {
+                'parameter': name,
+                'low_variation': ranges[name][0],
+                'high_variation': ranges[name][1],
+                'low_value': float(values[2 * i]),
+                'high_value': float(values[2 * i + 1]),
+                'swing': float(abs(values[2 * i + 1] - values[2 * i]))
+            }
+            for i, name in enumerate(names)
+        ]
+        bars.sort(key=lambda bar: bar['swing'], reverse=True)
+        for bar in bars:
+            bar['base_value'] = base
+        return bars
 
 
 class PricingApprovalWorkflow:
@@ -601,6 +1066,35 @@ class PricingAPI:
             'difference_percent': scenario.difference_percent
         }
     
+    def run_scenario_analysis(
+        self,
+        bid_data: Dict[str, Any],
+        ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+        n_scenarios: int = 10000,
+        market_data: Optional[Dict[str, Any]] = None,
+        customer_info: Optional[Dict[str, Any]] = None,
+        copper_share: Optional[float] = None,
+        fx_share: Optional[float] = None,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """API endpoint: Monte Carlo distributions and tornado chart.
+        
+        Copper/fx shares default to those derived from the bid's line items;
+        when neither is known they are left out of the default ranges.
+        """
+        engine = ScenarioEngine(
+            bid_data,
+            copper_share=copper_share,
+            fx_share=fx_share,
+            market_data=market_data,
+            customer_info=customer_info,
+            win_estimator=self.win_estimator
+        )
+        ranges = ranges or engine.default_ranges()
+        result = engine.simulate(ranges, n_scenarios=n_scenarios, seed=seed).summary()
+        result['tornado'] = engine.tornado(ranges)
+        return result
+    
     def submit_for_approval(
         self,
         bid_id: str,
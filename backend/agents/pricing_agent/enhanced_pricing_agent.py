@@ -99,6 +99,10 @@ class ProductPricing:
     # Delivery
     delivery_days: int = 30
     
+    # Cost exposure, for copper/FX scenario analysis
+    conductor_material: str = ""
+    country_of_origin: str = ""
+    
     def to_dict(self) -> Dict[str, Any]:
         data = asdict(self)
         data['testing_costs'] = [tc.to_dict() for tc in self.testing_costs]
@@ -721,23 +725,60 @@ class EnhancedPricingAgent:
         product_pricings = []
         
         for comparison in comparisons:
-            # Get top recommended product
-            products = comparison.get('products', [])
-            if not products:
-                continue
-            
-            top_product = products[0]  # Top recommendation
-            requirement = comparison.get('requirement', {})
-            
-            # Calculate pricing
-            pricing = self._calculate_product_pricing(
-                top_product,
-                requirement,
-                customer_info
-            )
+            pricing = self.price_line_item(comparison, customer_info)
+            if pricing is not None:
+                product_pricings.append(pricing)
+        
+        return self.build_bid(product_pricings, customer_info, rfp_details)
+    
+    def price_line_item(
+        self,
+        comparison: Dict[str, Any],
+        customer_info: Dict[str, Any]
+    ) -> Optional[ProductPricing]:
+        """Price the top recommended product for one requirement.
+        
+        Line items are independent, so callers may price them concurrently
+        as technical matches arrive and combine them with build_bid().
+        
+        Args:
+            comparison: Technical comparison ({'requirement', 'products'})
+            customer_info: Customer information
             
-            product_pricings.append(pricing)
+        Returns:
+            ProductPricing, or None if the comparison has no products
+        """
+        # Get top recommended product
+        products = comparison.get('products', [])
+        if not products:
+            return None
+        
+        top_product = products[0]  # Top recommendation
+        requirement = comparison.get('requirement', {})
+        
+        # Calculate pricing
+        return self._calculate_product_pricing(
+            top_product,
+            requirement,
+            customer_info
+        )
+    
+    def build_bid(
+        self,
+        product_pricings: List[ProductPricing],
+        customer_info: Dict[str, Any],
+        rfp_details: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Combine priced line items into the complete pricing response.
         
+        Args:
+            product_pricings: Priced line items in requirement order
+            customer_info: Customer information
+            rfp_details: RFP details
+            
+        Returns:
+            Complete pricing response with bid documents
+        """
         # Generate bid summary
         bid_summary = self._generate_bid_summary(
             product_pricings,
@@ -866,6 +907,16 @@ class EnhancedPricingAgent:
         # Set delivery days
         pricing.delivery_days = product.get('delivery_days', 30)
         
+        # Record what drives the line's copper / FX exposure
+        specifications = product.get('specifications')
+        specifications = specifications if isinstance(specifications, dict) else {}
+        pricing.conductor_material = str(
+            product.get('conductor_material') or specifications.get('conductor_material') or ''
+        )
+        pricing.country_of_origin = str(
+            product.get('country_of_origin') or specifications.get('country_of_origin') or ''
+        )
+        
         return pricing
     
     def _generate_bid_summary(
@@ -0,0 +1,420 @@
+"""
+Product Search Index - In-process inverted index over the OEM catalog.
+
+Keeps token -> product_id postings for category/product_name/model_number and
+per-spec-key sorted numeric arrays (voltage_rating, conductor_size, cores, ...)
+so ProductRepository can resolve keyword and specification lookups without
+leading-wildcard scans of oem_products.
+"""
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Optional, Set, Tuple, Iterable
+import structlog
+from sqlalchemy import event, select, func
+from sqlalchemy.orm import Session, object_session
+
+from db.product_models import OEMProduct
+
+logger = structlog.get_logger()
+
+# Fields covered by keyword postings (mirrors the ilike() columns of the DB query)
+TEXT_FIELDS = ('category', 'product_name', 'model_number')
+
+# Unit suffixes stripped before numeric comparison
+NUMERIC_UNITS = ['sq mm', 'sqmm', 'mm2', 'mm', 'kv', 'v', 'a', 'w', 'kg', 'm']
+
+_TOKEN_SPLIT = re.compile(r"[\s\-_/,;:()\[\]]+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase index tokens."""
+    if not text:
+        return []
+    return [t for t in _TOKEN_SPLIT.split(str(text).lower()) if t]
+
+
+def normalize_spec_key(key: str) -> str:
+    """Normalize a specification key the same way spec filtering does."""
+    return key.lower().replace('_', ' ').replace('-', ' ').strip()
+
+
+def parse_numeric_spec(value: Any) -> Optional[float]:
+    """Parse a specification value into a float after stripping units.
+
+    Returns:
+        Float value, or None if the value is not numeric
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    text = str(value).strip().lower()
+    for unit in NUMERIC_UNITS:
+        text = text.replace(unit, '').strip()
+    try:
+        return float(text)
+    except (ValueError, TypeError):
+        return None
+
+
+def numeric_tolerance(spec_key: str, required: float) -> float:
+    """Get the absolute match tolerance for a numeric specification.
+
+    Args:
+        spec_key: Specification key name
+        required: Required numeric value
+
+    Returns:
+        Allowed absolute deviation from the required value
+    """
+    spec_key_lower = spec_key.lower()
+
+    if any(key in spec_key_lower for key in ['voltage', 'rating', 'kv']):
+        # Voltage: 5% tolerance (stricter)
+        return required * 0.05
+    if any(key in spec_key_lower for key in ['size', 'diameter', 'thickness', 'cross', 'section']):
+        # Size: 10% tolerance
+        return required * 0.10
+    if any(key in spec_key_lower for key in ['current', 'ampere', 'amp']):
+        # Current: 15% tolerance (can vary with conditions)
+        return required * 0.15
+    if any(key in spec_key_lower for key in ['temperature', 'temp']):
+        # Temperature: ±5°C
+        return 5.0
+    if any(key in spec_key_lower for key in ['core', 'pair', 'count']):
+        # Count: exact match
+        return 0
+    # Default: 10% tolerance
+    return required * 0.10
+
+
+class ProductSearchIndex:
+    """Inverted index of product dictionaries keyed by product_id."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.logger = logger.bind(component="ProductSearchIndex")
+        self._lock = threading.RLock()
+
+        self._products: Dict[str, Dict[str, Any]] = {}
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+
+        # token -> product ids
+        self._postings: Dict[str, Set[str]] = {}
+        # product id -> tokens (for removal)
+        self._doc_tokens: Dict[str, Set[str]] = {}
+        # lowercase manufacturer -> product ids
+        self._manufacturers: Dict[str, Set[str]] = {}
+        # normalized spec key -> (sorted values, ids aligned with values)
+        self._spec_values: Dict[str, Tuple[List[float], List[str]]] = {}
+        # product id -> [(spec key, value)] (for removal)
+        self._doc_specs: Dict[str, List[Tuple[str, float]]] = {}
+        # keyword part -> ids of every token containing it (reset on writes)
+        self._part_cache: Dict[str, Set[str]] = {}
+
+        self.is_built = False
+        # Catalog version the index was built from (see catalog_version)
+        self.version: Optional[Tuple] = None
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def build(self, products: Iterable[Dict[str, Any]], version: Optional[Tuple] = None):
+        """Rebuild the index from an iterable of product dictionaries.
+
+        Products are kept in iteration order for result ordering.
+
+        Args:
+            products: Product dictionaries
+            version: Catalog version the products were read at
+        """
+        with self._lock:
+            self.clear()
+            for product in products:
+                self._add(product)
+            self.is_built = True
+            self.version = version
+
+        self.logger.info(
+            "Product index built",
+            products=len(self._products),
+            tokens=len(self._postings),
+            spec_keys=len(self._spec_values)
+        )
+
+    def clear(self):
+        """Drop all indexed products."""
+        with self._lock:
+            self._products.clear()
+            self._order.clear()
+            self._next_order = 0
+            self._postings.clear()
+            self._doc_tokens.clear()
+            self._manufacturers.clear()
+            self._spec_values.clear()
+            self._doc_specs.clear()
+            self._part_cache.clear()
+            self.is_built = False
+            self.version = None
+
+    def upsert(self, product: Dict[str, Any]):
+        """Insert or replace a product, keeping its original position."""
+        with self._lock:
+            product_id = product['product_id']
+            order = self._order.get(product_id)
+            if product_id in self._products:
+                self._remove(product_id)
+            self._add(product, order=order)
+            self._part_cache.clear()
+
+    def remove(self, product_id: str):
+        """Remove a product from the index if present."""
+        with self._lock:
+            if product_id in self._products:
+                self._remove(product_id)
+                self._part_cache.clear()
+
+    def get(self, product_id: str) -> Optional[Dict[str, Any]]:
+        """Get an indexed product dictionary by ID."""
+        return self._products.get(product_id)
+
+    def all_ids(self) -> List[str]:
+        """Get all product IDs in index order."""
+        with self._lock:
+            return self._sorted(self._products.keys())
+
+    def products(self, product_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Get shallow copies of products so callers can annotate them freely."""
+        return [dict(self._products[pid]) for pid in product_ids if pid in self._products]
+
+    def search_keywords(self, keywords: List[str]) -> List[str]:
+        """Find products whose text fields contain any of the keywords.
+
+        Equivalent to OR-ing ``ilike('%keyword%')`` over TEXT_FIELDS: each
+        keyword is resolved to candidate postings via the token vocabulary
+        and candidates are verified against the raw field text.
+
+        Args:
+            keywords: Lowercase keywords or phrases
+
+        Returns:
+            Matching product IDs in index order
+        """
+        with self._lock:
+            matched: Set[str] = set()
+            for keyword in keywords:
+                keyword = keyword.lower().strip()
+                if not keyword:
+                    continue
+                candidates = self._keyword_candidates(keyword)
+                for pid in candidates:
+                    if pid in matched:
+                        continue
+                    product = self._products[pid]
+                    if any(keyword in (product.get(f) or '').lower() for f in TEXT_FIELDS):
+                        matched.add(pid)
+            return self._sorted(matched)
+
+    def filter_manufacturer(self, product_ids: List[str], manufacturer: str) -> List[str]:
+        """Keep products whose manufacturer contains the given text."""
+        with self._lock:
+            manufacturer_lower = manufacturer.lower()
+            allowed: Set[str] = set()
+            for name, ids in self._manufacturers.items():
+                if manufacturer_lower in name:
+                    allowed |= ids
+            return [pid for pid in product_ids if pid in allowed]
+
+    def range_lookup(self, spec_key: str, low: float, high: float) -> Set[str]:
+        """Get products whose numeric spec value lies in [low, high]."""
+        with self._lock:
+            entry = self._spec_values.get(normalize_spec_key(spec_key))
+            if not entry:
+                return set()
+            values, ids = entry
+            start = bisect_left(values, low)
+            end = bisect_right(values, high)
+            return set(ids[start:end])
+
+    def _keyword_candidates(self, keyword: str) -> Set[str]:
+        """Intersect postings of every vocabulary token containing each keyword part."""
+        parts = tokenize(keyword)
+        if not parts:
+            return set(self._products.keys())
+
+        candidates: Optional[Set[str]] = None
+        for part in parts:
+            part_ids = self._part_cache.get(part)
+            if part_ids is None:
+                part_ids = set()
+                for token, ids in self._postings.items():
+                    if part in token:
+                        part_ids |= ids
+                self._part_cache[part] = part_ids
+            candidates = part_ids if candidates is None else candidates & part_ids
+            if not candidates:
+                return set()
+        return candidates or set()
+
+    def _sorted(self, product_ids: Iterable[str]) -> List[str]:
+        return sorted(product_ids, key=lambda pid: self._order.get(pid, 0))
+
+    def _add(self, product: Dict[str, Any], order: Optional[int] = None):
+        product_id = product['product_id']
+        self._products[product_id] = product
+        if order is None:
+            order = self._next_order
+            self._next_order += 1
+        self._order[product_id] = order
+
+        tokens: Set[str] = set()
+        for field in TEXT_FIELDS:
+            tokens.update(tokenize(product.get(field)))
+        self._doc_tokens[product_id] = tokens
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(product_id)
+
+        manufacturer = (product.get('manufacturer') or '').lower()
+        self._manufacturers.setdefault(manufacturer, set()).add(product_id)
+
+        doc_specs = []
+        for key, value in (product.get('specifications') or {}).items():
+            numeric = parse_numeric_spec(value)
+            if numeric is None:
+                continue
+            norm_key = normalize_spec_key(key)
+            values, ids = self._spec_values.setdefault(norm_key, ([], []))
+            position = bisect_right(values, numeric)
+            values.insert(position, numeric)
+            ids.insert(position, product_id)
+            doc_specs.append((norm_key, numeric))
+        self._doc_specs[product_id] = doc_specs
+
+    def _remove(self, product_id: str):
+        product = self._products.pop(product_id)
+        self._order.pop(product_id, None)
+
+        for token in self._doc_tokens.pop(product_id, set()):
+            ids = self._postings.get(token)
+            if ids is not None:
+                ids.discard(product_id)
+                if not ids:
+                    del self._postings[token]
+
+        manufacturer = (product.get('manufacturer') or '').lower()
+        ids = self._manufacturers.get(manufacturer)
+        if ids is not None:
+            ids.discard(product_id)
+            if not ids:
+                del self._manufacturers[manufacturer]
+
+        for norm_key, numeric in self._doc_specs.pop(product_id, []):
+            values, ids = self._spec_values[norm_key]
+            start = bisect_left(values, numeric)
+            end = bisect_right(values, numeric)
+            for position in range(start, end):
+                if ids[position] == product_id:
+                    del values[position]
+                    del ids[position]
+                    break
+            if not values:
+                del self._spec_values[norm_key]
+
+
+def product_to_dict(product: OEMProduct) -> Dict[str, Any]:
+    """Convert OEMProduct model to the repository dictionary format."""
+    return {
+        'product_id': product.product_id,
+        'manufacturer': product.manufacturer,
+        'model_number': product.model_number,
+        'product_name': product.product_name,
+        'category': product.category,
+        'specifications': product.specifications or {},
+        'certifications': product.certifications or [],
+        'standards': product.standards or [],
+        'unit_price': float(product.unit_price) if product.unit_price else 0.0,
+        'stock': product.stock_quantity or 1000,
+        'delivery_days': product.delivery_days or 7
+    }
+
+
+async def catalog_version(db) -> Tuple:
+    """Cheap fingerprint of oem_products that changes with every write.
+
+    Inserts raise the max id, updates and bulk upserts/deactivations bump
+    updated_at and deletes lower the count, so a worker can tell that
+    another process changed the catalog without reloading it.
+
+    Args:
+        db: Async session or connection
+
+    Returns:
+        (row count, max id, max updated_at)
+    """
+    result = await db.execute(
+        select(func.count(OEMProduct.id), func.max(OEMProduct.id), func.max(OEMProduct.updated_at))
+    )
+    return tuple(result.one())
+
+
+# Shared index instance (one per process)
+_product_index: Optional[ProductSearchIndex] = None
+
+
+def get_product_index() -> ProductSearchIndex:
+    """Get the process-wide product search index."""
+    global _product_index
+    if _product_index is None:
+        _product_index = ProductSearchIndex()
+    return _product_index
+
+
+# Session.info key of index changes waiting for their transaction to commit
+_PENDING_CHANGES = 'product_index_pending'
+
+
+def _queue_index_change(target: OEMProduct, product: Optional[Dict[str, Any]]):
+    """Record an index change on the target's session until it commits."""
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_CHANGES, []).append((target.product_id, product))
+
+
+@event.listens_for(OEMProduct, 'after_insert')
+@event.listens_for(OEMProduct, 'after_update')
+def _sync_product_write(mapper, connection, target: OEMProduct):
+    """Queue ORM writes to oem_products for the index.
+
+    The product is snapshotted at flush time (it is expired after commit)
+    but only reaches the index once the transaction commits.
+    """
+    if target.is_active is False:
+        _queue_index_change(target, None)
+    else:
+        _queue_index_change(target, product_to_dict(target))
+
+
+@event.listens_for(OEMProduct, 'after_delete')
+def _sync_product_delete(mapper, connection, target: OEMProduct):
+    """Queue ORM deletes from oem_products for the index."""
+    _queue_index_change(target, None)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_product_changes(session: Session):
+    """Apply a committed transaction's product writes to a built index."""
+    pending = session.info.pop(_PENDING_CHANGES, None)
+    index = get_product_index()
+    if not pending or not index.is_built:
+        return
+    for product_id, product in pending:
+        if product is None:
+            index.remove(product_id)
+        else:
+            index.upsert(product)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_product_changes(session: Session):
+    """Drop the product writes of a rolled-back transaction."""
+    session.info.pop(_PENDING_CHANGES, None)
@@ -4,15 +4,33 @@ Product Repository - OEM product database with specifications.
 This module provides a searchable repository of OEM products (Havells, Polycab, KEI, etc.)
 with specifications for product matching.
 """
+import asyncio
+import time
 from typing import List, Dict, Any, Optional
 import structlog
-from sqlalchemy import select, or_, func
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from db.database import AsyncSessionLocal
 from db.product_models import OEMProduct
+from agents.product_index import (
+    ProductSearchIndex,
+    catalog_version,
+    get_product_index,
+    product_to_dict,
+    parse_numeric_spec,
+    numeric_tolerance,
+)
 
 logger = structlog.get_logger()
 
+# Guards the index build across concurrent searches
+_index_build_lock = asyncio.Lock()
+
+# Seconds between catalog version checks; writes made by other workers reach
+# this process's index within this window
+INDEX_VERSION_CHECK_SECONDS = 5.0
+_index_checked_at = 0.0
+
 
 class ProductRepository:
     """Repository of OEM products with specifications."""
@@ -325,73 +343,98 @@ class ProductRepository:
             
             return results[:limit]
         
-        # Database query with smart category matching
-        async with AsyncSessionLocal() as db:
-            query = select(OEMProduct).where(OEMProduct.is_active == True)
-            
-            # Smart category filtering - extract keywords
-            category_results = []
-            if category:
-                # Extract meaningful keywords from category
-                keywords = self._extract_category_keywords(category)
-                
-                # Build OR conditions for each keyword
-                category_conditions = []
-                for keyword in keywords:
-                    category_conditions.extend([
-                        OEMProduct.category.ilike(f"%{keyword}%"),
-                        OEMProduct.product_name.ilike(f"%{keyword}%"),
-                        OEMProduct.model_number.ilike(f"%{keyword}%")
-                    ])
-                
-                if category_conditions:
-                    category_query = query.where(or_(*category_conditions))
-                    category_query = category_query.limit(limit * 5)
-                    result = await db.execute(category_query)
-                    category_results = result.scalars().all()
-            
-            # If category search found products, use them; otherwise search ALL products
-            if category_results:
-                products = category_results
-                self.logger.info(
-                    f"Category search: {len(products)} candidates",
-                    category=category,
-                    keywords=keywords if category else None
-                )
-            else:
-                # Search ALL products if category search returned nothing
-                all_query = query
-                if manufacturer:
-                    all_query = all_query.where(OEMProduct.manufacturer.ilike(f"%{manufacturer}%"))
-                
-                # Get ALL products (or large subset)
-                all_query = all_query.limit(1000)  # Get all products
-                result = await db.execute(all_query)
-                products = result.scalars().all()
-                
-                self.logger.info(
-                    f"Searching ALL products: {len(products)} candidates (category returned 0)",
-                    category=category
-                )
-            
-            # Convert to dict format
-            results = [self._product_to_dict(p) for p in products]
-            
-            # ALWAYS filter by specifications to get top matches
-            if specifications and len(specifications) > 0:
-                results = self._filter_by_specifications(results, specifications)
-            elif not specifications:
-                # No specs provided, return top products by category match
-                results = results[:limit]
-            
+        index = await self._ensure_index()
+        
+        # Smart category filtering - extract keywords and resolve via postings
+        candidate_ids: List[str] = []
+        keywords = []
+        if category:
+            keywords = self._extract_category_keywords(category)
+            if keywords:
+                candidate_ids = index.search_keywords(keywords)[:limit * 5]
+        
+        # If category search found products, use them; otherwise search ALL products
+        if candidate_ids:
             self.logger.info(
-                f"Search results: {len(results)} products from database",
+                f"Category search: {len(candidate_ids)} candidates",
                 category=category,
-                manufacturer=manufacturer,
-                has_specs=bool(specifications)
+                keywords=keywords
             )
+        else:
+            candidate_ids = index.all_ids()
+            if manufacturer:
+                candidate_ids = index.filter_manufacturer(candidate_ids, manufacturer)
             
-            return results[:limit]
+            # No spec pre-filter: spec scoring accepts partial key and
+            # substring value matches that an exact-key range lookup misses
+            
+            candidate_ids = candidate_ids[:1000]
+            self.logger.info(
+                f"Searching ALL products: {len(candidate_ids)} candidates (category returned 0)",
+                category=category
+            )
+        
+        results = index.products(candidate_ids)
+        
+        # ALWAYS filter by specifications to get top matches
+        if specifications and len(specifications) > 0:
+            results = self._filter_by_specifications(results, specifications)
+        elif not specifications:
+            # No specs provided, return top products by category match
+            results = results[:limit]
+        
+        self.logger.info(
+            f"Search results: {len(results)} products from index",
+            category=category,
+            manufacturer=manufacturer,
+            has_specs=bool(specifications)
+        )
+        
+        return results[:limit]
+    
+    async def _ensure_index(self) -> ProductSearchIndex:
+        """Build the shared product index on first use and keep it current.
+        
+        The ORM listeners only see writes made in this process, so the
+        catalog version is re-read at most every INDEX_VERSION_CHECK_SECONDS
+        and the index rebuilt when another worker (e.g. a bulk catalog load)
+        changed oem_products.
+        """
+        global _index_checked_at
+        index = get_product_index()
+        if index.is_built and time.monotonic() - _index_checked_at < INDEX_VERSION_CHECK_SECONDS:
+            return index
+        
+        async with _index_build_lock:
+            if index.is_built and time.monotonic() - _index_checked_at < INDEX_VERSION_CHECK_SECONDS:
+                return index
+            if index.is_built:
+                async with AsyncSessionLocal() as db:
+                    version = await catalog_version(db)
+                if version != index.version:
+                    self.logger.info("Catalog changed, rebuilding product index")
+                    await self.refresh_index()
+            else:
+                await self.refresh_index()
+            _index_checked_at = time.monotonic()
+        return index
+    
+    async def refresh_index(self) -> int:
+        """Rebuild the shared product index from active OEM products.
+        
+        Returns:
+            Number of indexed products
+        """
+        index = get_product_index()
+        async with AsyncSessionLocal() as db:
+            version = await catalog_version(db)
+            result = await db.execute(
+                select(OEMProduct)
+                .where(OEMProduct.is_active == True)
+                .order_by(OEMProduct.id)
+            )
+            index.build((self._product_to_dict(p) for p in result.scalars().all()), version=version)
+        return len(index)
     
     def _extract_category_keywords(self, category: str) -> List[str]:
         """Extract meaningful keywords from category for better matching.
@@ -599,67 +642,17 @@ class ProductRepository:
             return False
         
         # Numeric comparison with smart tolerance
-        try:
-            # Extract numeric value and unit
-            req_str = str(required).strip()
-            prod_str = str(product).strip()
-            
-            # Common unit patterns
-            units = ['sq mm', 'sqmm', 'mm2', 'mm', 'kv', 'v', 'a', 'w', 'kg', 'm']
-            req_num = req_str.lower()
-            prod_num = prod_str.lower()
-            
-            # Remove units
-            for unit in units:
-                req_num = req_num.replace(unit, '').strip()
-                prod_num = prod_num.replace(unit, '').strip()
-            
-            req_float = float(req_num)
-            prod_float = float(prod_num)
-            
-            # Determine tolerance based on spec type
-            if any(key in spec_key_lower for key in ['voltage', 'rating', 'kv']):
-                # Voltage: 5% tolerance (stricter)
-                tolerance = req_float * 0.05
-            elif any(key in spec_key_lower for key in ['size', 'diameter', 'thickness', 'cross', 'section']):
-                # Size: 10% tolerance
-                tolerance = req_float * 0.10
-            elif any(key in spec_key_lower for key in ['current', 'ampere', 'amp']):
-                # Current: 15% tolerance (can vary with conditions)
-                tolerance = req_float * 0.15
-            elif any(key in spec_key_lower for key in ['temperature', 'temp']):
-                # Temperature: ±5°C
-                tolerance = 5.0
-            elif any(key in spec_key_lower for key in ['core', 'pair', 'count']):
-                # Count: exact match
-                tolerance = 0
-            else:
-                # Default: 10% tolerance
-                tolerance = req_float * 0.10
-            
-            return abs(req_float - prod_float) <= tolerance
-            
-        except (ValueError, TypeError):
-            pass
+        req_float = parse_numeric_spec(required)
+        prod_float = parse_numeric_spec(product)
+        if req_float is not None and prod_float is not None:
+            return abs(req_float - prod_float) <= numeric_tolerance(spec_key, req_float)
         
         # Exact match for other types
         return required == product
     
     def _product_to_dict(self, product: OEMProduct) -> Dict[str, Any]:
         """Convert OEMProduct model to dictionary."""
-        return {
-            'product_id': product.product_id,
-            'manufacturer': product.manufacturer,
-            'model_number': product.model_number,
-            'product_name': product.product_name,
-            'category': product.category,
-            'specifications': product.specifications or {},
-            'certifications': product.certifications or [],
-            'standards': product.standards or [],
-            'unit_price': float(product.unit_price) if product.unit_price else 0.0,
-            'stock': product.stock_quantity or 1000,
-            'delivery_days': product.delivery_days or 7
-        }
+        return product_to_dict(product)
     
     async def get_product_by_id(self, product_id: str) -> Optional[Dict[str, Any]]:
         """Get product by ID."""
@@ -0,0 +1,434 @@
+"""
+Dedupe Store - Persistent duplicate detection for discovered RFPs.
+
+Two layers:
+- A memory-mapped Bloom filter answers "never seen" without touching disk
+  for the common case of new listings.
+- An SQLite table holds the exact set of seen keys with first/last seen
+  times; keys not seen again within the TTL are aged out.
+
+Both survive restarts, and memory use is bounded by the filter size
+rather than by the number of tenders ever seen. Checking and recording
+are separate steps, so a caller records keys only once it has emitted
+them.
+"""
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+import hashlib
+import math
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+import structlog
+
+from config.settings import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = structlog.get_logger()
+
+
+class MmapBloomFilter:
+    """Bloom filter whose bit array lives in a memory-mapped file.
+    
+    Setting bits and bumping the item count are read-modify-writes of the
+    shared mapping, so writers hold an exclusive fcntl lock on the file;
+    several processes can share one filter without losing bits. A rebuild
+    replaces the file under that lock, so writers re-check the path after
+    locking and readers call remap_if_replaced() before a lookup batch.
+    """
+    
+    MAGIC = b'RFPBLOOM'
+    HEADER = struct.Struct('<8sIIQQ')  # magic, version, hashes, bits, items added
+    VERSION = 1
+    
+    def __init__(self, path: str, capacity: int = 1_000_000, error_rate: float = 0.001):
+        """Open or create a filter file.
+        
+        Args:
+            path: Filter file path
+            capacity: Expected number of items (sizes a new file)
+            error_rate: Target false positive rate at capacity (sizes a new file)
+        """
+        self.path = path
+        
+        if not self._valid_file(path):
+            num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+            num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+            self._create(path, num_bits, num_hashes)
+        
+        self._map = None
+        self._open()
+    
+    def _open(self):
+        """Map the file currently at self.path."""
+        self._file = open(self.path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        stat = os.fstat(self._file.fileno())
+        self._identity = (stat.st_dev, stat.st_ino)
+        _, _, self.num_hashes, self.num_bits, _ = self.HEADER.unpack_from(self._map, 0)
+        # Capacity the existing file was sized for (it may have been grown by a rebuild)
+        self.capacity = max(1, int(self.num_bits * math.log(2) / self.num_hashes))
+    
+    def _replaced(self) -> bool:
+        """Whether another process swapped a new file in at self.path."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return (stat.st_dev, stat.st_ino) != self._identity
+    
+    def remap_if_replaced(self) -> bool:
+        """Map the current file if the path now names a rebuilt filter.
+        
+        Returns:
+            True if the filter was remapped
+        """
+        if self._map is None or not self._replaced():
+            return False
+        self.close()
+        self._open()
+        return True
+    
+    @contextmanager
+    def locked(self) -> Iterator["MmapBloomFilter"]:
+        """Hold the exclusive lock on the current filter file.
+        
+        Lock, then re-check the path: a rebuild finished while waiting
+        means the lock is on a dead file, so remap and lock the new one.
+        """
+        while True:
+            self.remap_if_replaced()
+            if fcntl is None:
+                break
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            if not self._replaced():
+                break
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        handle = self._file
+        try:
+            yield self
+        finally:
+            # A rebuild under the lock may already have closed the handle
+            if fcntl is not None and not handle.closed:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    
+    @classmethod
+    def _create(cls, path: str, num_bits: int, num_hashes: int):
+        with open(path, 'wb') as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, num_hashes, num_bits, 0))
+            f.truncate(cls.HEADER.size + (num_bits + 7) // 8)
+    
+    @classmethod
+    def _valid_file(cls, path: str) -> bool:
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(cls.HEADER.size)
+                size = os.fstat(f.fileno()).st_size
+        except OSError:
+            return False
+        if len(header) < cls.HEADER.size:
+            return False
+        magic, version, _, num_bits, _ = cls.HEADER.unpack(header)
+        return magic == cls.MAGIC and version == cls.VERSION and size >= cls.HEADER.size + (num_bits + 7) // 8
+    
+    def _positions(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+    
+    @property
+    def count(self) -> int:
+        """Items added by every process sharing the file."""
+        return self.HEADER.unpack_from(self._map, 0)[4]
+    
+    def add(self, key: str):
+        """Add a key."""
+        self.add_many([key])
+    
+    def add_many(self, keys: Iterable[str]):
+        """Add keys under the file lock."""
+        keys = list(keys)
+        if not keys:
+            return
+        with self.locked():
+            self.add_many_locked(keys)
+    
+    def add_many_locked(self, keys: Iterable[str]):
+        """Add keys; the caller holds locked()."""
+        keys = list(keys)
+        if not keys:
+            return
+        offset = self.HEADER.size
+        for key in keys:
+            for position in self._positions(key):
+                index = offset + position // 8
+                self._map[index] = self._map[index] | (1 << (position % 8))
+        self.HEADER.pack_into(
+            self._map, 0, self.MAGIC, self.VERSION, self.num_hashes, self.num_bits,
+            self.count + len(keys)
+        )
+    
+    def __contains__(self, key: str) -> bool:
+        offset = self.HEADER.size
+        return all(
+            self._map[offset + position // 8] & (1 << (position % 8))
+            for position in self._positions(key)
+        )
+    
+    def flush(self):
+        """Sync dirty pages to disk."""
+        self._map.flush()
+    
+    @property
+    def saturated(self) -> bool:
+        """True once more items were added than the filter was sized for."""
+        return self.count > self.capacity
+    
+    def close(self):
+        """Flush and unmap the filter."""
+        if self._map is not None:
+            self.flush()
+            self._map.close()
+            self._file.close()
+            self._map = None
+
+
+class DedupeStore:
+    """Persistent, bounded set of seen RFP keys with TTL aging."""
+    
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        ttl_days: float = 60,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+        purge_interval_seconds: float = 3600
+    ):
+        """Open or create the store.
+        
+        Args:
+            directory: Directory for the filter and database files
+                (defaults to settings.dedupe_store_dir)
+            ttl_days: Keys not seen again for this long are forgotten
+            capacity: Bloom filter capacity before it is rebuilt
+            error_rate: Bloom filter false positive rate at capacity
+            purge_interval_seconds: Minimum time between automatic purges
+        """
+        self.logger = logger.bind(component="DedupeStore")
+        directory = str(directory or settings.dedupe_store_dir)
+        self.directory = directory
+        self.ttl_seconds = ttl_days * 86400
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.purge_interval_seconds = purge_interval_seconds
+        self.stats = {'checked': 0, 'filter_negatives': 0, 'duplicates': 0, 'purged': 0}
+        
+        os.makedirs(directory, exist_ok=True)
+        self.filter_path = os.path.join(directory, "seen.bloom")
+        self._lock = threading.Lock()
+        
+        self._db = sqlite3.connect(
+            os.path.join(directory, "seen.db"), check_same_thread=False, isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            "key TEXT PRIMARY KEY, first_seen REAL NOT NULL, last_seen REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_seen_last_seen ON seen(last_seen)")
+        
+        self._filter = MmapBloomFilter(self.filter_path, capacity, error_rate)
+        # A filter that knows fewer items than the table (lost or replaced file) would
+        # report false negatives, so rebuild it from the exact set
+        with self._filter.locked():
+            if self._filter.count < self.size():
+                self._rebuild_filter()
+        
+        self._last_purge = 0.0
+        self.logger.info("Dedupe store opened", directory=directory, keys=self.size())
+    
+    def size(self) -> int:
+        """Number of keys in the exact set."""
+        return self._db.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+    
+    def check(self, keys: Iterable[str], now: Optional[float] = None) -> List[bool]:
+        """Check a batch of keys (e.g. one listing page) without recording them.
+        
+        Known keys that are listed again have their last_seen refreshed so
+        they do not age out while still listed.
+        
+        Args:
+            keys: Keys in page order
+            now: Current time (epoch seconds)
+        
+        Returns:
+            True per key that was seen before (earlier in the batch counts)
+        """
+        keys = list(keys)
+        now = time.time() if now is None else now
+        
+        with self._lock:
+            self._maybe_purge(now)
+            # Pick up a filter another process rebuilt since the last batch
+            self._filter.remap_if_replaced()
+            
+            candidates = [key for key in set(keys) if key in self._filter]
+            known = self._existing(candidates, now)
+            
+            duplicates = []
+            batch_seen = set()
+            for key in keys:
+                duplicates.append(key in known or key in batch_seen)
+                batch_seen.add(key)
+            
+            if known:
+                self._db.executemany(
+                    "UPDATE seen SET last_seen = ? WHERE key = ?", [(now, key) for key in known]
+                )
+            
+            self.stats['checked'] += len(keys)
+            self.stats['filter_negatives'] += len(set(keys)) - len(candidates)
+            self.stats['duplicates'] += sum(duplicates)
+        
+        return duplicates
+    
+    def add(self, keys: Iterable[str], now: Optional[float] = None):
+        """Record keys as seen (e.g. once the RFPs they identify were emitted).
+        
+        Args:
+            keys: Keys to record; already known keys are refreshed
+            now: Current time (epoch seconds)
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return
+        now = time.time() if now is None else now
+        
+        # The filter lock spans bits and rows, so a rebuild in another process
+        # never reads the table between the two and drops these keys
+        with self._lock, self._filter.locked() as bloom:
+            known = self._existing([key for key in keys if key in bloom], now)
+            new_keys = [key for key in keys if key not in known]
+            
+            # Filter bits go in before the rows: a crash in between leaves a false
+            # positive (checked against the table), never a false negative
+            bloom.add_many_locked(new_keys)
+            bloom.flush()
+            
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT INTO seen(key, first_seen, last_seen) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET first_seen = excluded.first_seen, last_seen = excluded.last_seen",
+                [(key, now, now) for key in new_keys]
+            )
+            self._db.executemany(
+                "UPDATE seen SET last_seen = ? WHERE key = ?", [(now, key) for key in known]
+            )
+            self._db.execute("COMMIT")
+            
+            if bloom.saturated:
+                self._purge(now)
+                self._rebuild_filter()
+    
+    def check_and_add(self, keys: Iterable[str], now: Optional[float] = None) -> List[bool]:
+        """Check a batch of keys and record them as seen in one step.
+        
+        Args:
+            keys: Keys in page order
+            now: Current time (epoch seconds)
+        
+        Returns:
+            True per key that was seen before (earlier in the batch counts)
+        """
+        keys = list(keys)
+        duplicates = self.check(keys, now)
+        self.add([key for key, is_duplicate in zip(keys, duplicates) if not is_duplicate], now)
+        return duplicates
+    
+    def _existing(self, keys: List[str], now: float) -> set:
+        """Keys present in the exact set and not yet expired."""
+        existing = set()
+        cutoff = now - self.ttl_seconds
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._db.execute(
+                f"SELECT key FROM seen WHERE last_seen >= ? AND key IN ({placeholders})",
+                [cutoff, *chunk]
+            )
+            existing.update(row[0] for row in rows)
+        return existing
+    
+    def _maybe_purge(self, now: float):
+        if now - self._last_purge >= self.purge_interval_seconds:
+            self._purge(now)
+    
+    def _purge(self, now: float) -> int:
+        """Delete keys not seen within the TTL."""
+        deleted = self._db.execute(
+            "DELETE FROM seen WHERE last_seen < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        self._last_purge = now
+        if deleted:
+            self.stats['purged'] += deleted
+            self.logger.info("Expired RFP keys purged", purged=deleted)
+        return deleted
+    
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """Delete keys not seen within the TTL.
+        
+        Returns:
+            Number of keys removed
+        """
+        with self._lock:
+            return self._purge(time.time() if now is None else now)
+    
+    def _rebuild_filter(self):
+        """Rebuild the Bloom filter from the exact set (drops aged-out keys).
+        
+        The caller holds self._filter.locked(). The new file is swapped in
+        before the old one is closed, so processes waiting on the lock find
+        the path replaced and remap instead of writing to the dead file.
+        """
+        live = self.size()
+        capacity = max(self.capacity, 2 * live)
+        temp_path = f"{self.filter_path}.{os.getpid()}.tmp"
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        
+        rebuilt = MmapBloomFilter(temp_path, capacity, self.error_rate)
+        rebuilt.add_many_locked(key for (key,) in self._db.execute("SELECT key FROM seen"))
+        rebuilt.close()
+        
+        os.replace(temp_path, self.filter_path)
+        previous, self._filter = self._filter, MmapBloomFilter(self.filter_path, capacity, self.error_rate)
+        previous.close()
+        self.logger.info("Bloom filter rebuilt", keys=live, capacity=capacity)
+    
+    def clear(self):
+        """Forget every key."""
+        with self._lock, self._filter.locked():
+            self._db.execute("DELETE FROM seen")
+            self._rebuild_filter()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Lookup counters plus current sizes."""
+        return {
+            **self.stats,
+            'keys': self.size(),
+            'filter_items': self._filter.count,
+            'filter_capacity': self._filter.capacity
+        }
+    
+    def close(self):
+        """Flush the filter and close the database."""
+        with self._lock:
+            self._filter.close()
+            self._db.close()
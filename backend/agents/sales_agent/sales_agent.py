@@ -309,6 +309,10 @@ class SalesAgent:
                     # Send summary alert
                     if self.config.alert_on_new_rfp:
                         self._send_discovery_alert(relevant_opportunities)
+                
+                # Only handled RFPs count as seen; a failed cycle rediscovers them
+                self.processed_urls.update(rfp['url'] for rfp in new_rfps)
+                self.url_monitor.mark_emitted(new_rfps)
             
             # Update statistics
             self.statistics['last_run'] = datetime.now().isoformat()
@@ -346,28 +350,32 @@ class SalesAgent:
         
         new_rfps = []
         
-        for site in self.config.monitored_sites:
-            try:
-                rfps = self.url_monitor.check_site(site)
-                
-                # Filter out already processed URLs
-                for rfp in rfps:
-                    if rfp['url'] not in self.processed_urls:
-                        new_rfps.append(rfp)
-                        self.processed_urls.add(rfp['url'])
-                
-                self.logger.debug(
-                    "Site monitored",
-                    site=site.name,
-                    new_rfps=len(rfps)
-                )
-                
-            except Exception as e:
-                self.logger.error(
-                    "Failed to monitor site",
-                    site=site.name,
-                    error=str(e)
-                )
+        # All sites are checked concurrently; per-site failures are logged by the monitor
+        try:
+            results = self.url_monitor.check_all_sites()
+        except Exception as e:
+            self.logger.error("Failed to monitor sites", error=str(e))
+            results = {}
+        
+        seen_urls = set(self.processed_urls)
+        already_processed = []
+        for site_name, rfps in results.items():
+            # Filter out already processed URLs
+            for rfp in rfps:
+                if rfp['url'] not in seen_urls:
+                    new_rfps.append(rfp)
+                    seen_urls.add(rfp['url'])
+                else:
+                    already_processed.append(rfp)
+            
+            self.logger.debug(
+                "Site monitored",
+                site=site_name,
+                new_rfps=len(rfps)
+            )
+        
+        if already_processed:
+            self.url_monitor.mark_emitted(already_processed)
         
         self.statistics['total_discovered'] += len(new_rfps)
         return new_rfps
@@ -683,7 +691,8 @@ Reasons for relevance:
                 'metrics': {
                     'monitored_sites': len(self.config.monitored_sites),
                     'processed_urls': len(self.processed_urls),
-                    'duplicate_cache_size': len(self.url_monitor.seen_rfp_hashes) if hasattr(self.url_monitor, 'seen_rfp_hashes') else 0
+                    'duplicate_cache_size': self.url_monitor.dedupe_store.size(),
+                    'last_sweep': getattr(self.url_monitor, 'last_sweep', {})
                 }
             }
         
@@ -1,10 +1,16 @@
 """
 URL Monitor V2 - Complete implementation with all features.
-Includes: Selenium, proxy rotation, duplicate detection, retry logic.
+Includes: Selenium, proxy rotation, duplicate detection, retry logic,
+and concurrent sweeps with conditional requests.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
 from dataclasses import dataclass
 from datetime import datetime
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import asyncio
+import httpx
 import requests
 from bs4 import BeautifulSoup
 import re
@@ -13,6 +19,11 @@ import time
 import hashlib
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+try:
+    from .dedupe_store import DedupeStore
+except ImportError:
+    from dedupe_store import DedupeStore
+
 logger = structlog.get_logger()
 
 
@@ -101,22 +112,108 @@ class ProxyPool:
         self.failed_proxies.clear()
 
 
+class HostScheduler:
+    """Per-host concurrency and request spacing for a sweep.
+    
+    Each request reserves the next free start time for its host, so a
+    site's rate limit only delays later requests to the same host.
+    """
+    
+    def __init__(self, max_concurrency_per_host: int = 2):
+        """Initialize scheduler.
+        
+        Args:
+            max_concurrency_per_host: Requests in flight per host
+        """
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+    
+    @asynccontextmanager
+    async def slot(self, host: str, min_interval: float):
+        """Wait for a request slot on host.
+        
+        Args:
+            host: Host name (with port)
+            min_interval: Seconds between request starts on this host
+        """
+        semaphore = self._semaphores.setdefault(
+            host, asyncio.Semaphore(self.max_concurrency_per_host)
+        )
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + min_interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+
+class _Sweep:
+    """Connection pools and scheduler shared by the site checks of one sweep."""
+    
+    def __init__(self, scheduler: HostScheduler, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.scheduler = scheduler
+        self.transport = transport
+        self.clients: Dict[Optional[str], httpx.AsyncClient] = {}
+    
+    def client(self, proxy: Optional[str] = None) -> httpx.AsyncClient:
+        """Pooled client for a proxy (None for direct connections)."""
+        if proxy not in self.clients:
+            self.clients[proxy] = httpx.AsyncClient(
+                timeout=30,
+                follow_redirects=True,
+                proxy=proxy if self.transport is None else None,
+                transport=self.transport
+            )
+        return self.clients[proxy]
+    
+    async def close(self):
+        for client in self.clients.values():
+            await client.aclose()
+
+
 class URLMonitor:
     """Monitor URLs for new RFP announcements with full features."""
     
-    def __init__(self, proxy_pool: Optional[ProxyPool] = None, use_selenium: bool = False):
+    def __init__(
+        self,
+        proxy_pool: Optional[ProxyPool] = None,
+        use_selenium: bool = False,
+        max_concurrency_per_host: int = 2,
+        sweep_deadline_seconds: float = 120,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        dedupe_store: Optional[DedupeStore] = None
+    ):
         """Initialize URL monitor.
         
         Args:
             proxy_pool: Optional proxy pool for rotation
             use_selenium: Whether to use Selenium for dynamic pages
+            max_concurrency_per_host: Concurrent requests per host during a sweep
+            sweep_deadline_seconds: Time budget for one sweep over all sites
+            transport: Optional httpx transport (e.g. httpx.MockTransport in tests)
+            dedupe_store: Persistent store of seen RFPs (defaults to settings.dedupe_store_dir)
         """
         self.logger = logger.bind(component="URLMonitor")
         self.monitored_sites: Dict[str, MonitoredSite] = {}
         self.proxy_pool = proxy_pool
         self.use_selenium_global = use_selenium
         self.selenium_driver = None
-        self.seen_rfp_hashes = set()  # For duplicate detection
+        self.dedupe_store = dedupe_store or DedupeStore()  # For duplicate detection
+        
+        # Async sweep settings
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self.sweep_deadline_seconds = sweep_deadline_seconds
+        self.transport = transport
+        self.validators: Dict[str, Dict[str, str]] = {}  # url -> ETag / Last-Modified
+        # Validators of the latest fetch, until the RFPs it found are acknowledged
+        self._fetched_validators: Dict[str, Dict[str, str]] = {}
+        self._unacknowledged: Dict[str, Tuple[Dict[str, str], Set[str]]] = {}  # url -> (validators, hashes)
+        self.fetch_stats = {'requests': 0, 'not_modified': 0, 'errors': 0}
+        self.last_sweep: Dict[str, Any] = {}
+        self._selenium_lock: Optional[asyncio.Lock] = None
         
         # Initialize Selenium if requested
         if use_selenium:
@@ -168,11 +265,7 @@ class URLMonitor:
         Returns:
             True if duplicate
         """
-        rfp_hash = self._generate_rfp_hash(rfp)
-        if rfp_hash in self.seen_rfp_hashes:
-            return True
-        self.seen_rfp_hashes.add(rfp_hash)
-        return False
+        return self.dedupe_store.check_and_add([self._generate_rfp_hash(rfp)])[0]
     
     def add_site(self, site: MonitoredSite):
         """Add site to monitoring."""
@@ -223,25 +316,8 @@ class URLMonitor:
                 response.raise_for_status()
                 soup = BeautifulSoup(response.content, 'html.parser')
             
-            # Extract RFPs
-            rfps = self._extract_rfps(soup, site)
-            
-            # Filter duplicates
-            unique_rfps = []
-            duplicates = 0
-            for rfp in rfps:
-                if not self._is_duplicate(rfp):
-                    unique_rfps.append(rfp)
-                else:
-                    duplicates += 1
-            
-            self.logger.info(
-                "Site checked successfully",
-                site=site.name,
-                rfps_found=len(rfps),
-                unique=len(unique_rfps),
-                duplicates=duplicates
-            )
+            # Extract RFPs and filter duplicates
+            unique_rfps = self._filter_new(self._extract_rfps(soup, site), site)
             
             # Rate limiting
             time.sleep(site.rate_limit_seconds)
@@ -261,6 +337,26 @@ class URLMonitor:
             self.logger.error("Unexpected error checking site", site=site.name, error=str(e))
             return []
     
+    def _filter_new(self, rfps: List[Dict[str, Any]], site: MonitoredSite) -> List[Dict[str, Any]]:
+        """Drop RFPs seen before and log the check result.
+        
+        Nothing is recorded here: RFPs stay new until the caller acknowledges
+        them with mark_emitted.
+        """
+        # One batched membership check per listing page
+        seen = self.dedupe_store.check(self._generate_rfp_hash(rfp) for rfp in rfps)
+        unique_rfps = [rfp for rfp, is_duplicate in zip(rfps, seen) if not is_duplicate]
+        duplicates = len(rfps) - len(unique_rfps)
+        
+        self.logger.info(
+            "Site checked successfully",
+            site=site.name,
+            rfps_found=len(rfps),
+            unique=len(unique_rfps),
+            duplicates=duplicates
+        )
+        return unique_rfps
+    
     def _scrape_with_selenium(self, site: MonitoredSite) -> BeautifulSoup:
         """Scrape dynamic page with Selenium.
         
@@ -302,19 +398,207 @@ class URLMonitor:
             raise
     
     def check_all_sites(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Check all monitored sites."""
-        results = {}
+        """Check all monitored sites concurrently (blocking wrapper around sweep)."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.sweep())
         
-        for site_name, site in self.monitored_sites.items():
-            try:
-                rfps = self.check_site(site)
-                results[site_name] = rfps
-            except Exception as e:
-                self.logger.error("Failed to check site", site=site_name, error=str(e))
-                results[site_name] = []
+        # Called from async code: run the sweep on its own loop
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.sweep()).result()
+    
+    async def sweep(self, deadline_seconds: Optional[float] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Check all monitored sites concurrently within one deadline.
+        
+        Sites still running at the deadline are cancelled and report no RFPs
+        for this sweep.
+        
+        Args:
+            deadline_seconds: Time budget (defaults to sweep_deadline_seconds)
+            
+        Returns:
+            New RFPs per site name; acknowledge them with mark_emitted once
+            they have been handled
+        """
+        deadline = self.sweep_deadline_seconds if deadline_seconds is None else deadline_seconds
+        results = {name: [] for name in self.monitored_sites}
+        summary = {'sites': len(results), 'completed': 0, 'failed': 0, 'timed_out': 0}
+        started = time.monotonic()
+        
+        sweep = _Sweep(HostScheduler(self.max_concurrency_per_host), self.transport)
+        self._selenium_lock = asyncio.Lock()
+        try:
+            tasks = {
+                asyncio.create_task(self.check_site_async(site, sweep)): name
+                for name, site in self.monitored_sites.items()
+            }
+            if tasks:
+                done, pending = await asyncio.wait(tasks, timeout=deadline)
+                
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.wait(pending)
+                    summary['timed_out'] = len(pending)
+                    self.logger.warning(
+                        "Sweep deadline reached",
+                        deadline_seconds=deadline,
+                        sites=[tasks[task] for task in pending]
+                    )
+                
+                for task in done:
+                    name = tasks[task]
+                    if task.exception():
+                        summary['failed'] += 1
+                        self.fetch_stats['errors'] += 1
+                        self.logger.error("Failed to check site", site=name, error=str(task.exception()))
+                    else:
+                        summary['completed'] += 1
+                        results[name] = task.result()
+        finally:
+            await sweep.close()
+        
+        # The same tender listed on several portals is returned once
+        returned = set()
+        for name, rfps in results.items():
+            unique = []
+            for rfp in rfps:
+                rfp_hash = self._generate_rfp_hash(rfp)
+                if rfp_hash not in returned:
+                    returned.add(rfp_hash)
+                    unique.append(rfp)
+            results[name] = unique
         
+        summary['duration_seconds'] = round(time.monotonic() - started, 3)
+        self.last_sweep = summary
+        self.logger.info("Sweep completed", **summary)
         return results
     
+    async def check_site_async(self, site: MonitoredSite, sweep: _Sweep) -> List[Dict[str, Any]]:
+        """Check one site as part of a sweep.
+        
+        Args:
+            site: MonitoredSite to check
+            sweep: Shared clients and host scheduler
+            
+        Returns:
+            List of new RFPs (empty when the listing is unchanged)
+        """
+        if not site.enabled:
+            self.logger.debug("Site disabled, skipping", site=site.name)
+            return []
+        
+        if site.use_selenium or self.use_selenium_global:
+            # One shared driver: render pages one at a time off the event loop
+            async with self._selenium_lock:
+                soup = await asyncio.to_thread(self._scrape_with_selenium, site)
+        else:
+            content = await self._fetch_listing(site, sweep)
+            if content is None:
+                return []
+            soup = BeautifulSoup(content, 'html.parser')
+        
+        new_rfps = self._filter_new(self._extract_rfps(soup, site), site)
+        self._hold_validators(site.url, new_rfps)
+        return new_rfps
+    
+    def _hold_validators(self, url: str, new_rfps: List[Dict[str, Any]]):
+        """Keep a fetch's validators until its new RFPs are acknowledged.
+        
+        Sending them earlier would turn the next fetch into a 304 and hide
+        RFPs whose emit failed.
+        """
+        fresh = self._fetched_validators.pop(url, None)
+        if fresh is None:
+            return
+        hashes = {self._generate_rfp_hash(rfp) for rfp in new_rfps}
+        if hashes:
+            self._unacknowledged[url] = (fresh, hashes)
+        else:
+            self._unacknowledged.pop(url, None)
+            self._set_validators(url, fresh)
+    
+    def _set_validators(self, url: str, fresh: Dict[str, str]):
+        if fresh:
+            self.validators[url] = fresh
+        else:
+            self.validators.pop(url, None)
+    
+    def mark_emitted(self, rfps: Iterable[Dict[str, Any]]):
+        """Record RFPs as seen once they have been emitted.
+        
+        Until then later checks keep returning them, so a failure between
+        discovery and emit does not lose a tender.
+        
+        Args:
+            rfps: RFPs returned by sweep, check_site or check_all_sites
+        """
+        hashes = {self._generate_rfp_hash(rfp) for rfp in rfps}
+        self.dedupe_store.add(hashes)
+        for url, (fresh, pending) in list(self._unacknowledged.items()):
+            pending -= hashes
+            if not pending:
+                del self._unacknowledged[url]
+                self._set_validators(url, fresh)
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type(httpx.HTTPError),
+        reraise=True
+    )
+    async def _fetch_listing(self, site: MonitoredSite, sweep: _Sweep) -> Optional[bytes]:
+        """Conditionally GET a listing page.
+        
+        Args:
+            site: Site to fetch
+            sweep: Shared clients and host scheduler
+            
+        Returns:
+            Page content, or None if unchanged since the last fetch (304)
+        """
+        proxy_url = None
+        if self.proxy_pool:
+            proxy_dict = self.proxy_pool.get_next_proxy()
+            if proxy_dict:
+                proxy_url = proxy_dict.get('http', '')
+        
+        headers = {}
+        validators = self.validators.get(site.url, {})
+        if 'etag' in validators:
+            headers['If-None-Match'] = validators['etag']
+        if 'last_modified' in validators:
+            headers['If-Modified-Since'] = validators['last_modified']
+        
+        self.logger.info("Checking site for new RFPs", site=site.name, conditional=bool(headers))
+        
+        try:
+            async with sweep.scheduler.slot(urlparse(site.url).netloc, site.rate_limit_seconds):
+                response = await sweep.client(proxy_url).get(site.url, headers=headers)
+        except httpx.TransportError:
+            if self.proxy_pool and proxy_url:
+                self.proxy_pool.mark_failed(proxy_url)
+                self.logger.warning("Marked proxy as failed", proxy=proxy_url)
+            raise
+        
+        self.fetch_stats['requests'] += 1
+        if response.status_code == 304:
+            self.fetch_stats['not_modified'] += 1
+            self.logger.debug("Listing not modified", site=site.name)
+            return None
+        
+        response.raise_for_status()
+        
+        fresh = {}
+        if response.headers.get('etag'):
+            fresh['etag'] = response.headers['etag']
+        if response.headers.get('last-modified'):
+            fresh['last_modified'] = response.headers['last-modified']
+        self._fetched_validators[site.url] = fresh
+        
+        return response.content
+    
     def _extract_rfps(self, soup: BeautifulSoup, site: MonitoredSite) -> List[Dict[str, Any]]:
         """Extract RFPs from HTML."""
         rfps = []
@@ -412,7 +696,11 @@ class URLMonitor:
     
     def clear_duplicate_cache(self):
         """Clear duplicate detection cache."""
-        self.seen_rfp_hashes.clear()
+        self.dedupe_store.clear()
+        # Unchanged listings must be refetched to rediscover their RFPs
+        self.validators.clear()
+        self._fetched_validators.clear()
+        self._unacknowledged.clear()
         self.logger.info("Duplicate cache cleared")
     
     def __del__(self):
@@ -52,6 +52,11 @@ class TechnicalAgentConfig:
                 'enabled': True,
                 'model_name': 'all-MiniLM-L6-v2',  # SentenceTransformer model
                 'index_path': './vector_index',
+                'index_type': 'flat',  # 'flat', 'ivf' or 'hnsw'
+                'embedding_cache_dir': './vector_index/embeddings',
+                'nlist': 100,  # IVF lists
+                'nprobe': 8,  # IVF lists probed per query
+                'ef_search': 64,  # HNSW search breadth
                 'similarity_threshold': 0.7,
                 'top_k': 10,
                 'use_mock': False  # Use mock embeddings for testing
@@ -183,6 +188,12 @@ class TechnicalAgentConfig:
             return True  # Mock mode always works
         return self.has_llm_api_key()
     
+    def vector_search_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for VectorSearchEngine from the vector_search section"""
+        section = self.get('vector_search', default={})
+        keys = ('model_name', 'index_type', 'embedding_cache_dir', 'nlist', 'nprobe', 'ef_search')
+        return {key: section[key] for key in keys if key in section}
+    
     def can_use_vector_search(self) -> bool:
         """Check if vector search can be used"""
         if self.get('vector_search', 'use_mock'):
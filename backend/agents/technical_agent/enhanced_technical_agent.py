@@ -92,7 +92,8 @@ class EnhancedTechnicalAgent:
         llm_api_key: Optional[str] = None,
         enable_vector_search: bool = True,
         memory_dir: str = "./memory",
-        enable_monitoring: bool = True
+        enable_monitoring: bool = True,
+        vector_search_options: Optional[Dict[str, Any]] = None
     ):
         """Initialize Enhanced Technical Agent.
         
@@ -103,6 +104,9 @@ class EnhancedTechnicalAgent:
             enable_vector_search: Enable vector search
             memory_dir: Memory directory
             enable_monitoring: Enable monitoring
+            vector_search_options: VectorSearchEngine settings (model_name,
+                index_type, embedding_cache_dir, nlist, nprobe, ef_search),
+                e.g. TechnicalAgentConfig.vector_search_kwargs()
         """
         self.logger = logger.bind(component="EnhancedTechnicalAgent")
         
@@ -126,7 +130,9 @@ class EnhancedTechnicalAgent:
         # Vector search
         if enable_vector_search:
             try:
-                self.vector_engine = VectorSearchEngine()
+                options = {'embedding_cache_dir': str(Path(memory_dir) / "embeddings")}
+                options.update(vector_search_options or {})
+                self.vector_engine = VectorSearchEngine(**options)
                 self.vector_engine.index_products(self.catalog_matcher.catalog)
                 self.hybrid_matcher = HybridMatcher(self.vector_engine)
                 self.vector_enabled = True
@@ -229,17 +235,24 @@ class EnhancedTechnicalAgent:
             comparisons = []
             all_matches = []
             
-            for requirement in requirements:
+            # Hybrid matching runs once for all requirements (batched encoding/search)
+            hybrid_results = None
+            if use_vector_search and self.vector_enabled:
+                hybrid_start = time.time()
+                hybrid_results = self.hybrid_matcher.match_many(
+                    [requirement.to_dict() for requirement in requirements],
+                    self.catalog_matcher.catalog,
+                    top_k=10
+                )
+                component_timings['hybrid_matching'] = time.time() - hybrid_start
+            
+            for index, requirement in enumerate(requirements):
                 self.context_manager.push_context('requirement', requirement.to_dict())
                 
                 # Match products (hybrid if vector search enabled)
                 match_start = time.time()
-                if use_vector_search and self.vector_enabled:
-                    matches_with_scores = self.hybrid_matcher.match(
-                        requirement.to_dict(),
-                        self.catalog_matcher.catalog,
-                        top_k=10
-                    )
+                if hybrid_results is not None:
+                    matches_with_scores = hybrid_results[index]
                     # Convert to ProductMatch objects
                     matches = self._convert_hybrid_matches(matches_with_scores, requirement)
                 else:
@@ -2,9 +2,10 @@
 Vector Search Integration for Product Matching.
 """
 from typing import List, Dict, Any, Optional, Tuple
+import hashlib
+import os
 import numpy as np
 import structlog
-from sentence_transformers import SentenceTransformer
 import faiss
 import json
 from pathlib import Path
@@ -12,44 +13,375 @@ from pathlib import Path
 logger = structlog.get_logger()
 
 
+def _number_or(value: Any, default: float) -> float:
+    """Coerce a metadata value to float, using default for None/non-numeric."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class EmbeddingStore:
+    """On-disk embedding cache keyed by product-text hash.
+    
+    Only texts whose hash is not already stored are sent to the encoder, so
+    re-indexing an unchanged catalog (e.g. on worker boot) encodes nothing.
+    """
+    
+    FILE_NAME = "embeddings.npz"
+    
+    def __init__(self, cache_dir: str, model_name: str):
+        """Initialize and load any existing cache.
+        
+        Args:
+            cache_dir: Directory holding the cache file
+            model_name: Embedding model name (part of every key)
+        """
+        self.logger = logger.bind(component="EmbeddingStore")
+        self.cache_dir = Path(cache_dir)
+        self.model_name = model_name
+        
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        
+        self._load()
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def key_for(self, text: str) -> str:
+        """Get the cache key for a product text."""
+        payload = f"{self.model_name}\0{text}".encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+    
+    def embed(self, texts: List[str], encode_fn) -> np.ndarray:
+        """Get embeddings for texts, encoding only cache misses.
+        
+        Args:
+            texts: Product texts
+            encode_fn: Callable mapping a list of texts to an embedding matrix
+            
+        Returns:
+            float32 matrix with one row per text
+        """
+        keys = [self.key_for(text) for text in texts]
+        
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in self._rows and key not in missing:
+                missing[key] = text
+        
+        if missing:
+            new_embeddings = np.asarray(encode_fn(list(missing.values())), dtype='float32')
+            self._append(list(missing.keys()), new_embeddings)
+            self.save()
+        
+        self.logger.info(
+            "Embedding cache lookup",
+            requested=len(texts),
+            encoded=len(missing),
+            cached=len(self._keys)
+        )
+        
+        if not keys:
+            return np.zeros((0, 0), dtype='float32')
+        return self._matrix[[self._rows[key] for key in keys]]
+    
+    def compact(self, keep_keys: List[str]):
+        """Drop cached embeddings whose keys are not in keep_keys.
+        
+        Call after a bulk re-embed so embeddings of removed or edited
+        products do not accumulate in the cache file.
+        """
+        keep_set = set(keep_keys)
+        keep = [key for key in self._keys if key in keep_set]
+        if len(keep) == len(self._keys):
+            return
+        
+        rows = [self._rows[key] for key in keep]
+        self._matrix = self._matrix[rows] if rows else None
+        self._keys = keep
+        self._rows = {key: i for i, key in enumerate(keep)}
+        self.save()
+    
+    def save(self):
+        """Atomically write the cache to disk."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / self.FILE_NAME
+        tmp_path = self.cache_dir / f".{self.FILE_NAME}.{os.getpid()}.tmp"
+        
+        matrix = self._matrix if self._matrix is not None else np.zeros((0, 0), dtype='float32')
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, keys=np.array(self._keys, dtype='U64'), embeddings=matrix)
+        os.replace(tmp_path, path)
+    
+    def _load(self):
+        path = self.cache_dir / self.FILE_NAME
+        if not path.exists():
+            return
+        
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                keys = [str(key) for key in data['keys']]
+                matrix = data['embeddings'].astype('float32')
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable embedding cache: {e}", path=str(path))
+            return
+        
+        if keys:
+            self._keys = keys
+            self._rows = {key: i for i, key in enumerate(keys)}
+            self._matrix = matrix
+    
+    def _append(self, keys: List[str], embeddings: np.ndarray):
+        start = len(self._keys)
+        self._keys.extend(keys)
+        self._rows.update({key: start + i for i, key in enumerate(keys)})
+        self._matrix = embeddings if self._matrix is None else np.vstack([self._matrix, embeddings])
+
+
+class FaissIndexManager:
+    """Builds and queries a FAISS index of a selectable type.
+    
+    Index types:
+        flat: exact inner-product search (IndexFlatIP)
+        ivf:  inverted lists (IndexIVFFlat), recall tuned with nprobe
+        hnsw: graph search (IndexHNSWFlat), recall tuned with ef_search
+    
+    Vector ids are row positions in the embedding matrix, so metadata filters
+    can be pushed down as id selectors.
+    """
+    
+    INDEX_TYPES = ('flat', 'ivf', 'hnsw')
+    
+    def __init__(
+        self,
+        dim: int,
+        index_type: str = "flat",
+        nlist: int = 100,
+        nprobe: int = 8,
+        hnsw_m: int = 32,
+        ef_construction: int = 200,
+        ef_search: int = 64,
+        exact_filter_threshold: int = 2048
+    ):
+        """Initialize index manager.
+        
+        Args:
+            dim: Embedding dimension
+            index_type: One of INDEX_TYPES
+            nlist: Number of IVF lists (clamped to catalog size)
+            nprobe: IVF lists probed per query
+            hnsw_m: HNSW graph degree
+            ef_construction: HNSW build-time candidate list size
+            ef_search: HNSW query-time candidate list size
+            exact_filter_threshold: Filtered searches over at most this many
+                ids are scored exactly instead of through the ANN index
+        """
+        if index_type not in self.INDEX_TYPES:
+            raise ValueError(f"Unknown index type '{index_type}', expected one of {self.INDEX_TYPES}")
+        
+        self.dim = dim
+        self.index_type = index_type
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.exact_filter_threshold = exact_filter_threshold
+        
+        self.embeddings = np.zeros((0, dim), dtype='float32')
+        self.index = faiss.IndexFlatIP(dim)
+    
+    @property
+    def ntotal(self) -> int:
+        return self.index.ntotal
+    
+    def build(self, embeddings: np.ndarray):
+        """Build the index from an embedding matrix (row i gets id i)."""
+        embeddings = np.ascontiguousarray(embeddings, dtype='float32')
+        if embeddings.size == 0:
+            embeddings = np.zeros((0, self.dim), dtype='float32')
+        self.embeddings = embeddings
+        count = embeddings.shape[0]
+        
+        if self.index_type == 'ivf' and count > 0:
+            # FAISS wants ~39 training points per list
+            nlist = max(1, min(self.nlist, count // 39))
+            quantizer = faiss.IndexFlatIP(self.dim)
+            index = faiss.IndexIVFFlat(quantizer, self.dim, nlist, faiss.METRIC_INNER_PRODUCT)
+            index.train(embeddings)
+            index.nprobe = min(self.nprobe, nlist)
+        elif self.index_type == 'hnsw':
+            index = faiss.IndexHNSWFlat(self.dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = self.ef_construction
+            index.hnsw.efSearch = self.ef_search
+        else:
+            index = faiss.IndexFlatIP(self.dim)
+        
+        if count > 0:
+            index.add(embeddings)
+        self.index = index
+    
+    def set_recall(self, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+        """Tune the recall/speed trade-off of the ANN index."""
+        if nprobe is not None:
+            self.nprobe = nprobe
+        if ef_search is not None:
+            self.ef_search = ef_search
+    
+    def search(
+        self,
+        queries: np.ndarray,
+        top_k: int,
+        id_subset: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Search the index, optionally restricted to a subset of ids.
+        
+        Args:
+            queries: float32 query matrix (one row per query)
+            top_k: Results per query
+            id_subset: Allowed vector ids, or None for no restriction
+            
+        Returns:
+            (scores, ids) matrices; missing results have id -1
+        """
+        queries = np.ascontiguousarray(queries, dtype='float32')
+        
+        if id_subset is not None:
+            id_subset = np.asarray(id_subset, dtype='int64')
+            if id_subset.size == 0:
+                empty = np.full((queries.shape[0], top_k), -1, dtype='int64')
+                return np.full(empty.shape, -np.inf, dtype='float32'), empty
+            if id_subset.size <= self.exact_filter_threshold:
+                return self._exact_search(queries, top_k, id_subset)
+        
+        search_k = min(top_k, self.ntotal)
+        if search_k <= 0:
+            empty = np.full((queries.shape[0], top_k), -1, dtype='int64')
+            return np.full(empty.shape, -np.inf, dtype='float32'), empty
+        
+        params = self._search_params(id_subset)
+        return self.index.search(queries, search_k, params=params)
+    
+    def _search_params(self, id_subset: Optional[np.ndarray]):
+        selector = faiss.IDSelectorBatch(id_subset) if id_subset is not None else None
+        
+        if self.index_type == 'ivf' and isinstance(self.index, faiss.IndexIVF):
+            return faiss.SearchParametersIVF(sel=selector, nprobe=min(self.nprobe, self.index.nlist))
+        if self.index_type == 'hnsw':
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=self.ef_search)
+        if selector is not None:
+            return faiss.SearchParameters(sel=selector)
+        return None
+    
+    def _exact_search(
+        self,
+        queries: np.ndarray,
+        top_k: int,
+        id_subset: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Brute-force inner product over a small id subset (never starves)."""
+        scores = queries @ self.embeddings[id_subset].T
+        k = min(top_k, id_subset.size)
+        order = np.argsort(-scores, axis=1, kind='stable')[:, :k]
+        return np.take_along_axis(scores, order, axis=1), id_subset[order]
+    
+    def save(self, path: Path):
+        """Write the index, its embeddings and config under path."""
+        faiss.write_index(self.index, str(path / "index.faiss"))
+        np.save(path / "embeddings.npy", self.embeddings)
+        with open(path / "index_config.json", 'w') as f:
+            json.dump({
+                'index_type': self.index_type,
+                'nlist': self.nlist,
+                'nprobe': self.nprobe,
+                'hnsw_m': self.hnsw_m,
+                'ef_construction': self.ef_construction,
+                'ef_search': self.ef_search
+            }, f)
+    
+    def load(self, path: Path):
+        """Load an index previously written with save()."""
+        config_path = path / "index_config.json"
+        if config_path.exists():
+            with open(config_path, 'r') as f:
+                for key, value in json.load(f).items():
+                    setattr(self, key, value)
+        
+        self.index = faiss.read_index(str(path / "index.faiss"))
+        embeddings_path = path / "embeddings.npy"
+        if embeddings_path.exists():
+            self.embeddings = np.load(embeddings_path)
+        elif self.index.ntotal > 0:
+            self.embeddings = self.index.reconstruct_n(0, self.index.ntotal)
+
+
 class VectorSearchEngine:
     """Vector-based semantic search for product catalog."""
     
     def __init__(
         self,
         model_name: str = "all-MiniLM-L6-v2",
-        index_path: Optional[str] = None
+        index_path: Optional[str] = None,
+        index_type: str = "flat",
+        embedding_cache_dir: Optional[str] = None,
+        nlist: int = 100,
+        nprobe: int = 8,
+        ef_search: int = 64
     ):
         """Initialize vector search engine.
         
         Args:
             model_name: Sentence transformer model name
             index_path: Path to saved FAISS index
+            index_type: FAISS index type ('flat', 'ivf' or 'hnsw')
+            embedding_cache_dir: Directory for the persistent embedding cache
+                (None disables caching)
+            nlist: Number of IVF lists
+            nprobe: IVF lists probed per query
+            ef_search: HNSW query-time candidate list size
         """
         self.logger = logger.bind(component="VectorSearchEngine")
         
-        # Load embedding model
+        # Load embedding model (imported here so the index classes work without it)
+        from sentence_transformers import SentenceTransformer
         self.model = SentenceTransformer(model_name)
         self.embedding_dim = self.model.get_sentence_embedding_dimension()
         
+        self.embedding_store = (
+            EmbeddingStore(embedding_cache_dir, model_name) if embedding_cache_dir else None
+        )
+        self.index_manager = FaissIndexManager(
+            self.embedding_dim,
+            index_type=index_type,
+            nlist=nlist,
+            nprobe=nprobe,
+            ef_search=ef_search
+        )
+        
         # Initialize FAISS index
-        self.index = None
+        self.index = self.index_manager.index  # Inner product for cosine similarity
         self.product_metadata = []
+        self._reset_filter_index()
         
         if index_path and Path(index_path).exists():
             self.load_index(index_path)
-        else:
-            self.index = faiss.IndexFlatIP(self.embedding_dim)  # Inner product for cosine similarity
         
         self.logger.info(
             "Vector search engine initialized",
             model=model_name,
-            embedding_dim=self.embedding_dim
+            embedding_dim=self.embedding_dim,
+            index_type=self.index_manager.index_type
         )
     
     def index_products(self, products: List[Dict[str, Any]]):
         """Index products for vector search.
         
+        Only products whose text is not in the embedding cache are encoded;
+        cached embeddings of products not in this batch are dropped.
+        
         Args:
             products: List of product dictionaries
         """
@@ -64,19 +396,29 @@ class VectorSearchEngine:
             product_texts.append(text)
             self.product_metadata.append(product)
         
-        # Generate embeddings
-        embeddings = self.model.encode(
-            product_texts,
-            normalize_embeddings=True,  # For cosine similarity
-            show_progress_bar=True
-        )
+        # Generate embeddings; drop cached ones for products no longer indexed
+        if self.embedding_store is not None:
+            embeddings = self.embedding_store.embed(product_texts, self._encode_products)
+            self.embedding_store.compact([self.embedding_store.key_for(text) for text in product_texts])
+        else:
+            embeddings = self._encode_products(product_texts)
         
         # Add to FAISS index
-        self.index = faiss.IndexFlatIP(self.embedding_dim)
-        self.index.add(embeddings.astype('float32'))
+        self.index_manager.build(embeddings)
+        self.index = self.index_manager.index
+        self._build_filter_index()
         
         self.logger.info(f"Indexed {self.index.ntotal} products")
     
+    def _encode_products(self, texts: List[str]) -> np.ndarray:
+        """Encode product texts into normalized embeddings."""
+        embeddings = self.model.encode(
+            texts,
+            normalize_embeddings=True,  # For cosine similarity
+            show_progress_bar=True
+        )
+        return np.asarray(embeddings, dtype='float32')
+    
     def search(
         self,
         query: str,
@@ -85,6 +427,9 @@ class VectorSearchEngine:
     ) -> List[Tuple[Dict[str, Any], float]]:
         """Search for products using semantic similarity.
         
+        Filters are resolved to an id subset before the search, so the
+        index returns up to top_k matching products directly.
+        
         Args:
             query: Search query (requirement description)
             top_k: Number of results to return
@@ -93,37 +438,106 @@ class VectorSearchEngine:
         Returns:
             List of (product, similarity_score) tuples
         """
+        results = self.search_many([query], top_k=top_k, filters=filters)[0]
+        
+        self.logger.info(f"Vector search found {len(results)} results", query=query[:50])
+        return results
+    
+    def search_many(
+        self,
+        queries: List[str],
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[Dict[str, Any], float]]]:
+        """Search for many queries with one encoder call and one index search.
+        
+        Args:
+            queries: Search queries (requirement descriptions)
+            top_k: Number of results per query
+            filters: Optional filters applied to every query
+            
+        Returns:
+            One list of (product, similarity_score) tuples per query
+        """
         if self.index is None or self.index.ntotal == 0:
             self.logger.warning("Index is empty")
+            return [[] for _ in queries]
+        if not queries:
             return []
         
-        # Generate query embedding
-        query_embedding = self.model.encode(
-            [query],
-            normalize_embeddings=True
-        ).astype('float32')
+        # Generate query embeddings in one batch
+        query_embeddings = np.asarray(
+            self.model.encode(queries, normalize_embeddings=True),
+            dtype='float32'
+        )
         
-        # Search index
-        search_k = min(top_k * 3, self.index.ntotal)  # Over-fetch for filtering
-        distances, indices = self.index.search(query_embedding, search_k)
+        # Search index with filters pushed down as an id selector
+        id_subset = self._filter_ids(filters) if filters else None
+        distances, indices = self.index_manager.search(query_embeddings, top_k, id_subset)
         
         # Collect results
-        results = []
-        for idx, score in zip(indices[0], distances[0]):
-            if idx < len(self.product_metadata):
-                product = self.product_metadata[idx]
-                
-                # Apply filters
-                if filters and not self._matches_filters(product, filters):
-                    continue
-                
-                results.append((product, float(score)))
-                
-                if len(results) >= top_k:
-                    break
+        all_results = []
+        for row_indices, row_scores in zip(indices, distances):
+            results = []
+            for idx, score in zip(row_indices, row_scores):
+                if 0 <= idx < len(self.product_metadata):
+                    results.append((self.product_metadata[idx], float(score)))
+            all_results.append(results)
+        
+        return all_results
+    
+    def set_recall(self, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+        """Tune ANN recall (IVF nprobe / HNSW efSearch)."""
+        self.index_manager.set_recall(nprobe=nprobe, ef_search=ef_search)
+    
+    def _reset_filter_index(self):
+        self._category_ids: Dict[str, List[int]] = {}
+        self._manufacturer_ids: Dict[str, List[int]] = {}
+        self._unit_prices = np.zeros(0)
+        self._available_stock = np.zeros(0)
+    
+    def _build_filter_index(self):
+        """Build metadata lookups used to turn filters into id subsets."""
+        self._reset_filter_index()
+        
+        for i, product in enumerate(self.product_metadata):
+            category = (product.get('category') or '').lower()
+            manufacturer = (product.get('manufacturer') or '').lower()
+            self._category_ids.setdefault(category, []).append(i)
+            self._manufacturer_ids.setdefault(manufacturer, []).append(i)
+        
+        self._unit_prices = np.array(
+            [_number_or(product.get('unit_price', float('inf')), float('inf')) for product in self.product_metadata],
+            dtype=float
+        )
+        self._available_stock = np.array(
+            [_number_or(product.get('available_stock', 0), 0) for product in self.product_metadata],
+            dtype=float
+        )
+    
+    def _filter_ids(self, filters: Dict[str, Any]) -> np.ndarray:
+        """Resolve filters to the sorted array of matching vector ids.
         
-        self.logger.info(f"Vector search found {len(results)} results", query=query[:50])
-        return results
+        Supports category/manufacturer (case-insensitive equality),
+        max_price and min_stock; unknown keys are ignored.
+        """
+        mask = np.ones(len(self.product_metadata), dtype=bool)
+        
+        for key, value in filters.items():
+            if key == 'category':
+                allowed = np.zeros_like(mask)
+                allowed[self._category_ids.get(value.lower(), [])] = True
+                mask &= allowed
+            elif key == 'manufacturer':
+                allowed = np.zeros_like(mask)
+                allowed[self._manufacturer_ids.get(value.lower(), [])] = True
+                mask &= allowed
+            elif key == 'max_price':
+                mask &= ~(self._unit_prices > value)
+            elif key == 'min_stock':
+                mask &= ~(self._available_stock < value)
+        
+        return np.flatnonzero(mask).astype('int64')
     
     def _create_product_text(self, product: Dict[str, Any]) -> str:
         """Create searchable text representation of product."""
@@ -152,24 +566,6 @@ class VectorSearchEngine:
         
         return ' '.join(str(p) for p in parts if p)
     
-    def _matches_filters(self, product: Dict[str, Any], filters: Dict[str, Any]) -> bool:
-        """Check if product matches filters."""
-        for key, value in filters.items():
-            if key == 'category':
-                if product.get('category', '').lower() != value.lower():
-                    return False
-            elif key == 'manufacturer':
-                if product.get('manufacturer', '').lower() != value.lower():
-                    return False
-            elif key == 'max_price':
-                if product.get('unit_price', float('inf')) > value:
-                    return False
-            elif key == 'min_stock':
-                if product.get('available_stock', 0) < value:
-                    return False
-        
-        return True
-    
     def save_index(self, index_path: str):
         """Save FAISS index and metadata.
         
@@ -177,10 +573,10 @@ class VectorSearchEngine:
             index_path: Path to save index
         """
         path = Path(index_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
+        path.mkdir(parents=True, exist_ok=True)
         
         # Save FAISS index
-        faiss.write_index(self.index, str(path / "index.faiss"))
+        self.index_manager.save(path)
         
         # Save metadata
         with open(path / "metadata.json", 'w') as f:
@@ -197,11 +593,13 @@ class VectorSearchEngine:
         path = Path(index_path)
         
         # Load FAISS index
-        self.index = faiss.read_index(str(path / "index.faiss"))
+        self.index_manager.load(path)
+        self.index = self.index_manager.index
         
         # Load metadata
         with open(path / "metadata.json", 'r') as f:
             self.product_metadata = json.load(f)
+        self._build_filter_index()
         
         self.logger.info(f"Index loaded from {index_path}", products=len(self.product_metadata))
 
@@ -236,23 +634,84 @@ class HybridMatcher:
         Returns:
             List of (product, combined_score) tuples
         """
-        self.logger.info("Performing hybrid matching")
+        return self.match_many([requirement], catalog, top_k=top_k, alpha=alpha)[0]
+    
+    def match_many(
+        self,
+        requirements: List[Dict[str, Any]],
+        catalog: List[Dict[str, Any]],
+        top_k: int = 10,
+        alpha: float = 0.7
+    ) -> List[List[Tuple[Dict[str, Any], float]]]:
+        """Hybrid matching for all BOQ requirements at once.
+        
+        All requirement queries are encoded in one batch and searched with a
+        single index query; rule-based scores are computed as a
+        (requirements x catalog) matrix.
+        
+        Args:
+            requirements: Product requirements
+            catalog: Product catalog
+            top_k: Number of results per requirement
+            alpha: Weight for vector search (1-alpha for rule-based)
+            
+        Returns:
+            One list of (product, combined_score) tuples per requirement
+        """
+        if not requirements:
+            return []
+        
+        self.logger.info("Performing hybrid matching", requirements=len(requirements))
         
-        # 1. Vector search
-        query = self._create_requirement_query(requirement)
-        vector_results = self.vector_engine.search(query, top_k=top_k*2)
+        # 1. Vector search (one encoder call, one index search)
+        queries = [self._create_requirement_query(r) for r in requirements]
+        vector_results = self.vector_engine.search_many(queries, top_k=top_k*2)
         
         # 2. Rule-based matching
-        rule_results = self._rule_based_match(requirement, catalog)
+        rule_scores = self._rule_based_scores(requirements, catalog)
         
         # 3. Combine scores
-        combined = self._combine_scores(vector_results, rule_results, alpha)
-        
-        # Sort and return top K
-        combined.sort(key=lambda x: x[1], reverse=True)
+        positions: Dict[str, int] = {}
+        for i, product in enumerate(catalog):
+            positions[product['product_id']] = i
+        catalog_rows = np.array(sorted(positions.values()), dtype=int)
+        
+        all_matches = []
+        for row, hits in enumerate(vector_results):
+            vector_scores = np.zeros(len(catalog))
+            products = {}
+            extra_products = []
+            extra_scores = []
+            for product, score in hits:
+                position = positions.get(product['product_id'])
+                if position is None:
+                    extra_products.append(product)
+                    extra_scores.append(alpha * score + (1 - alpha) * 0.0)
+                else:
+                    vector_scores[position] = score
+                    products.setdefault(position, product)
+            
+            combined = alpha * vector_scores + (1 - alpha) * rule_scores[row]
+            scores = np.concatenate([combined[catalog_rows], np.array(extra_scores, dtype=float)])
+            
+            # Sort and return top K
+            order = np.argsort(-scores, kind='stable')[:top_k]
+            matches = []
+            for i in order:
+                if i < len(catalog_rows):
+                    position = catalog_rows[i]
+                    product = products.get(position, catalog[position])
+                else:
+                    product = extra_products[i - len(catalog_rows)]
+                matches.append((product, float(scores[i])))
+            all_matches.append(matches)
         
-        self.logger.info(f"Hybrid matching found {len(combined[:top_k])} results")
-        return combined[:top_k]
+        self.logger.info(
+            "Hybrid matching completed",
+            requirements=len(requirements),
+            results=sum(len(m) for m in all_matches)
+        )
+        return all_matches
     
     def _create_requirement_query(self, requirement: Dict[str, Any]) -> str:
         """Create search query from requirement."""
@@ -274,93 +733,99 @@ class HybridMatcher:
         
         return ' '.join(str(p) for p in parts if p)
     
-    def _rule_based_match(
+    def _rule_based_scores(
         self,
-        requirement: Dict[str, Any],
+        requirements: List[Dict[str, Any]],
         catalog: List[Dict[str, Any]]
-    ) -> List[Tuple[Dict[str, Any], float]]:
-        """Rule-based matching for exact criteria."""
-        results = []
+    ) -> np.ndarray:
+        """Rule-based scores for exact criteria as a (requirements x catalog) matrix.
         
-        for product in catalog:
-            score = 0.0
-            count = 0
-            
+        Substring checks run once per distinct catalog value and are
+        broadcast back to products, so cost scales with distinct categories
+        and spec values rather than catalog size.
+        """
+        size = len(catalog)
+        scores = np.zeros((len(requirements), size))
+        if size == 0:
+            return scores
+        
+        # Distinct categories with a product -> category index
+        category_values: Dict[str, int] = {}
+        category_index = np.array([
+            category_values.setdefault((product.get('category') or '').lower(), len(category_values))
+            for product in catalog
+        ])
+        categories = list(category_values.keys())
+        
+        product_specs = [product.get('specifications') or {} for product in catalog]
+        product_standards = [
+            set(s.upper() for s in product.get('standards_compliance', []))
+            for product in catalog
+        ]
+        spec_columns: Dict[str, Tuple[List[str], np.ndarray]] = {}
+        standard_columns: Dict[str, np.ndarray] = {}
+        
+        for row, requirement in enumerate(requirements):
             # Category match
             req_category = requirement.get('item_name', '').lower()
-            prod_category = product.get('category', '').lower()
-            if req_category in prod_category or prod_category in req_category:
-                score += 1.0
-                count += 1
-            else:
-                count += 1
+            category_hits = np.array([
+                req_category in category or category in req_category
+                for category in categories
+            ])
+            score = category_hits[category_index].astype(float)
+            count = 1
             
             # Specification match
             req_specs = requirement.get('specifications', {})
-            prod_specs = product.get('specifications', {})
             if req_specs:
-                matched_specs = sum(
-                    1 for k, v in req_specs.items()
-                    if k in prod_specs and str(v).lower() in str(prod_specs[k]).lower()
-                )
-                score += matched_specs / len(req_specs)
+                matched_specs = np.zeros(size, dtype=int)
+                for key, value in req_specs.items():
+                    if key not in spec_columns:
+                        spec_columns[key] = self._spec_column(product_specs, key)
+                    values, value_index = spec_columns[key]
+                    needle = str(value).lower()
+                    hits = np.array([needle in v for v in values] + [False])
+                    matched_specs += hits[value_index]
+                score = score + matched_specs / len(req_specs)
                 count += 1
             
             # Standard match
             req_standards = set(s.upper() for s in requirement.get('required_standards', []))
-            prod_standards = set(s.upper() for s in product.get('standards_compliance', []))
             if req_standards:
-                matched_stds = len(req_standards & prod_standards)
-                score += matched_stds / len(req_standards)
+                matched_stds = np.zeros(size, dtype=int)
+                for standard in req_standards:
+                    if standard not in standard_columns:
+                        standard_columns[standard] = np.array(
+                            [standard in stds for stds in product_standards]
+                        )
+                    matched_stds += standard_columns[standard]
+                score = score + matched_stds / len(req_standards)
                 count += 1
             
             # Average score
-            final_score = score / count if count > 0 else 0.0
-            results.append((product, final_score))
+            scores[row] = score / count
         
-        return results
+        return scores
     
-    def _combine_scores(
+    def _spec_column(
         self,
-        vector_results: List[Tuple[Dict[str, Any], float]],
-        rule_results: List[Tuple[Dict[str, Any], float]],
-        alpha: float
-    ) -> List[Tuple[Dict[str, Any], float]]:
-        """Combine vector and rule-based scores."""
-        # Create lookup dictionaries
-        vector_scores = {
-            product['product_id']: score
-            for product, score in vector_results
-        }
-        rule_scores = {
-            product['product_id']: score
-            for product, score in rule_results
-        }
-        
-        # Combine
-        all_product_ids = set(vector_scores.keys()) | set(rule_scores.keys())
-        combined = []
-        
-        for pid in all_product_ids:
-            v_score = vector_scores.get(pid, 0.0)
-            r_score = rule_scores.get(pid, 0.0)
-            
-            # Weighted combination
-            combined_score = alpha * v_score + (1 - alpha) * r_score
-            
-            # Find product
-            product = None
-            for p, _ in vector_results:
-                if p['product_id'] == pid:
-                    product = p
-                    break
-            if not product:
-                for p, _ in rule_results:
-                    if p['product_id'] == pid:
-                        product = p
-                        break
-            
-            if product:
-                combined.append((product, combined_score))
+        product_specs: List[Dict[str, Any]],
+        key: str
+    ) -> Tuple[List[str], np.ndarray]:
+        """Distinct lowercase values of one spec key plus a per-product index.
+        
+        Products without the key point one past the last value.
+        """
+        values: Dict[str, int] = {}
+        missing = []
+        index = []
+        for specs in product_specs:
+            if key in specs:
+                index.append(values.setdefault(str(specs[key]).lower(), len(values)))
+            else:
+                index.append(-1)
+                missing.append(len(index) - 1)
         
-        return combined
+        value_index = np.array(index, dtype=int)
+        value_index[missing] = len(values)
+        return list(values.keys()), value_index
@@ -2,8 +2,9 @@
 Analytics and Monitoring API Endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Any, Optional
 from datetime import datetime
 
 from db.database import get_db
@@ -15,21 +16,32 @@ from services.error_tracking import get_error_tracker
 router = APIRouter(prefix="/api/v1/analytics", tags=["Analytics"])
 
 
+async def _run_analytics(db: AsyncSession, method: str, **kwargs) -> Any:
+    """Run an AnalyticsService method on the request's session."""
+    return await db.run_sync(
+        lambda session: getattr(get_analytics_service(session), method)(**kwargs)
+    )
+
+
+@cache_result(ttl_seconds=300, key_prefix="dashboard", tags=("analytics",), exclude=("db",))
+def _dashboard_data(db: Session, days: int):
+    return get_analytics_service(db).generate_dashboard_data(days=days)
+
+
 @router.get("/dashboard")
-@cache_result(ttl_seconds=300, key_prefix="dashboard")
-def get_dashboard_data(
+async def get_dashboard_data(
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get comprehensive dashboard analytics
     
     - Cached for 5 minutes
     - Includes RFP processing, match accuracy, win rates, agent performance, system health
+    - Historical sections read the daily rollup tables
     """
     try:
-        analytics = get_analytics_service(db)
-        dashboard_data = analytics.generate_dashboard_data(days=days)
+        dashboard_data = await db.run_sync(_dashboard_data, days)
         return {
             "success": True,
             "data": dashboard_data
@@ -39,82 +51,76 @@ def get_dashboard_data(
 
 
 @router.get("/rfp-processing")
-def get_rfp_processing_analytics(
+async def get_rfp_processing_analytics(
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get RFP processing statistics"""
     try:
-        analytics = get_analytics_service(db)
-        stats = analytics.get_rfp_processing_stats(days=days)
+        stats = await _run_analytics(db, 'get_rfp_processing_stats', days=days)
         return {"success": True, "data": stats}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/match-accuracy")
-def get_match_accuracy_analytics(
+async def get_match_accuracy_analytics(
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get product matching accuracy metrics"""
     try:
-        analytics = get_analytics_service(db)
-        stats = analytics.get_match_accuracy_stats(days=days)
+        stats = await _run_analytics(db, 'get_match_accuracy_stats', days=days)
         return {"success": True, "data": stats}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/win-rates")
-def get_win_rate_analytics(
+async def get_win_rate_analytics(
     days: int = Query(90, ge=1, le=365),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get RFP win rate statistics"""
     try:
-        analytics = get_analytics_service(db)
-        stats = analytics.get_win_rate_stats(days=days)
+        stats = await _run_analytics(db, 'get_win_rate_stats', days=days)
         return {"success": True, "data": stats}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/agent-performance")
-def get_agent_performance_analytics(
+async def get_agent_performance_analytics(
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get agent performance metrics"""
     try:
-        analytics = get_analytics_service(db)
-        stats = analytics.get_agent_performance_stats(days=days)
+        stats = await _run_analytics(db, 'get_agent_performance_stats', days=days)
         return {"success": True, "data": stats}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/system-health")
-def get_system_health_analytics(
-    db: Session = Depends(get_db)
+async def get_system_health_analytics(
+    db: AsyncSession = Depends(get_db)
 ):
     """Get system health metrics (not cached - real-time)"""
     try:
-        analytics = get_analytics_service(db)
-        stats = analytics.get_system_health_stats()
+        stats = await _run_analytics(db, 'get_system_health_stats')
         return {"success": True, "data": stats}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/realtime")
-def get_realtime_metrics(
-    db: Session = Depends(get_db)
+async def get_realtime_metrics(
+    db: AsyncSession = Depends(get_db)
 ):
     """Get real-time monitoring metrics"""
     try:
-        analytics = get_analytics_service(db)
-        metrics = analytics.get_realtime_metrics()
+        metrics = await _run_analytics(db, 'get_realtime_metrics')
         return {"success": True, "data": metrics}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -236,23 +242,25 @@ def get_error_patterns(error_type: Optional[str] = None):
 
 
 @router.get("/export")
-def export_analytics_data(
+async def export_analytics_data(
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Export all analytics data for reporting"""
     try:
-        analytics = get_analytics_service(db)
+        def collect(session: Session):
+            analytics = get_analytics_service(session)
+            return {
+                "generated_at": datetime.utcnow().isoformat(),
+                "period_days": days,
+                "rfp_processing": analytics.get_rfp_processing_stats(days),
+                "match_accuracy": analytics.get_match_accuracy_stats(days),
+                "win_rates": analytics.get_win_rate_stats(days),
+                "agent_performance": analytics.get_agent_performance_stats(days),
+                "system_health": analytics.get_system_health_stats()
+            }
         
-        export_data = {
-            "generated_at": datetime.utcnow().isoformat(),
-            "period_days": days,
-            "rfp_processing": analytics.get_rfp_processing_stats(days),
-            "match_accuracy": analytics.get_match_accuracy_stats(days),
-            "win_rates": analytics.get_win_rate_stats(days),
-            "agent_performance": analytics.get_agent_performance_stats(days),
-            "system_health": analytics.get_system_health_stats()
-        }
+        export_data = await db.run_sync(collect)
         
         return {
             "success": True,
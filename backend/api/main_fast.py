@@ -7,7 +7,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Path, status, Request, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse, RedirectResponse
+from fastapi.responses import JSONResponse, HTMLResponse, RedirectResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 import structlog
 
@@ -29,10 +29,12 @@ from api.models import (
 )
 
 # Import production services
+from config.settings import settings
 from config.logging_config import setup_production_logging, get_api_logger, get_performance_logger
 from services.monitoring_service import get_performance_monitor, monitor_async_performance
 from services.cache_service import get_cache_service
 from services.error_tracking import get_error_tracker, capture_exception
+from services.update_broadcaster import get_update_broadcaster
 from db.optimization import create_performance_indexes
 from db.database import get_db
 
@@ -51,6 +53,42 @@ performance_monitor = None
 cache_service = None
 
 
+async def compute_realtime_metrics() -> Dict[str, Any]:
+    """Compute one realtime metrics snapshot for the dashboard stream."""
+    from db.database import AsyncSessionLocal
+    from services.analytics_service import AnalyticsService
+    
+    async with AsyncSessionLocal() as session:
+        metrics = await session.run_sync(
+            lambda sync_session: AnalyticsService(sync_session).get_realtime_metrics()
+        )
+    if orchestrator:
+        metrics['orchestrator_active_workflows'] = len(orchestrator.get_all_active_workflows())
+    return metrics
+
+
+async def publish_workflow_event(event: str, payload: Dict[str, Any]):
+    """Forward orchestrator events to WebSocket subscribers."""
+    workflow_id = payload.get('workflow_id', '')
+    if event == 'stage_started':
+        message = f"Workflow {workflow_id} entered {payload.get('stage')}"
+    elif event == 'stage_completed':
+        message = f"Workflow {workflow_id} finished {payload.get('stage')} ({payload.get('status')})"
+    else:
+        message = f"{event.replace('_', ' ').capitalize()}: {workflow_id}"
+    get_update_broadcaster().publish(event, message, payload)
+
+
+def record_stage_metrics(event: str, payload: Dict[str, Any]):
+    """Record per-stage latencies for tail-latency reporting."""
+    if event == 'stage_completed' and performance_monitor:
+        performance_monitor.record_metric(
+            "workflow_stage_duration_seconds",
+            payload['duration'],
+            tags={'stage': payload['stage'], 'status': payload['status']}
+        )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize and cleanup resources."""
@@ -77,7 +115,7 @@ async def lifespan(app: FastAPI):
     performance_monitor = get_performance_monitor()
     
     # Initialize caching
-    cache_service = get_cache_service(max_size=1000, enable_redis=False)
+    cache_service = get_cache_service(max_size=1000, enable_redis=settings.cache_redis_enabled)
     
     # Create database indexes for optimization
     try:
@@ -112,6 +150,12 @@ async def lifespan(app: FastAPI):
     )
     await orchestrator.initialize()
     
+    # Push workflow events to dashboards as they happen
+    broadcaster = get_update_broadcaster()
+    broadcaster.metrics_provider = compute_realtime_metrics
+    orchestrator.add_event_listener(publish_workflow_event)
+    orchestrator.add_event_listener(record_stage_metrics)
+    
     # Record system startup metric
     if performance_monitor:
         performance_monitor.increment_counter("system_startup")
@@ -137,6 +181,8 @@ async def lifespan(app: FastAPI):
         if not task.done():
             task.cancel()
     
+    await get_update_broadcaster().stop()
+    
     comm_manager = None
     orchestrator = None
 
@@ -170,7 +216,14 @@ async def monitor_requests(request: Request, call_next):
         response = await call_next(request)
         
         if performance_monitor:
-            duration = performance_monitor.stop_timer(timer_id, "api_request_duration")
+            duration = performance_monitor.stop_timer(timer_id)
+            # Route templates (not raw paths) keep the tag sets bounded
+            route = request.scope.get("route")
+            performance_monitor.record_metric("api_request_duration", duration, tags={
+                'method': request.method,
+                'route': getattr(route, 'path', 'unmatched'),
+                'status': f"{response.status_code // 100}xx"
+            })
             performance_monitor.record_metric("api_response_time", duration)
             performance_monitor.increment_counter(f"api_status_{response.status_code}")
         
@@ -207,6 +260,17 @@ app.include_router(products_router, prefix="/api/products", tags=["Products"])
 app.include_router(agents_router, prefix="/api/agents", tags=["Agents"])
 app.include_router(challenge_router)
 
+
+# Registered before the SPA catch-all route so it is not shadowed
+@app.get("/metrics", response_class=PlainTextResponse, tags=["System"])
+async def prometheus_metrics():
+    """Expose counters and latency summaries in Prometheus text format."""
+    monitor = performance_monitor or get_performance_monitor()
+    return PlainTextResponse(
+        monitor.render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 # Check if React build exists, otherwise use static dashboard
 import os
 REACT_BUILD_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend_build")
@@ -244,33 +308,14 @@ else:
 # WebSocket endpoint for real-time updates
 @app.websocket("/ws/updates")
 async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time system updates"""
+    """WebSocket endpoint for real-time system updates.
+    
+    All clients share one broadcaster: metrics are computed once per tick
+    and sent as a snapshot on connect followed by deltas, and workflow
+    events are pushed as soon as they happen.
+    """
     await websocket.accept()
-    try:
-        while True:
-            # Send periodic updates (every 5 seconds)
-            await asyncio.sleep(5)
-            
-            # Get real-time metrics
-            try:
-                from services.analytics_service import get_analytics_service
-                analytics = get_analytics_service()
-                realtime_data = await analytics.get_realtime_metrics()
-                
-                await websocket.send_json({
-                    "type": "metrics_update",
-                    "data": realtime_data,
-                    "timestamp": datetime.now().isoformat()
-                })
-            except Exception as e:
-                logger.error(f"Error sending WebSocket update: {e}")
-    except Exception as e:
-        logger.info(f"WebSocket connection closed: {e}")
-    finally:
-        try:
-            await websocket.close()
-        except:
-            pass
+    await get_update_broadcaster().serve(websocket)
 
 
 # Exception handlers
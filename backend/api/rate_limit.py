@@ -1,26 +1,609 @@
-"""Rate limiting middleware for API."""
+"""Rate limiting middleware for API.
+
+Limits are decided by an algorithm (GCRA or sliding window) applied to
+per-key state held in a pluggable store:
+
+- MemoryStore: per-process dict; expired keys are reclaimed by a timing
+  wheel, a bucket at a time, instead of periodic full scans
+- SharedMemoryStore: fixed-size hash table in a memory-mapped file shared
+  by all workers on a host; an update locks only its key's probe range
+- RedisStore: state updated atomically by server-side Lua scripts, shared
+  across hosts; its methods are coroutines on redis.asyncio so a check
+  never blocks the event loop
+
+Responses carry the standard RateLimit-* headers alongside the legacy
+X-RateLimit-* ones.
+"""
+import hashlib
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
 import time
-from typing import Dict, Tuple
-from collections import defaultdict
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import Message, Receive, Scope, Send
 import structlog
 
+from config.settings import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 logger = structlog.get_logger()
 
+# Per-key algorithm state: three floats whose meaning depends on the algorithm
+State = Tuple[float, float, float]
+
+EXEMPT_PATHS = ("/health", "/", "/docs", "/redoc", "/openapi.json")
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of one rate limit check."""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # Seconds until the full quota is available again
+    retry_after: float = 0.0  # Seconds until a denied request would be allowed
+
+
+class GCRA:
+    """Generic cell rate algorithm (a token bucket kept as one timestamp).
+    
+    State is the theoretical arrival time (TAT) of the next request;
+    ``burst`` requests may arrive back to back, after which requests are
+    spaced ``period / calls`` apart.
+    """
+    
+    name = "gcra"
+    
+    LUA = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local burst = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - burst * interval
+if allow_at - now > 1e-6 then
+    return {0, 0, string.format('%.6f', tat - now), string.format('%.6f', allow_at - now)}
+end
+redis.call('SET', KEYS[1], string.format('%.6f', new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, math.max(0, math.floor((now - allow_at) / interval + 1e-6)), string.format('%.6f', new_tat - now), '0'}
+"""
+    
+    def __init__(self, calls: int, period: float, burst: Optional[int] = None):
+        """
+        Args:
+            calls: Requests allowed per period
+            period: Period in seconds
+            burst: Requests allowed back to back (defaults to calls)
+        """
+        self.calls = calls
+        self.period = period
+        self.burst = burst or calls
+        self.limit = self.burst
+        self.interval = period / calls
+    
+    def apply(self, state: Optional[State], now: float) -> Tuple[RateLimitDecision, State, float]:
+        """Decide one request.
+        
+        Returns:
+            Decision, new state and the time after which the state can be dropped
+        """
+        tat = max(state[0], now) if state else now
+        new_tat = tat + self.interval
+        allow_at = new_tat - self.burst * self.interval
+        # The microsecond slack absorbs float drift from summing intervals
+        if allow_at - now > 1e-6:
+            return RateLimitDecision(False, self.burst, 0, tat - now, allow_at - now), state, tat
+        
+        remaining = max(0, math.floor((now - allow_at) / self.interval + 1e-6))
+        return RateLimitDecision(True, self.burst, remaining, new_tat - now), (new_tat, 0.0, 0.0), new_tat
+    
+    def script_args(self, now: float) -> List[float]:
+        return [now, self.interval, self.burst]
+    
+    def policy(self) -> str:
+        """RateLimit-Policy header value."""
+        policy = f"{self.calls};w={self.period:g}"
+        return policy if self.burst == self.calls else f"{policy};burst={self.burst}"
+
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware using token bucket algorithm."""
+class SlidingWindow:
+    """Sliding window counter.
+    
+    Counts requests in fixed windows and estimates the rolling count as
+    the current window's count plus the previous window's count weighted
+    by how much of it still overlaps the rolling window.
+    State is (window index, current count, previous count).
+    """
+    
+    name = "sliding_window"
+    
+    LUA = """
+local now = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local calls = tonumber(ARGV[3])
+local window = math.floor(now / period)
+local start = window * period
+local saved = redis.call('HMGET', KEYS[1], 'w', 'cur', 'prev')
+local cur, prev = 0, 0
+local saved_window = tonumber(saved[1])
+if saved_window == window then
+    cur = tonumber(saved[2])
+    prev = tonumber(saved[3])
+elseif saved_window == window - 1 then
+    prev = tonumber(saved[2])
+end
+local weight = 1 - (now - start) / period
+local estimate = prev * weight + cur
+if estimate + 1 > calls then
+    local wait
+    if cur + 1 <= calls then
+        wait = start + period * (1 - (calls - 1 - cur) / prev) - now
+    else
+        wait = start + period * (2 - (calls - 1) / cur) - now
+    end
+    return {0, 0, string.format('%.6f', start + 2 * period - now), string.format('%.6f', wait)}
+end
+cur = cur + 1
+redis.call('HSET', KEYS[1], 'w', window, 'cur', cur, 'prev', prev)
+redis.call('PEXPIRE', KEYS[1], math.ceil((start + 2 * period - now) * 1000))
+return {1, math.floor(calls - estimate - 1 + 1e-9), string.format('%.6f', start + 2 * period - now), '0'}
+"""
+    
+    def __init__(self, calls: int, period: float):
+        """
+        Args:
+            calls: Requests allowed per rolling period
+            period: Period in seconds
+        """
+        self.calls = calls
+        self.period = period
+        self.limit = calls
+    
+    def apply(self, state: Optional[State], now: float) -> Tuple[RateLimitDecision, State, float]:
+        """Decide one request.
+        
+        Returns:
+            Decision, new state and the time after which the state can be dropped
+        """
+        window = math.floor(now / self.period)
+        start = window * self.period
+        current = previous = 0.0
+        if state and state[0] == window:
+            current, previous = state[1], state[2]
+        elif state and state[0] == window - 1:
+            previous = state[1]
+        
+        estimate = previous * (1 - (now - start) / self.period) + current
+        expires_at = start + 2 * self.period
+        if estimate + 1 > self.calls:
+            if current + 1 <= self.calls:
+                # Wait for enough of the previous window to slide out
+                wait = start + self.period * (1 - (self.calls - 1 - current) / previous) - now
+            else:
+                # Wait until this window, as the next one's previous, has slid out far enough
+                wait = start + self.period * (2 - (self.calls - 1) / current) - now
+            return RateLimitDecision(False, self.calls, 0, expires_at - now, wait), state, expires_at
+        
+        remaining = math.floor(self.calls - estimate - 1 + 1e-9)
+        decision = RateLimitDecision(True, self.calls, remaining, expires_at - now)
+        return decision, (float(window), current + 1, previous), expires_at
+    
+    def script_args(self, now: float) -> List[float]:
+        return [now, self.period, self.calls]
+    
+    def policy(self) -> str:
+        """RateLimit-Policy header value."""
+        return f"{self.calls};w={self.period:g}"
+
+
+ALGORITHMS = {GCRA.name: GCRA, SlidingWindow.name: SlidingWindow}
+
+
+class TimingWheel:
+    """Hashed timing wheel of key deadlines.
+    
+    Each tick's bucket holds the keys due in that tick (or a later lap of
+    the wheel). Advancing the wheel visits only the buckets for ticks that
+    have passed, so expiry work is spread over requests instead of being
+    done in one full scan.
+    """
+    
+    def __init__(self, tick: float = 1.0, size: int = 512):
+        """
+        Args:
+            tick: Bucket width in seconds
+            size: Number of buckets
+        """
+        self.tick = tick
+        self.size = size
+        self._buckets: List[set] = [set() for _ in range(size)]
+        self._deadlines: Dict[str, float] = {}
+        self._bucket_of: Dict[str, int] = {}
+        self._cursor: Optional[int] = None  # Next tick to process
+    
+    def __len__(self) -> int:
+        return len(self._deadlines)
+    
+    def schedule(self, key: str, deadline: float):
+        """Set (or move) a key's deadline."""
+        self._deadlines[key] = deadline
+        index = int(deadline // self.tick) % self.size
+        old = self._bucket_of.get(key)
+        if old != index:
+            if old is not None:
+                self._buckets[old].discard(key)
+            self._buckets[index].add(key)
+            self._bucket_of[key] = index
+    
+    def cancel(self, key: str):
+        """Forget a key."""
+        index = self._bucket_of.pop(key, None)
+        if index is not None:
+            self._buckets[index].discard(key)
+            del self._deadlines[key]
+    
+    def advance(self, now: float) -> List[str]:
+        """Move the wheel to ``now``.
+        
+        Returns:
+            Keys whose deadline has passed (they are removed from the wheel)
+        """
+        current = int(now // self.tick)
+        if self._cursor is None:
+            self._cursor = current
+        if current <= self._cursor:
+            return []
+        
+        expired = []
+        # A jump longer than one lap visits every bucket once
+        for tick in range(max(self._cursor, current - self.size), current):
+            bucket = self._buckets[tick % self.size]
+            due = [key for key in bucket if self._deadlines[key] <= now]
+            for key in due:
+                bucket.discard(key)
+                del self._deadlines[key]
+                del self._bucket_of[key]
+            expired.extend(due)
+        self._cursor = current
+        return expired
+
+
+class MemoryStore:
+    """Per-process store.
+    
+    A check does no I/O and never awaits, so on the event loop it is
+    atomic without locks. Limits are per worker process.
+    """
+    
+    is_async = False
+    
+    def __init__(self, tick: float = 1.0, wheel_size: int = 512):
+        """
+        Args:
+            tick: Expiry granularity in seconds
+            wheel_size: Timing wheel buckets
+        """
+        self._state: Dict[str, State] = {}
+        self._wheel = TimingWheel(tick, wheel_size)
+        self.stats = {'checks': 0, 'expired': 0}
+    
+    def __len__(self) -> int:
+        return len(self._state)
+    
+    def hit(self, key: str, algorithm, now: float) -> RateLimitDecision:
+        """Apply one request for ``key`` and return the decision."""
+        self.stats['checks'] += 1
+        expired = self._wheel.advance(now)
+        if expired:
+            for stale in expired:
+                self._state.pop(stale, None)
+            self.stats['expired'] += len(expired)
+        
+        decision, state, expires_at = algorithm.apply(self._state.get(key), now)
+        if decision.allowed:
+            self._state[key] = state
+            self._wheel.schedule(key, expires_at)
+        return decision
+    
+    def reset(self, key: Optional[str] = None):
+        """Forget one key, or all keys."""
+        if key is None:
+            self._state.clear()
+            self._wheel = TimingWheel(self._wheel.tick, self._wheel.size)
+        else:
+            self._state.pop(key, None)
+            self._wheel.cancel(key)
+
+
+class SharedMemoryStore:
+    """Store shared by all processes on a host through a memory-mapped table.
+    
+    Keys are hashed into an open-addressing table of fixed-size slots; a
+    key lives within ``max_probe`` slots of its home slot. A check takes a
+    byte-range lock on that probe range only, so unrelated keys update in
+    parallel. Slots whose state has expired are reused in place, which
+    replaces cleanup scans. When a probe range has no free slot the
+    request is allowed and counted in ``stats['overflow']``.
+    """
+    
+    is_async = False
+    MAGIC = b'RFPRLIM1'
+    HEADER = struct.Struct('<8sQ')  # magic, slots
+    SLOT = struct.Struct('<Qdddd')  # key hash, state (3 floats), expires at
+    
+    def __init__(self, path: Optional[str] = None, slots: int = 65536, max_probe: int = 16):
+        """Open or create the table.
+        
+        Args:
+            path: Table file (defaults to /dev/shm, else the temp directory)
+            slots: Table size for a new file
+            max_probe: Slots searched per key
+        """
+        if fcntl is None:
+            raise RuntimeError("SharedMemoryStore needs POSIX file locks (fcntl)")
+        
+        if path is None:
+            directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+            path = os.path.join(directory, "rfp_rate_limit.table")
+        self.path = path
+        self.max_probe = max_probe
+        self.stats = {'checks': 0, 'overflow': 0}
+        self._lock = threading.Lock()  # fcntl locks do not exclude threads of one process
+        
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, self.HEADER.size, 0)
+        try:
+            header = os.pread(self._fd, self.HEADER.size, 0)
+            if len(header) == self.HEADER.size and header[:8] == self.MAGIC:
+                slots = self.HEADER.unpack(header)[1]
+            else:
+                # Probe ranges run past the last home slot instead of wrapping
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, self.HEADER.size + (slots + max_probe) * self.SLOT.size)
+                os.pwrite(self._fd, self.HEADER.pack(self.MAGIC, slots), 0)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, self.HEADER.size, 0)
+        
+        self.slots = slots
+        self._map = mmap.mmap(self._fd, 0)
+    
+    @staticmethod
+    def _hash(key: str) -> int:
+        value = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little')
+        return value or 1  # 0 marks an empty slot
+    
+    def hit(self, key: str, algorithm, now: float) -> RateLimitDecision:
+        """Apply one request for ``key`` and return the decision."""
+        key_hash = self._hash(key)
+        first = self.HEADER.size + (key_hash % self.slots) * self.SLOT.size
+        span = self.max_probe * self.SLOT.size
+        fd = self._fd
+        
+        with self._lock:
+            self.stats['checks'] += 1
+            fcntl.lockf(fd, fcntl.LOCK_EX, span, first)
+            try:
+                target = None
+                state = None
+                for offset in range(first, first + span, self.SLOT.size):
+                    slot_hash, a, b, c, expires_at = self.SLOT.unpack_from(self._map, offset)
+                    if slot_hash == key_hash:
+                        target = offset
+                        state = (a, b, c) if expires_at > now else None
+                        break
+                    if target is None and (slot_hash == 0 or expires_at <= now):
+                        target = offset
+                
+                if target is None:
+                    self.stats['overflow'] += 1
+                    return RateLimitDecision(True, algorithm.limit, 0, 0.0)
+                
+                decision, state, expires_at = algorithm.apply(state, now)
+                if decision.allowed:
+                    self.SLOT.pack_into(self._map, target, key_hash, *state, expires_at)
+                return decision
+            finally:
+                fcntl.lockf(fd, fcntl.LOCK_UN, span, first)
+    
+    def reset(self, key: Optional[str] = None):
+        """Forget one key, or all keys."""
+        with self._lock:
+            if key is None:
+                start = self.HEADER.size
+                fcntl.lockf(self._fd, fcntl.LOCK_EX, 0, start)
+                try:
+                    self._map[start:] = bytes(len(self._map) - start)
+                finally:
+                    fcntl.lockf(self._fd, fcntl.LOCK_UN, 0, start)
+                return
+            key_hash = self._hash(key)
+            first = self.HEADER.size + (key_hash % self.slots) * self.SLOT.size
+            for offset in range(first, first + self.max_probe * self.SLOT.size, self.SLOT.size):
+                if self.SLOT.unpack_from(self._map, offset)[0] == key_hash:
+                    self.SLOT.pack_into(self._map, offset, 0, 0.0, 0.0, 0.0, 0.0)
+    
+    def close(self):
+        """Unmap the table."""
+        if self._map is not None:
+            self._map.close()
+            os.close(self._fd)
+            self._map = None
+
+
+class RedisStore:
+    """Store shared across hosts, updated by Lua scripts run atomically in Redis.
+    
+    Uses redis.asyncio, so ``hit`` and ``reset`` are coroutines. Failures to
+    reach Redis allow the request rather than taking the API down.
+    """
+    
+    is_async = True
+    
+    def __init__(self, redis_client=None, redis_url: Optional[str] = None, prefix: str = "ratelimit:"):
+        """
+        Args:
+            redis_client: Pre-built asyncio Redis-protocol client
+            redis_url: Redis URL (defaults to settings.redis_url)
+            prefix: Key prefix
+        """
+        if redis_client is None:
+            from redis import asyncio as aioredis
+            redis_client = aioredis.Redis.from_url(redis_url or settings.redis_url, decode_responses=True)
+        self.redis_client = redis_client
+        self.prefix = prefix
+        self._scripts = {}
+        self.stats = {'checks': 0, 'errors': 0}
+    
+    async def hit(self, key: str, algorithm, now: float) -> RateLimitDecision:
+        """Apply one request for ``key`` and return the decision."""
+        self.stats['checks'] += 1
+        limit = algorithm.limit
+        script = self._scripts.get(algorithm.name)
+        if script is None:
+            script = self._scripts[algorithm.name] = self.redis_client.register_script(algorithm.LUA)
+        
+        try:
+            allowed, remaining, reset_after, retry_after = await script(
+                keys=[f"{self.prefix}{algorithm.name}:{key}"], args=algorithm.script_args(now)
+            )
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.warning("Rate limit store unavailable", error=str(e))
+            return RateLimitDecision(True, limit, limit, 0.0)
+        
+        return RateLimitDecision(
+            bool(int(allowed)), limit, int(remaining), float(reset_after), float(retry_after)
+        )
+    
+    async def reset(self, key: Optional[str] = None):
+        """Forget one key, or all keys."""
+        if key is not None:
+            await self.redis_client.delete(*(f"{self.prefix}{name}:{key}" for name in ALGORITHMS))
+            return
+        keys = [key async for key in self.redis_client.scan_iter(match=f"{self.prefix}*")]
+        if keys:
+            await self.redis_client.delete(*keys)
+    
+    async def close(self):
+        """Close the client's connections."""
+        await self.redis_client.aclose()
+
+
+def create_store(backend: str = "memory", **kwargs):
+    """Build a store by name ("memory", "shared" or "redis")."""
+    if backend == "memory":
+        return MemoryStore(**kwargs)
+    if backend == "shared":
+        return SharedMemoryStore(**kwargs)
+    if backend == "redis":
+        return RedisStore(**kwargs)
+    raise ValueError(f"Unknown rate limit store: {backend}")
+
+
+_store = None
+
+
+def get_rate_limit_store():
+    """Get the process-wide store selected by settings.rate_limit_store."""
+    global _store
+    if _store is None:
+        _store = create_store(settings.rate_limit_store)
+    return _store
+
+
+class RateLimiter:
+    """An algorithm with its limits, bound to a store and key namespace."""
+    
+    def __init__(
+        self,
+        calls: int,
+        period: float,
+        algorithm: str = "gcra",
+        store=None,
+        namespace: str = "global"
+    ):
+        """
+        Args:
+            calls: Number of calls allowed per period
+            period: Time period in seconds
+            algorithm: "gcra" or "sliding_window"
+            store: Store instance (defaults to the process-wide store)
+            namespace: Prefix that keeps this limiter's keys apart from others
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown rate limit algorithm: {algorithm}")
+        self.algorithm = ALGORITHMS[algorithm](calls, period)
+        self.store = store if store is not None else get_rate_limit_store()
+        self.namespace = namespace
+        self.policy = self.algorithm.policy()
+    
+    def check(self, key: str, now: Optional[float] = None) -> RateLimitDecision:
+        """Count one request for ``key`` against a synchronous store."""
+        if self.store.is_async:
+            raise TypeError(f"{type(self.store).__name__} is asynchronous; use acheck()")
+        return self.store.hit(
+            f"{self.namespace}:{key}", self.algorithm, time.time() if now is None else now
+        )
+    
+    async def acheck(self, key: str, now: Optional[float] = None) -> RateLimitDecision:
+        """Count one request for ``key`` against any store."""
+        if not self.store.is_async:
+            return self.check(key, now)
+        return await self.store.hit(
+            f"{self.namespace}:{key}", self.algorithm, time.time() if now is None else now
+        )
+    
+    def headers(self, decision: RateLimitDecision, now: Optional[float] = None) -> Dict[str, str]:
+        """Standard RateLimit-* headers plus the legacy X-RateLimit-* ones."""
+        now = time.time() if now is None else now
+        reset = str(math.ceil(decision.reset_after))
+        headers = {
+            "RateLimit-Limit": str(decision.limit),
+            "RateLimit-Remaining": str(decision.remaining),
+            "RateLimit-Reset": reset,
+            "RateLimit-Policy": self.policy,
+            "X-RateLimit-Limit": str(decision.limit),
+            "X-RateLimit-Remaining": str(decision.remaining),
+            "X-RateLimit-Reset": str(int(now + decision.reset_after)),
+        }
+        if not decision.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(decision.retry_after)))
+        return headers
+
+
+def _client_host(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimitMiddleware:
+    """Rate limiting middleware over a shared rate limit store.
+    
+    Written as plain ASGI middleware: BaseHTTPMiddleware's per-request
+    task and stream wrapping cost far more than the limit check itself.
+    """
     
     def __init__(
         self,
         app,
         calls: int = 100,
         period: int = 60,
-        identifier: str = "ip"
+        identifier: str = "ip",
+        algorithm: str = "gcra",
+        store=None,
+        exempt_paths: Sequence[str] = EXEMPT_PATHS
     ):
         """
         Initialize rate limiter.
@@ -30,134 +613,98 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             calls: Number of calls allowed per period
             period: Time period in seconds
             identifier: How to identify clients ("ip" or "user")
+            algorithm: "gcra" or "sliding_window"
+            store: Store instance (defaults to the process-wide store)
+            exempt_paths: Paths that are never limited
         """
-        super().__init__(app)
+        self.app = app
         self.calls = calls
         self.period = period
         self.identifier = identifier
-        self.clients: Dict[str, Tuple[int, float]] = defaultdict(lambda: (calls, time.time()))
-        self.cleanup_interval = 300  # Cleanup every 5 minutes
-        self.last_cleanup = time.time()
+        self.exempt_paths = frozenset(exempt_paths)
+        self.limiter = RateLimiter(calls, period, algorithm=algorithm, store=store, namespace="global")
     
     def _get_client_id(self, request: Request) -> str:
         """Get client identifier from request."""
         if self.identifier == "ip":
-            return request.client.host if request.client else "unknown"
+            return _client_host(request)
         elif self.identifier == "user":
             # Try to get user from authorization header
             auth_header = request.headers.get("authorization", "")
             if auth_header:
                 return auth_header
-            return request.client.host if request.client else "unknown"
+            return _client_host(request)
         return "unknown"
     
-    def _cleanup_old_entries(self):
-        """Remove old entries to prevent memory leak."""
-        current_time = time.time()
-        if current_time - self.last_cleanup > self.cleanup_interval:
-            expired_keys = [
-                key for key, (_, timestamp) in self.clients.items()
-                if current_time - timestamp > self.period * 2
-            ]
-            for key in expired_keys:
-                del self.clients[key]
-            self.last_cleanup = current_time
-            logger.debug("Rate limit cleanup", removed=len(expired_keys))
-    
-    async def dispatch(self, request: Request, call_next) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Process request with rate limiting."""
         # Skip rate limiting for health checks
-        if request.url.path in ["/health", "/", "/docs", "/redoc", "/openapi.json"]:
-            return await call_next(request)
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
         
+        request = Request(scope)
         client_id = self._get_client_id(request)
-        current_time = time.time()
-        
-        # Get or create client bucket
-        tokens, last_update = self.clients[client_id]
-        
-        # Refill tokens based on time elapsed
-        time_elapsed = current_time - last_update
-        tokens_to_add = (time_elapsed / self.period) * self.calls
-        tokens = min(self.calls, tokens + tokens_to_add)
-        
-        # Check if request can be processed
-        if tokens >= 1:
-            tokens -= 1
-            self.clients[client_id] = (tokens, current_time)
-            
-            # Add rate limit headers
-            response = await call_next(request)
-            response.headers["X-RateLimit-Limit"] = str(self.calls)
-            response.headers["X-RateLimit-Remaining"] = str(int(tokens))
-            response.headers["X-RateLimit-Reset"] = str(int(current_time + self.period))
-            
-            # Periodic cleanup
-            self._cleanup_old_entries()
-            
-            return response
-        else:
-            # Rate limit exceeded
-            retry_after = int(self.period - time_elapsed)
+        now = time.time()
+        decision = await self.limiter.acheck(client_id, now)
+        headers = self.limiter.headers(decision, now)
+        
+        if not decision.allowed:
             logger.warning(
                 "Rate limit exceeded",
                 client_id=client_id,
-                path=request.url.path,
-                retry_after=retry_after
+                path=scope["path"],
+                retry_after=headers["Retry-After"]
             )
-            
-            raise HTTPException(
+            response = JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Rate limit exceeded. Try again in {retry_after} seconds.",
-                headers={
-                    "Retry-After": str(retry_after),
-                    "X-RateLimit-Limit": str(self.calls),
-                    "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(int(current_time + retry_after))
-                }
+                content={"detail": f"Rate limit exceeded. Try again in {headers['Retry-After']} seconds."},
+                headers=headers
             )
+            await response(scope, receive, send)
+            return
+        
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                # An endpoint limiter's headers describe the tighter limit; keep them
+                for name, value in headers.items():
+                    response_headers.setdefault(name, value)
+            await send(message)
+        
+        await self.app(scope, receive, send_with_headers)
 
 
 class EndpointRateLimiter:
     """Per-endpoint rate limiter."""
     
-    def __init__(self, calls: int = 10, period: int = 60):
+    def __init__(self, calls: int = 10, period: int = 60, algorithm: str = "gcra", store=None):
         """
         Initialize endpoint rate limiter.
         
         Args:
             calls: Number of calls allowed per period
             period: Time period in seconds
+            algorithm: "gcra" or "sliding_window"
+            store: Store instance (defaults to the process-wide store)
         """
         self.calls = calls
         self.period = period
-        self.clients: Dict[str, Dict[str, Tuple[int, float]]] = defaultdict(
-            lambda: defaultdict(lambda: (calls, time.time()))
+        self.limiter = RateLimiter(
+            calls, period, algorithm=algorithm, store=store, namespace=f"endpoint:{calls}/{period}"
         )
     
     async def __call__(self, request: Request) -> bool:
         """Check rate limit for request."""
-        client_id = request.client.host if request.client else "unknown"
         endpoint = f"{request.method}:{request.url.path}"
-        current_time = time.time()
-        
-        # Get or create client bucket for this endpoint
-        tokens, last_update = self.clients[client_id][endpoint]
-        
-        # Refill tokens based on time elapsed
-        time_elapsed = current_time - last_update
-        tokens_to_add = (time_elapsed / self.period) * self.calls
-        tokens = min(self.calls, tokens + tokens_to_add)
-        
-        # Check if request can be processed
-        if tokens >= 1:
-            tokens -= 1
-            self.clients[client_id][endpoint] = (tokens, current_time)
+        now = time.time()
+        decision = await self.limiter.acheck(f"{_client_host(request)}:{endpoint}", now)
+        if decision.allowed:
             return True
-        else:
-            retry_after = int(self.period - time_elapsed)
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Rate limit exceeded for this endpoint. Try again in {retry_after} seconds.",
-                headers={"Retry-After": str(retry_after)}
-            )
+        
+        headers = self.limiter.headers(decision, now)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Rate limit exceeded for this endpoint. Try again in {headers['Retry-After']} seconds.",
+            headers=headers
+        )
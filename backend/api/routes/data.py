@@ -14,7 +14,8 @@ async def get_pricing(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     product_code: Optional[str] = None,
-    brand: Optional[str] = None
+    brand: Optional[str] = None,
+    cursor: Optional[str] = None
 ):
     """Get pricing records with pagination and filtering.
     
@@ -23,33 +24,37 @@ async def get_pricing(
         limit: Maximum number of records to return
         product_code: Filter by product code
         brand: Filter by brand
+        cursor: next_cursor from the previous page; skip is applied after it
         
     Returns:
         List of pricing records
     """
     data_service = get_data_service()
     
-    pricing = await data_service.get_pricing(
-        skip=skip,
-        limit=limit,
-        product_code=product_code,
-        brand=brand
-    )
+    try:
+        page = await data_service.get_pricing_page(
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            product_code=product_code,
+            brand=brand
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # Get total count
-    all_pricing = await data_service.get_pricing(
+    total = await data_service.count_pricing(
         product_code=product_code,
-        brand=brand,
-        limit=100000
+        brand=brand
     )
-    total = len(all_pricing)
     
     return {
         "data": {
-            "pricing": pricing,
+            "pricing": page["items"],
             "total": total,
             "skip": skip,
             "limit": limit,
+            "next_cursor": page["next_cursor"],
         }
     }
 
@@ -1,11 +1,12 @@
 """OEM Products API endpoints - Optimized for 693 database products."""
 from typing import Optional, List
 from fastapi import APIRouter, Query, HTTPException
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.database import AsyncSessionLocal
 from db.product_models import OEMProduct
+from db.product_search import detect_search_backend, apply_product_search
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -85,7 +86,8 @@ async def get_oem_products(
             query = query.where(OEMProduct.category.ilike(f"%{category}%"))
         
         if search:
-            query = query.where(OEMProduct.product_name.ilike(f"%{search}%"))
+            backend = await detect_search_backend(db)
+            query = apply_product_search(query, backend, search, columns=['product_name'])
         
         if voltage:
             query = query.where(OEMProduct.voltage_rating.ilike(f"%{voltage}%"))
@@ -242,15 +244,12 @@ async def search_products(
     - **limit**: Maximum number of results
     """
     async with AsyncSessionLocal() as db:
-        # Search in multiple fields
-        query = select(OEMProduct).where(
-            OEMProduct.is_active == True,
-            or_(
-                OEMProduct.product_name.ilike(f"%{q}%"),
-                OEMProduct.category.ilike(f"%{q}%"),
-                OEMProduct.manufacturer.ilike(f"%{q}%"),
-                OEMProduct.model_number.ilike(f"%{q}%")
-            )
+        # Search in multiple fields, best matches first when indexed
+        backend = await detect_search_backend(db)
+        query = apply_product_search(
+            select(OEMProduct).where(OEMProduct.is_active == True),
+            backend,
+            q
         ).limit(limit)
         
         result = await db.execute(query)
@@ -18,7 +18,8 @@ async def get_products(
     limit: int = Query(50, ge=1, le=100),
     category: Optional[str] = None,
     brand: Optional[str] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    cursor: Optional[str] = None
 ):
     """Get products with pagination and filtering.
     
@@ -28,6 +29,7 @@ async def get_products(
         category: Filter by category
         brand: Filter by brand
         search: Search query
+        cursor: next_cursor from the previous page; skip is applied after it
         
     Returns:
         List of products with pagination info
@@ -35,29 +37,32 @@ async def get_products(
     data_service = get_data_service()
     
     # Get products from data service
-    products = await data_service.get_products(
-        skip=skip,
-        limit=limit,
-        category=category,
-        brand=brand,
-        search=search
-    )
+    try:
+        page = await data_service.get_products_page(
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            category=category,
+            brand=brand,
+            search=search
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # Get total count (without pagination)
-    all_products = await data_service.get_products(
+    total = await data_service.count_products(
         category=category,
         brand=brand,
-        search=search,
-        limit=100000
+        search=search
     )
-    total = len(all_products)
     
     return {
         "data": {
-            "products": products,
+            "products": page["items"],
             "total": total,
             "skip": skip,
             "limit": limit,
+            "next_cursor": page["next_cursor"],
         }
     }
 
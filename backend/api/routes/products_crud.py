@@ -10,18 +10,68 @@ Endpoints:
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete, update
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 import structlog
 
 from db.database import get_db
 from db.models import Product
+from services.cache_service import async_cache_result, get_cache_service
 
 router = APIRouter(prefix="/api/products", tags=["products-crud"])
 logger = structlog.get_logger()
 
 
+# Tags of cached catalog reads; the write paths below invalidate them
+CATALOG_CACHE_TAGS = ("products", "pricing")
+
+
+def _invalidate_product_cache(pricing: bool = False, analytics: bool = False):
+    """Evict cached results that depend on products (and optionally pricing).
+    
+    Args:
+        pricing: Prices changed
+        analytics: The product count shown on the dashboard changed
+    """
+    tags = ["products"]
+    if pricing:
+        tags.append("pricing")
+    if analytics:
+        tags.append("analytics")
+    get_cache_service().invalidate_tags(*tags)
+
+
+@async_cache_result(ttl_seconds=300, key_prefix="catalog", tags=CATALOG_CACHE_TAGS, exclude=("db",))
+async def load_catalog_products(db: AsyncSession, limit: int = 100) -> List[Dict[str, Any]]:
+    """Catalog products with pricing, cached until a product write.
+    
+    Args:
+        db: Database session
+        limit: Maximum number of products
+        
+    Returns:
+        Product dicts in primary key order
+    """
+    result = await db.execute(select(Product).order_by(Product.id).limit(limit))
+    return [
+        {
+            "id": product.id,
+            "product_code": product.product_code,
+            "product_name": product.product_name,
+            "brand": product.brand,
+            "category": product.category,
+            "specifications": product.specifications,
+            "mrp": product.mrp,
+            "selling_price": product.selling_price,
+            "certifications": product.certifications,
+            "standard": product.standard,
+            "image_url": product.image_url,
+        }
+        for product in result.scalars().all()
+    ]
+
+
 class ProductCreate(BaseModel):
     """Product creation schema."""
     manufacturer: str = Field(..., description="Manufacturer name")
@@ -160,6 +210,8 @@ async def add_product(
         await db.commit()
         await db.refresh(new_product)
         
+        _invalidate_product_cache(pricing=True, analytics=True)
+        
         logger.info("Product added successfully", product_id=new_product.id)
         
         return {
@@ -249,6 +301,8 @@ async def update_product(
         await db.commit()
         await db.refresh(product)
         
+        _invalidate_product_cache(pricing='list_price' in product_update.model_fields_set)
+        
         logger.info("Product updated successfully", product_id=product_id, fields=list(update_data.keys()))
         
         return {
@@ -306,6 +360,8 @@ async def delete_product(
         await db.delete(product)
         await db.commit()
         
+        _invalidate_product_cache(pricing=True, analytics=True)
+        
         logger.info("Product deleted successfully", product_id=product_id)
         
         return {
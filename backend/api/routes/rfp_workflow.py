@@ -2,7 +2,7 @@
 RFP Processing Workflow API Routes
 Handles progress tracking, product matching, response generation, and exports
 """
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Header, Query
 from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -15,7 +15,8 @@ import io
 import csv
 
 from db.database import get_db
-from db.models import RFP, Product, RFPStatus
+from db.models import RFP, RFPStatus
+from api.routes.products_crud import load_catalog_products
 from rfp_parsing.rfp_pipeline import RFPPipeline
 from matching.spec_matcher import SpecificationMatcher
 from services.pdf_generator import PDFResponseGenerator
@@ -24,21 +25,65 @@ from services.progress_tracker import ProgressTracker
 logger = structlog.get_logger()
 router = APIRouter()
 
-# In-memory progress tracking (in production, use Redis or database)
-processing_progress = {}
-
 
 @router.get("/progress/{rfp_id}")
 async def get_processing_progress(rfp_id: int):
-    """Get real-time processing progress for an RFP."""
-    progress = processing_progress.get(rfp_id, {
-        "status": "not_started",
-        "progress": 0,
-        "current_stage": "Initializing",
-        "agents_status": {},
-        "estimated_time_remaining": None
-    })
-    return progress
+    """Get real-time processing progress for an RFP.
+    
+    Includes 'seq', the sequence number of the latest progress event, which
+    can be passed as ``since`` to the events/stream endpoints.
+    """
+    return ProgressTracker.get_progress(rfp_id)
+
+
+@router.get("/progress/{rfp_id}/events")
+async def poll_progress_events(
+    rfp_id: int,
+    since: int = Query(0, ge=0, description="Last sequence number seen"),
+    timeout: float = Query(25.0, ge=0, le=60, description="Seconds to wait for new events")
+):
+    """Long-poll for progress events after a sequence number."""
+    events = await ProgressTracker.wait_for_events(rfp_id, since, timeout)
+    return {
+        "rfp_id": rfp_id,
+        "events": events,
+        "last_seq": events[-1]["seq"] if events else since
+    }
+
+
+@router.get("/progress/{rfp_id}/stream")
+async def stream_progress(
+    rfp_id: int,
+    since: int = Query(0, ge=0, description="Resume after this sequence number"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """Stream stage and agent-status changes via Server-Sent Events.
+    
+    Each event carries its sequence number as the SSE id, so browsers
+    reconnecting with Last-Event-ID resume where they left off. The
+    stream ends after the completed/failed event.
+    """
+    if last_event_id and last_event_id.isdigit():
+        since = max(since, int(last_event_id))
+    
+    async def event_generator():
+        async for event in ProgressTracker.stream(rfp_id, since):
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            yield (
+                f"id: {event['seq']}\n"
+                f"data: {json.dumps(event, default=str)}\n\n"
+            )
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
 
 
 @router.post("/match-products/{rfp_id}")
@@ -76,35 +121,33 @@ async def match_products(
         # Initialize spec matcher
         matcher = SpecificationMatcher()
         
-        # Get all products
-        products_query = select(Product).limit(100)  # Get top 100 products
-        products_result = await db.execute(products_query)
-        all_products = products_result.scalars().all()
+        # Get top 100 products (cached until a product write)
+        all_products = await load_catalog_products(db, limit=100)
         
         # Match products
         matched_products = []
         for product in all_products:
             score = matcher.calculate_match_score(
                 specifications,
-                product.specifications,
+                product["specifications"],
                 standards,
-                getattr(product, 'certifications', '').split(',') if hasattr(product, 'certifications') else []
+                (product["certifications"] or '').split(',')
             )
             
             if score > 0.3:  # Minimum 30% match
                 matched_products.append({
-                    "product_id": product.id,
-                    "product_code": product.product_code,
-                    "product_name": product.product_name,
-                    "brand": product.brand,
-                    "category": product.category,
+                    "product_id": product["id"],
+                    "product_code": product["product_code"],
+                    "product_name": product["product_name"],
+                    "brand": product["brand"],
+                    "category": product["category"],
                     "match_score": round(score * 100, 2),
-                    "specifications": product.specifications,
-                    "mrp": product.mrp,
-                    "selling_price": product.selling_price,
-                    "certifications": getattr(product, 'certifications', ''),
-                    "standard": getattr(product, 'standard', ''),
-                    "image_url": product.image_url
+                    "specifications": product["specifications"],
+                    "mrp": product["mrp"],
+                    "selling_price": product["selling_price"],
+                    "certifications": product["certifications"],
+                    "standard": product["standard"],
+                    "image_url": product["image_url"]
                 })
         
         # Sort by match score and get top 3
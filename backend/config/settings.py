@@ -3,8 +3,12 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Backend package root; relative state paths resolve here, not against the cwd
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -23,6 +27,8 @@ class Settings(BaseSettings):
     
     # Redis
     redis_url: str = "redis://localhost:6379/0"
+    cache_redis_enabled: bool = False
+    rate_limit_store: str = "memory"  # memory, shared or redis
     
     # AI Models
     openai_api_key: Optional[str] = None
@@ -36,6 +42,14 @@ class Settings(BaseSettings):
     parallel_execution: bool = True
     max_agent_retries: int = 3
     
+    # Agent Message Queue
+    message_queue_persistent: bool = False
+    message_queue_path: Path = BACKEND_DIR / "data" / "message_queue.db"
+    message_queue_max_deliveries: int = 5
+    
+    # Sales Agent
+    dedupe_store_dir: Path = BACKEND_DIR / "data" / "agent_state" / "dedupe"
+    
     # Vector Database
     chroma_persist_dir: str = "./data/chromadb"
     
@@ -46,6 +60,7 @@ class Settings(BaseSettings):
     testing_data_dir: Path = Path("../testing_data")
     rfp_input_dir: Path = Path("../RFPs")
     output_dir: Path = Path("./outputs")
+    catalog_snapshot_dir: Optional[Path] = BACKEND_DIR / "data" / "catalog_snapshot"
     
     # Security
     secret_key: str = "dev-secret-key-change-in-production-12345678"
@@ -62,6 +77,14 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8"
     )
     
+    @field_validator("message_queue_path", "dedupe_store_dir", "catalog_snapshot_dir")
+    @classmethod
+    def _resolve_backend_path(cls, value: Optional[Path]) -> Optional[Path]:
+        """Resolve relative state paths against the backend directory."""
+        if value is not None and not value.is_absolute():
+            value = BACKEND_DIR / value
+        return value
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # Ensure output directory exists
@@ -169,6 +169,7 @@ class ValidatedProductLoader(BaseDataLoader):
                             'name': str(row.get('Product Name', row.get('name', ''))),
                             'category': 'Wires & Cables',
                             'brand': brand.replace('_', ' ').title(),
+                            'model': str(row.get('Product_Code', row.get('SKU', ''))),
                             'specifications': self._extract_cable_specifications(row),
                             'standard': str(row.get('Standard', row.get('standard', ''))),
                             'voltage': str(row.get('Voltage', row.get('voltage', ''))),
@@ -1,6 +1,7 @@
 """Database module."""
 from .database import Base, get_db, init_db, close_db
 from .models import RFP, Product, AgentLog, Standard, RFPStatus, AgentType
+from . import analytics_rollups  # noqa: F401  (registers rollup tables and maintenance hook)
 
 __all__ = [
     "Base",
@@ -0,0 +1,409 @@
+"""
+Analytics Rollups - Incrementally maintained aggregates for the dashboard
+
+Each rollup table holds per-day totals for one dimension (RFP status,
+workflow status, customer, match category, agent). Rows of rfps,
+workflow_runs and agent_logs contribute counts and sums to them; a
+session hook applies the difference between a row's old and new
+contribution on every flush, so dashboard reads touch one row per day
+and key instead of the full history.
+
+rebuild_rollups() recomputes every table from the base tables; run
+scripts/backfill_analytics_rollups.py once after deploying and whenever
+rows were changed outside the ORM (bulk UPDATE statements, raw SQL).
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import structlog
+from sqlalchemy import Date, Float, Integer, String, delete, event, inspect, insert, select, update
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from db.database import Base
+from db.models import RFP, WorkflowRun, AgentLog
+
+logger = structlog.get_logger()
+
+# Quote value buckets for win rates (lower bound inclusive)
+QUOTE_VALUE_RANGES = {
+    '0-100k': (0, 100000),
+    '100k-500k': (100000, 500000),
+    '500k-1M': (500000, 1000000),
+    '1M+': (1000000, float('inf'))
+}
+
+# Stored in key columns when the source value is missing
+NO_KEY = ''
+
+
+class RFPDailyRollup(Base):
+    """RFPs created per day and status."""
+    __tablename__ = "analytics_rfp_daily"
+    
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    status: Mapped[str] = mapped_column(String(50), primary_key=True)
+    rfps: Mapped[int] = mapped_column(Integer, default=0)
+    processing_time_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    processing_time_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class WorkflowDailyRollup(Base):
+    """Workflow runs created per day and status."""
+    __tablename__ = "analytics_workflow_daily"
+    
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    status: Mapped[str] = mapped_column(String(50), primary_key=True)
+    runs: Mapped[int] = mapped_column(Integer, default=0)
+    duration_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    duration_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class CustomerDailyRollup(Base):
+    """Completed workflow outcomes per day, customer and quote value range."""
+    __tablename__ = "analytics_customer_daily"
+    
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    customer_id: Mapped[str] = mapped_column(String(100), primary_key=True)
+    value_range: Mapped[str] = mapped_column(String(20), primary_key=True)
+    completed: Mapped[int] = mapped_column(Integer, default=0)
+    won: Mapped[int] = mapped_column(Integer, default=0)
+    lost: Mapped[int] = mapped_column(Integer, default=0)
+    won_value_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    lost_value_sum: Mapped[float] = mapped_column(Float, default=0.0)
+
+
+class CategoryDailyRollup(Base):
+    """Product matching results of completed workflows per day, category and match type."""
+    __tablename__ = "analytics_category_daily"
+    
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    category: Mapped[str] = mapped_column(String(100), primary_key=True)
+    match_type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    matches: Mapped[int] = mapped_column(Integer, default=0)
+    category_score_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    match_scores: Mapped[int] = mapped_column(Integer, default=0)
+    match_score_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    confidences: Mapped[int] = mapped_column(Integer, default=0)
+    confidence_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    high_confidence: Mapped[int] = mapped_column(Integer, default=0)
+    low_confidence: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class AgentDailyRollup(Base):
+    """Agent actions per day, agent and action."""
+    __tablename__ = "analytics_agent_daily"
+    
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    agent_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    action: Mapped[str] = mapped_column(String(200), primary_key=True)
+    actions: Mapped[int] = mapped_column(Integer, default=0)
+    successes: Mapped[int] = mapped_column(Integer, default=0)
+    failures: Mapped[int] = mapped_column(Integer, default=0)
+    duration_sum: Mapped[float] = mapped_column(Float, default=0.0)
+
+
+ROLLUP_MODELS = [
+    RFPDailyRollup, WorkflowDailyRollup, CustomerDailyRollup,
+    CategoryDailyRollup, AgentDailyRollup
+]
+
+# (rollup model, key values, measure deltas)
+Contribution = Tuple[type, Tuple, Dict[str, float]]
+
+
+def quote_value_range(value: Optional[float]) -> str:
+    """Name of the QUOTE_VALUE_RANGES bucket for a quote value."""
+    value = value or 0
+    for range_name, (min_val, max_val) in QUOTE_VALUE_RANGES.items():
+        if min_val <= value < max_val:
+            return range_name
+    return NO_KEY
+
+
+def _day(value: Optional[datetime]) -> date:
+    return (value or datetime.utcnow()).date()
+
+
+def _rfp_contributions(row: Dict[str, Any]) -> List[Contribution]:
+    status = row['status']
+    status = status.value if hasattr(status, 'value') else (status or NO_KEY)
+    processing_time = row['processing_time_seconds']
+    return [(RFPDailyRollup, (_day(row['created_at']), status), {
+        'rfps': 1,
+        'processing_time_sum': processing_time or 0.0,
+        'processing_time_count': int(processing_time is not None),
+    })]
+
+
+def _workflow_contributions(row: Dict[str, Any]) -> List[Contribution]:
+    day = _day(row['created_at'])
+    status = row['status'] or NO_KEY
+    duration = row['duration_seconds']
+    contributions = [(WorkflowDailyRollup, (day, status), {
+        'runs': 1,
+        'duration_sum': duration or 0.0,
+        'duration_count': int(duration is not None),
+    })]
+    
+    if status != 'completed':
+        return contributions
+    
+    # Outcome: won is None while the tender is still pending
+    won = row['won']
+    value = row['quote_value_usd'] or 0.0
+    contributions.append((
+        CustomerDailyRollup,
+        (day, row['customer_id'] or NO_KEY, quote_value_range(value)),
+        {
+            'completed': 1,
+            'won': int(won is True),
+            'lost': int(won is False),
+            'won_value_sum': value if won is True else 0.0,
+            'lost_value_sum': value if won is False else 0.0,
+        }
+    ))
+    
+    matching = (row['stage_results'] or {}).get('product_matching')
+    if isinstance(matching, dict):
+        score = matching.get('match_score')
+        confidence = matching.get('confidence')
+        contributions.append((
+            CategoryDailyRollup,
+            (day, str(matching.get('category', 'unknown')), str(matching.get('match_type', NO_KEY))),
+            {
+                'matches': 1,
+                'category_score_sum': score or 0.0,
+                'match_scores': int(score is not None),
+                'match_score_sum': score or 0.0,
+                'confidences': int(confidence is not None),
+                'confidence_sum': confidence or 0.0,
+                'high_confidence': int(confidence is not None and confidence > 0.8),
+                'low_confidence': int(confidence is not None and confidence < 0.5),
+            }
+        ))
+    
+    return contributions
+
+
+def _agent_log_contributions(row: Dict[str, Any]) -> List[Contribution]:
+    duration = row['duration_seconds']
+    return [(
+        AgentDailyRollup,
+        (_day(row['started_at']), row['agent_name'] or NO_KEY, row['action'] or NO_KEY),
+        {
+            'actions': 1,
+            'successes': int(row['status'] == 'success'),
+            'failures': int(row['status'] == 'error'),
+            'duration_sum': duration or 0.0,
+        }
+    )]
+
+
+# Source model -> (columns read, contribution function)
+ROLLUP_SOURCES = {
+    RFP: (
+        ['created_at', 'status', 'processing_time_seconds'],
+        _rfp_contributions
+    ),
+    WorkflowRun: (
+        ['created_at', 'status', 'duration_seconds', 'customer_id',
+         'won', 'quote_value_usd', 'stage_results'],
+        _workflow_contributions
+    ),
+    AgentLog: (
+        ['started_at', 'agent_name', 'action', 'status', 'duration_seconds'],
+        _agent_log_contributions
+    ),
+}
+
+
+class RollupDeltas:
+    """Accumulates measure deltas per rollup row."""
+    
+    def __init__(self):
+        self.rows: Dict[type, Dict[Tuple, Dict[str, float]]] = defaultdict(dict)
+    
+    def add(self, contributions: Iterable[Contribution], sign: int = 1):
+        for model, key, measures in contributions:
+            totals = self.rows[model].setdefault(key, defaultdict(int))
+            for name, value in measures.items():
+                totals[name] += sign * value
+    
+    def __bool__(self):
+        return any(self.rows.values())
+    
+    def items(self):
+        """Yield (model, key, measures), skipping rows whose deltas cancel out."""
+        for model, rows in self.rows.items():
+            for key, measures in rows.items():
+                if any(measures.values()):
+                    yield model, key, dict(measures)
+
+
+def _key_columns(model) -> List[str]:
+    return [column.name for column in model.__table__.primary_key.columns]
+
+
+def _measure_columns(model) -> List[str]:
+    keys = set(_key_columns(model))
+    return [column.name for column in model.__table__.columns if column.name not in keys]
+
+
+def apply_deltas(connection, deltas: RollupDeltas):
+    """Add accumulated deltas to the rollup tables.
+    
+    Args:
+        connection: Connection inside the writing transaction
+        deltas: Deltas to apply
+    """
+    grouped = defaultdict(list)
+    for model, key, measures in deltas.items():
+        row = dict(zip(_key_columns(model), key))
+        row.update({name: measures.get(name, 0) for name in _measure_columns(model)})
+        grouped[model].append(row)
+    
+    dialect = connection.dialect.name
+    for model, rows in grouped.items():
+        table = model.__table__
+        measures = _measure_columns(model)
+        
+        if dialect in ('sqlite', 'postgresql'):
+            if dialect == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            stmt = dialect_insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=_key_columns(model),
+                set_={name: table.c[name] + stmt.excluded[name] for name in measures}
+            )
+            connection.execute(stmt, rows)
+            continue
+        
+        for row in rows:
+            condition = [table.c[name] == row[name] for name in _key_columns(model)]
+            updated = connection.execute(
+                update(table).where(*condition)
+                .values({name: table.c[name] + row[name] for name in measures})
+            )
+            if updated.rowcount == 0:
+                connection.execute(insert(table), [row])
+
+
+def _old_values(session: Session, state, columns: List[str]) -> Dict[str, Any]:
+    """Column values as stored before the pending changes.
+    
+    Uses attribute history where it holds the old value; otherwise (the
+    attribute was expired or never loaded) reads the row, which the flush
+    has not touched yet.
+    """
+    values = {}
+    for column in columns:
+        history = state.attrs[column].history
+        if history.deleted:
+            values[column] = history.deleted[0]
+        elif history.unchanged:
+            values[column] = history.unchanged[0]
+        else:
+            break
+    else:
+        return values
+    
+    model = state.mapper.class_
+    row = session.connection().execute(
+        select(*[getattr(model, column) for column in columns]).where(
+            *[pk == value for pk, value in zip(state.mapper.primary_key, state.identity)]
+        )
+    ).first()
+    stored = dict(zip(columns, row)) if row else {}
+    return {**stored, **values}
+
+
+def _current_values(obj, columns: List[str]) -> Dict[str, Any]:
+    return {column: getattr(obj, column) for column in columns}
+
+
+@event.listens_for(Session, 'before_flush')
+def _retract_old_contributions(session: Session, flush_context, instances):
+    """Subtract the stored contribution of rows about to be updated or deleted."""
+    deltas = RollupDeltas()
+    updated = []
+    
+    for obj in session.dirty | session.deleted:
+        source = ROLLUP_SOURCES.get(type(obj))
+        if not source:
+            continue
+        columns, contributions = source
+        state = inspect(obj)
+        deleted = obj in session.deleted
+        if not deleted and not any(state.attrs[column].history.has_changes() for column in columns):
+            continue
+        deltas.add(contributions(_old_values(session, state, columns)), sign=-1)
+        if not deleted:
+            updated.append(obj)
+    
+    session.info['rollup_flush'] = (deltas, updated)
+
+
+@event.listens_for(Session, 'after_flush')
+def _maintain_rollups(session: Session, flush_context):
+    """Add the new contributions and apply the net deltas in the flush's transaction."""
+    deltas, updated = session.info.pop('rollup_flush', (RollupDeltas(), []))
+    
+    # Inserted rows are read after the flush so column defaults are populated
+    for obj in list(session.new) + updated:
+        source = ROLLUP_SOURCES.get(type(obj))
+        if source:
+            columns, contributions = source
+            deltas.add(contributions(_current_values(obj, columns)))
+    
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+        session.info['rollups_changed'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_dashboard_cache(session: Session):
+    """Evict cached dashboard data once rollup changes are committed."""
+    if session.info.pop('rollups_changed', False):
+        from services.cache_service import get_cache_service
+        get_cache_service().invalidate_tags("analytics")
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_rollup_changes(session: Session):
+    session.info.pop('rollups_changed', None)
+
+
+def rebuild_rollups(db: Session, batch_size: int = 1000) -> Dict[str, int]:
+    """Recompute every rollup table from the base tables.
+    
+    Replaces the rollup contents in the session's transaction; the caller
+    commits.
+    
+    Args:
+        db: Session (e.g. via ``AsyncSession.run_sync``)
+        batch_size: Base rows fetched per round trip
+    
+    Returns:
+        Number of base rows scanned per source table
+    """
+    deltas = RollupDeltas()
+    scanned = {}
+    
+    for model, (columns, contributions) in ROLLUP_SOURCES.items():
+        stmt = select(*[getattr(model, column) for column in columns]).execution_options(
+            yield_per=batch_size
+        )
+        count = 0
+        for row in db.execute(stmt):
+            deltas.add(contributions(dict(zip(columns, row))))
+            count += 1
+        scanned[model.__tablename__] = count
+    
+    for rollup in ROLLUP_MODELS:
+        db.execute(delete(rollup))
+    apply_deltas(db.connection(), deltas)
+    
+    logger.info("Analytics rollups rebuilt", **scanned)
+    return scanned
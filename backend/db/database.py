@@ -58,6 +58,10 @@ async def init_db(use_enhanced: bool = True):
         
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
+        
+        # Full-text/trigram index for product search
+        from db.optimization import create_product_search_index
+        await conn.run_sync(create_product_search_index)
     
     logger.info("Database initialized successfully")
 
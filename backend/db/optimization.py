@@ -62,10 +62,123 @@ def create_performance_indexes(db: Session):
         except Exception as e:
             logger.warning(f"Failed to create index: {index_sql}. Error: {e}")
     
+    create_product_search_index(db)
+    
     db.commit()
     logger.info("Index creation completed")
 
 
+# Text columns of oem_products covered by the product search index
+PRODUCT_SEARCH_COLUMNS = ['product_name', 'category', 'manufacturer', 'model_number']
+
+PRODUCT_FTS_TABLE = "oem_products_fts"
+
+
+def _sqlite_product_search_ddl(populate: bool = True) -> list:
+    """FTS5 external-content table over oem_products plus sync triggers.
+    
+    Args:
+        populate: Rebuild the index from existing rows; only needed when the
+            table is first created, afterwards the triggers keep it in sync
+    """
+    columns = ", ".join(PRODUCT_SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{c}" for c in PRODUCT_SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{c}" for c in PRODUCT_SEARCH_COLUMNS)
+    delete_old = (
+        f"INSERT INTO {PRODUCT_FTS_TABLE}({PRODUCT_FTS_TABLE}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = (
+        f"INSERT INTO {PRODUCT_FTS_TABLE}(rowid, {columns}) "
+        f"VALUES (new.id, {new_values});"
+    )
+    return [
+        # Trigram tokens give case-insensitive substring matching, i.e. the
+        # same hits as ilike('%q%') for queries of 3+ characters
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {PRODUCT_FTS_TABLE} USING fts5("
+        f"{columns}, content='oem_products', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {PRODUCT_FTS_TABLE}_ai AFTER INSERT ON oem_products "
+        f"BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {PRODUCT_FTS_TABLE}_ad AFTER DELETE ON oem_products "
+        f"BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {PRODUCT_FTS_TABLE}_au AFTER UPDATE OF {columns} ON oem_products "
+        f"BEGIN {delete_old} {insert_new} END",
+    ] + ([f"INSERT INTO {PRODUCT_FTS_TABLE}({PRODUCT_FTS_TABLE}) VALUES ('rebuild')"] if populate else [])
+
+
+def _postgres_product_search_ddl() -> list:
+    """pg_trgm GIN index per search column (serves ilike '%q%' and similarity ranking)."""
+    statements = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"]
+    statements += [
+        f"CREATE INDEX IF NOT EXISTS idx_oem_products_{c}_trgm "
+        f"ON oem_products USING gin ({c} gin_trgm_ops)"
+        for c in PRODUCT_SEARCH_COLUMNS
+    ]
+    return statements
+
+
+def create_product_search_index(db) -> bool:
+    """Create the full-text/trigram search index for oem_products.
+    
+    On SQLite this is an FTS5 external-content table kept in sync by
+    triggers; on PostgreSQL, pg_trgm GIN indexes. Other
+    databases keep using ilike scans. Safe to run repeatedly; the FTS
+    table is only populated from existing rows when first created.
+    
+    The DDL runs in a SAVEPOINT, so a failure (e.g. no permission for
+    CREATE EXTENSION) leaves the caller's transaction usable.
+    
+    Args:
+        db: Session or Connection (e.g. from ``AsyncConnection.run_sync``)
+    
+    Returns:
+        True if a search index is in place
+    """
+    dialect = db.dialect.name if hasattr(db, 'dialect') else db.get_bind().dialect.name
+    
+    if dialect == 'sqlite':
+        exists = db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": PRODUCT_FTS_TABLE}
+        ).first() is not None
+        statements = _sqlite_product_search_ddl(populate=not exists)
+    elif dialect == 'postgresql':
+        statements = _postgres_product_search_ddl()
+    else:
+        logger.info(f"No product search index for dialect {dialect}; using ilike fallback")
+        return False
+    
+    try:
+        with db.begin_nested():
+            for statement in statements:
+                db.execute(text(statement))
+    except Exception as e:
+        # e.g. SQLite without FTS5/trigram, or no permission for CREATE EXTENSION
+        logger.warning(f"Failed to create product search index: {e}")
+        return False
+    
+    from db.product_search import reset_search_backend
+    reset_search_backend()
+    logger.info(f"Product search index ready ({dialect})")
+    return True
+
+
+def drop_product_search_index(db):
+    """Remove the oem_products search index (reverse of create_product_search_index)."""
+    dialect = db.dialect.name if hasattr(db, 'dialect') else db.get_bind().dialect.name
+    
+    if dialect == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            db.execute(text(f"DROP TRIGGER IF EXISTS {PRODUCT_FTS_TABLE}_{suffix}"))
+        db.execute(text(f"DROP TABLE IF EXISTS {PRODUCT_FTS_TABLE}"))
+    elif dialect == 'postgresql':
+        for column in PRODUCT_SEARCH_COLUMNS:
+            db.execute(text(f"DROP INDEX IF EXISTS idx_oem_products_{column}_trgm"))
+    
+    from db.product_search import reset_search_backend
+    reset_search_backend()
+
+
 def analyze_query_performance(db: Session):
     """Analyze and optimize query performance"""
     
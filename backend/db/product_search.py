@@ -0,0 +1,128 @@
+"""
+Product Search - Ranked text search over oem_products
+
+Uses the index created by db.optimization.create_product_search_index:
+FTS5 (trigram) on SQLite and pg_trgm on PostgreSQL. When neither is
+available, queries fall back to the original ilike scans.
+"""
+from typing import Dict, List, Optional
+import structlog
+from sqlalchemy import Float, Integer, Select, func, or_, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.optimization import PRODUCT_FTS_TABLE, PRODUCT_SEARCH_COLUMNS
+from db.product_models import OEMProduct
+
+logger = structlog.get_logger()
+
+# Trigram FTS needs at least one full trigram to match
+MIN_FTS_QUERY_LENGTH = 3
+
+# Relative bm25 weights, in PRODUCT_SEARCH_COLUMNS order
+FTS_COLUMN_WEIGHTS = [10.0, 5.0, 2.0, 2.0]
+
+# Detected backend per database URL ('fts5', 'pg_trgm' or 'like')
+_search_backends: Dict[str, str] = {}
+
+
+def reset_search_backend():
+    """Forget detected backends (call after creating or dropping the index)."""
+    _search_backends.clear()
+
+
+async def detect_search_backend(session: AsyncSession) -> str:
+    """Detect which search strategy the database supports.
+
+    Args:
+        session: Async database session
+
+    Returns:
+        'fts5', 'pg_trgm' or 'like'
+    """
+    bind = session.get_bind()
+    key = str(bind.url)
+    backend = _search_backends.get(key)
+    if backend is not None:
+        return backend
+
+    backend = 'like'
+    try:
+        if bind.dialect.name == 'sqlite':
+            found = await session.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {'name': PRODUCT_FTS_TABLE}
+            )
+            if found.first():
+                backend = 'fts5'
+        elif bind.dialect.name == 'postgresql':
+            found = await session.execute(
+                text("SELECT 1 FROM pg_indexes WHERE indexname = :name"),
+                {'name': 'idx_oem_products_product_name_trgm'}
+            )
+            if found.first():
+                backend = 'pg_trgm'
+    except Exception as e:
+        logger.warning("Product search backend detection failed", error=str(e))
+
+    _search_backends[key] = backend
+    logger.info("Product search backend selected", backend=backend)
+    return backend
+
+
+def _fts_match_expression(query: str, columns: List[str]) -> str:
+    """Build an FTS5 MATCH string: the query as one phrase, limited to columns."""
+    phrase = '"' + query.replace('"', '""') + '"'
+    if columns == PRODUCT_SEARCH_COLUMNS:
+        return phrase
+    return "{" + " ".join(columns) + "} : " + phrase
+
+
+def apply_product_search(
+    stmt: Select,
+    backend: str,
+    query: str,
+    columns: Optional[List[str]] = None
+) -> Select:
+    """Restrict a select over OEMProduct to rows matching a text query, best first.
+
+    Matches the same rows as OR-ing ``column.ilike('%query%')`` over the
+    columns; the indexed backends add relevance ordering.
+
+    Args:
+        stmt: Select statement over OEMProduct
+        backend: Result of detect_search_backend
+        query: Search text
+        columns: Columns to search (defaults to all PRODUCT_SEARCH_COLUMNS)
+
+    Returns:
+        Statement with search filter and ranking applied
+    """
+    columns = columns or PRODUCT_SEARCH_COLUMNS
+    query = query.strip()
+
+    if backend == 'fts5' and len(query) >= MIN_FTS_QUERY_LENGTH:
+        weights = ", ".join(str(w) for w in FTS_COLUMN_WEIGHTS)
+        matches = (
+            text(
+                f"SELECT rowid, bm25({PRODUCT_FTS_TABLE}, {weights}) AS rank "
+                f"FROM {PRODUCT_FTS_TABLE} WHERE {PRODUCT_FTS_TABLE} MATCH :match"
+            )
+            .bindparams(match=_fts_match_expression(query, columns))
+            .columns(rowid=Integer, rank=Float)
+            .subquery('product_matches')
+        )
+        return (
+            stmt.join(matches, matches.c.rowid == OEMProduct.id)
+            .order_by(matches.c.rank, OEMProduct.id)
+        )
+
+    condition = or_(*[getattr(OEMProduct, c).ilike(f"%{query}%") for c in columns])
+    stmt = stmt.where(condition)
+
+    if backend == 'pg_trgm':
+        similarity = func.greatest(*[
+            func.similarity(func.coalesce(getattr(OEMProduct, c), ''), query) for c in columns
+        ]) if len(columns) > 1 else func.similarity(getattr(OEMProduct, columns[0]), query)
+        stmt = stmt.order_by(similarity.desc(), OEMProduct.id)
+
+    return stmt
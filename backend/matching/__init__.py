@@ -4,6 +4,7 @@ from matching.specification_matcher import (
     SpecificationMatcher,
     ParameterMatch,
     SpecificationMatchResult,
+    ProductSpecBatch,
     ParameterType,
     MatchStatus
 )
@@ -20,6 +21,7 @@ __all__ = [
     'SpecificationMatcher',
     'ParameterMatch',
     'SpecificationMatchResult',
+    'ProductSpecBatch',
     'ParameterType',
     'MatchStatus',
     'WeightedScorer',
@@ -1,6 +1,7 @@
 """Score aggregation and normalization utilities."""
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
+import numpy as np
 import structlog
 
 logger = structlog.get_logger()
@@ -42,24 +43,10 @@ class ScoreAggregator:
         Returns:
             AggregatedScore with breakdown
         """
-        # Default weights
-        if pricing_score is not None:
-            default_weights = {
-                'technical': 0.50,
-                'compliance': 0.30,
-                'pricing': 0.20
-            }
-        else:
-            default_weights = {
-                'technical': 0.70,
-                'compliance': 0.30
-            }
-        
-        weights = custom_weights or default_weights
-        
-        # Normalize weights to sum to 1.0
-        total_weight = sum(weights.values())
-        normalized_weights = {k: v/total_weight for k, v in weights.items()}
+        normalized_weights, total_weight = self._match_score_weights(
+            pricing_score is not None,
+            custom_weights
+        )
         
         # Component scores
         component_scores = {
@@ -108,6 +95,67 @@ class ScoreAggregator:
             outlier_count=outliers
         )
     
+    def aggregate_match_score_arrays(
+        self,
+        technical_scores: np.ndarray,
+        compliance_scores: np.ndarray,
+        custom_weights: Optional[Dict[str, float]] = None
+    ) -> np.ndarray:
+        """Vectorized overall scores for many technical/compliance pairs.
+        
+        Uses the same weights and operation order as aggregate_match_scores,
+        so each element equals that method's overall_score exactly.
+        
+        Args:
+            technical_scores: Technical scores, one per candidate
+            compliance_scores: Compliance scores, one per candidate
+            custom_weights: Optional custom weights for each dimension
+            
+        Returns:
+            Array of overall scores
+        """
+        normalized_weights, _ = self._match_score_weights(False, custom_weights)
+        
+        technical = np.asarray(technical_scores, dtype=float)
+        compliance = np.asarray(compliance_scores, dtype=float)
+        return (
+            technical * normalized_weights.get('technical', 0)
+            + compliance * normalized_weights.get('compliance', 0)
+        )
+    
+    def _match_score_weights(
+        self,
+        with_pricing: bool,
+        custom_weights: Optional[Dict[str, float]] = None
+    ) -> Tuple[Dict[str, float], float]:
+        """Get normalized dimension weights and their raw total.
+        
+        Args:
+            with_pricing: Whether a pricing score is included
+            custom_weights: Optional custom weights for each dimension
+            
+        Returns:
+            Tuple of (normalized weights, total raw weight)
+        """
+        # Default weights
+        if with_pricing:
+            default_weights = {
+                'technical': 0.50,
+                'compliance': 0.30,
+                'pricing': 0.20
+            }
+        else:
+            default_weights = {
+                'technical': 0.70,
+                'compliance': 0.30
+            }
+        
+        weights = custom_weights or default_weights
+        
+        # Normalize weights to sum to 1.0
+        total_weight = sum(weights.values())
+        return {k: v/total_weight for k, v in weights.items()}, total_weight
+    
     def aggregate_parameter_scores(
         self,
         parameter_matches: List[Any],
@@ -1,7 +1,8 @@
 """Core specification matching engine with weighted parameter matching."""
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
+import numpy as np
 import structlog
 
 from utils.specification_normalizer import SpecificationNormalizer
@@ -82,6 +83,97 @@ class SpecificationMatchResult:
     _confidence_factors: Optional[Any] = None
 
 
+@dataclass
+class ParameterColumn:
+    """One RFP parameter across a product batch, normalized once."""
+    present: np.ndarray  # bool, product has the parameter
+    is_numeric: np.ndarray  # bool, normalized value is int/float
+    numeric: np.ndarray  # float, normalized value (NaN if not numeric)
+    values: List[Any]  # normalized values (None where absent)
+    keys: List[Any]  # hashable memo keys for values (None if unhashable)
+
+
+class ProductSpecBatch:
+    """Product list pre-extracted into per-parameter columns for batch matching.
+    
+    Build once per catalog (or candidate list) and pass to
+    SpecificationMatcher.batch_match for every BOQ line; parameter extraction
+    and value normalization then happen once per product instead of once per
+    (line item, product) pair.
+    """
+    
+    def __init__(
+        self,
+        matcher: "SpecificationMatcher",
+        products: List[Dict[str, Any]],
+        category: str = "default"
+    ):
+        """Extract parameters for every product.
+        
+        Args:
+            matcher: Matcher whose extractor/normalizer rules are applied
+            products: List of product specifications
+            category: Product category used for extraction
+        """
+        self.matcher = matcher
+        self.products = list(products)
+        self.category = category
+        self.params = [
+            matcher.extractor.extract_parameters(product, category)
+            for product in self.products
+        ]
+        self._columns: Dict[str, ParameterColumn] = {}
+    
+    def __len__(self) -> int:
+        return len(self.products)
+    
+    def column(self, param_name: str) -> ParameterColumn:
+        """Get (building on first use) the normalized column for a parameter."""
+        column = self._columns.get(param_name)
+        if column is not None:
+            return column
+        
+        size = len(self.products)
+        present = np.zeros(size, dtype=bool)
+        is_numeric = np.zeros(size, dtype=bool)
+        numeric = np.full(size, np.nan)
+        values: List[Any] = [None] * size
+        keys: List[Any] = [None] * size
+        memo: Dict[Any, Any] = {}
+        
+        for i, params in enumerate(self.params):
+            if param_name not in params:
+                continue
+            present[i] = True
+            raw = params[param_name]
+            raw_key = _memo_key(raw)
+            if raw_key is not None and raw_key in memo:
+                normalized = memo[raw_key]
+            else:
+                normalized = self.matcher._normalize_for_match(param_name, raw, self.category)
+                if raw_key is not None:
+                    memo[raw_key] = normalized
+            
+            values[i] = normalized
+            keys[i] = _memo_key(normalized)
+            if isinstance(normalized, (int, float)):
+                is_numeric[i] = True
+                numeric[i] = float(normalized)
+        
+        column = ParameterColumn(present, is_numeric, numeric, values, keys)
+        self._columns[param_name] = column
+        return column
+
+
+def _memo_key(value: Any) -> Any:
+    """Typed hashable key for a value, or None if it is unhashable."""
+    try:
+        hash(value)
+    except TypeError:
+        return None
+    return (type(value).__name__, value)
+
+
 class SpecificationMatcher:
     """Core specification matching engine with weighted parameter matching."""
     
@@ -287,6 +379,24 @@ class SpecificationMatcher:
         if self.enable_unit_conversion:
             match = self._apply_unit_conversion(match, param_name)
         
+        return self._compare_parameter(match, param_type)
+    
+    def _compare_parameter(
+        self,
+        match: ParameterMatch,
+        param_type: ParameterType
+    ) -> ParameterMatch:
+        """Compare already-normalized values of a parameter.
+        
+        Args:
+            match: ParameterMatch with normalized values set
+            param_type: Type of parameter
+            
+        Returns:
+            Updated ParameterMatch
+        """
+        param_name = match.parameter_name
+        
         # Compare values based on type
         if isinstance(match.normalized_rfp, (int, float)) and isinstance(match.normalized_product, (int, float)):
             match = self._match_numeric_parameter(match, param_type)
@@ -528,26 +638,55 @@ class SpecificationMatcher:
         Returns:
             Updated ParameterMatch with converted units
         """
+        rfp_value, rfp_converted = self._convert_to_base_unit(match.normalized_rfp, param_name)
+        product_value, product_converted = self._convert_to_base_unit(match.normalized_product, param_name)
+        
+        match.normalized_rfp = rfp_value
+        match.normalized_product = product_value
+        if rfp_converted or product_converted:
+            match.unit_converted = True
+        
+        return match
+    
+    def _convert_to_base_unit(self, value: Any, param_name: str) -> Tuple[Any, bool]:
+        """Convert a single normalized value to its base unit.
+        
+        Args:
+            value: Normalized value
+            param_name: Name of parameter
+            
+        Returns:
+            Tuple of (possibly converted value, whether conversion happened)
+        """
+        if not isinstance(value, (str, int, float)):
+            return value, False
+        
         # Try to convert using standardize_to_base_unit
         try:
-            if isinstance(match.normalized_rfp, (str, int, float)):
-                rfp_str = str(match.normalized_rfp)
-                result_rfp = self.unit_converter.standardize_to_base_unit(rfp_str)
-                if result_rfp['success']:
-                    match.normalized_rfp = result_rfp['value']
-                    match.unit_converted = True
-            
-            if isinstance(match.normalized_product, (str, int, float)):
-                prod_str = str(match.normalized_product)
-                result_prod = self.unit_converter.standardize_to_base_unit(prod_str)
-                if result_prod['success']:
-                    match.normalized_product = result_prod['value']
-                    match.unit_converted = True
+            result = self.unit_converter.standardize_to_base_unit(str(value))
+            if result['success']:
+                return result['value'], True
         except Exception as e:
             # If conversion fails, continue with original values
             self.logger.debug(f"Unit conversion failed for {param_name}: {e}")
         
-        return match
+        return value, False
+    
+    def _normalize_for_match(self, param_name: str, value: Any, category: str) -> Any:
+        """Normalize one side of a parameter exactly as _match_parameter does.
+        
+        Args:
+            param_name: Name of parameter
+            value: Raw parameter value
+            category: Product category
+            
+        Returns:
+            Normalized (and unit-converted, if enabled) value
+        """
+        normalized = self._normalize_value(param_name, value, category)
+        if self.enable_unit_conversion:
+            normalized, _ = self._convert_to_base_unit(normalized, param_name)
+        return normalized
     
     def _normalize_value(self, param_name: str, value: Any, category: str) -> Any:
         """Normalize a parameter value.
@@ -813,43 +952,223 @@ class SpecificationMatcher:
         
         return intersection / union if union > 0 else 0.0
     
+    def prepare_products(
+        self,
+        products: List[Dict[str, Any]],
+        category: str = "default"
+    ) -> ProductSpecBatch:
+        """Pre-extract product parameters for repeated batch matching.
+        
+        Args:
+            products: List of product specifications
+            category: Product category
+            
+        Returns:
+            ProductSpecBatch reusable across batch_match calls
+        """
+        return ProductSpecBatch(self, products, category)
+    
     def batch_match(
         self,
         rfp_requirements: Dict[str, Any],
-        products: List[Dict[str, Any]],
+        products: Union[List[Dict[str, Any]], ProductSpecBatch],
         category: str = "default",
         top_k: int = 10
     ) -> List[SpecificationMatchResult]:
         """Match RFP requirements against multiple products.
         
+        Overall scores for all products are computed column-wise in one
+        pass; full SpecificationMatchResult objects are only built for the
+        top_k products.
+        
         Args:
             rfp_requirements: RFP technical requirements
-            products: List of product specifications
+            products: List of product specifications or a prepared batch
             category: Product category
             top_k: Number of top matches to return
             
         Returns:
             List of top matching results, sorted by score
         """
+        if isinstance(products, ProductSpecBatch) and products.matcher is self and products.category == category:
+            batch = products
+        else:
+            product_list = products.products if isinstance(products, ProductSpecBatch) else products
+            batch = ProductSpecBatch(self, product_list, category)
+        
         self.logger.info(
             "Starting batch matching",
-            num_products=len(products),
+            num_products=len(batch),
             category=category
         )
         
-        results = []
-        for product in products:
-            result = self.match_specifications(
-                rfp_requirements,
-                product,
-                category
-            )
-            results.append(result)
+        if len(batch) == 0:
+            return []
+        
+        overall_scores = self.score_batch(rfp_requirements, batch)
+        
+        # Stable descending order keeps input order for ties, like list.sort
+        top_indices = np.argsort(-overall_scores, kind='stable')[:top_k]
+        
+        results = [
+            self.match_specifications(rfp_requirements, batch.products[i], category)
+            for i in top_indices
+        ]
         
         # Sort by overall score
         results.sort(key=lambda x: x.overall_score, reverse=True)
         
-        return results[:top_k]
+        return results
+    
+    def score_batch(
+        self,
+        rfp_requirements: Dict[str, Any],
+        batch: ProductSpecBatch
+    ) -> np.ndarray:
+        """Compute overall match scores for every product in a batch.
+        
+        Each element equals match_specifications(...).overall_score for the
+        corresponding product.
+        
+        Args:
+            rfp_requirements: RFP technical requirements
+            batch: Prepared product batch
+            
+        Returns:
+            Array of overall scores aligned with batch.products
+        """
+        size = len(batch)
+        category = batch.category
+        rfp_params = self.extractor.extract_parameters(rfp_requirements, category)
+        critical_param_names = self.critical_parameters.get(category, self.critical_parameters['default'])
+        
+        # Group RFP parameters by type, keeping order within each group
+        grouped: Dict[ParameterType, List[Tuple[str, Any]]] = {
+            ParameterType.CRITICAL: [],
+            ParameterType.IMPORTANT: [],
+            ParameterType.OPTIONAL: []
+        }
+        for param_name, rfp_value in rfp_params.items():
+            param_type = self._classify_parameter(param_name, critical_param_names)
+            grouped.get(param_type, grouped[ParameterType.OPTIONAL]).append((param_name, rfp_value))
+        
+        # Accumulate in the same order as _calculate_technical_score
+        total_score = np.zeros(size)
+        total_weight = np.zeros(size)
+        for param_type, default_weight in (
+            (ParameterType.CRITICAL, 1.0),
+            (ParameterType.IMPORTANT, 0.7),
+            (ParameterType.OPTIONAL, 0.3)
+        ):
+            weight = self.parameter_weights.get(param_type, default_weight)
+            for param_name, rfp_value in grouped[param_type]:
+                column = batch.column(param_name)
+                if not column.present.any():
+                    continue
+                scores = self._score_parameter_column(param_name, rfp_value, column, param_type, category)
+                total_score = np.where(column.present, total_score + scores * weight, total_score)
+                total_weight = np.where(column.present, total_weight + weight, total_weight)
+        
+        technical_scores = np.divide(
+            total_score,
+            total_weight,
+            out=np.zeros(size),
+            where=total_weight > 0
+        )
+        compliance_scores = self._score_compliance_column(rfp_requirements, batch)
+        
+        return self.score_aggregator.aggregate_match_score_arrays(technical_scores, compliance_scores)
+    
+    def _score_parameter_column(
+        self,
+        param_name: str,
+        rfp_value: Any,
+        column: ParameterColumn,
+        param_type: ParameterType,
+        category: str
+    ) -> np.ndarray:
+        """Score one RFP parameter against a whole product column.
+        
+        Numeric values go through vectorized tolerance checks mirroring
+        _match_numeric_parameter; everything else is scored once per
+        distinct normalized value via _compare_parameter.
+        
+        Returns:
+            Array of match scores (meaningful where column.present)
+        """
+        normalized_rfp = self._normalize_for_match(param_name, rfp_value, category)
+        scores = np.zeros(len(column.present))
+        
+        scalar_mask = column.present.copy()
+        if isinstance(normalized_rfp, (int, float)) and float(normalized_rfp) != 0:
+            rfp_val = float(normalized_rfp)
+            numeric_mask = column.present & column.is_numeric
+            prod_val = column.numeric[numeric_mask]
+            
+            if param_type == ParameterType.CRITICAL:
+                tolerance = 0.0 if self.strict_critical_match else self.default_tolerance
+                min_required = rfp_val * (1 - tolerance)
+                ratio = prod_val / rfp_val
+                numeric_scores = np.where(
+                    prod_val >= min_required,
+                    np.minimum(1.0, ratio),
+                    ratio if rfp_val > 0 else 0.0
+                )
+            else:
+                tolerance = self.default_tolerance * 2
+                lower_bound = rfp_val * (1 - tolerance)
+                upper_bound = rfp_val * (1 + tolerance)
+                closeness = 1.0 - np.abs(prod_val - rfp_val) / rfp_val
+                numeric_scores = np.where(
+                    (lower_bound <= prod_val) & (prod_val <= upper_bound),
+                    closeness,
+                    np.maximum(0.0, closeness)
+                )
+            
+            scores[numeric_mask] = numeric_scores
+            scalar_mask &= ~column.is_numeric
+        
+        memo: Dict[Any, float] = {}
+        for i in np.flatnonzero(scalar_mask):
+            key = column.keys[i]
+            if key is not None and key in memo:
+                scores[i] = memo[key]
+                continue
+            match = ParameterMatch(
+                parameter_name=param_name,
+                rfp_value=rfp_value,
+                product_value=column.values[i],
+                normalized_rfp=normalized_rfp,
+                normalized_product=column.values[i],
+                parameter_type=param_type
+            )
+            score = self._compare_parameter(match, param_type).match_score
+            scores[i] = score
+            if key is not None:
+                memo[key] = score
+        
+        return scores
+    
+    def _score_compliance_column(
+        self,
+        rfp_requirements: Dict[str, Any],
+        batch: ProductSpecBatch
+    ) -> np.ndarray:
+        """Compliance score per product, computed once per distinct standards list."""
+        if not rfp_requirements.get('standards', []):
+            return np.ones(len(batch))
+        
+        scores = np.zeros(len(batch))
+        memo: Dict[str, float] = {}
+        for i, product in enumerate(batch.products):
+            product_standards = product.get('standards', [])
+            key = repr(product_standards)
+            if key not in memo:
+                scratch = SpecificationMatchResult()
+                self._match_standards(rfp_requirements, {'standards': product_standards}, scratch)
+                memo[key] = self._calculate_compliance_score(scratch)
+            scores[i] = memo[key]
+        return scores
     
     def generate_detailed_explanation(
         self,
@@ -4,11 +4,11 @@ Calculates product prices, testing costs, logistics, margins, and generates comm
 """
 
 from pricing.base_calculator import PriceCalculator, PriceBreakdown
-from pricing.product_pricer import ProductPricer, ProductPrice
+from pricing.product_pricer import ProductPricer, ProductPrice, PriceTable, BOQLine, BOQPricing
 from pricing.test_calculator import TestCostCalculator, TestCost
 from pricing.logistics_calculator import LogisticsCalculator, LogisticsCost
 from pricing.margin_calculator import MarginCalculator, MarginBreakdown
-from pricing.bid_generator import BidGenerator, CommercialBid
+from pricing.bid_generator import BidGenerator, CommercialBid, IncrementalBid, BidDiff
 from pricing.pricing_engine import (
     PricingEngine,
     PriceOptimizationSuggestion,
@@ -21,6 +21,9 @@ __all__ = [
     'PriceBreakdown',
     'ProductPricer',
     'ProductPrice',
+    'PriceTable',
+    'BOQLine',
+    'BOQPricing',
     'TestCostCalculator',
     'TestCost',
     'LogisticsCalculator',
@@ -29,6 +32,8 @@ __all__ = [
     'MarginBreakdown',
     'BidGenerator',
     'CommercialBid',
+    'IncrementalBid',
+    'BidDiff',
     'PricingEngine',
     'PriceOptimizationSuggestion',
     'CostComparison',
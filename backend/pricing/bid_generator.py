@@ -1,8 +1,8 @@
 """
 Bid Generator - Generates complete commercial bids with all cost components.
 """
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass, field, replace
 from decimal import Decimal
 from datetime import datetime, date
 import structlog
@@ -130,6 +130,347 @@ class CommercialBid:
         }
 
 
+# CommercialBid amounts reported by BidDiff
+BID_AMOUNT_FIELDS = (
+    'product_cost', 'testing_cost', 'logistics_cost', 'packaging_cost', 'overhead_cost',
+    'subtotal', 'margin_rate', 'margin_amount', 'discount_rate', 'discount_amount',
+    'total_before_tax', 'tax_rate', 'tax_amount', 'grand_total'
+)
+
+
+@dataclass
+class BidDiff:
+    """What one edit to an IncrementalBid changed."""
+    changes: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)  # field -> (old, new)
+    items: Dict[int, Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]] = field(default_factory=dict)
+    recomputed: List[str] = field(default_factory=list)
+    
+    @property
+    def is_empty(self) -> bool:
+        return not self.changes and not self.items
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            'changes': {
+                name: {'old': float(old), 'new': float(new)}
+                for name, (old, new) in self.changes.items()
+            },
+            'items': {
+                index: {'old': old, 'new': new}
+                for index, (old, new) in self.items.items()
+            },
+            'recomputed': self.recomputed
+        }
+
+
+class IncrementalBid:
+    """A CommercialBid kept up to date edit by edit.
+    
+    Every amount of the bid is a node in a small dependency graph: each
+    BOQ line feeds the product cost, each testing requirement the testing
+    cost, the product cost and item count feed logistics, the three costs
+    and the margin rate feed the margin, and the margin and rates feed the
+    totals. An edit marks only its node dirty; recomputation visits the
+    dirty nodes downstream of it, repricing just the edited lines and
+    adjusting the running sums by their change. Each edit returns a
+    BidDiff. The bid always equals what BidGenerator.generate_bid would
+    produce from the current inputs.
+    """
+    
+    # Node -> nodes computed from it
+    DEPENDENCIES = {
+        'lines': ['product_cost'],
+        'item_count': ['logistics_cost'],
+        'tests': ['testing_cost'],
+        'logistics_params': ['logistics_cost'],
+        'margin_rate': ['margin'],
+        'rates': ['totals'],
+        'product_cost': ['logistics_cost', 'margin'],
+        'testing_cost': ['margin'],
+        'logistics_cost': ['margin'],
+        'margin': ['totals'],
+        'totals': []
+    }
+    
+    # Computed nodes in dependency order
+    COMPUTED = ('product_cost', 'testing_cost', 'logistics_cost', 'margin', 'totals')
+    
+    def __init__(
+        self,
+        generator: 'BidGenerator',
+        bid: CommercialBid,
+        items: List[Dict[str, Any]],
+        testing_requirements: Optional[List[Dict[str, Any]]] = None,
+        logistics_params: Optional[Dict[str, Any]] = None,
+        margin_rate: Optional[Decimal] = None
+    ):
+        """Price the whole bid once.
+        
+        Args:
+            generator: BidGenerator whose calculators price the bid
+            bid: Bid to fill in (rates and customer details already set)
+            items: List of items with product_id, quantity
+            testing_requirements: Testing requirements
+            logistics_params: Logistics parameters
+            margin_rate: Desired margin rate
+        """
+        self.generator = generator
+        self.bid = bid
+        self.items = [dict(item) for item in items]
+        self.testing_requirements = [dict(req) for req in testing_requirements] if testing_requirements else None
+        self.logistics_params = dict(logistics_params) if logistics_params else None
+        self.margin_rate = margin_rate
+        self.logger = logger.bind(component="IncrementalBid")
+        
+        # Line totals (None where the line could not be priced) and their exact sum
+        self._line_totals: List[Optional[Decimal]] = []
+        self._rows: List[Optional[Dict[str, Any]]] = []
+        for line in generator.product_pricer.price_boq(self.items).lines:
+            row = generator.product_pricer.item_breakdown(line)
+            self._rows.append(row)
+            self._line_totals.append(line.line_total if row is not None else None)
+        self._product_total = sum((t for t in self._line_totals if t is not None), Decimal('0'))
+        
+        self._test_costs = [self._price_test(req) for req in self.testing_requirements or []]
+        self._testing_total = sum((c for c in self._test_costs if c is not None), Decimal('0'))
+        
+        self._dirty_lines: set = set()
+        self._dirty_tests: set = set()
+        self._dirty: set = set()
+        self._structure_changed = False
+        self.stats = {'edits': 0, 'lines_repriced': 0, 'tests_repriced': 0}
+        
+        self.bid.items = [row for row in self._rows if row is not None]
+        self._invalidate('product_cost', 'testing_cost')
+        self._recompute()
+    
+    # Edits
+    
+    def update_item(self, index: int, **changes) -> BidDiff:
+        """Change fields of one BOQ line (quantity, unit_price, price_type, product_id).
+        
+        A unit_price of None restores the catalog price.
+        """
+        item = self.items[index]
+        for key, value in changes.items():
+            if key == 'unit_price' and value is None:
+                item.pop('unit_price', None)
+            else:
+                item[key] = value
+        self._dirty_lines.add(index)
+        return self._apply('lines')
+    
+    def update_quantity(self, index: int, quantity: int) -> BidDiff:
+        """Change the quantity of one BOQ line."""
+        return self.update_item(index, quantity=quantity)
+    
+    def update_unit_price(self, index: int, unit_price: Optional[Decimal]) -> BidDiff:
+        """Override the unit price of one BOQ line (None restores the catalog price).
+        
+        The override is the final unit price: volume discounts do not apply to it.
+        """
+        return self.update_item(index, unit_price=unit_price)
+    
+    def add_item(self, item: Dict[str, Any]) -> BidDiff:
+        """Append a BOQ line."""
+        self.items.append(dict(item))
+        self._line_totals.append(None)
+        self._rows.append(None)
+        self._dirty_lines.add(len(self.items) - 1)
+        return self._apply('lines', 'item_count')
+    
+    def remove_item(self, index: int) -> BidDiff:
+        """Remove a BOQ line; later lines move up by one."""
+        old_total = self._line_totals[index]
+        old_row = self._rows[index]
+        del self.items[index], self._line_totals[index], self._rows[index]
+        self._dirty_lines = {i - 1 if i > index else i for i in self._dirty_lines if i != index}
+        if old_total is not None:
+            self._product_total -= old_total
+        self._structure_changed = True
+        
+        diff = self._apply('lines', 'item_count')
+        diff.items[index] = (dict(old_row) if old_row else None, None)
+        return diff
+    
+    def update_testing_requirement(self, index: int, **changes) -> BidDiff:
+        """Change fields of one testing requirement."""
+        self.testing_requirements[index].update(changes)
+        self._dirty_tests.add(index)
+        return self._apply('tests')
+    
+    def add_testing_requirement(self, requirement: Dict[str, Any]) -> BidDiff:
+        """Append a testing requirement."""
+        if self.testing_requirements is None:
+            self.testing_requirements = []
+        self.testing_requirements.append(dict(requirement))
+        self._test_costs.append(None)
+        self._dirty_tests.add(len(self.testing_requirements) - 1)
+        return self._apply('tests')
+    
+    def remove_testing_requirement(self, index: int) -> BidDiff:
+        """Remove a testing requirement."""
+        old_cost = self._test_costs[index]
+        del self.testing_requirements[index], self._test_costs[index]
+        self._dirty_tests = {i - 1 if i > index else i for i in self._dirty_tests if i != index}
+        if old_cost is not None:
+            self._testing_total -= old_cost
+        return self._apply('tests')
+    
+    def update_logistics(self, **params) -> BidDiff:
+        """Change logistics parameters (weight_kg, delivery_method, ...)."""
+        self.logistics_params = {**(self.logistics_params or {}), **params}
+        return self._apply('logistics_params')
+    
+    def update_margin(self, margin_rate: Optional[Decimal]) -> BidDiff:
+        """Change the margin rate (None uses the category default)."""
+        self.margin_rate = margin_rate
+        return self._apply('margin_rate')
+    
+    def update_rates(
+        self,
+        tax_rate: Optional[Decimal] = None,
+        discount_rate: Optional[Decimal] = None
+    ) -> BidDiff:
+        """Change the tax and/or discount rate."""
+        if tax_rate is not None:
+            self.bid.tax_rate = tax_rate
+        if discount_rate is not None:
+            self.bid.discount_rate = discount_rate
+        return self._apply('rates')
+    
+    # Recomputation
+    
+    def _apply(self, *nodes: str) -> BidDiff:
+        """Invalidate nodes, recompute what depends on them and diff the bid."""
+        self.stats['edits'] += 1
+        before = {name: getattr(self.bid, name) for name in BID_AMOUNT_FIELDS}
+        self._invalidate(*nodes)
+        diff = self._recompute()
+        diff.changes = {
+            name: (before[name], getattr(self.bid, name))
+            for name in BID_AMOUNT_FIELDS
+            if getattr(self.bid, name) != before[name]
+        }
+        return diff
+    
+    def _invalidate(self, *nodes: str):
+        """Mark nodes and everything downstream of them dirty."""
+        self._dirty.update(node for node in nodes if node in self.COMPUTED)
+        pending = list(nodes)
+        while pending:
+            node = pending.pop()
+            for dependent in self.DEPENDENCIES[node]:
+                if dependent not in self._dirty:
+                    self._dirty.add(dependent)
+                    pending.append(dependent)
+    
+    def _recompute(self) -> BidDiff:
+        """Recompute dirty nodes in dependency order."""
+        diff = BidDiff()
+        for node in self.COMPUTED:
+            if node in self._dirty:
+                getattr(self, f'_compute_{node}')(diff)
+                diff.recomputed.append(node)
+        self._dirty.clear()
+        return diff
+    
+    def _compute_product_cost(self, diff: BidDiff):
+        pricer = self.generator.product_pricer
+        indexes = sorted(self._dirty_lines)
+        lines = pricer.price_boq([self.items[i] for i in indexes]).lines if indexes else []
+        
+        for index, line in zip(indexes, lines):
+            old_total, old_row = self._line_totals[index], self._rows[index]
+            new_row = pricer.item_breakdown(line)
+            new_total = line.line_total if new_row is not None else None
+            
+            if old_total is not None:
+                self._product_total -= old_total
+            if new_total is not None:
+                self._product_total += new_total
+            self._line_totals[index] = new_total
+            
+            if old_row is not None and new_row is not None:
+                # Same dict object as in bid.items; update it in place
+                old_copy = dict(old_row)
+                old_row.update(new_row)
+                new_row = old_row
+            else:
+                old_copy = old_row
+                self._rows[index] = new_row
+                self._structure_changed = True
+            if old_copy != new_row:
+                diff.items[index] = (old_copy, dict(new_row) if new_row else None)
+        
+        self.stats['lines_repriced'] += len(indexes)
+        self._dirty_lines.clear()
+        if self._structure_changed:
+            self.bid.items = [row for row in self._rows if row is not None]
+            self._structure_changed = False
+        self.bid.product_cost = Decimal(str(float(self._product_total)))
+    
+    def _price_test(self, req: Dict[str, Any]) -> Optional[Decimal]:
+        """Cost of one testing requirement (None, logged, if it cannot be priced)."""
+        test_calculator = self.generator.test_calculator
+        try:
+            return test_calculator.calculate_requirement(req)
+        except Exception as e:
+            test_calculator.logger.error(
+                "Failed to calculate test cost",
+                test_type=req.get('test_type'),
+                error=str(e)
+            )
+            return None
+    
+    def _compute_testing_cost(self, diff: BidDiff):
+        for index in sorted(self._dirty_tests):
+            old_cost = self._test_costs[index]
+            new_cost = self._price_test(self.testing_requirements[index])
+            if old_cost is not None:
+                self._testing_total -= old_cost
+            if new_cost is not None:
+                self._testing_total += new_cost
+            self._test_costs[index] = new_cost
+        self.stats['tests_repriced'] += len(self._dirty_tests)
+        self._dirty_tests.clear()
+        
+        if self.testing_requirements:
+            self.bid.testing_cost = Decimal(str(float(self._testing_total)))
+        else:
+            self.bid.testing_cost = Decimal('0')
+    
+    def _compute_logistics_cost(self, diff: BidDiff):
+        params = self.logistics_params
+        if not params:
+            self.bid.logistics_cost = Decimal('0')
+            return
+        self.bid.logistics_cost = self.generator.logistics_calculator.calculate(
+            weight_kg=params.get('weight_kg', 100),
+            delivery_method=params.get('delivery_method', 'standard'),
+            distance_category=params.get('distance_category', 'regional'),
+            product_value=self.bid.product_cost,
+            packaging_size=params.get('packaging_size', 'medium'),
+            quantity=len(self.items)
+        )
+    
+    def _compute_margin(self, diff: BidDiff):
+        margin_breakdown = self.generator.margin_calculator.calculate_detailed(
+            product_cost=self.bid.product_cost,
+            testing_cost=self.bid.testing_cost,
+            logistics_cost=self.bid.logistics_cost,
+            margin_rate=self.margin_rate
+        )
+        self.bid.overhead_cost = margin_breakdown.overhead_cost
+        self.bid.margin_rate = margin_breakdown.margin_rate
+        self.bid.margin_amount = margin_breakdown.margin_amount
+    
+    def _compute_totals(self, diff: BidDiff):
+        self.bid.discount_amount = Decimal('0')
+        self.bid.calculate_totals()
+
+
 class BidGenerator:
     """Generate complete commercial bids."""
     
@@ -181,6 +522,43 @@ class BidGenerator:
         Returns:
             CommercialBid object
         """
+        return self.create_incremental_bid(
+            rfp_reference=rfp_reference,
+            items=items,
+            testing_requirements=testing_requirements,
+            logistics_params=logistics_params,
+            margin_rate=margin_rate,
+            customer_info=customer_info,
+            tax_rate=tax_rate,
+            discount_rate=discount_rate
+        ).bid
+    
+    def create_incremental_bid(
+        self,
+        rfp_reference: str,
+        items: List[Dict[str, Any]],
+        testing_requirements: Optional[List[Dict[str, Any]]] = None,
+        logistics_params: Optional[Dict[str, Any]] = None,
+        margin_rate: Optional[Decimal] = None,
+        customer_info: Optional[Dict[str, Any]] = None,
+        tax_rate: Decimal = Decimal('18'),
+        discount_rate: Decimal = Decimal('0')
+    ) -> IncrementalBid:
+        """Generate a bid that can then be edited line by line.
+        
+        Args:
+            rfp_reference: RFP reference number
+            items: List of items with product_id, quantity
+            testing_requirements: Testing requirements
+            logistics_params: Logistics parameters
+            margin_rate: Desired margin rate
+            customer_info: Customer information
+            tax_rate: Tax rate (GST)
+            discount_rate: Discount rate
+            
+        Returns:
+            IncrementalBid whose .bid is the generated CommercialBid
+        """
         self.logger.info("Generating commercial bid", rfp_ref=rfp_reference)
         
         # Generate bid ID
@@ -200,45 +578,16 @@ class BidGenerator:
             bid.customer_name = customer_info.get('name')
             bid.customer_address = customer_info.get('address')
         
-        # Calculate product costs
-        product_result = self.product_pricer.calculate_multi_product(items)
-        bid.product_cost = Decimal(str(product_result['total']))
-        bid.items = product_result['items']
-        
-        # Calculate testing costs
-        if testing_requirements:
-            test_result = self.test_calculator.calculate_testing_requirements(
-                testing_requirements
-            )
-            bid.testing_cost = Decimal(str(test_result['total_cost']))
-        
-        # Calculate logistics costs
-        if logistics_params:
-            logistics_cost = self.logistics_calculator.calculate(
-                weight_kg=logistics_params.get('weight_kg', 100),
-                delivery_method=logistics_params.get('delivery_method', 'standard'),
-                distance_category=logistics_params.get('distance_category', 'regional'),
-                product_value=bid.product_cost,
-                packaging_size=logistics_params.get('packaging_size', 'medium'),
-                quantity=len(items)
-            )
-            bid.logistics_cost = logistics_cost
-        
-        # Calculate margin
-        margin_breakdown = self.margin_calculator.calculate_detailed(
-            product_cost=bid.product_cost,
-            testing_cost=bid.testing_cost,
-            logistics_cost=bid.logistics_cost,
+        # Calculate product, testing and logistics costs, margin and totals
+        incremental = IncrementalBid(
+            self,
+            bid,
+            items,
+            testing_requirements=testing_requirements,
+            logistics_params=logistics_params,
             margin_rate=margin_rate
         )
         
-        bid.overhead_cost = margin_breakdown.overhead_cost
-        bid.margin_rate = margin_breakdown.margin_rate
-        bid.margin_amount = margin_breakdown.margin_amount
-        
-        # Calculate totals
-        bid.calculate_totals()
-        
         # Add standard assumptions
         bid.assumptions = [
             "Prices are valid for {} days from date of quote".format(bid.validity_days),
@@ -262,7 +611,7 @@ class BidGenerator:
             grand_total=float(bid.grand_total)
         )
         
-        return bid
+        return incremental
     
     def generate_from_rfp(
         self,
@@ -336,14 +685,35 @@ class BidGenerator:
         Returns:
             List of CommercialBid objects
         """
+        if not margin_scenarios:
+            return []
+        
+        # Items are priced once; only the margin and totals differ per scenario
+        base_bid = self.generate_bid(
+            rfp_reference=rfp_reference,
+            items=items,
+            margin_rate=margin_scenarios[0]
+        )
         bids = []
         
         for margin_rate in margin_scenarios:
-            bid = self.generate_bid(
-                rfp_reference=rfp_reference,
-                items=items,
+            bid = replace(
+                base_bid,
+                items=[dict(item) for item in base_bid.items],
+                notes=[],
+                assumptions=list(base_bid.assumptions),
+                exclusions=list(base_bid.exclusions)
+            )
+            margin_breakdown = self.margin_calculator.calculate_detailed(
+                product_cost=bid.product_cost,
+                testing_cost=bid.testing_cost,
+                logistics_cost=bid.logistics_cost,
                 margin_rate=margin_rate
             )
+            bid.overhead_cost = margin_breakdown.overhead_cost
+            bid.margin_rate = margin_breakdown.margin_rate
+            bid.margin_amount = margin_breakdown.margin_amount
+            bid.calculate_totals()
             bid.notes.append(f"Scenario with {float(margin_rate)}% margin")
             bids.append(bid)
         
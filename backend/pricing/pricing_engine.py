@@ -7,7 +7,7 @@ from decimal import Decimal
 from datetime import datetime
 import structlog
 
-from pricing.product_pricer import ProductPricer, ProductPrice
+from pricing.product_pricer import ProductPricer, ProductPrice, BOQPricing
 from pricing.test_calculator import TestCostCalculator
 from pricing.logistics_calculator import LogisticsCalculator
 from pricing.margin_calculator import MarginCalculator
@@ -136,6 +136,23 @@ class PricingEngine:
             'final_price': base_total - discount_amount
         }
     
+    def price_boq(
+        self,
+        items: List[Dict[str, Any]],
+        tax_rate: Decimal = Decimal('18'),
+        discount_rate: Decimal = Decimal('0')
+    ) -> BOQPricing:
+        """Price all BOQ lines in one pass, with volume discounts, bid discount and GST.
+        
+        Each line total equals lookup_product_price() for that line.
+        """
+        return self.product_pricer.price_boq(
+            items,
+            tax_rate=tax_rate,
+            discount_rate=discount_rate,
+            apply_volume_discount=True
+        )
+    
     # Feature 3: Testing Frequency Analyzer
     def analyze_testing_frequency(
         self,
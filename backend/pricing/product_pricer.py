@@ -1,9 +1,10 @@
 """
 Product Pricer - Looks up product prices from catalog and applies pricing rules.
 """
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass, field
 from decimal import Decimal
+import numpy as np
 import structlog
 
 from pricing.base_calculator import PriceCalculator
@@ -48,6 +49,203 @@ class ProductPrice:
         }
 
 
+PRICE_TYPES = ('base', 'list', 'dealer', 'bulk')
+
+# Prices and rates needing more decimals than this are priced with Decimal
+MAX_SCALE_DIGITS = 6
+
+# Quantities (and break quantities) must fit in the low 32 bits of a break key
+MAX_VECTOR_QUANTITY = 2 ** 31 - 1
+
+# Intermediate products above this are computed with Python ints, not int64
+INT64_SAFE = 2 ** 62
+
+
+def _decimal_places(value: Decimal) -> Optional[int]:
+    """Decimal places needed to hold ``value`` exactly (None if not finite)."""
+    if not isinstance(value, Decimal) or not value.is_finite():
+        return None
+    return max(0, -value.as_tuple().exponent)
+
+
+def _exact_product(values: np.ndarray, *factors) -> np.ndarray:
+    """Element-wise product that never overflows.
+    
+    Stays in int64 when the result is known to fit, otherwise switches to
+    Python ints (object arrays), which are exact at any size.
+    """
+    bound = np.abs(values.astype(float))
+    for factor in factors:
+        bound = bound * np.abs(np.asarray(factor, dtype=float))
+    if values.size and bound.max() >= INT64_SAFE:
+        values = values.astype(object)
+        factors = [f.astype(object) if isinstance(f, np.ndarray) else int(f) for f in factors]
+    for factor in factors:
+        values = values * factor
+    return values
+
+
+def _round_half_even(numerator: np.ndarray, denominator: int) -> np.ndarray:
+    """numerator / denominator rounded half-to-even, as Decimal.quantize does by default."""
+    quotient = numerator // denominator
+    twice_remainder = 2 * (numerator - quotient * denominator)
+    round_up = (twice_remainder > denominator) | ((twice_remainder == denominator) & (quotient % 2 == 1))
+    return quotient + round_up.astype(quotient.dtype)
+
+
+def _to_decimal(numerator, places: int) -> Decimal:
+    """Exact Decimal for numerator / 10**places."""
+    return Decimal(numerator).scaleb(-places)
+
+
+@dataclass
+class BOQLine:
+    """One priced bill-of-quantities line."""
+    product_id: str
+    quantity: Any
+    price_type: str = 'base'
+    price_override: Optional[Decimal] = None  # Final unit price; no volume discount
+    product_name: str = 'Unknown'
+    unit_price: Decimal = Decimal('0')
+    volume_discount_rate: Decimal = Decimal('0')
+    line_total: Decimal = Decimal('0')  # After volume discount, rounded (as calculate())
+    discount_amount: Decimal = Decimal('0')
+    tax_amount: Decimal = Decimal('0')
+    total: Decimal = Decimal('0')
+    error: Optional[str] = None
+
+
+@dataclass
+class BOQPricing:
+    """Prices for a whole bill of quantities."""
+    lines: List[BOQLine]
+    discount_rate: Decimal
+    tax_rate: Decimal
+    subtotal: Decimal = Decimal('0')
+    discount_amount: Decimal = Decimal('0')
+    tax_amount: Decimal = Decimal('0')
+    grand_total: Decimal = Decimal('0')
+    vectorized_lines: int = 0
+    
+    @property
+    def failed_lines(self) -> List[BOQLine]:
+        return [line for line in self.lines if line.error]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            'items': [
+                {
+                    'product_id': line.product_id,
+                    'product_name': line.product_name,
+                    'quantity': line.quantity,
+                    'unit_price': float(line.unit_price),
+                    'volume_discount_rate': float(line.volume_discount_rate),
+                    'line_total': float(line.line_total),
+                    'discount_amount': float(line.discount_amount),
+                    'tax_amount': float(line.tax_amount),
+                    'total': float(line.total)
+                }
+                for line in self.lines if not line.error
+            ],
+            'errors': {line.product_id: line.error for line in self.failed_lines},
+            'discount_rate': float(self.discount_rate),
+            'tax_rate': float(self.tax_rate),
+            'subtotal': float(self.subtotal),
+            'discount_amount': float(self.discount_amount),
+            'tax_amount': float(self.tax_amount),
+            'grand_total': float(self.grand_total)
+        }
+
+
+class PriceTable:
+    """Catalog prices and volume breaks as scaled-integer arrays.
+    
+    Unit prices for every price type are stored as integers at one common
+    decimal scale, and each product's volume breaks are sorted once into
+    a global key array (product row in the high bits, break quantity in
+    the low bits) so one ``searchsorted`` finds every line's tier. Products
+    whose prices or rates need more than MAX_SCALE_DIGITS decimals are
+    marked inexact and left to the Decimal path.
+    """
+    
+    def __init__(self, catalog: Dict[str, ProductPrice]):
+        """Build the arrays.
+        
+        Args:
+            catalog: Product ID to ProductPrice
+        """
+        self.catalog = catalog
+        self.product_ids = list(catalog)
+        self.index = {product_id: row for row, product_id in enumerate(self.product_ids)}
+        self.size = len(self.product_ids)
+        
+        # Resolve each price type the way ProductPricer.calculate does
+        self.unit_prices: List[List[Decimal]] = [[] for _ in PRICE_TYPES]
+        self.exact = np.ones(self.size, dtype=bool)
+        breaks: List[Tuple[int, int, Decimal]] = []
+        price_places = rate_places = 0
+        
+        for row, product_id in enumerate(self.product_ids):
+            product = catalog[product_id]
+            resolved = [
+                product.base_price,
+                product.list_price or product.base_price,
+                product.dealer_price or product.base_price,
+                product.bulk_price or product.base_price
+            ]
+            product_breaks = [
+                (qty, rate) for qty, rate in (product.volume_breaks or {}).items()
+                if isinstance(qty, (int, np.integer)) and qty <= MAX_VECTOR_QUANTITY
+            ]
+            if len(product_breaks) != len(product.volume_breaks or {}):
+                self.exact[row] = False
+            
+            places = [_decimal_places(price) for price in resolved]
+            places += [_decimal_places(rate) for _, rate in product_breaks]
+            if any(p is None or p > MAX_SCALE_DIGITS for p in places):
+                self.exact[row] = False
+            if self.exact[row]:
+                price_places = max([price_places] + places[:len(resolved)])
+                rate_places = max([rate_places] + places[len(resolved):])
+                breaks.extend((row, max(0, int(qty)), rate) for qty, rate in product_breaks)
+            
+            for type_index, price in enumerate(resolved):
+                self.unit_prices[type_index].append(price)
+        
+        self.price_places = price_places
+        self.rate_places = rate_places
+        self.price_scale = 10 ** price_places
+        self.rate_scale = 10 ** rate_places
+        
+        self.prices = np.zeros((len(PRICE_TYPES), self.size), dtype=np.int64)
+        for type_index, prices in enumerate(self.unit_prices):
+            for row, price in enumerate(prices):
+                if self.exact[row]:
+                    scaled = int(price.scaleb(price_places))
+                    if abs(scaled) >= INT64_SAFE:
+                        self.exact[row] = False
+                    else:
+                        self.prices[type_index, row] = scaled
+        
+        breaks = [b for b in breaks if self.exact[b[0]]]
+        breaks.sort(key=lambda b: (b[0], b[1]))
+        self.break_keys = np.array([(row << 32) | qty for row, qty, _ in breaks], dtype=np.int64)
+        self.break_rates = np.array(
+            [int(rate.scaleb(rate_places)) for _, _, rate in breaks], dtype=np.int64
+        )
+        self.break_rate_values = [rate for _, _, rate in breaks]
+    
+    def volume_tiers(self, rows: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+        """Index into the break arrays of each line's tier (-1 where none applies)."""
+        if not len(self.break_keys):
+            return np.full(len(rows), -1)
+        keys = (rows.astype(np.int64) << 32) | quantities
+        positions = np.searchsorted(self.break_keys, keys, side='right') - 1
+        same_product = (self.break_keys[np.maximum(positions, 0)] >> 32) == rows
+        return np.where((positions >= 0) & same_product, positions, -1)
+
+
 class ProductPricer(PriceCalculator):
     """Look up and calculate product prices."""
     
@@ -59,6 +257,7 @@ class ProductPricer(PriceCalculator):
         """
         super().__init__()
         self.price_catalog = price_catalog or {}
+        self._price_table: Optional[PriceTable] = None
         self.logger = logger.bind(component="ProductPricer")
     
     def load_price_catalog(self, catalog: Dict[str, ProductPrice]):
@@ -68,6 +267,7 @@ class ProductPricer(PriceCalculator):
             catalog: Price catalog dictionary
         """
         self.price_catalog = catalog
+        self._price_table = None
         self.logger.info("Price catalog loaded", products=len(catalog))
     
     def add_product_price(self, product: ProductPrice):
@@ -77,6 +277,7 @@ class ProductPricer(PriceCalculator):
             product: ProductPrice object
         """
         self.price_catalog[product.product_id] = product
+        self._price_table = None
         self.logger.debug("Product price added", product_id=product.product_id)
     
     def get_product_price(self, product_id: str) -> Optional[ProductPrice]:
@@ -95,7 +296,8 @@ class ProductPricer(PriceCalculator):
         product_id: str,
         quantity: int,
         price_type: str = 'base',
-        apply_volume_discount: bool = True
+        apply_volume_discount: bool = True,
+        unit_price: Optional[Decimal] = None
     ) -> Decimal:
         """Calculate product price for given quantity.
         
@@ -104,6 +306,8 @@ class ProductPricer(PriceCalculator):
             quantity: Quantity
             price_type: Type of price ('base', 'list', 'dealer', 'bulk')
             apply_volume_discount: Whether to apply volume discounts
+            unit_price: Price overriding the catalog price (e.g. negotiated for
+                one line); taken as final, so no volume discount is applied
             
         Returns:
             Total price as Decimal
@@ -115,7 +319,10 @@ class ProductPricer(PriceCalculator):
             raise ValueError(f"Product {product_id} not found in catalog")
         
         # Get base price based on type
-        if price_type == 'list' and product.list_price:
+        overridden = unit_price is not None
+        if overridden:
+            unit_price = self.to_decimal(unit_price)
+        elif price_type == 'list' and product.list_price:
             unit_price = product.list_price
         elif price_type == 'dealer' and product.dealer_price:
             unit_price = product.dealer_price
@@ -127,8 +334,8 @@ class ProductPricer(PriceCalculator):
         # Calculate subtotal
         subtotal = unit_price * Decimal(quantity)
         
-        # Apply volume discount if enabled
-        if apply_volume_discount and product.volume_breaks:
+        # Apply volume discount if enabled (a negotiated price already includes it)
+        if apply_volume_discount and product.volume_breaks and not overridden:
             discount_rate = self._get_volume_discount(quantity, product.volume_breaks)
             discount_amount = subtotal * discount_rate / Decimal('100')
             subtotal -= discount_amount
@@ -157,7 +364,7 @@ class ProductPricer(PriceCalculator):
         """Calculate prices for multiple products.
         
         Args:
-            items: List of dicts with 'product_id', 'quantity', 'price_type' (optional)
+            items: List of dicts with 'product_id', 'quantity', 'price_type' and 'unit_price' (optional)
             
         Returns:
             Dictionary with total and item-wise breakdown
@@ -165,36 +372,11 @@ class ProductPricer(PriceCalculator):
         total = Decimal('0')
         item_breakdown = []
         
-        for item in items:
-            product_id = item.get('product_id')
-            quantity = item.get('quantity', 1)
-            price_type = item.get('price_type', 'base')
-            
-            try:
-                item_total = self.calculate(
-                    product_id,
-                    quantity,
-                    price_type=price_type
-                )
-                
-                product = self.get_product_price(product_id)
-                
-                item_breakdown.append({
-                    'product_id': product_id,
-                    'product_name': product.product_name if product else 'Unknown',
-                    'quantity': quantity,
-                    'unit_price': float(item_total / Decimal(quantity)),
-                    'total': float(item_total)
-                })
-                
-                total += item_total
-                
-            except Exception as e:
-                self.logger.error(
-                    "Failed to calculate item price",
-                    product_id=product_id,
-                    error=str(e)
-                )
+        for line in self.price_boq(items).lines:
+            item = self.item_breakdown(line)
+            if item is not None:
+                item_breakdown.append(item)
+                total += line.line_total
         
         return {
             'total': float(total),
@@ -202,6 +384,200 @@ class ProductPricer(PriceCalculator):
             'item_count': len(item_breakdown)
         }
     
+    def item_breakdown(self, line: BOQLine) -> Optional[Dict[str, Any]]:
+        """Item-wise breakdown row of a priced BOQ line.
+        
+        Args:
+            line: Line from price_boq
+            
+        Returns:
+            Breakdown dict, or None (logged) if the line could not be priced
+        """
+        try:
+            if line.error:
+                raise ValueError(line.error)
+            
+            return {
+                'product_id': line.product_id,
+                'product_name': line.product_name,
+                'quantity': line.quantity,
+                'unit_price': float(line.line_total / Decimal(line.quantity)),
+                'total': float(line.line_total)
+            }
+            
+        except Exception as e:
+            self.logger.error(
+                "Failed to calculate item price",
+                product_id=line.product_id,
+                error=str(e)
+            )
+            return None
+    
+    def get_price_table(self) -> PriceTable:
+        """Array form of the catalog, rebuilt when the catalog changes.
+        
+        Changes made through load_price_catalog/add_product_price (or adding
+        keys to price_catalog) are picked up; call invalidate_price_table()
+        after editing ProductPrice objects in place.
+        """
+        table = self._price_table
+        if table is None or table.catalog is not self.price_catalog or table.size != len(self.price_catalog):
+            table = self._price_table = PriceTable(self.price_catalog)
+        return table
+    
+    def invalidate_price_table(self):
+        """Drop the cached price arrays."""
+        self._price_table = None
+    
+    def price_boq(
+        self,
+        items: List[Dict[str, Any]],
+        tax_rate: Decimal = Decimal('0'),
+        discount_rate: Decimal = Decimal('0'),
+        apply_volume_discount: bool = True
+    ) -> BOQPricing:
+        """Price a whole bill of quantities in one vectorized pass.
+        
+        Line totals equal calculate() for every line (volume discount, then
+        rounding half-to-even to 2 places); the bid-level discount and tax
+        are then applied per line as in CommercialBid.calculate_totals. All
+        arithmetic is on scaled integers, so results equal the Decimal path
+        exactly. Lines the arrays cannot represent exactly (non-integer or
+        out-of-range quantities, prices with many decimals) fall back to it.
+        
+        Args:
+            items: List of dicts with 'product_id', 'quantity', 'price_type' and 'unit_price' (optional)
+            tax_rate: Tax rate in percent, applied after the discount
+            discount_rate: Bid-level discount rate in percent
+            apply_volume_discount: Whether to apply volume discounts
+            
+        Returns:
+            BOQPricing with per-line amounts and totals; unknown products are
+            reported on their line and excluded from totals
+        """
+        table = self.get_price_table()
+        lines = [
+            BOQLine(
+                product_id=item.get('product_id'),
+                quantity=item.get('quantity', 1),
+                price_type=item.get('price_type', 'base'),
+                price_override=item.get('unit_price')
+            )
+            for item in items
+        ]
+        
+        rows = np.array([table.index.get(line.product_id, -1) for line in lines], dtype=np.int64)
+        quantities = np.array([
+            line.quantity if type(line.quantity) is int and 0 <= line.quantity <= MAX_VECTOR_QUANTITY else -1
+            for line in lines
+        ], dtype=np.int64)
+        type_index = {price_type: i for i, price_type in enumerate(PRICE_TYPES)}
+        types = np.array([type_index.get(line.price_type, 0) for line in lines], dtype=np.int64)
+        
+        known = rows >= 0
+        vector = known & (quantities >= 0)
+        vector &= np.array([line.price_override is None for line in lines], dtype=bool)
+        vector[vector] = table.exact[rows[vector]]
+        
+        # Line totals in cents: price * qty * (100 - rate) / 100, rounded half-even
+        v_rows, v_qty = rows[vector], quantities[vector]
+        prices = table.prices[types[vector], v_rows]
+        tiers = table.volume_tiers(v_rows, v_qty) if apply_volume_discount else np.full(len(v_rows), -1)
+        rates = np.zeros(len(v_rows), dtype=np.int64)
+        has_tier = tiers >= 0
+        rates[has_tier] = table.break_rates[tiers[has_tier]]
+        numerators = _exact_product(prices, v_qty, 100 * table.rate_scale - rates)
+        # numerators are in units of 1 / (100 * price_scale * rate_scale) rupees
+        cents = _round_half_even(numerators, table.price_scale * table.rate_scale)
+        
+        line_cents: Dict[int, int] = {}
+        for line_index, row, type_index, tier, line_cent in zip(
+            np.flatnonzero(vector).tolist(), v_rows.tolist(), types[vector].tolist(), tiers.tolist(), cents.tolist()
+        ):
+            line = lines[line_index]
+            line.product_name = table.catalog[line.product_id].product_name
+            line.unit_price = table.unit_prices[type_index][row]
+            if tier >= 0:
+                line.volume_discount_rate = table.break_rate_values[tier]
+            line_cents[line_index] = line_cent
+        
+        for line_index in np.flatnonzero(~vector):
+            self._price_line_decimal(lines[line_index], apply_volume_discount, line_cents, line_index)
+        
+        return self._apply_bid_rates(lines, line_cents, tax_rate, discount_rate, int(vector.sum()))
+    
+    def _price_line_decimal(self, line: BOQLine, apply_volume_discount: bool, line_cents: Dict[int, int], line_index: int):
+        """Price one line with the Decimal path (fallback for price_boq)."""
+        product = self.get_product_price(line.product_id)
+        if not product:
+            line.error = f"Product {line.product_id} not found in catalog"
+            return
+        try:
+            line_total = self.calculate(
+                line.product_id, line.quantity, price_type=line.price_type,
+                apply_volume_discount=apply_volume_discount, unit_price=line.price_override
+            )
+        except Exception as e:
+            line.error = str(e)
+            return
+        
+        line.product_name = product.product_name
+        line.unit_price = self.to_decimal(line.price_override) if line.price_override is not None else {
+            'list': product.list_price, 'dealer': product.dealer_price, 'bulk': product.bulk_price
+        }.get(line.price_type) or product.base_price
+        if apply_volume_discount and product.volume_breaks and line.price_override is None:
+            line.volume_discount_rate = self._get_volume_discount(line.quantity, product.volume_breaks)
+        line_cents[line_index] = int(line_total.scaleb(2))
+    
+    def _apply_bid_rates(
+        self,
+        lines: List[BOQLine],
+        line_cents: Dict[int, int],
+        tax_rate: Decimal,
+        discount_rate: Decimal,
+        vectorized_lines: int
+    ) -> BOQPricing:
+        """Spread the bid-level discount and tax over priced lines, exactly."""
+        discount_rate, tax_rate = self.to_decimal(discount_rate), self.to_decimal(tax_rate)
+        discount_places = _decimal_places(discount_rate) or 0
+        tax_places = _decimal_places(tax_rate) or 0
+        discount_int = int(discount_rate.scaleb(discount_places))
+        tax_int = int(tax_rate.scaleb(tax_places))
+        
+        # discount = cents * d / 100 / 100, net = cents * (100 - d) / 100 / 100,
+        # tax = net * t / 100, at scales 10^(4 + d places) and 10^(6 + d places + t places)
+        keep = 100 * 10 ** discount_places - discount_int
+        indexes = list(line_cents)
+        cents = [line_cents[i] for i in indexes]
+        cents = np.array(cents, dtype=np.int64 if all(abs(c) < INT64_SAFE for c in cents) else object)
+        discounts = _exact_product(cents, discount_int)
+        nets = _exact_product(cents, keep)
+        taxes = _exact_product(nets, tax_int)
+        totals = _exact_product(nets, 100 * 10 ** tax_places) + taxes
+        
+        net_places = 4 + discount_places
+        tax_scale = net_places + 2 + tax_places
+        for line_index, line_cent, discount, tax, total in zip(
+            indexes, cents.tolist(), discounts.tolist(), taxes.tolist(), totals.tolist()
+        ):
+            line = lines[line_index]
+            line.line_total = _to_decimal(line_cent, 2)
+            line.discount_amount = _to_decimal(discount, net_places)
+            line.tax_amount = _to_decimal(tax, tax_scale)
+            line.total = _to_decimal(total, tax_scale)
+        
+        subtotal = sum(line_cents.values())
+        return BOQPricing(
+            lines=lines,
+            discount_rate=discount_rate,
+            tax_rate=tax_rate,
+            subtotal=_to_decimal(subtotal, 2),
+            discount_amount=_to_decimal(subtotal * discount_int, net_places),
+            tax_amount=_to_decimal(subtotal * keep * tax_int, tax_scale),
+            grand_total=_to_decimal(subtotal * keep * (100 * 10 ** tax_places + tax_int), tax_scale),
+            vectorized_lines=vectorized_lines
+        )
+    
     def _get_volume_discount(
         self,
         quantity: int,
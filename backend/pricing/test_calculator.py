@@ -147,6 +147,22 @@ class TestCostCalculator(PriceCalculator):
         
         return self.round_price(total_cost)
     
+    def calculate_requirement(self, requirement: Dict[str, Any]) -> Decimal:
+        """Calculate the cost of one testing requirement.
+        
+        Args:
+            requirement: Test requirement dict (see calculate_testing_requirements)
+            
+        Returns:
+            Cost as Decimal
+        """
+        return self.calculate(
+            requirement.get('test_type'),
+            quantity=requirement.get('quantity', 1),
+            laboratory_type=requirement.get('laboratory_type', 'government_lab'),
+            rush_service=requirement.get('rush_service', False)
+        )
+    
     def calculate_testing_requirements(
         self,
         requirements: List[Dict[str, Any]]
@@ -171,18 +187,12 @@ class TestCostCalculator(PriceCalculator):
         
         for req in requirements:
             test_type = req.get('test_type')
-            quantity = req.get('quantity', 1)
             laboratory_type = req.get('laboratory_type', 'government_lab')
             is_mandatory = req.get('is_mandatory', True)
             rush_service = req.get('rush_service', False)
             
             try:
-                cost = self.calculate(
-                    test_type,
-                    quantity=quantity,
-                    laboratory_type=laboratory_type,
-                    rush_service=rush_service
-                )
+                cost = self.calculate_requirement(req)
                 
                 test_cost = TestCost(
                     test_type='test',
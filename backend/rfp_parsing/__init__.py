@@ -7,7 +7,7 @@ from rfp_parsing.base_parser import DocumentParser, ParseResult, MultiFormatPars
 from rfp_parsing.pdf_extractor import PDFExtractor, PDFExtractionResult
 from rfp_parsing.boq_extractor import BOQExtractor, BOQItem
 from rfp_parsing.spec_parser import SpecificationParser, Specification
-from rfp_parsing.rfp_pipeline import RFPPipeline, RFPDocument
+from rfp_parsing.rfp_pipeline import RFPPipeline, RFPDocument, BatchItemResult
 from rfp_parsing.date_extractor import DateExtractor, Deadline
 from rfp_parsing.testing_extractor import TestingRequirementExtractor, TestingRequirement
 from rfp_parsing.ocr_handler import OCRHandler
@@ -31,6 +31,7 @@ __all__ = [
     # Pipeline
     'RFPPipeline',
     'RFPDocument',
+    'BatchItemResult',
     # Date extraction
     'DateExtractor',
     'Deadline',
@@ -1,9 +1,14 @@
 """
 PDF Extractor - Extract text, tables, and metadata from PDF documents using pdfplumber.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import gzip
+import hashlib
+import json
+import os
 import pdfplumber
 import pandas as pd
 import structlog
@@ -35,19 +40,91 @@ class PDFExtractionResult:
         }
 
 
+# Bump when the cached payload layout changes
+_CACHE_VERSION = 2
+
+
+def _json_safe(value: Any) -> Any:
+    """Normalize a PDF metadata value to plain JSON types.
+    
+    pdfplumber metadata can hold bytes, tuples and PDF objects. Fresh and
+    cached extractions both go through this, so a cache hit returns exactly
+    what the original extraction returned.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    if isinstance(value, dict):
+        return {str(key): _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    return str(value)
+
+
+def _extract_pages(
+    pages,
+    extract_text: bool,
+    extract_tables: bool,
+    table_settings: Dict[str, Any]
+) -> List[Tuple[Optional[str], List[List[List[Any]]]]]:
+    """Extract raw text and table rows from pdfplumber pages.
+    
+    Returns:
+        One (text or None, raw tables) tuple per page
+    """
+    extracted = []
+    for page in pages:
+        page_text = (page.extract_text() or "") if extract_text else None
+        tables = page.extract_tables(table_settings=table_settings) if extract_tables else []
+        extracted.append((page_text, tables or []))
+    return extracted
+
+
+def _extract_page_range(
+    pdf_path: str,
+    start: int,
+    end: int,
+    extract_text: bool,
+    extract_tables: bool,
+    table_settings: Dict[str, Any]
+) -> List[Tuple[Optional[str], List[List[List[Any]]]]]:
+    """Process-pool worker: extract pages [start, end) (0-based) of a PDF."""
+    with pdfplumber.open(pdf_path, pages=list(range(start + 1, end + 1))) as pdf:
+        return _extract_pages(pdf.pages, extract_text, extract_tables, table_settings)
+
+
 class PDFExtractor:
     """Extract text and tables from PDF documents using pdfplumber."""
     
-    def __init__(self):
-        """Initialize PDF extractor."""
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        parallel_min_pages: int = 16
+    ):
+        """Initialize PDF extractor.
+        
+        Args:
+            max_workers: Worker processes for page-parallel extraction
+                (None or 1 = serial; parallel extraction is opt-in, e.g.
+                os.cpu_count() for batch jobs)
+            cache_dir: Directory for cached extraction results keyed by file
+                hash and settings (None disables caching)
+            parallel_min_pages: Minimum page count before fanning out
+        """
         self.logger = logger.bind(component="PDFExtractor")
+        self.max_workers = max_workers or 1
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.parallel_min_pages = parallel_min_pages
     
     def extract(
         self,
         pdf_path: str,
         extract_text: bool = True,
         extract_tables: bool = True,
-        table_settings: Optional[Dict[str, Any]] = None
+        table_settings: Optional[Dict[str, Any]] = None,
+        parallel: Optional[bool] = None
     ) -> PDFExtractionResult:
         """Extract content from PDF file.
         
@@ -56,6 +133,8 @@ class PDFExtractor:
             extract_text: Whether to extract text content
             extract_tables: Whether to extract tables
             table_settings: Optional pdfplumber table extraction settings
+            parallel: Fan page ranges out to a process pool (None = automatic
+                based on page count and max_workers)
             
         Returns:
             PDFExtractionResult with extracted content
@@ -75,66 +154,193 @@ class PDFExtractor:
                 "intersection_tolerance": 3,
             }
         
-        result = PDFExtractionResult(
-            file_path=str(pdf_path),
-            total_pages=0
-        )
+        cache_key = None
+        if self.cache_dir is not None:
+            cache_key = self._cache_key(pdf_path, extract_text, extract_tables, table_settings)
+            cached = self._load_cached(cache_key)
+            if cached is not None:
+                self.logger.info("PDF extraction cache hit", file=str(pdf_path))
+                return self._build_result(pdf_path, *cached)
         
         try:
             with pdfplumber.open(pdf_path) as pdf:
-                result.total_pages = len(pdf.pages)
-                result.metadata = pdf.metadata or {}
+                total_pages = len(pdf.pages)
+                metadata = _json_safe(pdf.metadata or {})
                 
                 self.logger.info(
                     "Processing PDF",
-                    pages=result.total_pages,
-                    metadata_keys=list(result.metadata.keys())
+                    pages=total_pages,
+                    metadata_keys=list(metadata.keys())
                 )
                 
-                all_text = []
-                
-                for page_num, page in enumerate(pdf.pages, 1):
-                    # Extract text
-                    if extract_text:
-                        page_text = page.extract_text() or ""
-                        result.text_by_page.append(page_text)
-                        all_text.append(page_text)
-                    
-                    # Extract tables
-                    if extract_tables:
-                        tables = page.extract_tables(table_settings=table_settings)
-                        
-                        if tables:
-                            page_dataframes = []
-                            for table_data in tables:
-                                if table_data and len(table_data) > 0:
-                                    # Convert to DataFrame
-                                    df = pd.DataFrame(table_data[1:], columns=table_data[0])
-                                    # Clean column names
-                                    df.columns = [str(col).strip() if col else f"Column_{i}" 
-                                                 for i, col in enumerate(df.columns)]
-                                    page_dataframes.append(df)
-                                    result.tables.append(df)
-                            
-                            if page_dataframes:
-                                result.tables_by_page[page_num] = page_dataframes
-                
-                # Combine all text
-                result.text = "\n\n".join(all_text)
-                
-                self.logger.info(
-                    "PDF extraction completed",
-                    pages=result.total_pages,
-                    text_length=len(result.text),
-                    tables_found=len(result.tables)
-                )
+                use_parallel = parallel
+                if use_parallel is None:
+                    use_parallel = self.max_workers > 1 and total_pages >= self.parallel_min_pages
                 
-                return result
+                if use_parallel:
+                    pages = self._extract_parallel(
+                        pdf_path, total_pages, extract_text, extract_tables, table_settings
+                    )
+                else:
+                    pages = _extract_pages(pdf.pages, extract_text, extract_tables, table_settings)
+            
+            if cache_key is not None:
+                self._store_cached(cache_key, total_pages, metadata, pages)
+            
+            result = self._build_result(pdf_path, total_pages, metadata, pages)
+            
+            self.logger.info(
+                "PDF extraction completed",
+                pages=result.total_pages,
+                text_length=len(result.text),
+                tables_found=len(result.tables),
+                parallel=use_parallel
+            )
+            
+            return result
                 
         except Exception as e:
             self.logger.error("PDF extraction failed", error=str(e), file=str(pdf_path))
             raise
     
+    def _extract_parallel(
+        self,
+        pdf_path: Path,
+        total_pages: int,
+        extract_text: bool,
+        extract_tables: bool,
+        table_settings: Dict[str, Any]
+    ) -> List[Tuple[Optional[str], List[List[List[Any]]]]]:
+        """Extract page ranges across a process pool and merge them in order."""
+        workers = max(1, min(self.max_workers, total_pages))
+        # Two ranges per worker smooths out uneven (table-heavy) pages
+        chunk_size = max(1, -(-total_pages // (workers * 2)))
+        ranges = [
+            (start, min(start + chunk_size, total_pages))
+            for start in range(0, total_pages, chunk_size)
+        ]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _extract_page_range,
+                    str(pdf_path), start, end,
+                    extract_text, extract_tables, table_settings
+                )
+                for start, end in ranges
+            ]
+            pages = []
+            for future in futures:
+                pages.extend(future.result())
+        
+        return pages
+    
+    def _build_result(
+        self,
+        pdf_path: Path,
+        total_pages: int,
+        metadata: Dict[str, Any],
+        pages: List[Tuple[Optional[str], List[List[List[Any]]]]]
+    ) -> PDFExtractionResult:
+        """Assemble a PDFExtractionResult from raw per-page output."""
+        result = PDFExtractionResult(
+            file_path=str(pdf_path),
+            total_pages=total_pages,
+            metadata=metadata
+        )
+        
+        all_text = []
+        
+        for page_num, (page_text, tables) in enumerate(pages, 1):
+            if page_text is not None:
+                result.text_by_page.append(page_text)
+                all_text.append(page_text)
+            
+            page_dataframes = []
+            for table_data in tables:
+                if table_data and len(table_data) > 0:
+                    # Convert to DataFrame
+                    df = pd.DataFrame(table_data[1:], columns=table_data[0])
+                    # Clean column names
+                    df.columns = [str(col).strip() if col else f"Column_{i}" 
+                                 for i, col in enumerate(df.columns)]
+                    page_dataframes.append(df)
+                    result.tables.append(df)
+            
+            if page_dataframes:
+                result.tables_by_page[page_num] = page_dataframes
+        
+        # Combine all text
+        result.text = "\n\n".join(all_text)
+        
+        return result
+    
+    def _cache_key(
+        self,
+        pdf_path: Path,
+        extract_text: bool,
+        extract_tables: bool,
+        table_settings: Dict[str, Any]
+    ) -> str:
+        """Content-addressed cache key: file hash plus extraction settings."""
+        digest = hashlib.sha256()
+        with open(pdf_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        
+        settings = json.dumps(
+            {
+                'version': _CACHE_VERSION,
+                'text': extract_text,
+                'tables': extract_tables,
+                'table_settings': table_settings
+            },
+            sort_keys=True,
+            default=str
+        )
+        digest.update(settings.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _load_cached(self, cache_key: str) -> Optional[Tuple[int, Dict[str, Any], List[Tuple[Optional[str], List[List[List[Any]]]]]]]:
+        """Load cached raw extraction output, or None on miss."""
+        path = self.cache_dir / f"{cache_key}.json.gz"
+        if not path.exists():
+            return None
+        
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning("Ignoring unreadable PDF cache entry", error=str(e), path=str(path))
+            return None
+        
+        pages = [(page['text'], page['tables']) for page in payload['pages']]
+        return payload['total_pages'], payload['metadata'], pages
+    
+    def _store_cached(
+        self,
+        cache_key: str,
+        total_pages: int,
+        metadata: Dict[str, Any],
+        pages: List[Tuple[Optional[str], List[List[List[Any]]]]]
+    ):
+        """Write raw extraction output to the cache atomically."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / f"{cache_key}.json.gz"
+        tmp_path = self.cache_dir / f".{cache_key}.{os.getpid()}.tmp"
+        
+        payload = {
+            'total_pages': total_pages,
+            'metadata': metadata,
+            'pages': [{'text': text, 'tables': tables} for text, tables in pages]
+        }
+        try:
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning("Failed to write PDF cache entry", error=str(e), path=str(path))
+    
     def extract_text_only(self, pdf_path: str) -> str:
         """Extract only text from PDF (faster).
         
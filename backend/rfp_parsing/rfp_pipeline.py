@@ -1,9 +1,13 @@
 """
 RFP Pipeline - Main pipeline for processing RFP documents.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator
 from dataclasses import dataclass, field
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import time
 import pandas as pd
 import structlog
 
@@ -99,6 +103,50 @@ class RFPDocument:
         }
 
 
+@dataclass
+class BatchItemResult:
+    """Outcome of processing one document in a batch."""
+    file_path: str
+    index: int
+    document: Optional[RFPDocument] = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+    elapsed_seconds: float = 0.0
+    
+    @property
+    def success(self) -> bool:
+        """Whether the document was processed successfully."""
+        return self.document is not None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            'file_path': self.file_path,
+            'index': self.index,
+            'success': self.success,
+            'error': self.error,
+            'error_type': self.error_type,
+            'elapsed_seconds': self.elapsed_seconds,
+            'document': self.document.to_dict() if self.document else None
+        }
+
+
+# Pipeline reused across tasks inside a batch worker process
+_worker_pipeline: Optional["RFPPipeline"] = None
+
+
+def _init_batch_worker(config: Dict[str, Any]):
+    """Process-pool initializer: build one pipeline per worker."""
+    global _worker_pipeline
+    # Batch workers already run in parallel; keep page extraction serial
+    _worker_pipeline = RFPPipeline(pdf_workers=1, **config)
+
+
+def _process_in_worker(pdf_path: str, index: int) -> BatchItemResult:
+    """Process-pool task: process one document with the worker pipeline."""
+    return _worker_pipeline._process_timed(pdf_path, index)
+
+
 class RFPPipeline:
     """Complete pipeline for processing RFP documents."""
     
@@ -109,7 +157,9 @@ class RFPPipeline:
         extract_dates: bool = True,
         extract_testing: bool = True,
         use_ocr_fallback: bool = False,
-        section_headings: Optional[List[str]] = None
+        section_headings: Optional[List[str]] = None,
+        pdf_workers: Optional[int] = None,
+        pdf_cache_dir: Optional[str] = None
     ):
         """Initialize RFP pipeline.
         
@@ -120,8 +170,11 @@ class RFPPipeline:
             extract_testing: Whether to extract testing requirements
             use_ocr_fallback: Whether to use OCR for scanned PDFs
             section_headings: List of section headings to extract
+            pdf_workers: Worker processes for page-parallel PDF extraction
+                (None = serial)
+            pdf_cache_dir: Directory for cached PDF extraction results
         """
-        self.pdf_extractor = PDFExtractor()
+        self.pdf_extractor = PDFExtractor(max_workers=pdf_workers, cache_dir=pdf_cache_dir)
         self.boq_extractor = BOQExtractor()
         self.spec_parser = SpecificationParser()
         self.date_extractor = DateExtractor()
@@ -143,6 +196,17 @@ class RFPPipeline:
             "Submission Requirements"
         ]
         
+        # Constructor settings replayed in batch worker processes
+        self._batch_config = {
+            'extract_boq': extract_boq,
+            'extract_specs': extract_specs,
+            'extract_dates': extract_dates,
+            'extract_testing': extract_testing,
+            'use_ocr_fallback': use_ocr_fallback,
+            'section_headings': self.section_headings,
+            'pdf_cache_dir': pdf_cache_dir
+        }
+        
         self.logger = logger.bind(component="RFPPipeline")
     
     def process(self, pdf_path: str) -> RFPDocument:
@@ -361,37 +425,196 @@ class RFPPipeline:
         
         return stats
     
-    def process_batch(self, pdf_paths: List[str]) -> List[RFPDocument]:
+    def process_batch(
+        self,
+        pdf_paths: List[str],
+        max_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None
+    ) -> List[RFPDocument]:
         """Process multiple RFP documents.
         
         Args:
             pdf_paths: List of PDF file paths
+            max_workers: Worker processes (None or 1 = in-process; pass e.g. os.cpu_count() to use a pool)
+            max_in_flight: Maximum documents submitted at once
             
         Returns:
-            List of RFPDocument objects
+            List of successfully processed RFPDocument objects, in input order
         """
-        self.logger.info("Processing batch of RFP documents", count=len(pdf_paths))
-        
-        results = []
-        
-        for pdf_path in pdf_paths:
-            try:
-                rfp_doc = self.process(pdf_path)
-                results.append(rfp_doc)
-            except Exception as e:
-                self.logger.error(
-                    "Failed to process RFP",
-                    file=pdf_path,
-                    error=str(e)
-                )
+        results = sorted(
+            self.iter_batch(pdf_paths, max_workers=max_workers, max_in_flight=max_in_flight),
+            key=lambda item: item.index
+        )
+        return [item.document for item in results if item.success]
+    
+    def iter_batch(
+        self,
+        pdf_paths: List[str],
+        max_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None
+    ) -> Iterator[BatchItemResult]:
+        """Process documents concurrently, yielding each as soon as it finishes.
+        
+        Failures are reported as results rather than raised, so one bad or
+        slow document never holds back the rest of the batch. If a worker
+        process dies, the documents in flight and those not yet submitted
+        are reported as failed.
+        
+        Args:
+            pdf_paths: List of PDF file paths
+            max_workers: Worker processes (None or 1 = in-process; pass e.g. os.cpu_count() to use a pool)
+            max_in_flight: Maximum documents submitted at once
+                (default: twice the worker count)
+            
+        Yields:
+            BatchItemResult per document, in completion order
+        """
+        workers = self._batch_workers(pdf_paths, max_workers)
+        self.logger.info("Processing batch of RFP documents", count=len(pdf_paths), workers=workers)
+        
+        started = time.perf_counter()
+        successful = 0
+        
+        if workers == 1:
+            for index, pdf_path in enumerate(pdf_paths):
+                item = self._process_timed(pdf_path, index)
+                successful += item.success
+                yield item
+        else:
+            limit = max(1, max_in_flight or workers * 2)
+            pending_paths = iter(enumerate(pdf_paths))
+            
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_batch_worker,
+                initargs=(self._batch_config,)
+            ) as executor:
+                in_flight = {}
+                unsubmitted = []
+                
+                def submit_next() -> bool:
+                    for index, pdf_path in pending_paths:
+                        try:
+                            future = executor.submit(_process_in_worker, str(pdf_path), index)
+                        except (BrokenProcessPool, RuntimeError) as e:
+                            # A worker died (or the pool shut down); the
+                            # remaining documents are reported as failed
+                            self.logger.error("RFP worker pool unusable", error=str(e))
+                            unsubmitted.append((index, str(pdf_path), e))
+                            unsubmitted.extend((i, str(p), e) for i, p in pending_paths)
+                            return False
+                        in_flight[future] = (index, str(pdf_path))
+                        return True
+                    return False
+                
+                while len(in_flight) < limit and submit_next():
+                    pass
+                
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, pdf_path = in_flight.pop(future)
+                        item = self._collect(future, pdf_path, index)
+                        successful += item.success
+                        submit_next()
+                        yield item
+                
+                for index, pdf_path, error in unsubmitted:
+                    yield BatchItemResult(
+                        file_path=pdf_path,
+                        index=index,
+                        error=str(error),
+                        error_type=type(error).__name__
+                    )
         
         self.logger.info(
             "Batch processing completed",
             total=len(pdf_paths),
-            successful=len(results)
+            successful=successful,
+            elapsed_seconds=round(time.perf_counter() - started, 3)
         )
+    
+    async def aiter_batch(
+        self,
+        pdf_paths: List[str],
+        max_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None
+    ) -> AsyncIterator[BatchItemResult]:
+        """Async variant of iter_batch for use inside the API event loop.
         
-        return results
+        Args:
+            pdf_paths: List of PDF file paths
+            max_workers: Worker processes (None or 1 = in-process; pass e.g. os.cpu_count() to use a pool)
+            max_in_flight: Maximum documents submitted at once
+            
+        Yields:
+            BatchItemResult per document, in completion order
+        """
+        loop = asyncio.get_running_loop()
+        iterator = self.iter_batch(pdf_paths, max_workers=max_workers, max_in_flight=max_in_flight)
+        
+        pending = None
+        
+        try:
+            while True:
+                # Block on the next completion in a thread, not the event loop.
+                # Shielded so a cancelled consumer leaves the future to finish.
+                pending = loop.run_in_executor(None, next, iterator, None)
+                item = await asyncio.shield(pending)
+                if item is None:
+                    break
+                yield item
+        finally:
+            # Closing a generator that is still running in the executor raises
+            if pending is not None and not pending.done():
+                await asyncio.wait([pending])
+            await loop.run_in_executor(None, iterator.close)
+    
+    def _batch_workers(self, pdf_paths: List[str], max_workers: Optional[int]) -> int:
+        """Resolve the worker count for a batch."""
+        workers = max_workers or 1
+        return max(1, min(workers, len(pdf_paths)))
+    
+    def _process_timed(self, pdf_path: str, index: int) -> BatchItemResult:
+        """Process one document, capturing timing and failures."""
+        started = time.perf_counter()
+        try:
+            rfp_doc = self.process(pdf_path)
+            elapsed = time.perf_counter() - started
+            rfp_doc.stats['processing_seconds'] = round(elapsed, 3)
+            return BatchItemResult(
+                file_path=str(pdf_path),
+                index=index,
+                document=rfp_doc,
+                elapsed_seconds=elapsed
+            )
+        except Exception as e:
+            self.logger.error(
+                "Failed to process RFP",
+                file=str(pdf_path),
+                error=str(e)
+            )
+            return BatchItemResult(
+                file_path=str(pdf_path),
+                index=index,
+                error=str(e),
+                error_type=type(e).__name__,
+                elapsed_seconds=time.perf_counter() - started
+            )
+    
+    def _collect(self, future, pdf_path: str, index: int) -> BatchItemResult:
+        """Turn a finished worker future into a BatchItemResult."""
+        try:
+            return future.result()
+        except Exception as e:
+            # Worker crashed or the result could not be returned
+            self.logger.error("RFP worker failed", file=pdf_path, error=str(e))
+            return BatchItemResult(
+                file_path=pdf_path,
+                index=index,
+                error=str(e),
+                error_type=type(e).__name__
+            )
     
     def export_boq_to_csv(self, rfp_doc: RFPDocument, output_path: str):
         """Export BOQ to CSV file.
@@ -6,8 +6,13 @@ from dataclasses import dataclass, field
 import re
 import structlog
 
+from utils.text_scanner import TextScanner, ScanResult, get_rfp_scanner, SPEC_PATTERNS
+
 logger = structlog.get_logger()
 
+# Trailing number and unit of a "Parameter: Value" value
+VALUE_UNIT_PATTERN = re.compile(r'(\d+\.?\d*)\s*([A-Za-z%]+)$')
+
 
 @dataclass
 class Specification:
@@ -34,23 +39,17 @@ class Specification:
 class SpecificationParser:
     """Parse technical specifications from RFP text."""
     
-    def __init__(self):
-        """Initialize specification parser."""
+    def __init__(self, scanner: Optional[TextScanner] = None):
+        """Initialize specification parser.
+        
+        Args:
+            scanner: Shared text scanner (defaults to the global RFP scanner)
+        """
         self.logger = logger.bind(component="SpecificationParser")
+        self.scanner = scanner or get_rfp_scanner()
         
-        # Common specification patterns
-        self.spec_patterns = {
-            'voltage': r'(?:voltage|rated\s*voltage)[:\s]*(\d+)\s*(V|volts?)',
-            'power': r'(?:power|wattage)[:\s]*(\d+\.?\d*)\s*(W|KW|watts?|kilowatts?)',
-            'current': r'(?:current|amperage)[:\s]*(\d+\.?\d*)\s*(A|amps?)',
-            'frequency': r'(?:frequency)[:\s]*(\d+)\s*(Hz)',
-            'capacity': r'(?:capacity|volume)[:\s]*(\d+\.?\d*)\s*(L|litre|liter|ton)',
-            'size': r'(?:size|dimensions?)[:\s]*(\d+\.?\d*)\s*(?:x\s*\d+\.?\d*)?\s*(mm|cm|m|inch)',
-            'temperature': r'(?:temperature|temp)[:\s]*(-?\d+\.?\d*)\s*(?:to\s*-?\d+\.?\d*)?\s*(°C|C|celsius)',
-            'pressure': r'(?:pressure)[:\s]*(\d+\.?\d*)\s*(bar|psi|kpa)',
-            'rating': r'(\d+)\s*star\s*rating',
-            'efficiency': r'(?:efficiency)[:\s]*(\d+\.?\d*)\s*(%|percent)',
-        }
+        # Common specification patterns (compiled into the shared scanner)
+        self.spec_patterns = {name: pattern for name, (pattern, _) in SPEC_PATTERNS.items()}
         
         # Requirement keywords
         self.requirement_keywords = {
@@ -72,12 +71,12 @@ class SpecificationParser:
         self.logger.info("Parsing specifications", category=category, text_length=len(text))
         
         specifications = []
+        scan = self.scanner.scan(text)
         
         # Extract specifications using patterns
-        for param_name, pattern in self.spec_patterns.items():
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            
-            for match in matches:
+        for param_name in self.spec_patterns:
+            for hit in scan.hits('spec', param_name):
+                match = hit.match
                 value = match.group(1)
                 unit = match.group(2) if match.lastindex >= 2 else None
                 
@@ -96,7 +95,7 @@ class SpecificationParser:
                 specifications.append(spec)
         
         # Extract custom specifications (key: value format)
-        custom_specs = self._extract_custom_specs(text, category)
+        custom_specs = self._extract_custom_specs(text, category, scan)
         specifications.extend(custom_specs)
         
         self.logger.info("Specifications parsed", count=len(specifications))
@@ -124,23 +123,28 @@ class SpecificationParser:
         
         return "mandatory"  # Default
     
-    def _extract_custom_specs(self, text: str, category: str) -> List[Specification]:
+    def _extract_custom_specs(
+        self,
+        text: str,
+        category: str,
+        scan: Optional[ScanResult] = None
+    ) -> List[Specification]:
         """Extract custom specifications in key-value format.
         
         Args:
             text: Text content
             category: Category name
+            scan: Scan of text, if already available
             
         Returns:
             List of Specification objects
         """
         specs = []
+        scan = scan or self.scanner.scan(text)
         
         # Pattern: "Parameter: Value" or "Parameter - Value"
-        pattern = r'([A-Z][A-Za-z\s]+?)[:\-]\s*(.+?)(?:\n|$)'
-        matches = re.finditer(pattern, text, re.MULTILINE)
-        
-        for match in matches:
+        for hit in scan.hits('custom_spec'):
+            match = hit.match
             parameter = match.group(1).strip()
             value_text = match.group(2).strip()
             
@@ -149,7 +153,7 @@ class SpecificationParser:
                 continue
             
             # Try to extract unit from value
-            unit_match = re.search(r'(\d+\.?\d*)\s*([A-Za-z%]+)$', value_text)
+            unit_match = VALUE_UNIT_PATTERN.search(value_text)
             if unit_match:
                 value = unit_match.group(1)
                 unit = unit_match.group(2)
@@ -1,11 +1,16 @@
 """
 Testing Requirement Extractor - Extract testing, certification, and compliance requirements.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 import re
 import structlog
 
+from utils.text_scanner import (
+    TextScanner, ScanHit, get_rfp_scanner, line_bounds,
+    STANDARD_PATTERNS, CERTIFICATION_PATTERNS, TESTING_KEYWORDS, INSPECTION_KEYWORDS
+)
+
 logger = structlog.get_logger()
 
 
@@ -36,45 +41,20 @@ class TestingRequirement:
 class TestingRequirementExtractor:
     """Extract testing, certification, and compliance requirements."""
     
-    def __init__(self):
-        """Initialize testing requirement extractor."""
-        self.logger = logger.bind(component="TestingRequirementExtractor")
-        
-        # Standard patterns
-        self.standard_patterns = {
-            'is': r'IS[\s:-]*(\d+(?:\.\d+)?)',  # Indian Standards
-            'iec': r'IEC[\s:-]*(\d+(?:\.\d+)?)',  # International Electrotechnical Commission
-            'ieee': r'IEEE[\s:-]*(\d+(?:\.\d+)?)',  # IEEE Standards
-            'iso': r'ISO[\s:-]*(\d+(?:\.\d+)?)',  # ISO Standards
-            'bis': r'BIS[\s:-]*(\d+(?:\.\d+)?)',  # Bureau of Indian Standards
-            'astm': r'ASTM[\s:-]*([A-Z]?\d+)',  # ASTM Standards
-            'en': r'EN[\s:-]*(\d+(?:\.\d+)?)',  # European Standards
-        }
-        
-        # Certification patterns
-        self.certification_patterns = [
-            r'(?:CE|ce)\s*(?:marked|certification|certified)',
-            r'(?:UL|ul)\s*(?:listed|certification|certified)',
-            r'(?:RoHS|rohs)\s*(?:compliant|compliance)',
-            r'(?:FCC|fcc)\s*(?:certified|certification)',
-            r'(?:ISI|isi)\s*(?:mark|marked|certification)',
-        ]
+    def __init__(self, scanner: Optional[TextScanner] = None):
+        """Initialize testing requirement extractor.
         
-        # Testing keywords
-        self.testing_keywords = {
-            'type_test': ['type test', 'type testing', 'prototype test'],
-            'routine_test': ['routine test', 'production test', 'acceptance test'],
-            'sample_test': ['sample testing', 'sample test'],
-            'field_test': ['field test', 'site test', 'installation test'],
-            'performance_test': ['performance test', 'performance testing'],
-            'quality_test': ['quality test', 'quality assurance test'],
-        }
+        Args:
+            scanner: Shared text scanner (defaults to the global RFP scanner)
+        """
+        self.logger = logger.bind(component="TestingRequirementExtractor")
+        self.scanner = scanner or get_rfp_scanner()
         
-        # Inspection keywords
-        self.inspection_keywords = [
-            'inspection', 'factory acceptance test', 'FAT', 'SAT',
-            'site acceptance test', 'witness test', 'third party inspection'
-        ]
+        # Patterns and keywords are compiled into the shared scanner
+        self.standard_patterns = {name: pattern for name, (pattern, _) in STANDARD_PATTERNS.items()}
+        self.certification_patterns = [pattern for pattern, _ in CERTIFICATION_PATTERNS]
+        self.testing_keywords = TESTING_KEYWORDS
+        self.inspection_keywords = INSPECTION_KEYWORDS
     
     def extract_standards(self, text: str) -> List[str]:
         """Extract all standards mentioned in text.
@@ -85,17 +65,8 @@ class TestingRequirementExtractor:
         Returns:
             List of standard identifiers
         """
-        standards = []
-        
-        for std_type, pattern in self.standard_patterns.items():
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            
-            for match in matches:
-                std_id = match.group(0).strip()
-                if std_id not in standards:
-                    standards.append(std_id)
-        
-        return standards
+        scan = self.scanner.scan(text)
+        return self._unique_texts(scan.hits('standard') + scan.hits('catalog_standard'))
     
     def extract_certifications(self, text: str) -> List[str]:
         """Extract certification requirements.
@@ -106,17 +77,19 @@ class TestingRequirementExtractor:
         Returns:
             List of certifications
         """
-        certifications = []
+        return self._unique_texts(self.scanner.scan(text).hits('certification'))
+    
+    def extract_catalog_tests(self, text: str) -> List[str]:
+        """Extract tests from the testing catalogue mentioned by name.
         
-        for pattern in self.certification_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        Args:
+            text: Text content
             
-            for match in matches:
-                cert = match.group(0).strip()
-                if cert not in certifications:
-                    certifications.append(cert)
-        
-        return certifications
+        Returns:
+            Catalogue test names in order of first mention
+        """
+        hits = self.scanner.scan(text).hits('catalog_test')
+        return self._unique_names(sorted(hits, key=lambda hit: hit.start))
     
     def extract_testing_requirements(self, text: str) -> List[TestingRequirement]:
         """Extract all testing requirements.
@@ -127,22 +100,24 @@ class TestingRequirementExtractor:
         Returns:
             List of TestingRequirement objects
         """
+        scan = self.scanner.scan(text)
         requirements = []
         
         # Extract testing requirements
         for test_type, keywords in self.testing_keywords.items():
             for keyword in keywords:
-                pattern = re.compile(rf'.*{re.escape(keyword)}.*', re.IGNORECASE)
-                matches = pattern.finditer(text)
-                
-                for match in matches:
-                    source = match.group(0).strip()
+                for start, end in self._keyword_lines(text, scan.hits('test', keyword)):
+                    source = text[start:end].strip()
                     
                     # Check if mandatory
                     is_mandatory = self._is_mandatory(source)
                     
                     # Extract associated standards
-                    standards = self.extract_standards(source)
+                    standards = self._unique_texts(
+                        scan.hits_between('standard', start, end) +
+                        scan.hits_between('catalog_standard', start, end)
+                    )
+                    catalog_tests = self._unique_names(scan.hits_between('catalog_test', start, end))
                     
                     req = TestingRequirement(
                         requirement_type='test',
@@ -150,6 +125,7 @@ class TestingRequirementExtractor:
                         description=keyword,
                         is_mandatory=is_mandatory,
                         standard=standards[0] if standards else None,
+                        parameters={'catalog_tests': catalog_tests} if catalog_tests else None,
                         source_text=source
                     )
                     
@@ -181,11 +157,8 @@ class TestingRequirementExtractor:
         
         # Extract inspection requirements
         for keyword in self.inspection_keywords:
-            pattern = re.compile(rf'.*{re.escape(keyword)}.*', re.IGNORECASE)
-            matches = pattern.finditer(text)
-            
-            for match in matches:
-                source = match.group(0).strip()
+            for start, end in self._keyword_lines(text, scan.hits('inspection', keyword)):
+                source = text[start:end].strip()
                 
                 req = TestingRequirement(
                     requirement_type='inspection',
@@ -199,6 +172,32 @@ class TestingRequirementExtractor:
         
         return requirements
     
+    def _keyword_lines(self, text: str, hits: List[ScanHit]) -> List[Tuple[int, int]]:
+        """Bounds of each distinct line containing a keyword hit, in text order."""
+        lines = []
+        for hit in hits:
+            bounds = line_bounds(text, hit.start)
+            if not lines or lines[-1] != bounds:
+                lines.append(bounds)
+        return lines
+    
+    def _unique_texts(self, hits: List[ScanHit]) -> List[str]:
+        """Stripped hit texts without duplicates, in hit order."""
+        texts = []
+        for hit in hits:
+            value = hit.text.strip()
+            if value not in texts:
+                texts.append(value)
+        return texts
+    
+    def _unique_names(self, hits: List[ScanHit]) -> List[str]:
+        """Rule names of hits without duplicates, in hit order."""
+        names = []
+        for hit in hits:
+            if hit.name not in names:
+                names.append(hit.name)
+        return names
+    
     def _is_mandatory(self, text: str) -> bool:
         """Check if requirement is mandatory.
         
@@ -0,0 +1,52 @@
+"""
+Backfill the analytics rollup tables from rfps, workflow_runs and agent_logs.
+
+Run once after deploying the rollups, and again whenever base rows were
+changed outside the ORM (bulk UPDATEs, raw SQL) so the rollups drifted.
+The rebuild replaces all rollup rows in a single transaction.
+"""
+
+import sys
+import argparse
+import asyncio
+from pathlib import Path
+import logging
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from db.database import engine, AsyncSessionLocal, Base
+from db.analytics_rollups import ROLLUP_MODELS, rebuild_rollups
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def backfill_rollups(batch_size: int = 1000):
+    """Create the rollup tables if needed and rebuild them."""
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[model.__table__ for model in ROLLUP_MODELS]
+        )
+
+    async with AsyncSessionLocal() as session:
+        scanned = await session.run_sync(rebuild_rollups, batch_size)
+        await session.commit()
+
+    for table, count in scanned.items():
+        logger.info(f"Rolled up {count} rows from {table}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the analytics rollup tables")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Base rows fetched per round trip")
+    args = parser.parse_args()
+    asyncio.run(backfill_rollups(batch_size=args.batch_size))
@@ -0,0 +1,103 @@
+"""
+Micro-benchmark of rate limiting overhead.
+
+Measures the cost of one limit check for each store and algorithm, then
+the added latency per request of RateLimitMiddleware on a trivial
+endpoint served in-process.
+
+Usage:
+    python scripts/benchmark_rate_limit.py [--checks 200000] [--clients 10000] [--redis-url URL]
+"""
+
+import sys
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import httpx
+from fastapi import FastAPI
+
+from api.rate_limit import ALGORITHMS, MemoryStore, SharedMemoryStore, RedisStore, RateLimitMiddleware
+
+
+async def bench_store(store, algorithm, checks: int, clients: int) -> float:
+    """Microseconds per check, cycling through `clients` keys."""
+    if store.is_async:
+        await store.reset()
+    else:
+        store.reset()
+    keys = [f"client-{i}" for i in range(clients)]
+    start = time.perf_counter()
+    now = time.time()
+    for i in range(checks):
+        decision = store.hit(keys[i % clients], algorithm, now + i * 1e-5)
+        if store.is_async:
+            await decision
+    return (time.perf_counter() - start) / checks * 1e6
+
+
+async def bench_requests(app: FastAPI, requests: int) -> float:
+    """Microseconds per request through an in-process ASGI client."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):
+            await client.get("/ping")
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/ping")
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+def make_app(store=None) -> FastAPI:
+    app = FastAPI()
+    if store is not None:
+        app.add_middleware(RateLimitMiddleware, calls=10 ** 9, period=60, store=store)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rate limit stores and middleware")
+    parser.add_argument("--checks", type=int, default=200_000, help="Limit checks per store/algorithm")
+    parser.add_argument("--clients", type=int, default=10_000, help="Distinct client keys")
+    parser.add_argument("--requests", type=int, default=2_000, help="HTTP requests per middleware run")
+    parser.add_argument("--redis-url", default=None, help="Also benchmark RedisStore against this server")
+    args = parser.parse_args()
+
+    table_path = os.path.join(tempfile.mkdtemp(), "bench.table")
+    stores = {
+        "memory": MemoryStore,
+        "shared": lambda: SharedMemoryStore(table_path, slots=4 * args.clients),
+    }
+    if args.redis_url:
+        stores["redis"] = lambda: RedisStore(redis_url=args.redis_url)
+
+    print(f"{'store':<8} {'algorithm':<15} {'us/check':>10}")
+    for store_name, factory in stores.items():
+        for algorithm_name, algorithm_class in ALGORITHMS.items():
+            store = factory()
+            checks = args.checks if store_name != "redis" else args.checks // 20
+            per_check = asyncio.run(bench_store(store, algorithm_class(100, 60), checks, args.clients))
+            print(f"{store_name:<8} {algorithm_name:<15} {per_check:>10.2f}")
+
+    baseline = asyncio.run(bench_requests(make_app(), args.requests))
+    print(f"\n{'middleware':<24} {'us/request':>10} {'overhead':>10}")
+    print(f"{'none':<24} {baseline:>10.1f} {'-':>10}")
+    for store_name, factory in stores.items():
+        per_request = asyncio.run(bench_requests(make_app(factory()), args.requests))
+        print(f"{store_name:<24} {per_request:>10.1f} {per_request - baseline:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Build and publish the shared catalog snapshot.
+
+Parses the product, pricing, testing and standards sources once and
+atomically swaps in a new memory-mapped snapshot. Workers map it when they
+next start (or call DataService.initialize(force_reload=True)); running
+workers keep serving the snapshot they already mapped. Workers also rebuild
+on startup by themselves when the source files changed, so this script is
+only needed to pre-build before a rolling restart.
+
+Usage:
+    python scripts/build_catalog_snapshot.py [--snapshot-dir DIR]
+"""
+
+import sys
+import argparse
+import asyncio
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from services.data_service import DataService
+
+
+async def build(snapshot_dir):
+    service = DataService(snapshot_dir=snapshot_dir)
+    if not service.snapshot_dir:
+        print("No snapshot directory configured (set CATALOG_SNAPSHOT_DIR or pass --snapshot-dir)")
+        return 1
+
+    snapshot = await service.build_snapshot()
+    if snapshot.path is None:
+        print("Snapshot not published: one or more sources failed to load")
+        return 1
+
+    stats = snapshot.stats()
+    print(f"Published {stats['path']} ({stats['size_bytes'] / 1e6:.1f} MB, {stats['strings']} strings)")
+    for table, rows in stats["tables"].items():
+        print(f"  {table:<10} {rows:>8} rows")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the shared catalog snapshot")
+    parser.add_argument("--snapshot-dir", default=None, help="Override settings.catalog_snapshot_dir")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(build(args.snapshot_dir)))
+
+
+if __name__ == "__main__":
+    main()
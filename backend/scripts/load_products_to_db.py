@@ -2,18 +2,21 @@
 Load Products to Database - Import CSV data into SQLite
 
 This script loads all OEM product data from CSV files into the database.
+Only files that changed since the last run are loaded; pass --full to
+reload everything.
 """
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import argparse
 import asyncio
 from sqlalchemy import select
 from db.database import AsyncSessionLocal, engine, Base
-from db.product_models import OEMProduct, ProductInventory
-from agents.data_loader import ProductDataLoader
+from db.product_models import OEMProduct
+from db.optimization import create_product_search_index
+from agents.catalog_loader import BulkCatalogLoader
 import structlog
-from datetime import datetime
 
 logger = structlog.get_logger()
 
@@ -23,27 +26,16 @@ async def create_tables():
     logger.info("Creating database tables...")
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_product_search_index)
     logger.info("Database tables created")
 
 
-async def clear_existing_products():
-    """Clear existing products from database."""
-    async with AsyncSessionLocal() as db:
-        result = await db.execute(select(OEMProduct))
-        existing = result.scalars().all()
-        
-        if existing:
-            logger.info(f"Clearing {len(existing)} existing products")
-            for product in existing:
-                await db.delete(product)
-            await db.commit()
-            logger.info("Existing products cleared")
-        else:
-            logger.info("No existing products to clear")
-
-
-async def load_products_from_csv():
-    """Load products from CSV files into database."""
+async def load_products_from_csv(full: bool = False):
+    """Load products from CSV files into database.
+    
+    Args:
+        full: Reload every CSV even if unchanged since the last run
+    """
     
     logger.info("="*80)
     logger.info("LOADING OEM PRODUCTS FROM CSV FILES TO DATABASE")
@@ -52,93 +44,20 @@ async def load_products_from_csv():
     # Step 1: Create tables
     await create_tables()
     
-    # Step 2: Load CSV data
+    # Step 2: Bulk upsert changed CSV files
     logger.info("\nStep 1: Loading CSV data...")
-    data_loader = ProductDataLoader(base_path="..")
-    products = data_loader.load_all_products()
-    logger.info(f"Loaded {len(products)} products from CSV files")
-    
-    # Step 3: Clear existing data (optional)
-    logger.info("\nStep 2: Clearing existing database...")
-    await clear_existing_products()
+    loader = BulkCatalogLoader(engine=engine, base_path="..")
+    result = await loader.load(force=full)
     
-    # Step 4: Insert products into database
-    logger.info("\nStep 3: Inserting products into database...")
-    
-    async with AsyncSessionLocal() as db:
-        inserted_count = 0
-        error_count = 0
-        
-        for idx, product_data in enumerate(products, 1):
-            try:
-                # Check for duplicate product_id and skip if exists
-                product_id = product_data.get('product_id')
-                result = await db.execute(
-                    select(OEMProduct).where(OEMProduct.product_id == product_id)
-                )
-                if result.scalar_one_or_none():
-                    # Skip duplicate
-                    continue
-                
-                # Create OEMProduct instance
-                product = OEMProduct(
-                    product_id=product_id,
-                    manufacturer=product_data.get('manufacturer'),
-                    model_number=product_data.get('model_number'),
-                    product_name=product_data.get('product_name'),
-                    category=product_data.get('category'),
-                    specifications=product_data.get('specifications', {}),
-                    unit_price=product_data.get('unit_price', 0.0),
-                    stock_quantity=product_data.get('stock', 1000),
-                    available_stock=product_data.get('stock', 1000),
-                    delivery_days=product_data.get('delivery_days', 7),
-                    certifications=product_data.get('certifications', []),
-                    standards=product_data.get('standards', []),
-                    currency='INR',
-                    is_active=True,
-                    data_source='CSV Import',
-                    extracted_date=datetime.now()
-                )
-                
-                # Extract specific fields from specifications
-                specs = product_data.get('specifications', {})
-                product.voltage_rating = specs.get('voltage_rating')
-                product.conductor_material = specs.get('conductor_material')
-                product.conductor_size = specs.get('conductor_size')
-                product.insulation_type = specs.get('insulation')
-                product.max_temperature = specs.get('temperature_rating')
-                product.current_rating = specs.get('current_rating')
-                
-                if 'cores' in specs:
-                    try:
-                        product.no_of_cores = int(specs['cores'])
-                    except:
-                        pass
-                
-                db.add(product)
-                inserted_count += 1
-                
-                # Commit in batches of 100
-                if idx % 100 == 0:
-                    await db.commit()
-                    logger.info(f"Inserted {inserted_count} products...")
-                
-            except Exception as e:
-                error_count += 1
-                logger.error(f"Failed to insert product {product_data.get('product_id')}: {e}")
-                continue
-        
-        # Final commit
-        await db.commit()
-        
-        logger.info("\n" + "="*80)
-        logger.info(f"DATABASE LOADING COMPLETE")
-        logger.info(f"Total Products Inserted: {inserted_count}")
-        logger.info(f"Errors: {error_count}")
-        logger.info("="*80)
+    logger.info("\n" + "="*80)
+    logger.info(f"DATABASE LOADING COMPLETE")
+    logger.info(f"Files loaded: {len(result.files_loaded)}, unchanged: {len(result.files_skipped)}")
+    logger.info(f"Total Products Upserted: {result.rows_upserted}")
+    logger.info(f"Products Deactivated: {result.rows_deactivated}")
+    logger.info("="*80)
     
-    # Step 5: Verify insertion
-    logger.info("\nStep 4: Verifying database...")
+    # Step 3: Verify insertion
+    logger.info("\nStep 2: Verifying database...")
     async with AsyncSessionLocal() as db:
         result = await db.execute(select(OEMProduct))
         all_products = result.scalars().all()
@@ -164,4 +83,7 @@ async def load_products_from_csv():
 
 
 if __name__ == "__main__":
-    asyncio.run(load_products_from_csv())
+    parser = argparse.ArgumentParser(description="Load OEM product CSVs into the database")
+    parser.add_argument("--full", action="store_true", help="Reload all files, ignoring the manifest")
+    args = parser.parse_args()
+    asyncio.run(load_products_from_csv(full=args.full))
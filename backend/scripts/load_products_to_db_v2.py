@@ -3,16 +3,16 @@ Load OEM Product Data from CSV files into SQLite Database.
 
 This script:
 1. Creates database tables
-2. Loads products from CSV using ProductDataLoader
-3. Inserts products into database with duplicate handling
+2. Bulk-upserts products from changed CSV files (BulkCatalogLoader)
+3. Verifies the loaded catalog
+
+Pass --full to reload every CSV regardless of the checksum manifest.
 """
 
 import sys
-import os
+import argparse
 import asyncio
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict, Any
 import logging
 
 # Add backend directory to path
@@ -21,8 +21,9 @@ sys.path.insert(0, str(backend_dir))
 
 from sqlalchemy import select
 from db.database import engine, AsyncSessionLocal, Base
-from db.product_models import OEMProduct, ProductInventory, PriceHistory
-from agents.data_loader import ProductDataLoader
+from db.product_models import OEMProduct
+from db.optimization import create_product_search_index
+from agents.catalog_loader import BulkCatalogLoader
 
 # Setup logging
 logging.basicConfig(
@@ -40,22 +41,19 @@ async def create_tables():
         
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
+        
+        # Product search index (kept in sync with oem_products by triggers)
+        await conn.run_sync(create_product_search_index)
     
     logger.info("Database tables created successfully")
 
 
-async def clear_existing_products():
-    """Clear all existing products from database."""
-    async with AsyncSessionLocal() as db:
-        # Delete all products
-        from sqlalchemy import delete
-        await db.execute(delete(OEMProduct))
-        await db.commit()
-        logger.info("Cleared all existing products from database")
-
-
-async def load_products_to_database():
-    """Main function to load products into database."""
+async def load_products_to_database(full: bool = False):
+    """Main function to load products into database.
+    
+    Args:
+        full: Reload every CSV even if unchanged since the last run
+    """
     
     logger.info("="*80)
     logger.info("DATABASE LOADING PROCESS STARTED")
@@ -65,99 +63,16 @@ async def load_products_to_database():
     logger.info("\nStep 1: Creating database schema...")
     await create_tables()
     
-    # Step 2: Clear existing data
-    logger.info("\nStep 2: Clearing existing database...")
-    await clear_existing_products()
+    # Step 2: Bulk upsert changed CSV files
+    logger.info("\nStep 2: Loading products from CSV files...")
+    loader = BulkCatalogLoader(engine=engine)
+    load_result = await loader.load(force=full)
     
-    # Step 3: Load products from CSV
-    logger.info("\nStep 3: Loading products from CSV files...")
-    data_loader = ProductDataLoader()
-    products = data_loader.load_all_products()
-    
-    logger.info(f"\nLoaded {len(products)} products from CSV files")
-    logger.info("Breakdown by manufacturer:")
-    for manufacturer in ['Havells', 'Polycab', 'KEI', 'Finolex', 'RR Kabel']:
-        count = sum(1 for p in products if p.get('manufacturer') == manufacturer)
-        logger.info(f"  - {manufacturer}: {count} products")
-    
-    # Step 4: Insert products into database
-    logger.info("\nStep 4: Inserting products into database...")
-    
-    inserted_count = 0
-    error_count = 0
-    batch_size = 50  # Smaller batches for better error handling
-    
-    async with AsyncSessionLocal() as db:
-        for idx, product_data in enumerate(products, 1):
-            try:
-                # Create product instance
-                product = OEMProduct(
-                    product_id=product_data.get('product_id'),
-                    manufacturer=product_data.get('manufacturer'),
-                    model_number=product_data.get('model_number'),
-                    product_name=product_data.get('product_name', ''),
-                    category=product_data.get('category', 'General'),
-                    specifications=product_data.get('specifications', {}),
-                    unit_price=product_data.get('unit_price', 0.0),
-                    stock_quantity=product_data.get('stock', 1000),
-                    available_stock=product_data.get('stock', 1000),
-                    delivery_days=product_data.get('delivery_days', 7),
-                    certifications=product_data.get('certifications', []),
-                    standards=product_data.get('standards', []),
-                    currency='INR',
-                    is_active=True,
-                    data_source='CSV Import',
-                    extracted_date=datetime.now()
-                )
-                
-                # Extract specific technical specifications
-                specs = product_data.get('specifications', {})
-                product.voltage_rating = specs.get('voltage_rating')
-                product.conductor_material = specs.get('conductor_material')
-                product.conductor_size = specs.get('conductor_size')
-                product.insulation_type = specs.get('insulation')
-                product.max_temperature = specs.get('temperature_rating')
-                product.current_rating = specs.get('current_rating')
-                
-                if 'cores' in specs:
-                    try:
-                        product.no_of_cores = int(specs['cores'])
-                    except:
-                        pass
-                
-                db.add(product)
-                inserted_count += 1
-                
-                # Commit in batches
-                if idx % batch_size == 0:
-                    try:
-                        await db.commit()
-                        logger.info(f"  Committed batch: {inserted_count}/{idx} products inserted")
-                    except Exception as batch_error:
-                        logger.error(f"  Batch commit failed: {batch_error}")
-                        await db.rollback()
-                        error_count += batch_size
-                        inserted_count -= batch_size
-                
-            except Exception as e:
-                error_count += 1
-                product_id = product_data.get('product_id', 'UNKNOWN')
-                manufacturer = product_data.get('manufacturer', 'UNKNOWN')
-                logger.error(f"  Failed to process product {idx} - {manufacturer} - {product_id}: {str(e)[:200]}")
-                import traceback
-                logger.error(f"  Traceback: {traceback.format_exc()[:500]}")
-                continue
-        
-        # Final commit for remaining products
-        try:
-            await db.commit()
-            logger.info(f"  Final commit: All products processed")
-        except Exception as final_error:
-            logger.error(f"  Final commit failed: {final_error}")
-            await db.rollback()
+    logger.info(f"\nFiles loaded: {', '.join(load_result.files_loaded) or 'none'}")
+    logger.info(f"Files unchanged: {', '.join(load_result.files_skipped) or 'none'}")
     
-    # Step 5: Verify insertion
-    logger.info("\nStep 5: Verifying database insertion...")
+    # Step 3: Verify insertion
+    logger.info("\nStep 3: Verifying database insertion...")
     async with AsyncSessionLocal() as db:
         result = await db.execute(select(OEMProduct))
         db_products = result.scalars().all()
@@ -166,8 +81,8 @@ async def load_products_to_database():
         logger.info("DATABASE LOADING COMPLETE")
         logger.info("="*80)
         logger.info(f"Total Products in Database: {len(db_products)}")
-        logger.info(f"Successfully Inserted: {inserted_count}")
-        logger.info(f"Errors: {error_count}")
+        logger.info(f"Upserted: {load_result.rows_upserted}")
+        logger.info(f"Deactivated: {load_result.rows_deactivated}")
         
         # Count by manufacturer
         logger.info("\nProducts by manufacturer in database:")
@@ -179,4 +94,7 @@ async def load_products_to_database():
 
 
 if __name__ == "__main__":
-    asyncio.run(load_products_to_database())
+    parser = argparse.ArgumentParser(description="Load OEM product CSVs into the database")
+    parser.add_argument("--full", action="store_true", help="Reload all files, ignoring the manifest")
+    args = parser.parse_args()
+    asyncio.run(load_products_to_database(full=args.full))
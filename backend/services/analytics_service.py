@@ -1,8 +1,11 @@
 """
 Comprehensive Analytics Service
 Tracks RFP processing, match accuracy, win rates, agent performance, and system health
+
+Historical statistics read the daily rollup tables in db.analytics_rollups,
+so their cost depends on the period length rather than on the history size.
 """
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional, Any
 from collections import defaultdict
 import statistics
@@ -11,6 +14,14 @@ from sqlalchemy.orm import Session
 
 from db.database import get_db, AsyncSessionLocal
 from db.models import RFP, Product, AgentLog, WorkflowRun
+from db.analytics_rollups import (
+    NO_KEY,
+    RFPDailyRollup,
+    WorkflowDailyRollup,
+    CustomerDailyRollup,
+    CategoryDailyRollup,
+    AgentDailyRollup,
+)
 
 
 class AnalyticsService:
@@ -21,51 +32,57 @@ class AnalyticsService:
     
     # ==================== RFP Processing Analytics ====================
     
-    def get_rfp_processing_stats(self, days: int = 30) -> Dict[str, Any]:
-        """Get comprehensive RFP processing statistics from real RFP table"""
-        start_date = datetime.utcnow() - timedelta(days=days)
+    @staticmethod
+    def _start_day(days: int) -> date:
+        """First day included in a window of the last `days` days (rollups are per day)"""
+        return (datetime.utcnow() - timedelta(days=days)).date()
+    
+    def _rfp_status_totals(self, start_day: Optional[date] = None) -> Dict[str, Dict[str, float]]:
+        """Sum the daily RFP rollup per status from start_day on (all history if None)"""
+        query = self.db.query(
+            RFPDailyRollup.status,
+            func.sum(RFPDailyRollup.rfps),
+            func.sum(RFPDailyRollup.processing_time_sum),
+            func.sum(RFPDailyRollup.processing_time_count)
+        )
+        if start_day is not None:
+            query = query.filter(RFPDailyRollup.day >= start_day)
         
-        # Total RFPs from RFP table
-        total_rfps = self.db.query(RFP).filter(
-            RFP.created_at >= start_date
-        ).count()
+        return {
+            status: {'rfps': rfps, 'time_sum': time_sum or 0, 'time_count': time_count or 0}
+            for status, rfps, time_sum, time_count in query.group_by(RFPDailyRollup.status).all()
+            if rfps
+        }
+    
+    def get_rfp_processing_stats(self, days: int = 30) -> Dict[str, Any]:
+        """Get comprehensive RFP processing statistics from the RFP rollup"""
+        totals = self._rfp_status_totals(self._start_day(days))
+        total_rfps = sum(t['rfps'] for t in totals.values())
         
         # If no recent RFPs, get all RFPs
         if total_rfps == 0:
-            total_rfps = self.db.query(RFP).count()
-            start_date = datetime.utcnow() - timedelta(days=365)  # Look back 1 year
+            total_rfps = sum(t['rfps'] for t in self._rfp_status_totals().values())
+            totals = self._rfp_status_totals(self._start_day(365))  # Look back 1 year
         
-        # RFPs by status
-        status_counts = self.db.query(
-            RFP.status,
-            func.count(RFP.id)
-        ).filter(
-            RFP.created_at >= start_date
-        ).group_by(RFP.status).all()
+        status_counts = {status: t['rfps'] for status, t in totals.items()}
         
         # Count in progress (discovered + processing)
-        in_progress = sum(c for s, c in status_counts if s.value in ['discovered', 'processing'])
+        in_progress = sum(c for s, c in status_counts.items() if s in ['discovered', 'processing'])
         
         # Average processing time
-        rfps_with_time = self.db.query(RFP).filter(
-            and_(
-                RFP.created_at >= start_date,
-                RFP.processing_time_seconds.isnot(None)
-            )
-        ).all()
-        
-        avg_processing_time = statistics.mean([
-            r.processing_time_seconds for r in rfps_with_time
-        ]) if rfps_with_time else 0
+        time_count = sum(t['time_count'] for t in totals.values())
+        avg_processing_time = (
+            sum(t['time_sum'] for t in totals.values()) / time_count
+        ) if time_count else 0
         
         # Success rate (reviewed, approved, submitted)
-        success_count = sum(c for s, c in status_counts if s.value in ['reviewed', 'approved', 'submitted'])
+        success_count = sum(c for s, c in status_counts.items() if s in ['reviewed', 'approved', 'submitted'])
         success_rate = (success_count / total_rfps * 100) if total_rfps > 0 else 0
         
         return {
             'total_rfps': total_rfps,
             'in_progress': in_progress,
-            'status_breakdown': {s.value: c for s, c in status_counts},
+            'status_breakdown': status_counts,
             'avg_processing_time_seconds': round(avg_processing_time, 2),
             'success_rate_percent': round(success_rate, 2),
             'period_days': days
@@ -90,220 +107,174 @@ class AnalyticsService:
     def _get_daily_volume(self, start_date: datetime) -> List[Dict[str, Any]]:
         """Get daily RFP processing volume"""
         daily_data = self.db.query(
-            func.date(WorkflowRun.created_at).label('date'),
-            func.count(WorkflowRun.id).label('count')
+            WorkflowDailyRollup.day,
+            func.sum(WorkflowDailyRollup.runs)
         ).filter(
-            WorkflowRun.created_at >= start_date
+            WorkflowDailyRollup.day >= start_date.date()
         ).group_by(
-            func.date(WorkflowRun.created_at)
-        ).order_by('date').all()
+            WorkflowDailyRollup.day
+        ).order_by(WorkflowDailyRollup.day).all()
         
         return [
-            {'date': str(date), 'count': count}
-            for date, count in daily_data
+            {'date': str(day), 'count': count}
+            for day, count in daily_data
+            if count
         ]
     
     # ==================== Match Accuracy Analytics ====================
     
     def get_match_accuracy_stats(self, days: int = 30) -> Dict[str, Any]:
-        """Calculate product matching accuracy metrics"""
-        start_date = datetime.utcnow() - timedelta(days=days)
-        
-        # Get completed workflows with matching data
-        workflows = self.db.query(WorkflowRun).filter(
-            and_(
-                WorkflowRun.status == 'completed',
-                WorkflowRun.created_at >= start_date,
-                WorkflowRun.stage_results.isnot(None)
-            )
+        """Calculate product matching accuracy metrics from the category rollup"""
+        rows = self.db.query(
+            CategoryDailyRollup.category,
+            CategoryDailyRollup.match_type,
+            func.sum(CategoryDailyRollup.matches),
+            func.sum(CategoryDailyRollup.category_score_sum),
+            func.sum(CategoryDailyRollup.match_scores),
+            func.sum(CategoryDailyRollup.match_score_sum),
+            func.sum(CategoryDailyRollup.confidences),
+            func.sum(CategoryDailyRollup.confidence_sum),
+            func.sum(CategoryDailyRollup.high_confidence),
+            func.sum(CategoryDailyRollup.low_confidence)
+        ).filter(
+            CategoryDailyRollup.day >= self._start_day(days)
+        ).group_by(
+            CategoryDailyRollup.category,
+            CategoryDailyRollup.match_type
         ).all()
         
-        match_scores = []
-        confidence_scores = []
+        totals = defaultdict(float)
         match_types = defaultdict(int)
+        category_totals = defaultdict(lambda: {'matches': 0, 'score_sum': 0.0})
         
-        for workflow in workflows:
-            stage_results = workflow.stage_results or {}
+        for (category, match_type, matches, category_score_sum, match_scores, match_score_sum,
+             confidences, confidence_sum, high_confidence, low_confidence) in rows:
+            if not matches:
+                continue
+            
+            totals['match_scores'] += match_scores
+            totals['match_score_sum'] += match_score_sum
+            totals['confidences'] += confidences
+            totals['confidence_sum'] += confidence_sum
+            totals['high_confidence'] += high_confidence
+            totals['low_confidence'] += low_confidence
             
-            # Extract matching data
-            if 'product_matching' in stage_results:
-                matching_data = stage_results['product_matching']
-                
-                if isinstance(matching_data, dict):
-                    # Match score
-                    if 'match_score' in matching_data:
-                        match_scores.append(matching_data['match_score'])
-                    
-                    # Confidence
-                    if 'confidence' in matching_data:
-                        confidence_scores.append(matching_data['confidence'])
-                    
-                    # Match type
-                    if 'match_type' in matching_data:
-                        match_types[matching_data['match_type']] += 1
-        
-        avg_match_score = statistics.mean(match_scores) if match_scores else 0
-        avg_confidence = statistics.mean(confidence_scores) if confidence_scores else 0
+            if match_type != NO_KEY:
+                match_types[match_type] += matches
+            
+            category_totals[category]['matches'] += matches
+            category_totals[category]['score_sum'] += category_score_sum
+        
+        avg_match_score = (totals['match_score_sum'] / totals['match_scores']) if totals['match_scores'] else 0
+        avg_confidence = (totals['confidence_sum'] / totals['confidences']) if totals['confidences'] else 0
         
         # Accuracy by category
-        category_accuracy = self._calculate_category_accuracy(workflows)
+        category_accuracy = {
+            category: round(data['score_sum'] / data['matches'], 4)
+            for category, data in category_totals.items()
+        }
         
         return {
             'avg_match_score': round(avg_match_score, 4),
             'avg_confidence': round(avg_confidence, 4),
             'match_type_distribution': dict(match_types),
-            'total_matches': len(match_scores),
+            'total_matches': int(totals['match_scores']),
             'category_accuracy': category_accuracy,
-            'high_confidence_matches': sum(1 for c in confidence_scores if c > 0.8),
-            'low_confidence_matches': sum(1 for c in confidence_scores if c < 0.5),
+            'high_confidence_matches': int(totals['high_confidence']),
+            'low_confidence_matches': int(totals['low_confidence']),
             'period_days': days
         }
     
-    def _calculate_category_accuracy(self, workflows: List[WorkflowRun]) -> Dict[str, float]:
-        """Calculate matching accuracy by product category"""
-        category_scores = defaultdict(list)
-        
-        for workflow in workflows:
-            stage_results = workflow.stage_results or {}
-            if 'product_matching' in stage_results:
-                matching_data = stage_results['product_matching']
-                if isinstance(matching_data, dict):
-                    category = matching_data.get('category', 'unknown')
-                    score = matching_data.get('match_score', 0)
-                    category_scores[category].append(score)
-        
-        return {
-            category: round(statistics.mean(scores), 4)
-            for category, scores in category_scores.items()
-            if scores
-        }
-    
     # ==================== Win Rate Analytics ====================
     
     def get_win_rate_stats(self, days: int = 90) -> Dict[str, Any]:
-        """Calculate RFP win rate statistics"""
-        start_date = datetime.utcnow() - timedelta(days=days)
-        
-        # Get completed RFPs
-        completed_rfps = self.db.query(WorkflowRun).filter(
-            and_(
-                WorkflowRun.status == 'completed',
-                WorkflowRun.created_at >= start_date
-            )
+        """Calculate RFP win rate statistics from the customer rollup"""
+        rows = self.db.query(
+            CustomerDailyRollup.customer_id,
+            CustomerDailyRollup.value_range,
+            func.sum(CustomerDailyRollup.completed),
+            func.sum(CustomerDailyRollup.won),
+            func.sum(CustomerDailyRollup.lost),
+            func.sum(CustomerDailyRollup.won_value_sum),
+            func.sum(CustomerDailyRollup.lost_value_sum)
+        ).filter(
+            CustomerDailyRollup.day >= self._start_day(days)
+        ).group_by(
+            CustomerDailyRollup.customer_id,
+            CustomerDailyRollup.value_range
         ).all()
         
-        total_completed = len(completed_rfps)
+        total_completed = 0
         won_count = 0
         lost_count = 0
-        pending_count = 0
+        won_value_sum = 0.0
+        lost_value_sum = 0.0
+        customer_data = defaultdict(lambda: {'total': 0, 'won': 0})
+        range_data = defaultdict(lambda: {'total': 0, 'won': 0})
         
-        # Analyze win/loss data
-        for workflow in completed_rfps:
-            metadata = workflow.metadata or {}
-            outcome = metadata.get('outcome', 'pending')
+        for customer, value_range, completed, won, lost, won_values, lost_values in rows:
+            if not completed:
+                continue
             
-            if outcome == 'won':
-                won_count += 1
-            elif outcome == 'lost':
-                lost_count += 1
-            else:
-                pending_count += 1
+            total_completed += completed
+            won_count += won
+            lost_count += lost
+            won_value_sum += won_values
+            lost_value_sum += lost_values
+            
+            # Win rate by customer
+            customer_data[customer or None]['total'] += completed
+            customer_data[customer or None]['won'] += won
+            
+            # Win rate by value range
+            if value_range != NO_KEY:
+                range_data[value_range]['total'] += completed
+                range_data[value_range]['won'] += won
         
+        pending_count = total_completed - won_count - lost_count
         win_rate = (won_count / total_completed * 100) if total_completed > 0 else 0
         
-        # Win rate by customer
-        customer_win_rates = self._calculate_customer_win_rates(completed_rfps)
-        
-        # Win rate by value range
-        value_win_rates = self._calculate_value_win_rates(completed_rfps)
-        
-        # Average quote value for won vs lost
-        won_values = [
-            w.metadata.get('quote_value', 0) 
-            for w in completed_rfps 
-            if w.metadata and w.metadata.get('outcome') == 'won'
-        ]
-        lost_values = [
-            w.metadata.get('quote_value', 0) 
-            for w in completed_rfps 
-            if w.metadata and w.metadata.get('outcome') == 'lost'
-        ]
-        
         return {
             'total_completed': total_completed,
             'won_count': won_count,
             'lost_count': lost_count,
             'pending_count': pending_count,
             'win_rate_percent': round(win_rate, 2),
-            'customer_win_rates': customer_win_rates,
-            'value_range_win_rates': value_win_rates,
-            'avg_won_value': round(statistics.mean(won_values), 2) if won_values else 0,
-            'avg_lost_value': round(statistics.mean(lost_values), 2) if lost_values else 0,
+            'customer_win_rates': self._win_rates(customer_data),
+            'value_range_win_rates': self._win_rates(range_data),
+            'avg_won_value': round(won_value_sum / won_count, 2) if won_count else 0,
+            'avg_lost_value': round(lost_value_sum / lost_count, 2) if lost_count else 0,
             'period_days': days
         }
     
-    def _calculate_customer_win_rates(self, workflows: List[WorkflowRun]) -> Dict[str, Dict[str, Any]]:
-        """Calculate win rates by customer"""
-        customer_data = defaultdict(lambda: {'total': 0, 'won': 0})
-        
-        for workflow in workflows:
-            customer = workflow.customer_id
-            outcome = (workflow.metadata or {}).get('outcome', 'pending')
-            
-            customer_data[customer]['total'] += 1
-            if outcome == 'won':
-                customer_data[customer]['won'] += 1
-        
+    @staticmethod
+    def _win_rates(groups: Dict[Any, Dict[str, int]]) -> Dict[Any, Dict[str, Any]]:
+        """Format total/won counts per group with their win rate"""
         return {
-            customer: {
+            name: {
                 'total': data['total'],
                 'won': data['won'],
                 'win_rate': round(data['won'] / data['total'] * 100, 2) if data['total'] > 0 else 0
             }
-            for customer, data in customer_data.items()
-        }
-    
-    def _calculate_value_win_rates(self, workflows: List[WorkflowRun]) -> Dict[str, Dict[str, Any]]:
-        """Calculate win rates by quote value ranges"""
-        ranges = {
-            '0-100k': (0, 100000),
-            '100k-500k': (100000, 500000),
-            '500k-1M': (500000, 1000000),
-            '1M+': (1000000, float('inf'))
-        }
-        
-        range_data = defaultdict(lambda: {'total': 0, 'won': 0})
-        
-        for workflow in workflows:
-            metadata = workflow.metadata or {}
-            value = metadata.get('quote_value', 0)
-            outcome = metadata.get('outcome', 'pending')
-            
-            for range_name, (min_val, max_val) in ranges.items():
-                if min_val <= value < max_val:
-                    range_data[range_name]['total'] += 1
-                    if outcome == 'won':
-                        range_data[range_name]['won'] += 1
-                    break
-        
-        return {
-            range_name: {
-                'total': data['total'],
-                'won': data['won'],
-                'win_rate': round(data['won'] / data['total'] * 100, 2) if data['total'] > 0 else 0
-            }
-            for range_name, data in range_data.items()
+            for name, data in groups.items()
         }
     
     # ==================== Agent Performance Analytics ====================
     
     def get_agent_performance_stats(self, days: int = 30) -> Dict[str, Any]:
-        """Analyze agent performance metrics"""
-        start_date = datetime.utcnow() - timedelta(days=days)
-        
-        # Get agent logs
-        agent_logs = self.db.query(AgentLog).filter(
-            AgentLog.timestamp >= start_date
+        """Analyze agent performance metrics from the agent rollup"""
+        rows = self.db.query(
+            AgentDailyRollup.agent_name,
+            AgentDailyRollup.action,
+            func.sum(AgentDailyRollup.actions),
+            func.sum(AgentDailyRollup.successes),
+            func.sum(AgentDailyRollup.failures),
+            func.sum(AgentDailyRollup.duration_sum)
+        ).filter(
+            AgentDailyRollup.day >= self._start_day(days)
+        ).group_by(
+            AgentDailyRollup.agent_name,
+            AgentDailyRollup.action
         ).all()
         
         agent_stats = defaultdict(lambda: {
@@ -314,21 +285,16 @@ class AnalyticsService:
             'action_types': defaultdict(int)
         })
         
-        for log in agent_logs:
-            agent_name = log.agent_name
-            stats = agent_stats[agent_name]
-            
-            stats['total_actions'] += 1
+        for agent_name, action, actions, successes, failures, duration_sum in rows:
+            if not actions:
+                continue
             
-            if log.status == 'success':
-                stats['successful_actions'] += 1
-            elif log.status == 'error':
-                stats['failed_actions'] += 1
-            
-            if log.duration:
-                stats['total_duration'] += log.duration
-            
-            stats['action_types'][log.action] += 1
+            stats = agent_stats[agent_name]
+            stats['total_actions'] += actions
+            stats['successful_actions'] += successes
+            stats['failed_actions'] += failures
+            stats['total_duration'] += duration_sum or 0
+            stats['action_types'][action or None] += actions
         
         # Calculate metrics
         agent_metrics = {}
@@ -440,40 +406,38 @@ class AnalyticsService:
             'generated_at': datetime.utcnow().isoformat()
         }
     
+    def _workflow_status_totals(self, start_day: Optional[date] = None,
+                                end_day: Optional[date] = None) -> Dict[str, int]:
+        """Sum the daily workflow rollup per status over [start_day, end_day)"""
+        query = self.db.query(
+            WorkflowDailyRollup.status,
+            func.sum(WorkflowDailyRollup.runs)
+        )
+        if start_day is not None:
+            query = query.filter(WorkflowDailyRollup.day >= start_day)
+        if end_day is not None:
+            query = query.filter(WorkflowDailyRollup.day < end_day)
+        
+        return {
+            status: runs
+            for status, runs in query.group_by(WorkflowDailyRollup.status).all()
+            if runs
+        }
+    
     def _generate_summary_stats(self, days: int) -> Dict[str, Any]:
         """Generate high-level summary statistics"""
-        start_date = datetime.utcnow() - timedelta(days=days)
-        
-        total_rfps = self.db.query(WorkflowRun).filter(
-            WorkflowRun.created_at >= start_date
-        ).count()
-        
-        completed = self.db.query(WorkflowRun).filter(
-            and_(
-                WorkflowRun.status == 'completed',
-                WorkflowRun.created_at >= start_date
-            )
-        ).count()
+        start_day = self._start_day(days)
         
-        in_progress = self.db.query(WorkflowRun).filter(
-            WorkflowRun.status == 'in_progress'
-        ).count()
+        current = self._workflow_status_totals(start_day)
+        total_rfps = sum(current.values())
+        completed = current.get('completed', 0)
+        failed = current.get('failed', 0)
         
-        failed = self.db.query(WorkflowRun).filter(
-            and_(
-                WorkflowRun.status == 'failed',
-                WorkflowRun.created_at >= start_date
-            )
-        ).count()
+        in_progress = self._workflow_status_totals().get('in_progress', 0)
         
         # Calculate trends (compare with previous period)
-        previous_start = start_date - timedelta(days=days)
-        previous_total = self.db.query(WorkflowRun).filter(
-            and_(
-                WorkflowRun.created_at >= previous_start,
-                WorkflowRun.created_at < start_date
-            )
-        ).count()
+        previous_start = start_day - timedelta(days=days)
+        previous_total = sum(self._workflow_status_totals(previous_start, start_day).values())
         
         trend = ((total_rfps - previous_total) / previous_total * 100) if previous_total > 0 else 0
         
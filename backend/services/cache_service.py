@@ -1,67 +1,145 @@
 """
 Caching Service for Performance Optimization
-Supports in-memory caching with TTL and optional Redis backend
+Two-tier cache: bounded in-process L1 with TTL plus an optional shared Redis L2,
+with single-flight computation and tag-based invalidation.
 """
-from typing import Any, Optional, Callable
+from typing import Any, Optional, Callable, Dict, Iterable, List, Set, Tuple, Union
 from datetime import datetime, timedelta
 import json
 import hashlib
 import functools
+import inspect
+import sys
+import threading
+import time
+import uuid
 from collections import OrderedDict
 import asyncio
 
+from config.settings import settings
+
+
+# Redis key namespaces
+TAG_KEY_PREFIX = "cache:tag:"
+LOCK_KEY_PREFIX = "cache:lock:"
+
+
+def _estimate_size(value: Any, serialized: Optional[str] = None) -> int:
+    """Approximate memory footprint of a cached value in bytes."""
+    if serialized is not None:
+        return len(serialized)
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
 
 class LRUCache:
     """Thread-safe LRU cache with TTL support"""
     
-    def __init__(self, max_size: int = 1000):
+    def __init__(self, max_size: int = 1000, max_bytes: Optional[int] = None):
         self.cache = OrderedDict()
         self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
         self.hits = 0
         self.misses = 0
+        self.evictions = 0
+        # tag -> keys, and key -> (size, tags) for eviction bookkeeping
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._entry_meta: Dict[str, Tuple[int, Tuple[str, ...]]] = {}
+        self._lock = threading.RLock()
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
-        if key in self.cache:
-            value, expiry = self.cache[key]
-            
-            # Check if expired
-            if expiry and datetime.utcnow() > expiry:
-                del self.cache[key]
-                self.misses += 1
-                return None
+        with self._lock:
+            if key in self.cache:
+                value, expiry = self.cache[key]
+                
+                # Check if expired
+                if expiry and datetime.utcnow() > expiry:
+                    self._remove(key)
+                    self.misses += 1
+                    return None
+                
+                # Move to end (most recently used)
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return value
             
-            # Move to end (most recently used)
-            self.cache.move_to_end(key)
-            self.hits += 1
-            return value
-        
-        self.misses += 1
-        return None
+            self.misses += 1
+            return None
     
-    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None):
-        """Set value in cache with optional TTL"""
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: Optional[int] = None,
+        tags: Iterable[str] = (),
+        size: Optional[int] = None
+    ):
+        """Set value in cache with optional TTL and invalidation tags"""
         expiry = None
         if ttl_seconds:
             expiry = datetime.utcnow() + timedelta(seconds=ttl_seconds)
         
-        self.cache[key] = (value, expiry)
-        self.cache.move_to_end(key)
+        if size is None:
+            size = _estimate_size(value)
+        tags = tuple(tags)
         
-        # Evict oldest if over max size
-        if len(self.cache) > self.max_size:
-            self.cache.popitem(last=False)
+        with self._lock:
+            if key in self.cache:
+                self._remove(key)
+            
+            # Values larger than the whole budget are not worth caching
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            
+            self.cache[key] = (value, expiry)
+            self._entry_meta[key] = (size, tags)
+            self.current_bytes += size
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+            
+            # Evict oldest while over either bound
+            while self.cache and (
+                len(self.cache) > self.max_size
+                or (self.max_bytes is not None and self.current_bytes > self.max_bytes)
+            ):
+                oldest = next(iter(self.cache))
+                self._remove(oldest)
+                self.evictions += 1
     
     def delete(self, key: str):
         """Delete key from cache"""
-        if key in self.cache:
-            del self.cache[key]
+        with self._lock:
+            if key in self.cache:
+                self._remove(key)
+    
+    def keys_for_tag(self, tag: str) -> Set[str]:
+        """Get keys currently cached under a tag"""
+        with self._lock:
+            return set(self._tag_index.get(tag, ()))
+    
+    def invalidate_tag(self, tag: str) -> int:
+        """Delete every key cached under a tag"""
+        with self._lock:
+            keys = self._tag_index.pop(tag, set())
+            for key in keys:
+                if key in self.cache:
+                    self._remove(key)
+            return len(keys)
     
     def clear(self):
         """Clear all cache"""
-        self.cache.clear()
-        self.hits = 0
-        self.misses = 0
+        with self._lock:
+            self.cache.clear()
+            self._tag_index.clear()
+            self._entry_meta.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
     
     def get_stats(self) -> dict:
         """Get cache statistics"""
@@ -71,34 +149,87 @@ class LRUCache:
         return {
             'size': len(self.cache),
             'max_size': self.max_size,
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes,
             'hits': self.hits,
             'misses': self.misses,
+            'evictions': self.evictions,
             'hit_rate': round(hit_rate, 2),
-            'memory_items': len(self.cache)
+            'memory_items': len(self.cache),
+            'tags': len(self._tag_index)
         }
+    
+    def _remove(self, key: str):
+        del self.cache[key]
+        size, tags = self._entry_meta.pop(key, (0, ()))
+        self.current_bytes -= size
+        for tag in tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
 
 
 class CacheService:
-    """Comprehensive caching service"""
+    """Comprehensive caching service
+    
+    Reads go L1 (process memory) then L2 (Redis). Entries promoted from L2
+    and all entries written while L2 is enabled keep an L1 TTL of at most
+    ``l1_ttl_seconds``, which bounds how long another worker's invalidation
+    can take to become visible in this process.
+    """
     
-    def __init__(self, max_size: int = 1000, enable_redis: bool = False):
-        self.memory_cache = LRUCache(max_size=max_size)
-        self.enable_redis = enable_redis
-        self.redis_client = None
+    def __init__(
+        self,
+        max_size: int = 1000,
+        enable_redis: bool = False,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+        redis_client: Any = None,
+        redis_url: Optional[str] = None,
+        l1_ttl_seconds: int = 300,
+        lock_timeout_seconds: float = 30.0
+    ):
+        """Initialize cache service.
         
-        if enable_redis:
+        Args:
+            max_size: Maximum number of L1 entries
+            enable_redis: Whether to use a shared Redis L2
+            max_bytes: Approximate L1 size bound in bytes (None = unbounded)
+            redis_client: Pre-built Redis-protocol client (e.g. a test fake)
+            redis_url: Redis URL (defaults to settings.redis_url)
+            l1_ttl_seconds: Maximum L1 TTL while L2 is enabled
+            lock_timeout_seconds: Cross-process compute lock lifetime
+        """
+        self.memory_cache = LRUCache(max_size=max_size, max_bytes=max_bytes)
+        self.enable_redis = enable_redis or redis_client is not None
+        self.redis_client = redis_client
+        self.l1_ttl_seconds = l1_ttl_seconds
+        self.lock_timeout_seconds = lock_timeout_seconds
+        
+        # Single-flight state: key -> in-progress marker
+        self._inflight: Dict[str, threading.Event] = {}
+        self._async_inflight: Dict[str, asyncio.Future] = {}
+        self._inflight_lock = threading.Lock()
+        self.coalesced = 0
+        self.l2_hits = 0
+        self.l2_misses = 0
+        
+        if self.enable_redis and self.redis_client is None:
             try:
                 import redis
-                self.redis_client = redis.Redis(
-                    host='localhost',
-                    port=6379,
-                    db=0,
+                self.redis_client = redis.Redis.from_url(
+                    redis_url or settings.redis_url,
                     decode_responses=True
                 )
             except ImportError:
                 print("Redis not available, using memory cache only")
                 self.enable_redis = False
     
+    @property
+    def _l2(self):
+        return self.redis_client if self.enable_redis else None
+    
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache (memory first, then Redis)"""
         # Try memory cache first
@@ -107,76 +238,328 @@ class CacheService:
             return value
         
         # Try Redis if enabled
-        if self.enable_redis and self.redis_client:
+        if self._l2 is not None:
             try:
-                redis_value = self.redis_client.get(key)
+                redis_value = self._l2.get(key)
                 if redis_value:
                     # Deserialize and store in memory cache
                     value = json.loads(redis_value)
-                    self.memory_cache.set(key, value, ttl_seconds=300)
+                    self.l2_hits += 1
+                    self.memory_cache.set(
+                        key, value,
+                        ttl_seconds=self.l1_ttl_seconds,
+                        size=len(redis_value)
+                    )
                     return value
+                self.l2_misses += 1
             except Exception as e:
                 print(f"Redis get error: {e}")
         
         return None
     
-    def set(self, key: str, value: Any, ttl_seconds: int = 3600):
-        """Set value in cache (both memory and Redis)"""
-        # Store in memory cache
-        self.memory_cache.set(key, value, ttl_seconds=ttl_seconds)
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: int = 3600,
+        tags: Iterable[str] = ()
+    ):
+        """Set value in cache (both memory and Redis)
+        
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            ttl_seconds: Time to live
+            tags: Invalidation tags (e.g. "product:CAB-001", "pricing")
+        """
+        tags = tuple(tags)
+        serialized = None
         
-        # Store in Redis if enabled
-        if self.enable_redis and self.redis_client:
+        if self._l2 is not None:
             try:
                 serialized = json.dumps(value)
-                self.redis_client.setex(key, ttl_seconds, serialized)
+                pipe = self._l2.pipeline()
+                pipe.setex(key, ttl_seconds, serialized)
+                for tag in tags:
+                    tag_key = TAG_KEY_PREFIX + tag
+                    pipe.sadd(tag_key, key)
+                    # Tag sets outlive their longest member
+                    pipe.expire(tag_key, ttl_seconds, nx=True)
+                    pipe.expire(tag_key, ttl_seconds, gt=True)
+                pipe.execute()
             except Exception as e:
                 print(f"Redis set error: {e}")
+        
+        # Store in memory cache
+        l1_ttl = ttl_seconds
+        if self._l2 is not None:
+            l1_ttl = min(ttl_seconds, self.l1_ttl_seconds) if ttl_seconds else self.l1_ttl_seconds
+        self.memory_cache.set(
+            key, value,
+            ttl_seconds=l1_ttl,
+            tags=tags,
+            size=_estimate_size(value, serialized)
+        )
     
     def delete(self, key: str):
         """Delete key from cache"""
         self.memory_cache.delete(key)
         
-        if self.enable_redis and self.redis_client:
+        if self._l2 is not None:
             try:
-                self.redis_client.delete(key)
+                self._l2.delete(key)
             except Exception as e:
                 print(f"Redis delete error: {e}")
     
+    def invalidate_tags(self, *tags: str) -> int:
+        """Evict every entry cached under any of the given tags.
+        
+        Args:
+            tags: Tags to invalidate
+        
+        Returns:
+            Number of keys evicted
+        """
+        keys: Set[str] = set()
+        for tag in tags:
+            keys |= self.memory_cache.keys_for_tag(tag)
+            self.memory_cache.invalidate_tag(tag)
+        
+        if self._l2 is not None:
+            try:
+                tag_keys = [TAG_KEY_PREFIX + tag for tag in tags]
+                for tag_key in tag_keys:
+                    keys |= set(self._l2.smembers(tag_key))
+                if keys or tag_keys:
+                    self._l2.delete(*keys, *tag_keys)
+            except Exception as e:
+                print(f"Redis invalidate error: {e}")
+        
+        return len(keys)
+    
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl_seconds: int = 3600,
+        tags: Iterable[str] = ()
+    ) -> Any:
+        """Get a cached value, computing it at most once across concurrent misses.
+        
+        Threads in this process wait on the first caller; other processes
+        sharing L2 wait on a Redis lock and then read the stored result.
+        
+        Args:
+            key: Cache key
+            compute: Zero-argument function producing the value
+            ttl_seconds: Time to live
+            tags: Invalidation tags
+        
+        Returns:
+            Cached or freshly computed value
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        
+        with self._inflight_lock:
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = threading.Event()
+                self._inflight[key] = event
+        
+        if not leader:
+            self.coalesced += 1
+            event.wait(self.lock_timeout_seconds)
+            value = self.get(key)
+            if value is not None:
+                return value
+            return compute()
+        
+        try:
+            token = self._acquire_l2_lock(key)
+            if token is False:
+                value = self._wait_for_l2(key, time.sleep)
+                if value is not None:
+                    return value
+            try:
+                value = compute()
+                if value is not None:
+                    self.set(key, value, ttl_seconds=ttl_seconds, tags=tags)
+                return value
+            finally:
+                self._release_l2_lock(key, token)
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            event.set()
+    
+    async def _aget(self, key: str) -> Optional[Any]:
+        """get() that keeps blocking Redis round trips off the event loop."""
+        value = self.memory_cache.get(key)
+        if value is not None or self._l2 is None:
+            return value
+        return await asyncio.to_thread(self.get, key)
+    
+    async def _aset(self, key: str, value: Any, ttl_seconds: int, tags: Iterable[str]):
+        if self._l2 is None:
+            self.set(key, value, ttl_seconds=ttl_seconds, tags=tags)
+        else:
+            await asyncio.to_thread(self.set, key, value, ttl_seconds, tags)
+    
+    async def aget_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl_seconds: int = 3600,
+        tags: Iterable[str] = ()
+    ) -> Any:
+        """Async variant of get_or_compute; compute returns an awaitable.
+        
+        Redis calls run in a worker thread so the event loop never blocks
+        on the shared tier.
+        """
+        value = await self._aget(key)
+        if value is not None:
+            return value
+        
+        future = self._async_inflight.get(key)
+        if future is not None and not future.done():
+            self.coalesced += 1
+            return await asyncio.shield(future)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._async_inflight[key] = future
+        try:
+            token = None
+            if self._l2 is not None:
+                token = await asyncio.to_thread(self._acquire_l2_lock, key)
+            if token is False:
+                value = await self._await_l2(key)
+                if value is not None:
+                    future.set_result(value)
+                    return value
+            try:
+                value = await compute()
+                if value is not None:
+                    await self._aset(key, value, ttl_seconds, tags)
+            finally:
+                if token:
+                    await asyncio.to_thread(self._release_l2_lock, key, token)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+                # Waiters re-raise it; mark retrieved so the loop doesn't warn
+                future.exception()
+            raise
+        finally:
+            if self._async_inflight.get(key) is future:
+                del self._async_inflight[key]
+    
+    def _acquire_l2_lock(self, key: str) -> Union[str, bool, None]:
+        """Try to take the cross-process compute lock for a key.
+        
+        Returns:
+            Lock token if acquired, False if another process holds it,
+            None when L2 is unavailable
+        """
+        if self._l2 is None:
+            return None
+        token = uuid.uuid4().hex
+        try:
+            acquired = self._l2.set(
+                LOCK_KEY_PREFIX + key, token,
+                nx=True, px=int(self.lock_timeout_seconds * 1000)
+            )
+            return token if acquired else False
+        except Exception as e:
+            print(f"Redis lock error: {e}")
+            return None
+    
+    def _release_l2_lock(self, key: str, token: Union[str, bool, None]):
+        if not token:
+            return
+        try:
+            lock_key = LOCK_KEY_PREFIX + key
+            # Only release a lock we still own
+            if self._l2.get(lock_key) == token:
+                self._l2.delete(lock_key)
+        except Exception as e:
+            print(f"Redis unlock error: {e}")
+    
+    def _lock_held(self, key: str) -> bool:
+        try:
+            return bool(self._l2.exists(LOCK_KEY_PREFIX + key))
+        except Exception:
+            return False
+    
+    def _wait_for_l2(self, key: str, sleep: Callable[[float], Any]) -> Optional[Any]:
+        """Poll L2 until another process stores the key or drops its lock."""
+        deadline = time.monotonic() + self.lock_timeout_seconds
+        delay = 0.01
+        while time.monotonic() < deadline:
+            value = self.get(key)
+            if value is not None or not self._lock_held(key):
+                return value
+            sleep(delay)
+            delay = min(delay * 2, 0.25)
+        return None
+    
+    async def _await_l2(self, key: str) -> Optional[Any]:
+        deadline = time.monotonic() + self.lock_timeout_seconds
+        delay = 0.01
+        while time.monotonic() < deadline:
+            value = await self._aget(key)
+            if value is not None or not await asyncio.to_thread(self._lock_held, key):
+                return value
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.25)
+        return None
+    
     def clear(self, pattern: Optional[str] = None):
-        """Clear cache (with optional pattern)"""
+        """Clear cache (with optional pattern)
+        
+        Prefer invalidate_tags() for targeted eviction; pattern clearing
+        has to scan keys.
+        """
         if pattern:
             # Pattern-based clearing
-            if self.enable_redis and self.redis_client:
+            if self._l2 is not None:
                 try:
-                    keys = self.redis_client.keys(pattern)
+                    keys = list(self._l2.scan_iter(match=pattern, count=500))
                     if keys:
-                        self.redis_client.delete(*keys)
+                        self._l2.delete(*keys)
                 except Exception as e:
                     print(f"Redis clear error: {e}")
             
             # Memory cache pattern clearing
-            keys_to_delete = [k for k in self.memory_cache.cache.keys() if pattern in k]
+            keys_to_delete = [k for k in list(self.memory_cache.cache.keys()) if pattern in k]
             for key in keys_to_delete:
                 self.memory_cache.delete(key)
         else:
             # Clear all
             self.memory_cache.clear()
-            if self.enable_redis and self.redis_client:
+            if self._l2 is not None:
                 try:
-                    self.redis_client.flushdb()
+                    self._l2.flushdb()
                 except Exception as e:
                     print(f"Redis flush error: {e}")
     
     def get_stats(self) -> dict:
         """Get cache statistics"""
         stats = self.memory_cache.get_stats()
+        stats['coalesced_computations'] = self.coalesced
         
-        if self.enable_redis and self.redis_client:
+        if self._l2 is not None:
+            stats['l2_hits'] = self.l2_hits
+            stats['l2_misses'] = self.l2_misses
             try:
-                redis_info = self.redis_client.info('stats')
+                redis_info = self._l2.info('stats')
                 stats['redis_enabled'] = True
-                stats['redis_keys'] = self.redis_client.dbsize()
+                stats['redis_keys'] = self._l2.dbsize()
                 stats['redis_hits'] = redis_info.get('keyspace_hits', 0)
                 stats['redis_misses'] = redis_info.get('keyspace_misses', 0)
             except Exception as e:
@@ -191,42 +574,79 @@ class CacheService:
 # Global cache instance
 _cache_service = None
 
-def get_cache_service(max_size: int = 1000, enable_redis: bool = False) -> CacheService:
-    """Get or create cache service instance"""
+def get_cache_service(
+    max_size: int = 1000,
+    enable_redis: Optional[bool] = None,
+    max_bytes: Optional[int] = 64 * 1024 * 1024
+) -> CacheService:
+    """Get or create cache service instance
+    
+    The shared Redis L2 follows settings.cache_redis_enabled unless
+    enable_redis is given.
+    """
     global _cache_service
     if _cache_service is None:
-        _cache_service = CacheService(max_size=max_size, enable_redis=enable_redis)
+        _cache_service = CacheService(
+            max_size=max_size,
+            enable_redis=settings.cache_redis_enabled if enable_redis is None else enable_redis,
+            max_bytes=max_bytes
+        )
     return _cache_service
 
 
+TagsSpec = Union[Iterable[str], Callable[..., Iterable[str]], None]
+
+
+def _resolve_tags(tags: TagsSpec, args: tuple, kwargs: dict) -> Tuple[str, ...]:
+    """Resolve static tags or a tags(*args, **kwargs) callable."""
+    if tags is None:
+        return ()
+    if callable(tags):
+        return tuple(tags(*args, **kwargs))
+    return tuple(tags)
+
+
 # Cache decorator
-def cache_result(ttl_seconds: int = 3600, key_prefix: str = ""):
-    """Decorator to cache function results"""
+def cache_result(
+    ttl_seconds: int = 3600,
+    key_prefix: str = "",
+    tags: TagsSpec = None,
+    exclude: Iterable[str] = ()
+):
+    """Decorator to cache function results
+    
+    Args:
+        ttl_seconds: Time to live
+        key_prefix: Prefix for generated keys
+        tags: Invalidation tags, or a callable receiving the call arguments
+        exclude: Parameter names left out of the key (sessions, clients, ...)
+    """
     def decorator(func: Callable):
+        key_builder = _CacheKeyBuilder(func, key_prefix, exclude)
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             # Generate cache key
-            cache_key = _generate_cache_key(key_prefix, func.__name__, args, kwargs)
+            cache_key = key_builder(args, kwargs)
             
-            # Try to get from cache
             cache = get_cache_service()
-            cached_value = cache.get(cache_key)
-            
-            if cached_value is not None:
-                return cached_value
-            
-            # Execute function
-            result = func(*args, **kwargs)
-            
-            # Store in cache
-            cache.set(cache_key, result, ttl_seconds=ttl_seconds)
-            
-            return result
+            return cache.get_or_compute(
+                cache_key,
+                lambda: func(*args, **kwargs),
+                ttl_seconds=ttl_seconds,
+                tags=_resolve_tags(tags, args, kwargs)
+            )
         
         return wrapper
     return decorator
 
 
+def _key_part(value: Any) -> str:
+    if isinstance(value, (str, int, float, bool)):
+        return str(value)
+    return hashlib.md5(str(value).encode()).hexdigest()[:8]
+
+
 def _generate_cache_key(prefix: str, func_name: str, args: tuple, kwargs: dict) -> str:
     """Generate cache key from function call"""
     # Create hashable representation
@@ -234,44 +654,66 @@ def _generate_cache_key(prefix: str, func_name: str, args: tuple, kwargs: dict)
     
     # Add args
     for arg in args:
-        if isinstance(arg, (str, int, float, bool)):
-            key_parts.append(str(arg))
-        else:
-            key_parts.append(hashlib.md5(str(arg).encode()).hexdigest()[:8])
+        key_parts.append(_key_part(arg))
     
     # Add kwargs
     for k, v in sorted(kwargs.items()):
-        if isinstance(v, (str, int, float, bool)):
-            key_parts.append(f"{k}={v}")
-        else:
-            key_parts.append(f"{k}={hashlib.md5(str(v).encode()).hexdigest()[:8]}")
+        key_parts.append(f"{k}={_key_part(v)}")
     
     return ":".join(key_parts)
 
 
+class _CacheKeyBuilder:
+    """Per-function key builder; resolves the signature once at decoration time."""
+    
+    def __init__(self, func: Callable, prefix: str, exclude: Iterable[str]):
+        self.prefix = prefix
+        self.func_name = func.__name__
+        self.exclude = frozenset(exclude)
+        self.excluded_positions: Set[int] = set()
+        if self.exclude:
+            params = list(inspect.signature(func).parameters)
+            self.excluded_positions = {
+                i for i, name in enumerate(params) if name in self.exclude
+            }
+    
+    def __call__(self, args: tuple, kwargs: dict) -> str:
+        if self.exclude:
+            args = tuple(a for i, a in enumerate(args) if i not in self.excluded_positions)
+            kwargs = {k: v for k, v in kwargs.items() if k not in self.exclude}
+        return _generate_cache_key(self.prefix, self.func_name, args, kwargs)
+
+
 # Async cache decorator
-def async_cache_result(ttl_seconds: int = 3600, key_prefix: str = ""):
-    """Decorator to cache async function results"""
+def async_cache_result(
+    ttl_seconds: int = 3600,
+    key_prefix: str = "",
+    tags: TagsSpec = None,
+    exclude: Iterable[str] = ()
+):
+    """Decorator to cache async function results
+    
+    Args:
+        ttl_seconds: Time to live
+        key_prefix: Prefix for generated keys
+        tags: Invalidation tags, or a callable receiving the call arguments
+        exclude: Parameter names left out of the key
+    """
     def decorator(func: Callable):
+        key_builder = _CacheKeyBuilder(func, key_prefix, exclude)
+        
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
             # Generate cache key
-            cache_key = _generate_cache_key(key_prefix, func.__name__, args, kwargs)
+            cache_key = key_builder(args, kwargs)
             
-            # Try to get from cache
             cache = get_cache_service()
-            cached_value = cache.get(cache_key)
-            
-            if cached_value is not None:
-                return cached_value
-            
-            # Execute async function
-            result = await func(*args, **kwargs)
-            
-            # Store in cache
-            cache.set(cache_key, result, ttl_seconds=ttl_seconds)
-            
-            return result
+            return await cache.aget_or_compute(
+                cache_key,
+                lambda: func(*args, **kwargs),
+                ttl_seconds=ttl_seconds,
+                tags=_resolve_tags(tags, args, kwargs)
+            )
         
         return wrapper
     return decorator
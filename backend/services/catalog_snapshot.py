@@ -0,0 +1,757 @@
+"""Memory-mapped columnar snapshot of the reference catalog.
+
+The snapshot is a single read-only file holding every catalog table as
+NumPy column buffers plus one sorted string table. Workers map the file
+with ``mmap`` so the pages are shared through the OS page cache instead
+of every process holding its own lists of dicts.
+
+File layout::
+
+    b"HKSNAP01" | uint64 header length | JSON header | padding | buffers
+
+Every buffer starts on a 64-byte boundary and is described in the header
+by ``{"offset", "dtype", "count"}`` relative to the first buffer.
+
+Snapshots are written to a versioned file and published by atomically
+replacing the ``CURRENT`` pointer file, so readers see either the old or
+the new snapshot, never a partially written one. The header records a
+fingerprint of the source files so readers can tell when it is stale.
+Builders hold ``SnapshotLock`` so workers starting together publish one
+snapshot between them.
+"""
+import hashlib
+import json
+import mmap
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import structlog
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = structlog.get_logger()
+
+MAGIC = b"HKSNAP01"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+POINTER_FILE = "CURRENT"
+LOCK_FILE = ".lock"
+SNAPSHOT_SUFFIX = ".snap"
+NGRAM = 3
+
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+
+
+def _json_default(value: Any) -> Any:
+    """Convert NumPy scalars and other stragglers for JSON encoding."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    return str(value)
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=_json_default, ensure_ascii=False)
+
+
+def _column_kind(values: List[Any]) -> str:
+    """Pick the narrowest storage kind that round-trips every value exactly."""
+    kinds = set()
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            kinds.add("bool")
+        elif isinstance(value, int):
+            kinds.add("int" if _INT64_MIN <= value <= _INT64_MAX else "json")
+        elif isinstance(value, float):
+            kinds.add("float")
+        elif isinstance(value, str):
+            kinds.add("str")
+        else:
+            kinds.add("json")
+    if len(kinds) == 1:
+        return kinds.pop()
+    return "json" if kinds else "str"
+
+
+class _SnapshotWriter:
+    """Accumulates buffers and the string table for one snapshot."""
+    
+    def __init__(self):
+        self.strings: Dict[str, int] = {}
+        self.buffers: List[np.ndarray] = []
+        self.offset = 0
+    
+    def intern(self, text: str) -> int:
+        return self.strings.setdefault(text, len(self.strings))
+    
+    def add_buffer(self, array: np.ndarray) -> Dict[str, Any]:
+        array = np.ascontiguousarray(array)
+        descriptor = {"offset": self.offset, "dtype": array.dtype.str, "count": int(array.size)}
+        self.buffers.append(array)
+        self.offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+        return descriptor
+    
+    def add_table(self, rows: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        columns: Dict[str, None] = {}
+        for row in rows:
+            for key in row:
+                columns.setdefault(key, None)
+        
+        specs = []
+        for name in columns:
+            present = np.fromiter((name in row for row in rows), dtype=bool, count=len(rows))
+            values = [row.get(name) for row in rows]
+            null = np.fromiter((value is None for value in values), dtype=bool, count=len(rows))
+            kind = _column_kind(values)
+            
+            if kind == "str":
+                data = np.array([-1 if v is None else self.intern(v) for v in values], dtype=np.int32)
+            elif kind == "json":
+                data = np.array([-1 if v is None else self.intern(_dumps(v)) for v in values], dtype=np.int32)
+            elif kind == "int":
+                data = np.array([0 if v is None else v for v in values], dtype=np.int64)
+            elif kind == "float":
+                data = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            else:
+                data = np.array([bool(v) for v in values], dtype=bool)
+            
+            specs.append({
+                "name": name,
+                "kind": kind,
+                "values": data,
+                "present": None if present.all() else present,
+                "null": null if null.any() else None,
+            })
+        return {"rows": len(rows), "columns": specs}
+    
+    def finish(
+        self,
+        tables: Dict[str, Dict[str, Any]],
+        documents: Dict[str, Any],
+        fingerprint: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Sort the string table, remap codes and register every buffer."""
+        ordered = sorted(self.strings)
+        remap = np.empty(len(ordered) + 1, dtype=np.int32)
+        remap[-1] = -1
+        for new_code, text in enumerate(ordered):
+            remap[self.strings[text]] = new_code
+        
+        encoded = [text.encode("utf-8") for text in ordered]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(chunk) for chunk in encoded], out=offsets[1:])
+        header: Dict[str, Any] = {
+            "version": FORMAT_VERSION,
+            "created_at": time.time(),
+            "source_fingerprint": fingerprint,
+            "strings": {
+                "offsets": self.add_buffer(offsets),
+                "data": self.add_buffer(np.frombuffer(b"".join(encoded), dtype=np.uint8)),
+            },
+            "tables": {},
+            "documents": {},
+        }
+        
+        for table_name, table in tables.items():
+            columns = []
+            for spec in table["columns"]:
+                values = spec["values"]
+                if spec["kind"] in ("str", "json"):
+                    values = remap[values]
+                columns.append({
+                    "name": spec["name"],
+                    "kind": spec["kind"],
+                    "values": self.add_buffer(values),
+                    "present": None if spec["present"] is None else self.add_buffer(spec["present"]),
+                    "null": None if spec["null"] is None else self.add_buffer(spec["null"]),
+                })
+            header["tables"][table_name] = {"rows": table["rows"], "columns": columns}
+        
+        for name, document in documents.items():
+            payload = _dumps(document).encode("utf-8")
+            header["documents"][name] = self.add_buffer(np.frombuffer(payload, dtype=np.uint8))
+        return header
+
+
+def encode_snapshot(
+    tables: Dict[str, Sequence[Dict[str, Any]]],
+    documents: Optional[Dict[str, Any]] = None,
+    fingerprint: Optional[str] = None
+) -> bytes:
+    """Encode catalog tables and JSON documents into snapshot bytes.
+    
+    Args:
+        tables: Table name to list of row dicts
+        documents: Name to arbitrary JSON-serialisable value
+        fingerprint: Source fingerprint recorded in the header
+    
+    Returns:
+        Snapshot file contents
+    """
+    writer = _SnapshotWriter()
+    encoded_tables = {name: writer.add_table(rows) for name, rows in tables.items()}
+    header = writer.finish(encoded_tables, documents or {}, fingerprint)
+    header_bytes = json.dumps(header).encode("utf-8")
+    
+    prefix_len = len(MAGIC) + 8 + len(header_bytes)
+    padding = -prefix_len % ALIGNMENT
+    parts = [MAGIC, np.uint64(len(header_bytes)).tobytes(), header_bytes, b"\0" * padding]
+    for array in writer.buffers:
+        data = array.tobytes()
+        parts.append(data)
+        parts.append(b"\0" * (-len(data) % ALIGNMENT))
+    return b"".join(parts)
+
+
+def write_snapshot(
+    directory: Union[str, Path],
+    tables: Dict[str, Sequence[Dict[str, Any]]],
+    documents: Optional[Dict[str, Any]] = None,
+    keep: int = 2,
+    fingerprint: Optional[str] = None
+) -> Path:
+    """Write a snapshot and atomically make it the current one.
+    
+    Args:
+        directory: Snapshot directory
+        tables: Table name to list of row dicts
+        documents: Name to arbitrary JSON-serialisable value
+        keep: Number of snapshot files to retain, including the new one
+        fingerprint: Source fingerprint recorded in the header
+    
+    Returns:
+        Path of the published snapshot
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    payload = encode_snapshot(tables, documents, fingerprint)
+    
+    path = directory / f"catalog-{time.time_ns()}{SNAPSHOT_SUFFIX}"
+    _atomic_write(path, payload)
+    _atomic_write(directory / POINTER_FILE, path.name.encode("utf-8"))
+    
+    logger.info("Catalog snapshot published", path=str(path), size_bytes=len(payload))
+    _prune(directory, keep)
+    return path
+
+
+def _atomic_write(path: Path, payload: bytes):
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as handle:
+        handle.write(payload)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+def _prune(directory: Path, keep: int):
+    """Remove old snapshot files; mapped files stay valid until unmapped."""
+    snapshots = sorted(directory.glob(f"catalog-*{SNAPSHOT_SUFFIX}"), key=lambda p: p.name)
+    for stale in snapshots[:-keep] if keep > 0 else []:
+        try:
+            stale.unlink()
+        except OSError as e:
+            # Windows refuses to delete files another process has mapped
+            logger.debug("Could not remove old snapshot", path=str(stale), error=str(e))
+
+
+def source_fingerprint(sources: Iterable[Union[str, Path]]) -> str:
+    """Fingerprint source files by path, size and modification time.
+    
+    Args:
+        sources: Files or directories (walked recursively)
+    
+    Returns:
+        Hex digest that changes whenever a source file is added, removed
+        or rewritten
+    """
+    digest = hashlib.sha256()
+    for source in sources:
+        source = Path(source).resolve()
+        digest.update(f"{source}\n".encode("utf-8"))
+        files = sorted(source.rglob("*")) if source.is_dir() else [source]
+        for path in files:
+            if not path.is_file():
+                continue
+            stat = path.stat()
+            entry = f"{path.relative_to(source.parent)}|{stat.st_size}|{stat.st_mtime_ns}\n"
+            digest.update(entry.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SnapshotLock:
+    """Exclusive fcntl lock on a snapshot directory's ``.lock`` file.
+    
+    Held around check-and-build so only one worker parses the sources;
+    the others block, then map what it published. A no-op without fcntl.
+    """
+    
+    def __init__(self, directory: Union[str, Path]):
+        self.path = Path(directory) / LOCK_FILE
+        self._handle = None
+    
+    def acquire(self):
+        """Block until the lock is held (call from a thread in async code)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = open(self.path, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self._handle.fileno(), fcntl.LOCK_EX)
+    
+    def release(self):
+        """Release the lock if held."""
+        if self._handle is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._handle.close()
+            self._handle = None
+    
+    def __enter__(self) -> "SnapshotLock":
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+def current_snapshot_path(directory: Union[str, Path]) -> Optional[Path]:
+    """Resolve the ``CURRENT`` pointer of a snapshot directory.
+    
+    Args:
+        directory: Snapshot directory
+    
+    Returns:
+        Path of the current snapshot, or None if none is published
+    """
+    pointer = Path(directory) / POINTER_FILE
+    try:
+        name = pointer.read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+    path = pointer.parent / name
+    return path if name and path.exists() else None
+
+
+_NO_ROWS = np.zeros(0, dtype=np.intp)
+
+
+class StringTable:
+    """Sorted, UTF-8 encoded string table shared by every string column."""
+    
+    def __init__(self, offsets: np.ndarray, data: np.ndarray):
+        self.offsets = offsets
+        self.data = data
+        self._bytes = memoryview(data)
+    
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, code: int) -> str:
+        return str(self._bytes[self.offsets[code]:self.offsets[code + 1]], "utf-8")
+    
+    def find(self, text: str) -> int:
+        """Binary search for a string's code.
+        
+        Args:
+            text: String to look up
+        
+        Returns:
+            Code of the string, or -1 if it is not in the table
+        """
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self[mid] < text:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < len(self) and self[lo] == text else -1
+
+
+class SnapshotColumn:
+    """One column of a snapshot table backed by mapped buffers.
+    
+    String columns build their indexes on first use: an inverted index
+    from value to ascending row numbers, and a trigram index over the
+    lower-cased distinct values for substring search. Indexes live in
+    the process that built them and are dropped with the snapshot.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        values: np.ndarray,
+        present: Optional[np.ndarray],
+        null: Optional[np.ndarray],
+        strings: StringTable
+    ):
+        self.name = name
+        self.kind = kind
+        self.values = values
+        self.present = present
+        self.null = null
+        self.strings = strings
+        self._postings: Optional[Dict[str, np.ndarray]] = None
+        self._ngrams: Optional[Dict[str, List[str]]] = None
+    
+    def has(self, row: int) -> bool:
+        return self.present is None or bool(self.present[row])
+    
+    def get(self, row: int) -> Any:
+        if self.null is not None and self.null[row]:
+            return None
+        value = self.values[row]
+        if self.kind == "str":
+            return self.strings[value]
+        if self.kind == "json":
+            return json.loads(self.strings[value])
+        return value.item()
+    
+    def valid_mask(self) -> np.ndarray:
+        """Rows where the key is present and not None."""
+        mask = np.ones(len(self.values), dtype=bool)
+        if self.present is not None:
+            mask &= self.present
+        if self.null is not None:
+            mask &= ~self.null
+        return mask
+    
+    def equals_mask(self, value: Any) -> np.ndarray:
+        """Rows whose value equals ``value``, as ``row.get(name) == value`` would."""
+        if value is None:
+            # Missing keys count as None; a column present in every row has none
+            mask = np.zeros(len(self.values), dtype=bool) if self.present is None else ~self.present
+            return mask | (self.null if self.null is not None else False)
+        if self.kind == "str":
+            if not isinstance(value, str):
+                return np.zeros(len(self.values), dtype=bool)
+            return self.valid_mask() & (self.values == self.strings.find(value))
+        valid = self.valid_mask()
+        return np.fromiter(
+            (bool(valid[i]) and self.get(i) == value for i in range(len(self.values))),
+            dtype=bool,
+            count=len(self.values)
+        )
+    
+    def postings(self) -> Dict[str, np.ndarray]:
+        """Inverted index from string value to ascending row numbers."""
+        if self._postings is None:
+            rows = np.flatnonzero(self.valid_mask())
+            codes = self.values[rows]
+            order = np.argsort(codes, kind="stable")
+            codes, rows = codes[order], rows[order]
+            distinct, starts = np.unique(codes, return_index=True)
+            bounds = np.append(starts, len(codes)).tolist()
+            self._postings = {
+                self.strings[code]: rows[bounds[i]:bounds[i + 1]]
+                for i, code in enumerate(distinct.tolist())
+            }
+        return self._postings
+    
+    def ngrams(self) -> Dict[str, List[str]]:
+        """Trigram index from lower-cased trigram to the values containing it."""
+        if self._ngrams is None:
+            ngrams: Dict[str, List[str]] = {}
+            for value in self.postings():
+                lowered = value.lower()
+                for gram in {lowered[i:i + NGRAM] for i in range(len(lowered) - NGRAM + 1)}:
+                    ngrams.setdefault(gram, []).append(value)
+            self._ngrams = ngrams
+        return self._ngrams
+    
+    def lookup(self, value: Any) -> np.ndarray:
+        """Ascending rows whose value equals ``value``."""
+        if value is not None and self.kind == "str":
+            if not isinstance(value, str):
+                return _NO_ROWS
+            return self.postings().get(value, _NO_ROWS)
+        return np.flatnonzero(self.equals_mask(value))
+    
+    def search_values(self, needle: str) -> List[str]:
+        """Distinct values containing the lower-cased ``needle``.
+        
+        Needles of at least NGRAM characters are verified only against the
+        values sharing their rarest trigram; shorter needles scan every
+        distinct value.
+        
+        Args:
+            needle: Lower-cased text to look for
+        
+        Returns:
+            Matching values
+        """
+        if len(needle) < NGRAM:
+            candidates: Iterable[str] = self.postings()
+        else:
+            ngrams = self.ngrams()
+            grams = {needle[i:i + NGRAM] for i in range(len(needle) - NGRAM + 1)}
+            if not grams.issubset(ngrams):
+                return []
+            candidates = min((ngrams[gram] for gram in grams), key=len)
+        return [value for value in candidates if needle in value.lower()]
+    
+    def build_indexes(self):
+        """Build the string indexes now rather than on the first query."""
+        if self.kind == "str":
+            self.ngrams()
+
+
+class SnapshotTable:
+    """Read-only view over rows of a snapshot table.
+    
+    A view is an ascending array of row numbers, so filtered views keep
+    catalog order and ``after`` gives stable keyset pagination. Rows are
+    materialised into fresh dicts on access, so callers can annotate
+    returned records without touching the shared snapshot.
+    """
+    
+    def __init__(self, columns: Dict[str, SnapshotColumn], rows: np.ndarray, size: Optional[int] = None):
+        self.columns = columns
+        self.rows = rows
+        self.size = len(rows) if size is None else size
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in self.rows.tolist():
+            yield self._materialize(row)
+    
+    def __getitem__(self, item: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(item, slice):
+            return [self._materialize(row) for row in self.rows[item].tolist()]
+        return self._materialize(int(self.rows[item]))
+    
+    def _materialize(self, row: int) -> Dict[str, Any]:
+        return {name: column.get(row) for name, column in self.columns.items() if column.has(row)}
+    
+    def _restrict(self, rows: np.ndarray) -> "SnapshotTable":
+        """View over the ascending ``rows`` that are also in this view."""
+        if len(self.rows) != self.size:
+            rows = np.intersect1d(self.rows, rows, assume_unique=True)
+        return SnapshotTable(self.columns, rows, self.size)
+    
+    def after(self, row: int) -> "SnapshotTable":
+        """View over the rows that come after ``row`` in catalog order."""
+        return SnapshotTable(self.columns, self.rows[np.searchsorted(self.rows, row, side="right"):], self.size)
+    
+    def where(self, **equals: Any) -> "SnapshotTable":
+        """Filter rows by exact column values.
+        
+        Args:
+            **equals: Column name to required value
+        
+        Returns:
+            Table view over the matching rows
+        """
+        view = self
+        for name, value in equals.items():
+            column = self.columns.get(name)
+            if column is None:
+                if value is not None:
+                    return view._restrict(_NO_ROWS)
+                continue
+            view = view._restrict(column.lookup(value))
+        return view
+    
+    def search(self, text: str, columns: Iterable[str]) -> "SnapshotTable":
+        """Case-insensitive substring match over string columns.
+        
+        Candidate values come from the trigram index; the rows of every
+        matching value are then merged from the inverted index.
+        
+        Args:
+            text: Text to search for
+            columns: Columns to search in; a row matches if any column does
+        
+        Returns:
+            Table view over the matching rows
+        """
+        needle = text.lower()
+        matched = []
+        for name in columns:
+            column = self.columns.get(name)
+            if column is None or column.kind != "str":
+                continue
+            postings = column.postings()
+            matched.extend(postings[value] for value in column.search_values(needle))
+        return self._restrict(np.unique(np.concatenate(matched)) if matched else _NO_ROWS)
+    
+    def unique(self, name: str) -> List[Any]:
+        """Sorted distinct truthy values of a column."""
+        column = self.columns.get(name)
+        if column is None:
+            return []
+        valid = column.valid_mask()[self.rows]
+        if column.kind == "str":
+            codes = np.unique(column.values[self.rows][valid])
+            # The string table is sorted, so code order is string order
+            return [column.strings[code] for code in codes.tolist() if column.strings[code]]
+        return sorted(set(column.get(row) for row in self.rows[valid].tolist()) - {0, False, ""})
+    
+    def build_indexes(self, columns: Iterable[str]):
+        """Build the indexes of the given columns ahead of the first query."""
+        for name in columns:
+            column = self.columns.get(name)
+            if column is not None:
+                column.build_indexes()
+    
+    def first(self, value: Any, columns: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """First row where any of ``columns`` equals ``value``.
+        
+        Args:
+            value: Value to look for
+            columns: Candidate columns, checked together in row order
+        
+        Returns:
+            Row dict or None
+        """
+        best: Optional[int] = None
+        for name in columns:
+            column = self.columns.get(name)
+            if column is None:
+                continue
+            rows = self._restrict(column.lookup(value)).rows
+            if len(rows) and (best is None or rows[0] < best):
+                best = int(rows[0])
+        return None if best is None else self._materialize(best)
+
+
+class CatalogSnapshot:
+    """A decoded snapshot over a mapped file or an in-memory buffer."""
+    
+    def __init__(self, buffer: Union[bytes, mmap.mmap], path: Optional[Path] = None):
+        """Decode the header and create zero-copy views over the buffers.
+        
+        Args:
+            buffer: Snapshot contents
+            path: File the buffer was mapped from, if any
+        
+        Raises:
+            ValueError: If the buffer is not a snapshot of a supported version
+        """
+        if buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a catalog snapshot")
+        header_len = int(np.frombuffer(buffer, dtype=np.uint64, count=1, offset=len(MAGIC))[0])
+        header_start = len(MAGIC) + 8
+        header = json.loads(bytes(buffer[header_start:header_start + header_len]))
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {header.get('version')}")
+        
+        self.buffer = buffer
+        self.path = path
+        self.header = header
+        self.created_at: float = header["created_at"]
+        self.source_fingerprint: Optional[str] = header.get("source_fingerprint")
+        self._base = header_start + header_len + (-(header_start + header_len) % ALIGNMENT)
+        self._documents: Dict[str, Any] = {}
+        
+        self.strings = StringTable(
+            self._array(header["strings"]["offsets"]),
+            self._array(header["strings"]["data"])
+        )
+        self.tables: Dict[str, SnapshotTable] = {}
+        for table_name, table in header["tables"].items():
+            columns = {
+                spec["name"]: SnapshotColumn(
+                    spec["name"],
+                    spec["kind"],
+                    self._array(spec["values"]),
+                    self._array(spec["present"]) if spec["present"] else None,
+                    self._array(spec["null"]) if spec["null"] else None,
+                    self.strings
+                )
+                for spec in table["columns"]
+            }
+            self.tables[table_name] = SnapshotTable(columns, np.arange(table["rows"]))
+    
+    def _array(self, descriptor: Dict[str, Any]) -> np.ndarray:
+        return np.frombuffer(
+            self.buffer,
+            dtype=np.dtype(descriptor["dtype"]),
+            count=descriptor["count"],
+            offset=self._base + descriptor["offset"]
+        )
+    
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "CatalogSnapshot":
+        """Map a snapshot file read-only.
+        
+        Args:
+            path: Snapshot file
+        
+        Returns:
+            CatalogSnapshot sharing pages with every other reader of the file
+        """
+        path = Path(path)
+        with open(path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, path)
+    
+    @classmethod
+    def open_current(cls, directory: Union[str, Path]) -> Optional["CatalogSnapshot"]:
+        """Map the snapshot the directory's ``CURRENT`` pointer names.
+        
+        Args:
+            directory: Snapshot directory
+        
+        Returns:
+            CatalogSnapshot, or None if no snapshot is published
+        """
+        path = current_snapshot_path(directory)
+        return cls.open(path) if path else None
+    
+    @property
+    def snapshot_id(self) -> str:
+        """Identity shared by every reader of the same snapshot.
+        
+        The file name for a mapped snapshot, so all workers agree on it;
+        the creation time for one only held in memory.
+        """
+        return self.path.name if self.path else f"memory-{self.created_at!r}"
+    
+    def table(self, name: str) -> SnapshotTable:
+        """Get a table by name; unknown tables are empty."""
+        if name not in self.tables:
+            return SnapshotTable({}, _NO_ROWS)
+        return self.tables[name]
+    
+    def document(self, name: str, default: Any = None) -> Any:
+        """Decode a JSON document, caching it for this process.
+        
+        Args:
+            name: Document name
+            default: Value returned when the document is missing
+        
+        Returns:
+            Decoded document
+        """
+        if name not in self._documents:
+            descriptor = self.header["documents"].get(name)
+            if descriptor is None:
+                return default
+            self._documents[name] = json.loads(self._array(descriptor).tobytes())
+        return self._documents[name]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Summary of the snapshot for logging."""
+        return {
+            "path": str(self.path) if self.path else None,
+            "size_bytes": len(self.buffer),
+            "strings": len(self.strings),
+            "tables": {name: len(table) for name, table in self.tables.items()},
+            "created_at": self.created_at,
+        }
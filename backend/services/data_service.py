@@ -1,9 +1,13 @@
 """Centralized data service for managing all loaded data."""
 import asyncio
-from typing import Dict, Any, List, Optional
+import base64
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
 import structlog
 from functools import lru_cache
 
+from config.settings import settings
+
 from data import (
     ValidatedProductLoader,
     PricingDataLoader,
@@ -11,15 +15,50 @@ from data import (
     StandardsDataLoader,
     HistoricalRFPLoader,
 )
+from services.catalog_snapshot import (
+    CatalogSnapshot,
+    SnapshotLock,
+    SnapshotTable,
+    encode_snapshot,
+    source_fingerprint,
+    write_snapshot,
+)
 
 logger = structlog.get_logger()
 
+# Columns with hash/inverted and trigram indexes
+PRODUCT_INDEXES = ("model", "id", "product_code", "category", "brand", "name")
+PRICING_INDEXES = ("product_id", "model", "product_code", "brand")
+
+# Columns a product or pricing lookup matches, as emitted by the loaders
+PRODUCT_KEY_COLUMNS = ("model", "product_code", "id")
+PRICING_KEY_COLUMNS = ("product_id", "model", "product_code")
+
 
 class DataService:
-    """Centralized service for accessing all loaded data."""
+    """Centralized service for accessing all loaded data.
+    
+    Products, pricing, testing and standards data are served from a
+    read-only columnar catalog snapshot. When a snapshot directory is
+    configured, every worker maps the same snapshot file so the catalog
+    pages are shared across processes and startup skips CSV parsing
+    unless the source files changed since the snapshot was built.
+    """
     
-    def __init__(self):
-        """Initialize data service with all loaders."""
+    def __init__(
+        self,
+        snapshot_dir: Optional[Union[str, Path]] = None,
+        source_dirs: Optional[Sequence[Union[str, Path]]] = None
+    ):
+        """Initialize data service with all loaders.
+        
+        Args:
+            snapshot_dir: Catalog snapshot directory; defaults to
+                settings.catalog_snapshot_dir
+            source_dirs: Files/directories the snapshot is built from,
+                fingerprinted to detect a stale snapshot; defaults to the
+                configured data directories
+        """
         self.logger = logger.bind(component="DataService")
         
         # Initialize loaders
@@ -29,20 +68,35 @@ class DataService:
         self.standards_loader = StandardsDataLoader()
         self.rfp_loader = HistoricalRFPLoader()
         
-        # Cache for loaded data
-        self._products_cache: Optional[List[Dict[str, Any]]] = None
-        self._pricing_cache: Optional[List[Dict[str, Any]]] = None
-        self._testing_cache: Optional[Dict[str, Any]] = None
-        self._standards_cache: Optional[Dict[str, Any]] = None
+        self.snapshot_dir: Optional[Path] = (
+            Path(snapshot_dir) if snapshot_dir else settings.catalog_snapshot_dir
+        )
+        self.source_dirs: List[Path] = [Path(path) for path in (source_dirs or (
+            settings.data_dir,
+            settings.wires_cables_dir,
+            settings.standards_dir,
+            settings.testing_data_dir,
+        ))]
+        
+        # Shared catalog snapshot; historical RFPs stay a mutable list
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._tests_by_name: Dict[Any, Tuple[str, Dict[str, Any]]] = {}
+        self._standards_by_code: Dict[Any, Tuple[str, Dict[str, Any]]] = {}
         self._rfps_cache: Optional[List[Dict[str, Any]]] = None
         
         self._initialized = False
     
     async def initialize(self, force_reload: bool = False):
-        """Load all data into memory.
+        """Map the current catalog snapshot, rebuilding it if missing or stale.
+        
+        A published snapshot is reused only when its source fingerprint
+        matches the current source files. Otherwise the rebuild runs under
+        the directory's SnapshotLock, so workers starting together map the
+        first one's snapshot instead of each publishing their own.
         
         Args:
-            force_reload: Force reload even if already initialized
+            force_reload: Re-read the snapshot pointer and re-check the
+                sources even if already initialized
         """
         if self._initialized and not force_reload:
             self.logger.info("Data service already initialized")
@@ -50,43 +104,232 @@ class DataService:
         
         self.logger.info("Initializing data service - loading all data")
         
+        if self.snapshot_dir:
+            fingerprint = await asyncio.to_thread(source_fingerprint, self.source_dirs)
+            snapshot = self._open_current(fingerprint)
+            if snapshot is None:
+                # Only the first worker to take the lock rebuilds; the others
+                # wait for it and map the snapshot it published
+                lock = SnapshotLock(self.snapshot_dir)
+                await asyncio.to_thread(lock.acquire)
+                try:
+                    snapshot = self._open_current(fingerprint) or await self._build_snapshot(fingerprint)
+                finally:
+                    lock.release()
+            # Readers of the previous snapshot keep their mapping until released
+            await self._use_snapshot(snapshot)
+            self.logger.info("Mapped catalog snapshot", **snapshot.stats())
+        else:
+            await self.build_snapshot()
+        
+        try:
+            self._rfps_cache = await self.rfp_loader.load()
+        except Exception as e:
+            self.logger.error("Failed to load RFPs data", error=str(e))
+            self._rfps_cache = []
+        
+        self._initialized = True
+        
+        self.logger.info(
+            "Data service initialized",
+            products=len(self._products),
+            pricing=len(self._pricing),
+            testing_categories=len(self._testing),
+            standards_categories=len(self._standards),
+            rfps=len(self._rfps_cache)
+        )
+    
+    async def build_snapshot(self) -> CatalogSnapshot:
+        """Parse the source data and publish a new catalog snapshot.
+        
+        The snapshot is written to the snapshot directory under the
+        directory's SnapshotLock and swapped in atomically, stamped with the
+        source fingerprint; other workers map it on their next
+        ``initialize()`` (startup, or ``force_reload=True``). Without a
+        snapshot directory, or when a loader fails, the snapshot is only
+        kept in memory.
+        
+        Returns:
+            The new snapshot, already in use by this service
+        """
+        # Fingerprint first so edits made while loading trigger another rebuild
+        fingerprint = await asyncio.to_thread(source_fingerprint, self.source_dirs)
+        if not self.snapshot_dir:
+            snapshot = await self._build_snapshot(fingerprint)
+        else:
+            lock = SnapshotLock(self.snapshot_dir)
+            await asyncio.to_thread(lock.acquire)
+            try:
+                snapshot = await self._build_snapshot(fingerprint)
+            finally:
+                lock.release()
+        await self._use_snapshot(snapshot)
+        return snapshot
+    
+    def _open_current(self, fingerprint: str) -> Optional[CatalogSnapshot]:
+        """Map the published snapshot if it was built from ``fingerprint``.
+        
+        Returns:
+            The snapshot, or None if none is published, it cannot be mapped
+            or its sources changed
+        """
+        try:
+            snapshot = CatalogSnapshot.open_current(self.snapshot_dir)
+        except (OSError, ValueError) as e:
+            self.logger.warning("Failed to map catalog snapshot", error=str(e))
+            return None
+        if snapshot is not None and snapshot.source_fingerprint != fingerprint:
+            self.logger.info("Catalog sources changed since snapshot, rebuilding", path=str(snapshot.path))
+            return None
+        return snapshot
+    
+    async def _build_snapshot(self, fingerprint: str) -> CatalogSnapshot:
+        """Parse the sources and publish a snapshot (caller holds the lock).
+        
+        Args:
+            fingerprint: Source fingerprint taken before loading
+        
+        Returns:
+            The new snapshot, not yet in use by this service
+        """
         # Load all data in parallel
         results = await asyncio.gather(
             self.product_loader.load(),
             self.pricing_loader.load(),
             self.testing_loader.load(),
             self.standards_loader.load(),
-            self.rfp_loader.load(),
             return_exceptions=True
         )
         
-        # Store results
-        self._products_cache = results[0] if not isinstance(results[0], Exception) else []
-        self._pricing_cache = results[1] if not isinstance(results[1], Exception) else []
-        self._testing_cache = results[2] if not isinstance(results[2], Exception) else {}
-        self._standards_cache = results[3] if not isinstance(results[3], Exception) else {}
-        self._rfps_cache = results[4] if not isinstance(results[4], Exception) else []
-        
         # Log any errors
+        failed = False
         for i, result in enumerate(results):
             if isinstance(result, Exception):
-                loader_names = ["Products", "Pricing", "Testing", "Standards", "RFPs"]
+                failed = True
+                loader_names = ["Products", "Pricing", "Testing", "Standards"]
                 self.logger.error(
                     f"Failed to load {loader_names[i]} data",
                     error=str(result)
                 )
         
-        self._initialized = True
+        tables = {
+            "products": results[0] if not isinstance(results[0], Exception) else [],
+            "pricing": results[1] if not isinstance(results[1], Exception) else [],
+        }
+        documents = {
+            "testing": results[2] if not isinstance(results[2], Exception) else {},
+            "standards": results[3] if not isinstance(results[3], Exception) else {},
+        }
         
-        self.logger.info(
-            "Data service initialized",
-            products=len(self._products_cache),
-            pricing=len(self._pricing_cache),
-            testing_categories=len(self._testing_cache),
-            standards_categories=len(self._standards_cache),
-            rfps=len(self._rfps_cache)
+        if self.snapshot_dir and not failed:
+            path = await asyncio.to_thread(
+                write_snapshot, self.snapshot_dir, tables, documents, fingerprint=fingerprint
+            )
+            snapshot = CatalogSnapshot.open(path)
+        else:
+            snapshot = CatalogSnapshot(
+                await asyncio.to_thread(encode_snapshot, tables, documents, fingerprint)
+            )
+        
+        self.logger.info("Built catalog snapshot", **snapshot.stats())
+        return snapshot
+    
+    async def _use_snapshot(self, snapshot: CatalogSnapshot):
+        """Build the lookup indexes of a snapshot, then swap it in.
+        
+        Args:
+            snapshot: Snapshot to serve from
+        """
+        tests_by_name, standards_by_code = await asyncio.to_thread(self._build_indexes, snapshot)
+        
+        # Publish the indexes together with the snapshot they describe
+        self._snapshot = snapshot
+        self._tests_by_name = tests_by_name
+        self._standards_by_code = standards_by_code
+    
+    @staticmethod
+    def _build_indexes(snapshot: CatalogSnapshot) -> Tuple[Dict, Dict]:
+        snapshot.table("products").build_indexes(PRODUCT_INDEXES)
+        snapshot.table("pricing").build_indexes(PRICING_INDEXES)
+        
+        def by_key(document: Dict[str, Any], key: str) -> Dict[Any, Tuple[str, Dict[str, Any]]]:
+            # First match wins, as in a scan over categories in order
+            index: Dict[Any, Tuple[str, Dict[str, Any]]] = {}
+            for category, records in document.items():
+                if isinstance(records, list):
+                    for record in records:
+                        index.setdefault(record.get(key), (category, record))
+            return index
+        
+        return (
+            by_key(snapshot.document("testing", {}), "test_name"),
+            by_key(snapshot.document("standards", {}), "standard_code"),
         )
     
+    def _page(
+        self,
+        table: SnapshotTable,
+        skip: int,
+        limit: int,
+        cursor: Optional[str]
+    ) -> Dict[str, Any]:
+        """Slice a filtered view, resuming after ``cursor`` if given.
+        
+        Cursors name a row of the current snapshot, so paging is stable
+        however long a client takes between pages.
+        
+        Args:
+            table: Filtered view to page through
+            skip: Number of records to skip after the cursor
+            limit: Maximum number of records to return
+            cursor: ``next_cursor`` of the previous page
+            
+        Returns:
+            Dict with the page ``items`` and the ``next_cursor``, which is
+            None on the last page
+            
+        Raises:
+            ValueError: If the cursor is malformed or from another snapshot
+        """
+        if cursor:
+            table = table.after(self._decode_cursor(cursor))
+        rows = table.rows[skip:skip + limit]
+        has_more = len(rows) > 0 and len(table) > skip + limit
+        return {
+            "items": table[skip:skip + limit],
+            "next_cursor": self._encode_cursor(int(rows[-1])) if has_more else None,
+        }
+    
+    def _encode_cursor(self, row: int) -> str:
+        token = f"{self._snapshot.snapshot_id}:{row}".encode("utf-8")
+        return base64.urlsafe_b64encode(token).decode("ascii")
+    
+    def _decode_cursor(self, cursor: str) -> int:
+        try:
+            snapshot_id, row = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").rsplit(":", 1)
+            row = int(row)
+        except (ValueError, UnicodeError) as e:
+            raise ValueError("Invalid pagination cursor") from e
+        if snapshot_id != self._snapshot.snapshot_id:
+            raise ValueError("Pagination cursor is from a previous catalog snapshot; restart from the first page")
+        return row
+    
+    @property
+    def _products(self) -> SnapshotTable:
+        return self._snapshot.table("products")
+    
+    @property
+    def _pricing(self) -> SnapshotTable:
+        return self._snapshot.table("pricing")
+    
+    @property
+    def _testing(self) -> Dict[str, Any]:
+        return self._snapshot.document("testing", {})
+    
+    @property
+    def _standards(self) -> Dict[str, Any]:
+        return self._snapshot.document("standards", {})
+    
     # ========== Product Methods ==========
     
     async def get_products(
@@ -112,29 +355,85 @@ class DataService:
         if not self._initialized:
             await self.initialize()
         
-        products = self._products_cache or []
+        products = self._filter_products(category, brand, search)
+        
+        # Apply pagination
+        return products[skip:skip + limit]
+    
+    async def count_products(
+        self,
+        category: Optional[str] = None,
+        brand: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> int:
+        """Count products matching the filters without materializing them.
+        
+        Args:
+            category: Filter by category
+            brand: Filter by brand
+            search: Search in product name
+            
+        Returns:
+            Number of matching products
+        """
+        if not self._initialized:
+            await self.initialize()
+        
+        return len(self._filter_products(category, brand, search))
+    
+    async def get_products_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        category: Optional[str] = None,
+        brand: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get a page of products with a cursor for the next page.
+        
+        Args:
+            limit: Maximum number of records to return
+            cursor: ``next_cursor`` of the previous page
+            skip: Number of records to skip after the cursor
+            category: Filter by category
+            brand: Filter by brand
+            search: Search in product name
+            
+        Returns:
+            Dict with ``items`` and ``next_cursor``
+            
+        Raises:
+            ValueError: If the cursor is invalid or stale
+        """
+        if not self._initialized:
+            await self.initialize()
+        
+        return self._page(self._filter_products(category, brand, search), skip, limit, cursor)
+    
+    def _filter_products(
+        self,
+        category: Optional[str],
+        brand: Optional[str],
+        search: Optional[str]
+    ) -> SnapshotTable:
+        products = self._products
         
         # Apply filters
         if category:
-            products = [p for p in products if p.get("category") == category]
+            products = products.where(category=category)
         if brand:
-            products = [p for p in products if p.get("brand") == brand]
+            products = products.where(brand=brand)
         if search:
-            search_lower = search.lower()
-            products = [
-                p for p in products
-                if search_lower in p.get("name", "").lower()
-                or search_lower in p.get("category", "").lower()
-            ]
+            products = products.search(search, ("name", "category"))
         
-        # Apply pagination
-        return products[skip:skip + limit]
+        return products
     
     async def get_product_by_id(self, product_id: str) -> Optional[Dict[str, Any]]:
-        """Get a specific product by ID or product code.
+        """Get a specific product by model, product code or ID.
         
         Args:
-            product_id: Product ID or product code
+            product_id: Product model/SKU, product code or ID
             
         Returns:
             Product dict or None
@@ -142,14 +441,7 @@ class DataService:
         if not self._initialized:
             await self.initialize()
         
-        products = self._products_cache or []
-        
-        for product in products:
-            if (product.get("product_code") == product_id or
-                product.get("id") == product_id):
-                return product
-        
-        return None
+        return self._products.first(product_id, PRODUCT_KEY_COLUMNS)
     
     async def get_products_by_category(self, category: str) -> List[Dict[str, Any]]:
         """Get all products in a category.
@@ -182,9 +474,7 @@ class DataService:
         if not self._initialized:
             await self.initialize()
         
-        products = self._products_cache or []
-        categories = set(p.get("category") for p in products if p.get("category"))
-        return sorted(list(categories))
+        return self._products.unique("category")
     
     async def get_product_brands(self) -> List[str]:
         """Get list of all product brands.
@@ -195,9 +485,7 @@ class DataService:
         if not self._initialized:
             await self.initialize()
         
-        products = self._products_cache or []
-        brands = set(p.get("brand") for p in products if p.get("brand"))
-        return sorted(list(brands))
+        return self._products.unique("brand")
     
     # ========== Pricing Methods ==========
     
@@ -222,22 +510,74 @@ class DataService:
         if not self._initialized:
             await self.initialize()
         
-        pricing = self._pricing_cache or []
+        pricing = self._filter_pricing(product_code, brand)
+        
+        # Apply pagination
+        return pricing[skip:skip + limit]
+    
+    async def count_pricing(
+        self,
+        product_code: Optional[str] = None,
+        brand: Optional[str] = None
+    ) -> int:
+        """Count pricing records matching the filters.
+        
+        Args:
+            product_code: Filter by product code
+            brand: Filter by brand
+            
+        Returns:
+            Number of matching pricing records
+        """
+        if not self._initialized:
+            await self.initialize()
+        
+        return len(self._filter_pricing(product_code, brand))
+    
+    async def get_pricing_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        product_code: Optional[str] = None,
+        brand: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get a page of pricing records with a cursor for the next page.
+        
+        Args:
+            limit: Maximum number of records to return
+            cursor: ``next_cursor`` of the previous page
+            skip: Number of records to skip after the cursor
+            product_code: Filter by product code
+            brand: Filter by brand
+            
+        Returns:
+            Dict with ``items`` and ``next_cursor``
+            
+        Raises:
+            ValueError: If the cursor is invalid or stale
+        """
+        if not self._initialized:
+            await self.initialize()
+        
+        return self._page(self._filter_pricing(product_code, brand), skip, limit, cursor)
+    
+    def _filter_pricing(self, product_code: Optional[str], brand: Optional[str]) -> SnapshotTable:
+        pricing = self._pricing
         
         # Apply filters
         if product_code:
-            pricing = [p for p in pricing if p.get("product_code") == product_code]
+            pricing = pricing.where(product_code=product_code)
         if brand:
-            pricing = [p for p in pricing if p.get("brand") == brand]
+            pricing = pricing.where(brand=brand)
         
-        # Apply pagination
-        return pricing[skip:skip + limit]
+        return pricing
     
     async def get_pricing_for_product(self, product_code: str) -> Optional[Dict[str, Any]]:
         """Get pricing for a specific product.
         
         Args:
-            product_code: Product code
+            product_code: Pricing product ID, model or product code
             
         Returns:
             Pricing dict or None
@@ -245,13 +585,7 @@ class DataService:
         if not self._initialized:
             await self.initialize()
         
-        pricing = self._pricing_cache or []
-        
-        for price in pricing:
-            if price.get("product_code") == product_code:
-                return price
-        
-        return None
+        return self._pricing.first(product_code, PRICING_KEY_COLUMNS)
     
     # ========== Testing Methods ==========
     
@@ -264,7 +598,7 @@ class DataService:
         if not self._initialized:
             await self.initialize()
         
-        return self._testing_cache or {}
+        return self._testing
     
     async def get_test_by_name(self, test_name: str) -> Optional[Dict[str, Any]]:
         """Find a test by name across all categories.
@@ -278,15 +612,12 @@ class DataService:
         if not self._initialized:
             await self.initialize()
         
-        testing = self._testing_cache or {}
+        match = self._tests_by_name.get(test_name)
+        if match is None:
+            return None
         
-        for category, tests in testing.items():
-            if isinstance(tests, list):
-                for test in tests:
-                    if test.get("test_name") == test_name:
-                        return {**test, "category": category}
-        
-        return None
+        category, test = match
+        return {**test, "category": category}
     
     async def get_tests_by_category(self, category: str) -> List[Dict[str, Any]]:
         """Get all tests in a category.
@@ -300,8 +631,7 @@ class DataService:
         if not self._initialized:
             await self.initialize()
         
-        testing = self._testing_cache or {}
-        return testing.get(category, [])
+        return self._testing.get(category, [])
     
     # ========== Standards Methods ==========
     
@@ -314,7 +644,7 @@ class DataService:
         if not self._initialized:
             await self.initialize()
         
-        return self._standards_cache or {}
+        return self._standards
     
     async def get_standard_by_code(self, standard_code: str) -> Optional[Dict[str, Any]]:
         """Find a standard by code.
@@ -328,15 +658,12 @@ class DataService:
         if not self._initialized:
             await self.initialize()
         
-        standards = self._standards_cache or {}
-        
-        for category, standards_list in standards.items():
-            if isinstance(standards_list, list):
-                for standard in standards_list:
-                    if standard.get("standard_code") == standard_code:
-                        return {**standard, "category": category}
+        match = self._standards_by_code.get(standard_code)
+        if match is None:
+            return None
         
-        return None
+        category, standard = match
+        return {**standard, "category": category}
     
     async def get_indian_standards(self) -> List[Dict[str, Any]]:
         """Get all Indian standards.
@@ -347,8 +674,7 @@ class DataService:
         if not self._initialized:
             await self.initialize()
         
-        standards = self._standards_cache or {}
-        return standards.get("indian_standards", [])
+        return self._standards.get("indian_standards", [])
     
     async def get_international_standards(self) -> List[Dict[str, Any]]:
         """Get all international standards.
@@ -359,8 +685,7 @@ class DataService:
         if not self._initialized:
             await self.initialize()
         
-        standards = self._standards_cache or {}
-        return standards.get("international_standards", [])
+        return self._standards.get("international_standards", [])
     
     # ========== Historical RFP Methods ==========
     
@@ -415,8 +740,8 @@ class DataService:
         if not self._initialized:
             await self.initialize()
         
-        testing = self._testing_cache or {}
-        standards = self._standards_cache or {}
+        testing = self._testing
+        standards = self._standards
         
         total_tests = sum(
             len(v) if isinstance(v, list) else 0
@@ -430,12 +755,12 @@ class DataService:
         
         return {
             "products": {
-                "total": len(self._products_cache or []),
+                "total": len(self._products),
                 "categories": len(await self.get_product_categories()),
                 "brands": len(await self.get_product_brands()),
             },
             "pricing": {
-                "total": len(self._pricing_cache or []),
+                "total": len(self._pricing),
             },
             "testing": {
                 "total": total_tests,
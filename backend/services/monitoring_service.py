@@ -2,42 +2,227 @@
 Production Monitoring Service
 Tracks performance metrics, bottlenecks, and system health
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
+import math
+import re
 import time
 import threading
 import psutil
 import functools
 
 
+class LogHistogram:
+    """Fixed-memory histogram with logarithmic buckets (DDSketch style).
+    
+    Bucket bounds grow by a factor gamma, so any quantile is answered
+    within ``relative_accuracy`` of a recorded value. Values at or below
+    ``min_value`` (including zero and negatives) share one bucket and
+    bucket indexes are capped at ``max_value``, which bounds memory no
+    matter how many samples are recorded.
+    """
+    
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-9, max_value: float = 1e9):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.min_value = min_value
+        self.max_value = max_value
+        self._log_gamma = math.log(self.gamma)
+        self._max_index = math.ceil(math.log(max_value) / self._log_gamma)
+        self.buckets: Dict[int, int] = {}
+        self.low_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def add(self, value: float):
+        """Record one value."""
+        if value > self.min_value:
+            index = min(math.ceil(math.log(value) / self._log_gamma), self._max_index)
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+        else:
+            self.low_count += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+    
+    def merge(self, other: 'LogHistogram'):
+        """Add another histogram's samples (same accuracy) into this one."""
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.low_count += other.low_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    def clear(self):
+        """Drop all samples."""
+        self.buckets.clear()
+        self.low_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile (0 <= q <= 1); None when empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.low_count:
+            return self.min
+        
+        seen = self.low_count
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # Midpoint (in relative terms) of the bucket (gamma^(i-1), gamma^i]
+                value = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+class MetricSeries:
+    """Samples of one metric name and tag set.
+    
+    Keeps a lifetime histogram plus a ring of per-slot histograms covering
+    the recent window; a slot is reset when the clock comes round to it.
+    """
+    
+    def __init__(self, relative_accuracy: float, slot_seconds: float, slots: int):
+        self.slot_seconds = slot_seconds
+        self.total = LogHistogram(relative_accuracy)
+        self._windows = [LogHistogram(relative_accuracy) for _ in range(slots)]
+        self._epochs = [-1] * slots
+        self.last: Optional[float] = None
+        self.last_time = 0.0
+    
+    def add(self, value: float, now: float):
+        epoch = int(now // self.slot_seconds)
+        slot = epoch % len(self._windows)
+        window = self._windows[slot]
+        if self._epochs[slot] != epoch:
+            window.clear()
+            self._epochs[slot] = epoch
+        window.add(value)
+        self.total.add(value)
+        self.last = value
+        self.last_time = now
+    
+    def merge_recent(self, into: LogHistogram, duration_seconds: float, now: float):
+        """Merge the slots overlapping the last ``duration_seconds`` into ``into``."""
+        current = int(now // self.slot_seconds)
+        oldest = current - max(1, math.ceil(duration_seconds / self.slot_seconds)) + 1
+        for epoch, window in zip(self._epochs, self._windows):
+            if oldest <= epoch <= current:
+                into.merge(window)
+
+
+def _prometheus_name(name: str) -> str:
+    name = re.sub(r'[^a-zA-Z0-9_:]', '_', name)
+    return f"_{name}" if name[:1].isdigit() else name
+
+
+def _prometheus_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels:
+        value = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{_prometheus_name(key)}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _prometheus_value(value: Optional[float]) -> str:
+    return "NaN" if value is None else repr(float(value))
+
+
 class PerformanceMonitor:
-    """Monitor and track performance metrics"""
+    """Monitor and track performance metrics
+    
+    Each metric name and tag set is a series of log-bucketed histograms
+    (fixed memory, p50/p95/p99 within ``relative_accuracy``). Recording
+    takes one of ``stripes`` locks chosen by series, so concurrent
+    requests rarely contend; readers lock one series at a time.
+    """
     
-    def __init__(self, window_size: int = 1000):
-        self.window_size = window_size
-        self.metrics = defaultdict(lambda: deque(maxlen=window_size))
+    QUANTILES = (0.5, 0.95, 0.99)
+    
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        window_seconds: int = 300,
+        slot_seconds: int = 10,
+        stripes: int = 16,
+        max_series: int = 10000
+    ):
+        """Initialize the monitor.
+        
+        Args:
+            relative_accuracy: Quantile error bound relative to the value
+            window_seconds: Longest window served by get_metric_stats
+            slot_seconds: Granularity of windowed stats
+            stripes: Number of recording locks
+            max_series: Cap on name/tag-set combinations (extra ones are dropped)
+        """
+        self.relative_accuracy = relative_accuracy
+        self.window_seconds = window_seconds
+        self.slot_seconds = slot_seconds
+        self.max_series = max_series
+        # One extra slot so a full window is covered while the current slot fills
+        self._slots = math.ceil(window_seconds / slot_seconds) + 1
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+        self.series: Dict[Tuple[str, Tuple], MetricSeries] = {}
+        self._series_by_name: Dict[str, List[Tuple[str, Tuple]]] = defaultdict(list)
+        self.dropped_series = 0
         self.counters = defaultdict(int)
         self.timers = {}
-        self.lock = threading.Lock()
+        self.lock = threading.Lock()  # Series creation and system metrics
         
         # System monitoring
         self.system_metrics = deque(maxlen=60)  # Last 60 measurements
         self.start_time = time.time()
     
+    def _stripe(self, key) -> threading.Lock:
+        return self._stripes[hash(key) % len(self._stripes)]
+    
+    def _get_series(self, key: Tuple[str, Tuple]) -> Optional[MetricSeries]:
+        series = self.series.get(key)
+        if series is not None:
+            return series
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                if len(self.series) >= self.max_series:
+                    self.dropped_series += 1
+                    return None
+                series = MetricSeries(self.relative_accuracy, self.slot_seconds, self._slots)
+                self.series[key] = series
+                self._series_by_name[key[0]].append(key)
+            return series
+    
+    @staticmethod
+    def _tag_key(tags: Optional[Dict]) -> Tuple:
+        return tuple(sorted((str(k), str(v)) for k, v in tags.items())) if tags else ()
+    
     def record_metric(self, name: str, value: float, tags: Optional[Dict] = None):
         """Record a metric value"""
-        with self.lock:
-            timestamp = time.time()
-            self.metrics[name].append({
-                'value': value,
-                'timestamp': timestamp,
-                'tags': tags or {}
-            })
+        key = (name, self._tag_key(tags))
+        series = self._get_series(key)
+        if series is None:
+            return
+        with self._stripe(key):
+            series.add(value, time.time())
     
     def increment_counter(self, name: str, value: int = 1):
         """Increment a counter"""
-        with self.lock:
+        with self._stripe(name):
             self.counters[name] += value
     
     def start_timer(self, name: str) -> str:
@@ -58,46 +243,124 @@ class PerformanceMonitor:
             return duration
         return None
     
-    def get_metric_stats(self, name: str, duration_seconds: int = 60) -> Dict[str, Any]:
-        """Get statistics for a metric"""
-        with self.lock:
-            if name not in self.metrics:
-                return {}
-            
-            cutoff_time = time.time() - duration_seconds
-            recent_values = [
-                m['value'] for m in self.metrics[name]
-                if m['timestamp'] >= cutoff_time
-            ]
-            
-            if not recent_values:
-                return {}
-            
-            return {
-                'count': len(recent_values),
-                'min': min(recent_values),
-                'max': max(recent_values),
-                'avg': sum(recent_values) / len(recent_values),
-                'sum': sum(recent_values),
-                'last': recent_values[-1] if recent_values else None
-            }
+    def _summarize(self, keys: List[Tuple[str, Tuple]], duration_seconds: float, now: float) -> Dict[str, Any]:
+        merged = LogHistogram(self.relative_accuracy)
+        last, last_time = None, -math.inf
+        for key in keys:
+            series = self.series[key]
+            with self._stripe(key):
+                series.merge_recent(merged, duration_seconds, now)
+                if series.last_time > last_time and series.last_time >= now - duration_seconds:
+                    last, last_time = series.last, series.last_time
+        
+        if not merged.count:
+            return {}
+        
+        stats = {
+            'count': merged.count,
+            'min': merged.min,
+            'max': merged.max,
+            'avg': merged.sum / merged.count,
+            'sum': merged.sum,
+            'last': last
+        }
+        for q in self.QUANTILES:
+            stats[f"p{round(q * 100)}"] = merged.quantile(q)
+        return stats
+    
+    def get_metric_stats(
+        self,
+        name: str,
+        duration_seconds: int = 60,
+        tags: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """Get statistics for a metric
+        
+        Args:
+            name: Metric name
+            duration_seconds: Window length, in whole slots, up to window_seconds
+            tags: Only this tag set (default: all tag sets combined)
+        
+        Returns:
+            count/min/max/avg/sum/last and p50/p95/p99, or {} without samples
+        """
+        keys = list(self._series_by_name.get(name, ()))
+        if tags is not None:
+            keys = [key for key in keys if key[1] == self._tag_key(tags)]
+        return self._summarize(keys, duration_seconds, time.time())
     
     def get_all_metrics(self) -> Dict[str, Any]:
         """Get all metrics summary"""
-        with self.lock:
-            metrics_summary = {}
-            
-            for name in self.metrics.keys():
-                stats = self.get_metric_stats(name, duration_seconds=300)  # Last 5 minutes
-                if stats:
-                    metrics_summary[name] = stats
+        now = time.time()
+        metrics_summary = {}
+        series_summary = {}
+        
+        for name, keys in list(self._series_by_name.items()):
+            keys = list(keys)
+            stats = self._summarize(keys, 300, now)  # Last 5 minutes
+            if not stats:
+                continue
+            metrics_summary[name] = stats
             
-            return {
-                'metrics': metrics_summary,
-                'counters': dict(self.counters),
-                'active_timers': len(self.timers),
-                'uptime_seconds': time.time() - self.start_time
-            }
+            tagged = []
+            for key in keys:
+                if key[1]:
+                    key_stats = self._summarize([key], 300, now)
+                    if key_stats:
+                        tagged.append({'tags': dict(key[1]), **key_stats})
+            if tagged:
+                series_summary[name] = tagged
+        
+        return {
+            'metrics': metrics_summary,
+            'series': series_summary,
+            'counters': dict(self.counters),
+            'active_timers': len(self.timers),
+            'dropped_series': self.dropped_series,
+            'uptime_seconds': now - self.start_time
+        }
+    
+    def render_prometheus(self) -> str:
+        """Render counters, metric summaries and gauges in Prometheus text format.
+        
+        Metrics are exposed as summaries: quantiles over the recent window,
+        _sum and _count over the process lifetime.
+        """
+        now = time.time()
+        lines = []
+        
+        for name, value in sorted(dict(self.counters).items()):
+            metric = _prometheus_name(name)
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        
+        for name, keys in sorted(list(self._series_by_name.items())):
+            metric = _prometheus_name(name)
+            lines.append(f"# TYPE {metric} summary")
+            for key in list(keys):
+                series = self.series[key]
+                recent = LogHistogram(self.relative_accuracy)
+                with self._stripe(key):
+                    series.merge_recent(recent, self.window_seconds, now)
+                    total_sum, total_count = series.total.sum, series.total.count
+                for q in self.QUANTILES:
+                    labels = _prometheus_labels(key[1] + (('quantile', str(q)),))
+                    lines.append(f"{metric}{labels} {_prometheus_value(recent.quantile(q))}")
+                labels = _prometheus_labels(key[1])
+                lines.append(f"{metric}_sum{labels} {_prometheus_value(total_sum)}")
+                lines.append(f"{metric}_count{labels} {total_count}")
+        
+        gauges = {'process_uptime_seconds': now - self.start_time}
+        if self.system_metrics:
+            latest = self.system_metrics[-1]
+            for field in ('cpu_percent', 'memory_percent', 'disk_percent'):
+                if field in latest:
+                    gauges[f"system_{field}"] = latest[field]
+        for name, value in gauges.items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {_prometheus_value(value)}")
+        
+        return "\n".join(lines) + "\n"
     
     def record_system_metrics(self):
         """Record current system metrics"""
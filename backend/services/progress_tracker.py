@@ -1,82 +1,416 @@
 """
 Progress Tracker for RFP Processing
 Tracks agent execution progress in real-time
+
+Progress lives in a pluggable backend so every worker process sees the
+same state. Each change is also appended to a per-RFP event log with a
+monotonically increasing sequence number, which lets clients stream
+updates and resume from the last sequence they saw.
 """
-from typing import Dict, Any
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional, Callable, AsyncIterator
 from datetime import datetime
+from pathlib import Path
+from threading import Lock
+import asyncio
+import json
+import sqlite3
+import time
 import structlog
 
 logger = structlog.get_logger()
 
+# Event types after which no further updates are expected
+TERMINAL_EVENTS = {'completed', 'failed', 'cleared'}
+
+# Returned for RFPs with no recorded progress
+NOT_STARTED = {
+    "status": "not_started",
+    "progress": 0,
+    "current_stage": "Not Started",
+    "agents_status": {}
+}
+
+
+class ProgressBackend(ABC):
+    """Storage for progress state and its event log."""
+    
+    @abstractmethod
+    def update(
+        self,
+        rfp_id: int,
+        mutate: Callable[[Optional[Dict[str, Any]]], Optional[Dict[str, Any]]],
+        event_type: str,
+        reset_events: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Atomically apply a mutation and append an event.
+        
+        Args:
+            rfp_id: RFP identifier
+            mutate: Receives the current state (or None) and returns the new
+                state, or None to skip the update
+            event_type: Type recorded in the event log
+            reset_events: Drop earlier events of this RFP (new run)
+        
+        Returns:
+            The appended event, or None if the mutation was skipped
+        """
+    
+    @abstractmethod
+    def get(self, rfp_id: int) -> Optional[Dict[str, Any]]:
+        """Get current state with its 'seq', or None."""
+    
+    @abstractmethod
+    def events_since(self, rfp_id: int, seq: int, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get events with sequence numbers greater than seq, oldest first."""
+    
+    @abstractmethod
+    def delete(self, rfp_id: int):
+        """Remove state and events of an RFP."""
+    
+    def close(self):
+        """Release backend resources."""
+
+
+class MemoryProgressBackend(ProgressBackend):
+    """In-process backend (single worker, tests)."""
+    
+    def __init__(self):
+        self._lock = Lock()
+        self._states: Dict[int, Dict[str, Any]] = {}
+        self._events: Dict[int, List[Dict[str, Any]]] = {}
+        self._seqs: Dict[int, int] = {}
+    
+    def update(self, rfp_id, mutate, event_type, reset_events=False):
+        with self._lock:
+            current = self._states.get(rfp_id)
+            state = mutate(json.loads(json.dumps(current)) if current is not None else None)
+            if state is None:
+                return None
+            seq = self._seqs.get(rfp_id, 0) + 1
+            self._seqs[rfp_id] = seq
+            self._states[rfp_id] = state
+            event = _make_event(rfp_id, seq, event_type, state)
+            if reset_events:
+                self._events[rfp_id] = []
+            self._events.setdefault(rfp_id, []).append(event)
+            return event
+    
+    def get(self, rfp_id):
+        with self._lock:
+            state = self._states.get(rfp_id)
+            if state is None:
+                return None
+            return {**json.loads(json.dumps(state)), 'seq': self._seqs[rfp_id]}
+    
+    def events_since(self, rfp_id, seq, limit=100):
+        with self._lock:
+            return [e for e in self._events.get(rfp_id, []) if e['seq'] > seq][:limit]
+    
+    def delete(self, rfp_id):
+        with self._lock:
+            self._states.pop(rfp_id, None)
+            self._events.pop(rfp_id, None)
+            self._seqs.pop(rfp_id, None)
+
+
+class SQLiteProgressBackend(ProgressBackend):
+    """SQLite (WAL mode) backend shared by all workers on one host."""
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS progress_state (
+            rfp_id INTEGER PRIMARY KEY,
+            seq INTEGER NOT NULL,
+            state TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS progress_events (
+            rfp_id INTEGER NOT NULL,
+            seq INTEGER NOT NULL,
+            body TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (rfp_id, seq)
+        );
+    """
+    
+    def __init__(
+        self,
+        db_path: str = "data/progress.db",
+        busy_timeout: float = 30.0,
+        retention_hours: float = 24.0
+    ):
+        """Initialize SQLite backend.
+        
+        Args:
+            db_path: Database file path
+            busy_timeout: Seconds to wait for a competing writer
+            retention_hours: Events older than this are pruned when a new run starts
+        """
+        self.logger = logger.bind(component="SQLiteProgressBackend")
+        self.db_path = db_path
+        self.retention_seconds = retention_hours * 3600
+        
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        self._conn = sqlite3.connect(
+            db_path,
+            timeout=busy_timeout,
+            isolation_level=None,  # explicit transactions only
+            check_same_thread=False
+        )
+        self._lock = Lock()
+        
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self._SCHEMA)
+    
+    def _transaction(self, work: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run work inside BEGIN IMMEDIATE so read-modify-write never races."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(self._conn)
+                self._conn.execute("COMMIT")
+                return result
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    def update(self, rfp_id, mutate, event_type, reset_events=False):
+        def apply(conn: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+            row = conn.execute(
+                "SELECT seq, state FROM progress_state WHERE rfp_id = ?", (rfp_id,)
+            ).fetchone()
+            seq, current = (row[0], json.loads(row[1])) if row else (0, None)
+            state = mutate(current)
+            if state is None:
+                return None
+            
+            seq += 1
+            now = time.time()
+            event = _make_event(rfp_id, seq, event_type, state)
+            if reset_events:
+                conn.execute("DELETE FROM progress_events WHERE rfp_id = ?", (rfp_id,))
+                conn.execute(
+                    "DELETE FROM progress_events WHERE created_at < ?",
+                    (now - self.retention_seconds,)
+                )
+            conn.execute(
+                "INSERT INTO progress_state (rfp_id, seq, state, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(rfp_id) DO UPDATE SET "
+                "seq = excluded.seq, state = excluded.state, updated_at = excluded.updated_at",
+                (rfp_id, seq, json.dumps(state, default=str), now)
+            )
+            conn.execute(
+                "INSERT INTO progress_events (rfp_id, seq, body, created_at) VALUES (?, ?, ?, ?)",
+                (rfp_id, seq, json.dumps(event, default=str), now)
+            )
+            return event
+        
+        return self._transaction(apply)
+    
+    def get(self, rfp_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT seq, state FROM progress_state WHERE rfp_id = ?", (rfp_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {**json.loads(row[1]), 'seq': row[0]}
+    
+    def events_since(self, rfp_id, seq, limit=100):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT body FROM progress_events WHERE rfp_id = ? AND seq > ? "
+                "ORDER BY seq LIMIT ?",
+                (rfp_id, seq, limit)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+    
+    def delete(self, rfp_id):
+        def remove(conn: sqlite3.Connection):
+            conn.execute("DELETE FROM progress_state WHERE rfp_id = ?", (rfp_id,))
+            conn.execute("DELETE FROM progress_events WHERE rfp_id = ?", (rfp_id,))
+        self._transaction(remove)
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _make_event(rfp_id: int, seq: int, event_type: str, state: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "rfp_id": rfp_id,
+        "seq": seq,
+        "type": event_type,
+        "state": state,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
 
 class ProgressTracker:
     """Track processing progress for RFPs."""
     
-    # In-memory storage (use Redis in production)
-    _progress_store: Dict[int, Dict[str, Any]] = {}
+    # Shared backend; created on first use (SQLite so all workers agree)
+    _backend: Optional[ProgressBackend] = None
+    
+    @classmethod
+    def configure(cls, backend: ProgressBackend):
+        """Replace the progress backend.
+        
+        Args:
+            backend: Backend instance (e.g. MemoryProgressBackend for tests)
+        """
+        if cls._backend is not None and cls._backend is not backend:
+            cls._backend.close()
+        cls._backend = backend
+    
+    @classmethod
+    def backend(cls) -> ProgressBackend:
+        """Get the active backend, creating the default SQLite store if needed."""
+        if cls._backend is None:
+            cls._backend = SQLiteProgressBackend()
+        return cls._backend
     
     @classmethod
     def start_processing(cls, rfp_id: int):
         """Initialize processing progress."""
-        cls._progress_store[rfp_id] = {
+        cls.backend().update(rfp_id, lambda _: {
             "status": "processing",
             "progress": 0,
             "current_stage": "Initializing",
             "agents_status": {},
             "estimated_time_remaining": "2-5 minutes",
             "started_at": datetime.utcnow().isoformat()
-        }
+        }, 'started', reset_events=True)
         logger.info("Processing started", rfp_id=rfp_id)
     
     @classmethod
     def update_stage(cls, rfp_id: int, stage: str, progress: int):
         """Update current processing stage."""
-        if rfp_id in cls._progress_store:
-            cls._progress_store[rfp_id].update({
+        def mutate(state):
+            if state is None:
+                return None
+            state.update({
                 "current_stage": stage,
                 "progress": progress,
                 "updated_at": datetime.utcnow().isoformat()
             })
+            return state
+        
+        if cls.backend().update(rfp_id, mutate, 'stage'):
             logger.info("Stage updated", rfp_id=rfp_id, stage=stage, progress=progress)
     
     @classmethod
     def update_agent_status(cls, rfp_id: int, agent_name: str, status: str, details: str = ""):
         """Update individual agent status."""
-        if rfp_id in cls._progress_store:
-            if "agents_status" not in cls._progress_store[rfp_id]:
-                cls._progress_store[rfp_id]["agents_status"] = {}
-            
-            cls._progress_store[rfp_id]["agents_status"][agent_name] = {
+        def mutate(state):
+            if state is None:
+                return None
+            state.setdefault("agents_status", {})[agent_name] = {
                 "status": status,  # running, completed, failed
                 "details": details,
                 "updated_at": datetime.utcnow().isoformat()
             }
+            return state
+        
+        if cls.backend().update(rfp_id, mutate, 'agent_status'):
             logger.info("Agent status updated", rfp_id=rfp_id, agent=agent_name, status=status)
     
     @classmethod
     def complete_processing(cls, rfp_id: int, success: bool = True):
         """Mark processing as complete."""
-        if rfp_id in cls._progress_store:
-            cls._progress_store[rfp_id].update({
+        def mutate(state):
+            if state is None:
+                return None
+            state.update({
                 "status": "completed" if success else "failed",
-                "progress": 100 if success else cls._progress_store[rfp_id].get("progress", 0),
+                "progress": 100 if success else state.get("progress", 0),
                 "current_stage": "Completed" if success else "Failed",
                 "completed_at": datetime.utcnow().isoformat()
             })
+            return state
+        
+        if cls.backend().update(rfp_id, mutate, 'completed' if success else 'failed'):
             logger.info("Processing completed", rfp_id=rfp_id, success=success)
     
     @classmethod
     def get_progress(cls, rfp_id: int) -> Dict[str, Any]:
-        """Get current progress status."""
-        return cls._progress_store.get(rfp_id, {
-            "status": "not_started",
-            "progress": 0,
-            "current_stage": "Not Started",
-            "agents_status": {}
-        })
+        """Get current progress status (with the latest event 'seq')."""
+        state = cls.backend().get(rfp_id)
+        if state is None:
+            return {**NOT_STARTED, "agents_status": {}, "seq": 0}
+        return state
     
     @classmethod
     def clear_progress(cls, rfp_id: int):
         """Clear progress data for an RFP."""
-        if rfp_id in cls._progress_store:
-            del cls._progress_store[rfp_id]
+        cls.backend().delete(rfp_id)
+    
+    @classmethod
+    def get_events(cls, rfp_id: int, since: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get progress events after a sequence number."""
+        return cls.backend().events_since(rfp_id, since, limit)
+    
+    @classmethod
+    async def wait_for_events(
+        cls,
+        rfp_id: int,
+        since: int = 0,
+        timeout: float = 25.0,
+        poll_interval: float = 0.5
+    ) -> List[Dict[str, Any]]:
+        """Long-poll for events after a sequence number.
+        
+        Args:
+            rfp_id: RFP identifier
+            since: Last sequence number the client has seen
+            timeout: Maximum seconds to wait
+            poll_interval: Seconds between backend checks
+        
+        Returns:
+            New events (empty if none arrived before the timeout)
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            events = await asyncio.to_thread(cls.get_events, rfp_id, since)
+            if events or time.monotonic() >= deadline:
+                return events
+            await asyncio.sleep(min(poll_interval, max(deadline - time.monotonic(), 0)))
+    
+    @classmethod
+    async def stream(
+        cls,
+        rfp_id: int,
+        since: int = 0,
+        poll_interval: float = 0.5,
+        heartbeat: float = 15.0
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Yield progress events as they are recorded, from any worker.
+        
+        Yields None when ``heartbeat`` seconds pass without events so the
+        caller can keep the connection alive. Ends after a terminal event.
+        
+        Args:
+            rfp_id: RFP identifier
+            since: Resume after this sequence number
+            poll_interval: Seconds between backend checks
+            heartbeat: Seconds between keep-alive yields
+        """
+        last_seq = since
+        while True:
+            events = await cls.wait_for_events(rfp_id, last_seq, heartbeat, poll_interval)
+            if not events:
+                if last_seq > 0 and await asyncio.to_thread(cls.backend().get, rfp_id) is None:
+                    # Progress was cleared (e.g. processing cancelled)
+                    yield _make_event(rfp_id, last_seq, 'cleared', dict(NOT_STARTED))
+                    return
+                yield None
+                continue
+            for event in events:
+                last_seq = event['seq']
+                yield event
+                if event['type'] in TERMINAL_EVENTS:
+                    return
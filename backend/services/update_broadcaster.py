@@ -0,0 +1,315 @@
+"""
+Update Broadcaster for Real-time Dashboards
+Computes each metrics snapshot once and fans it out to every WebSocket subscriber
+"""
+from typing import Dict, Any, Optional, Callable, Awaitable, Set
+from collections import deque
+from datetime import datetime
+import asyncio
+import structlog
+
+logger = structlog.get_logger()
+
+# Keys that change on every snapshot and never justify a push on their own
+VOLATILE_KEYS = {'timestamp'}
+
+
+def metrics_delta(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Compute the changes between two flat metrics snapshots.
+    
+    Args:
+        previous: Last snapshot sent
+        current: New snapshot
+    
+    Returns:
+        Dictionary with 'changed' (key -> new value) and 'removed' (keys)
+    """
+    changed = {
+        key: value for key, value in current.items()
+        if key not in previous or previous[key] != value
+    }
+    removed = [key for key in previous if key not in current]
+    return {'changed': changed, 'removed': removed}
+
+
+class Subscriber:
+    """
+    One connected client with its own outbound buffer.
+    
+    Events are queued up to ``max_pending``; metrics updates are coalesced
+    into a single pending message, so a slow client only ever receives the
+    latest state rather than a backlog of stale ticks.
+    """
+    
+    def __init__(self, websocket, max_pending: int = 100):
+        self.websocket = websocket
+        self.max_pending = max_pending
+        self.events: deque = deque()
+        self.pending_metrics: Optional[Dict[str, Any]] = None
+        self.dropped_events = 0
+        self.closed = False
+        self._ready = asyncio.Event()
+    
+    def offer_event(self, message: Dict[str, Any]) -> bool:
+        """Queue an event message.
+        
+        Returns:
+            False if the buffer is full (the client is too slow to keep up)
+        """
+        if len(self.events) >= self.max_pending:
+            self.dropped_events += 1
+            return False
+        self.events.append(message)
+        self._ready.set()
+        return True
+    
+    def offer_metrics(self, snapshot: Dict[str, Any], delta: Dict[str, Any]):
+        """Queue a metrics update, merging it into any unsent one."""
+        pending = self.pending_metrics
+        if pending is None:
+            self.pending_metrics = {
+                'type': 'metrics_delta',
+                'data': {'changed': dict(delta['changed']), 'removed': list(delta['removed'])}
+            }
+        elif pending['type'] == 'metrics_snapshot':
+            pending['data'] = dict(snapshot)
+        else:
+            merged = pending['data']
+            for key in delta['removed']:
+                merged['changed'].pop(key, None)
+                if key not in merged['removed']:
+                    merged['removed'].append(key)
+            for key, value in delta['changed'].items():
+                merged['changed'][key] = value
+                if key in merged['removed']:
+                    merged['removed'].remove(key)
+        self._ready.set()
+    
+    def offer_snapshot(self, snapshot: Dict[str, Any]):
+        """Queue a full metrics snapshot, replacing any unsent update."""
+        self.pending_metrics = {'type': 'metrics_snapshot', 'data': dict(snapshot)}
+        self._ready.set()
+    
+    def close(self):
+        """Mark the subscriber closed and wake its sender."""
+        self.closed = True
+        self._ready.set()
+    
+    async def next_message(self) -> Optional[Dict[str, Any]]:
+        """Wait for the next message to send (events before metrics).
+        
+        Returns:
+            Message dictionary, or None once the subscriber is closed
+        """
+        while True:
+            if self.closed:
+                return None
+            if self.events:
+                return self.events.popleft()
+            if self.pending_metrics is not None:
+                message, self.pending_metrics = self.pending_metrics, None
+                return message
+            self._ready.clear()
+            await self._ready.wait()
+
+
+class UpdateBroadcaster:
+    """
+    Single producer for the /ws/updates stream.
+    
+    A background task computes realtime metrics once per interval (or as
+    soon as a workflow event arrives) and pushes only the changed keys to
+    all subscribers. Workflow events are fanned out immediately. Each
+    subscriber has its own sender task; clients that overflow their buffer
+    or stall a send past ``send_timeout`` are disconnected and can resync
+    from the snapshot they receive on reconnect.
+    """
+    
+    def __init__(
+        self,
+        metrics_provider: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None,
+        interval: float = 5.0,
+        max_pending: int = 100,
+        send_timeout: float = 10.0
+    ):
+        """Initialize broadcaster.
+        
+        Args:
+            metrics_provider: Async callable returning a flat metrics snapshot
+            interval: Seconds between metrics refreshes
+            max_pending: Event buffer size per subscriber
+            send_timeout: Seconds a single send may take before the client is dropped
+        """
+        self.logger = logger.bind(component="UpdateBroadcaster")
+        self.metrics_provider = metrics_provider
+        self.interval = interval
+        self.max_pending = max_pending
+        self.send_timeout = send_timeout
+        
+        self.subscribers: Set[Subscriber] = set()
+        self.last_snapshot: Optional[Dict[str, Any]] = None
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._provider_failing = False
+        
+        self.stats = {
+            'metrics_computed': 0,
+            'messages_sent': 0,
+            'events_published': 0,
+            'slow_disconnects': 0
+        }
+    
+    def start(self):
+        """Start the metrics producer task (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._produce())
+    
+    async def stop(self):
+        """Stop the producer and disconnect all subscribers."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for subscriber in list(self.subscribers):
+            await self._disconnect(subscriber)
+    
+    async def serve(self, websocket):
+        """Stream updates to an accepted WebSocket until it disconnects.
+        
+        Args:
+            websocket: Accepted WebSocket connection
+        """
+        subscriber = Subscriber(websocket, self.max_pending)
+        self.subscribers.add(subscriber)
+        if self.last_snapshot is not None:
+            subscriber.offer_snapshot(self.last_snapshot)
+        if self.last_snapshot is None or len(self.subscribers) == 1:
+            # First listener: wake an idle producer
+            self._wake.set()
+        self.start()
+        
+        receiver = asyncio.create_task(self._drain_incoming(subscriber))
+        try:
+            while True:
+                message = await subscriber.next_message()
+                if message is None:
+                    break
+                try:
+                    await asyncio.wait_for(websocket.send_json(message), self.send_timeout)
+                except asyncio.TimeoutError:
+                    self.stats['slow_disconnects'] += 1
+                    self.logger.warning("Dropping slow WebSocket client", timeout=self.send_timeout)
+                    break
+                self.stats['messages_sent'] += 1
+        except Exception as e:
+            self.logger.info("WebSocket connection closed", error=str(e))
+        finally:
+            receiver.cancel()
+            await self._disconnect(subscriber)
+    
+    def publish(self, event_type: str, message: str, data: Optional[Dict[str, Any]] = None):
+        """Push an event to every subscriber immediately.
+        
+        Also triggers an early metrics refresh, since events usually move
+        the counters shown on dashboards.
+        
+        Args:
+            event_type: Event type (e.g. 'workflow_completed')
+            message: Human-readable summary
+            data: Event payload
+        """
+        self.stats['events_published'] += 1
+        event = {
+            'type': event_type,
+            'message': message,
+            'data': data or {},
+            'timestamp': datetime.now().isoformat()
+        }
+        for subscriber in list(self.subscribers):
+            if not subscriber.offer_event(event):
+                self.stats['slow_disconnects'] += 1
+                self.logger.warning(
+                    "Dropping WebSocket client with full buffer",
+                    pending=len(subscriber.events)
+                )
+                subscriber.close()
+                self.subscribers.discard(subscriber)
+        self._wake.set()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get broadcaster statistics."""
+        return {**self.stats, 'subscribers': len(self.subscribers)}
+    
+    async def refresh_metrics(self):
+        """Compute one metrics snapshot and fan out the delta."""
+        if self.metrics_provider is None:
+            return
+        try:
+            snapshot = await self.metrics_provider()
+        except Exception as e:
+            if not self._provider_failing:
+                self.logger.error("Realtime metrics computation failed", error=str(e))
+            self._provider_failing = True
+            return
+        self._provider_failing = False
+        self.stats['metrics_computed'] += 1
+        
+        previous = self.last_snapshot
+        self.last_snapshot = snapshot
+        if previous is None:
+            for subscriber in self.subscribers:
+                subscriber.offer_snapshot(snapshot)
+            return
+        
+        delta = metrics_delta(previous, snapshot)
+        if not delta['removed'] and set(delta['changed']) <= VOLATILE_KEYS:
+            return
+        for subscriber in self.subscribers:
+            subscriber.offer_metrics(snapshot, delta)
+    
+    async def _produce(self):
+        """Refresh metrics on every tick or wake-up while anyone is listening."""
+        while True:
+            if not self.subscribers:
+                # Idle: nothing to compute until someone subscribes
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            
+            await self.refresh_metrics()
+            
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def _drain_incoming(self, subscriber: Subscriber):
+        """Read (and ignore) client frames so disconnects are noticed promptly."""
+        try:
+            while True:
+                await subscriber.websocket.receive_text()
+        except Exception:
+            pass
+        finally:
+            subscriber.close()
+    
+    async def _disconnect(self, subscriber: Subscriber):
+        subscriber.close()
+        self.subscribers.discard(subscriber)
+        try:
+            await subscriber.websocket.close()
+        except Exception:
+            pass
+
+
+# Singleton instance
+_update_broadcaster: Optional[UpdateBroadcaster] = None
+
+
+def get_update_broadcaster(**kwargs) -> UpdateBroadcaster:
+    """Get global update broadcaster instance."""
+    global _update_broadcaster
+    if _update_broadcaster is None:
+        _update_broadcaster = UpdateBroadcaster(**kwargs)
+    return _update_broadcaster
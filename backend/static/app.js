@@ -871,7 +871,52 @@ function addRealTimeUpdate(message) {
     }
 }
 
+// Live metrics, rebuilt from the stream's snapshot and deltas
+let realtimeMetrics = {};
+
+const REALTIME_METRIC_LABELS = {
+    active_workflows: 'Active workflows',
+    queued_workflows: 'Queued',
+    processing_workflows: 'Processing',
+    recent_completed_5m: 'Completed (5m)',
+    recent_errors_5m: 'Errors (5m)',
+    avg_queue_time_seconds: 'Avg queue time (s)',
+    orchestrator_active_workflows: 'Orchestrator workflows'
+};
+
+function applyMetricsUpdate(data) {
+    if (data.type === 'metrics_snapshot') {
+        realtimeMetrics = { ...data.data };
+    } else {
+        Object.assign(realtimeMetrics, data.data.changed);
+        data.data.removed.forEach(key => delete realtimeMetrics[key]);
+    }
+    renderRealtimeMetrics();
+}
+
+function renderRealtimeMetrics() {
+    const updates = document.getElementById('realTimeUpdates');
+    const container = document.getElementById('realtimeMetrics');
+    
+    if (updates && container) {
+        updates.style.display = 'block';
+        container.innerHTML = Object.entries(realtimeMetrics)
+            .filter(([key]) => key !== 'timestamp')
+            .map(([key, value]) => `
+                <div class="realtime-metric">
+                    <span>${REALTIME_METRIC_LABELS[key] || key}</span>
+                    <strong>${value}</strong>
+                </div>
+            `).join('');
+    }
+}
+
 function handleRealTimeUpdate(data) {
+    // Metrics arrive as a snapshot on connect followed by deltas
+    if (data.type === 'metrics_snapshot' || data.type === 'metrics_delta') {
+        applyMetricsUpdate(data);
+        return;
+    }
     addRealTimeUpdate(`${data.type}: ${data.message}`);
     
     // Refresh relevant tab if needed
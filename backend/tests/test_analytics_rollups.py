@@ -0,0 +1,144 @@
+"""Tests for incrementally maintained analytics rollups."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from db.database import Base
+from db.models import RFP, RFPStatus, WorkflowRun, AgentLog
+from db.analytics_rollups import ROLLUP_MODELS, rebuild_rollups
+from services import cache_service
+from services.analytics_service import AnalyticsService
+from services.cache_service import CacheService
+
+
+def _matching(category, score, confidence, match_type='exact'):
+    return {'product_matching': {
+        'category': category, 'match_score': score,
+        'confidence': confidence, 'match_type': match_type
+    }}
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'analytics.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _rollup_contents(db):
+    """All non-empty rollup rows, for comparing incremental and rebuilt state."""
+    contents = {}
+    for model in ROLLUP_MODELS:
+        rows = db.execute(select(model.__table__)).all()
+        contents[model.__tablename__] = sorted(
+            tuple(round(v, 6) if isinstance(v, float) else v for v in row)
+            for row in rows
+            if any(v for v in row[len(model.__table__.primary_key.columns):])
+        )
+    return contents
+
+
+class TestAnalyticsRollups:
+    """Test incremental maintenance against the rebuilt rollups and reported stats."""
+
+    def test_workflow_lifecycle_updates_rollups(self, db):
+        """Status changes, outcomes and deletes move counts between rollup rows."""
+        now = datetime.utcnow()
+        runs = [
+            WorkflowRun(workflow_id='wf-1', customer_id='acme', status='in_progress', created_at=now),
+            WorkflowRun(workflow_id='wf-2', customer_id='acme', status='completed', created_at=now,
+                        quote_value_usd=250000, won=False, duration_seconds=30,
+                        stage_results=_matching('cables', 0.9, 0.95)),
+            WorkflowRun(workflow_id='wf-3', customer_id='globex', status='failed', created_at=now),
+            WorkflowRun(workflow_id='wf-old', customer_id='acme', status='completed',
+                        created_at=now - timedelta(days=200), won=True, quote_value_usd=50000),
+        ]
+        db.add_all(runs)
+        db.commit()
+
+        # wf-1 completes and is won; wf-3 is removed
+        runs[0].status = 'completed'
+        runs[0].won = True
+        runs[0].quote_value_usd = 1500000
+        runs[0].duration_seconds = 90
+        runs[0].stage_results = _matching('cables', 0.7, 0.4, match_type='partial')
+        db.delete(runs[2])
+        db.commit()
+
+        analytics = AnalyticsService(db)
+        win_rates = analytics.get_win_rate_stats(days=90)
+        assert win_rates['total_completed'] == 2
+        assert win_rates['won_count'] == 1
+        assert win_rates['lost_count'] == 1
+        assert win_rates['avg_won_value'] == 1500000
+        assert win_rates['customer_win_rates'] == {'acme': {'total': 2, 'won': 1, 'win_rate': 50.0}}
+        assert win_rates['value_range_win_rates']['1M+'] == {'total': 1, 'won': 1, 'win_rate': 100.0}
+
+        accuracy = analytics.get_match_accuracy_stats(days=30)
+        assert accuracy['total_matches'] == 2
+        assert accuracy['avg_match_score'] == 0.8
+        assert accuracy['match_type_distribution'] == {'exact': 1, 'partial': 1}
+        assert accuracy['high_confidence_matches'] == 1
+        assert accuracy['low_confidence_matches'] == 1
+
+        summary = analytics._generate_summary_stats(30)
+        assert summary['total_rfps'] == 2
+        assert summary['completed'] == 2
+        assert summary['failed'] == 0
+        assert summary['in_progress'] == 0
+
+        incremental = _rollup_contents(db)
+        rebuild_rollups(db)
+        db.commit()
+        assert _rollup_contents(db) == incremental
+
+    def test_rfp_and_agent_rollups(self, db):
+        """RFP status and agent log rollups back the processing and agent stats."""
+        now = datetime.utcnow()
+        rfp = RFP(title='Cable tender', source='portal', file_path='t.pdf',
+                  status=RFPStatus.PROCESSING, created_at=now)
+        db.add(rfp)
+        db.add_all([
+            AgentLog(agent_name='technical', action='match', status='success',
+                     started_at=now, duration_seconds=4),
+            AgentLog(agent_name='technical', action='match', status='error',
+                     started_at=now, duration_seconds=2),
+            AgentLog(agent_name='pricing', action='quote', status='success',
+                     started_at=now - timedelta(days=60), duration_seconds=1),
+        ])
+        db.commit()
+
+        rfp.status = RFPStatus.APPROVED
+        rfp.processing_time_seconds = 120
+        db.commit()
+
+        analytics = AnalyticsService(db)
+        processing = analytics.get_rfp_processing_stats(days=30)
+        assert processing['status_breakdown'] == {'approved': 1}
+        assert processing['success_rate_percent'] == 100
+        assert processing['avg_processing_time_seconds'] == 120
+
+        agents = analytics.get_agent_performance_stats(days=30)
+        assert agents['total_actions'] == 2
+        assert agents['agent_metrics']['technical']['success_rate'] == 50
+        assert agents['agent_metrics']['technical']['avg_duration_seconds'] == 3
+        assert agents['agent_metrics']['technical']['action_types'] == {'match': 2}
+
+    def test_committed_changes_evict_cached_dashboard(self, db, monkeypatch):
+        """Rollup changes evict the "analytics" cache tag on commit, not on rollback."""
+        cache = CacheService()
+        monkeypatch.setattr(cache_service, '_cache_service', cache)
+        cache.set('dashboard', {'stale': True}, tags=['analytics'])
+
+        db.add(WorkflowRun(workflow_id='wf-rb', customer_id='acme', status='completed'))
+        db.flush()
+        db.rollback()
+        assert cache.get('dashboard') == {'stale': True}
+
+        db.add(WorkflowRun(workflow_id='wf-ok', customer_id='acme', status='completed'))
+        db.commit()
+        assert cache.get('dashboard') is None
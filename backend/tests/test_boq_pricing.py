@@ -0,0 +1,94 @@
+"""Tests for vectorized bill-of-quantities pricing."""
+import random
+from decimal import Decimal
+
+from pricing import PricingEngine, ProductPricer, ProductPrice
+
+
+def _catalog(seed: int = 3, size: int = 50):
+    rng = random.Random(seed)
+
+    def amount(places, upper):
+        return Decimal(rng.randint(1, upper * 10 ** places)).scaleb(-places)
+
+    catalog = {}
+    for i in range(size):
+        breaks = {qty: amount(rng.choice([0, 1, 2]), 20) for qty in rng.sample([10, 50, 100, 500], rng.randint(0, 3))}
+        catalog[f'P{i}'] = ProductPrice(
+            f'P{i}', f'Product {i}', amount(rng.choice([0, 2, 3]), 50000),
+            list_price=amount(2, 60000) if rng.random() < 0.5 else None,
+            dealer_price=amount(4, 40000) if rng.random() < 0.3 else None,
+            volume_breaks=breaks or None
+        )
+    return catalog
+
+
+class TestBOQPricing:
+    """Test that batch pricing matches the per-line Decimal path exactly."""
+
+    def test_line_totals_match_calculate(self):
+        pricer = ProductPricer(_catalog())
+        rng = random.Random(5)
+        items = [
+            {'product_id': f'P{rng.randint(0, 49)}', 'quantity': rng.choice([1, 9, 10, 99, 100, 501, 12345]),
+             'price_type': rng.choice(['base', 'list', 'dealer', 'bulk'])}
+            for _ in range(300)
+        ]
+
+        boq = pricer.price_boq(items)
+
+        assert boq.vectorized_lines == 300
+        for item, line in zip(items, boq.lines):
+            expected = pricer.calculate(item['product_id'], item['quantity'], price_type=item['price_type'])
+            assert str(line.line_total) == str(expected)
+
+    def test_bid_rates_match_commercial_bid_formulas(self):
+        pricer = ProductPricer(_catalog())
+        items = [{'product_id': f'P{i}', 'quantity': 7 * i + 1} for i in range(50)]
+        discount_rate, tax_rate = Decimal('3.75'), Decimal('12.5')
+
+        boq = pricer.price_boq(items, tax_rate=tax_rate, discount_rate=discount_rate)
+
+        subtotal = sum(line.line_total for line in boq.lines)
+        discount = subtotal * discount_rate / Decimal('100')
+        tax = (subtotal - discount) * tax_rate / Decimal('100')
+        assert boq.subtotal == subtotal
+        assert boq.discount_amount == discount
+        assert boq.tax_amount == tax
+        assert boq.grand_total == subtotal - discount + tax
+        line = boq.lines[10]
+        assert line.total == (line.line_total - line.discount_amount) * (1 + tax_rate / Decimal('100'))
+
+    def test_fallback_lines_and_errors(self):
+        catalog = _catalog()
+        catalog['P1'].base_price = Decimal('1.23456789')
+        pricer = ProductPricer(catalog)
+        items = [
+            {'product_id': 'P1', 'quantity': 3},
+            {'product_id': 'P2', 'quantity': 2.5},
+            {'product_id': 'P3', 'quantity': 2 ** 40},
+            {'product_id': 'missing', 'quantity': 1},
+        ]
+
+        boq = pricer.price_boq(items)
+
+        assert boq.vectorized_lines == 0
+        for item, line in zip(items[:3], boq.lines):
+            assert line.line_total == pricer.calculate(item['product_id'], item['quantity'])
+        assert [line.product_id for line in boq.failed_lines] == ['missing']
+        assert boq.subtotal == sum(line.line_total for line in boq.lines[:3])
+
+    def test_price_table_follows_catalog_changes(self):
+        engine = PricingEngine(_catalog(size=5))
+        items = [{'product_id': 'P0', 'quantity': 10}, {'product_id': 'NEW', 'quantity': 100}]
+        assert engine.price_boq(items).failed_lines
+
+        engine.product_pricer.add_product_price(ProductPrice(
+            'NEW', 'New cable', Decimal('10.50'), volume_breaks={100: Decimal('5')}
+        ))
+        boq = engine.price_boq(items)
+
+        assert not boq.failed_lines
+        assert boq.lines[1].line_total == Decimal('997.50')
+        assert boq.lines[1].volume_discount_rate == Decimal('5')
+        assert boq.tax_rate == Decimal('18')
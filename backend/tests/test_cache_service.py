@@ -0,0 +1,155 @@
+"""Tests for the two-tier cache service."""
+import asyncio
+import threading
+import time
+
+import fakeredis
+import pytest
+
+from services import cache_service
+from services.cache_service import CacheService, LRUCache
+
+
+@pytest.fixture
+def redis_client():
+    """Redis client on a private in-memory server, shared by every worker in a test."""
+    return fakeredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+
+
+class TestLRUCache:
+    """Test the in-process L1 bounds and tag index."""
+    
+    def test_byte_bound_evicts_oldest(self):
+        """Entries are evicted once the byte budget is exceeded."""
+        cache = LRUCache(max_size=100, max_bytes=250)
+        for i in range(5):
+            cache.set(f"k{i}", "x" * 98)  # ~100 bytes serialized
+        
+        assert cache.current_bytes <= 250
+        assert cache.get("k0") is None
+        assert cache.get("k4") == "x" * 98
+    
+    def test_tag_invalidation(self):
+        """Only entries under the tag are evicted."""
+        cache = LRUCache()
+        cache.set("a", 1, tags=["product:1"])
+        cache.set("b", 2, tags=["product:2"])
+        
+        assert cache.invalidate_tag("product:1") == 1
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.current_bytes == cache._entry_meta["b"][0]
+
+
+class TestCacheService:
+    """Test the shared L2, single-flight and tag invalidation."""
+    
+    def test_workers_share_l2(self, redis_client):
+        """A value written by one worker is read by another."""
+        worker_a = CacheService(redis_client=redis_client)
+        worker_b = CacheService(redis_client=redis_client)
+        
+        worker_a.set("quote:1", {"total": 10})
+        assert worker_b.get("quote:1") == {"total": 10}
+        assert worker_b.get_stats()["l2_hits"] == 1
+    
+    def test_tag_invalidation_reaches_l2(self, redis_client):
+        """Invalidating a tag evicts dependent entries in L1 and L2 only."""
+        worker_a = CacheService(redis_client=redis_client)
+        worker_b = CacheService(redis_client=redis_client)
+        worker_a.set("match:1", [1], tags=["product:CAB-1"])
+        worker_a.set("match:2", [2], tags=["product:CAB-2"])
+        
+        worker_b.invalidate_tags("product:CAB-1")
+        
+        assert redis_client.get("match:1") is None
+        assert worker_b.get("match:1") is None
+        assert worker_b.get("match:2") == [2]
+    
+    def test_single_flight_threads(self, redis_client):
+        """Concurrent misses for one key compute once."""
+        cache = CacheService(redis_client=redis_client)
+        calls = []
+        barrier = threading.Barrier(8)
+        
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return {"value": 42}
+        
+        def worker(results):
+            barrier.wait()
+            results.append(cache.get_or_compute("expensive", compute))
+        
+        results = []
+        threads = [threading.Thread(target=worker, args=(results,)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert len(calls) == 1
+        assert results == [{"value": 42}] * 8
+    
+    def test_single_flight_across_processes(self, redis_client):
+        """A second worker waits on the L2 lock instead of recomputing."""
+        worker_a = CacheService(redis_client=redis_client)
+        worker_b = CacheService(redis_client=redis_client)
+        
+        token = worker_a._acquire_l2_lock("shared")
+        assert token
+        threading.Timer(0.05, lambda: worker_a.set("shared", "from-a")).start()
+        
+        assert worker_b.get_or_compute("shared", lambda: "from-b") == "from-a"
+        worker_a._release_l2_lock("shared", token)
+    
+    async def test_async_single_flight(self):
+        """Concurrent coroutines share one computation."""
+        cache = CacheService()
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "done"
+        
+        results = await asyncio.gather(*[
+            cache.aget_or_compute("async-key", compute) for _ in range(5)
+        ])
+        
+        assert results == ["done"] * 5
+        assert len(calls) == 1
+        assert cache.get_stats()["coalesced_computations"] == 4
+    
+    async def test_async_single_flight_with_l2(self, redis_client):
+        """The async path reads and writes the shared tier and waits on its lock."""
+        worker_a = CacheService(redis_client=redis_client)
+        worker_b = CacheService(redis_client=redis_client)
+        
+        async def compute():
+            return {"total": 7}
+        
+        assert await worker_a.aget_or_compute("quote:7", compute, tags=["pricing"]) == {"total": 7}
+        assert await worker_b.aget_or_compute("quote:7", compute) == {"total": 7}
+        assert worker_b.get_stats()["l2_hits"] == 1
+        
+        token = worker_a._acquire_l2_lock("quote:8")
+        asyncio.get_running_loop().call_later(0.05, worker_a.set, "quote:8", "from-a")
+        assert await worker_b.aget_or_compute("quote:8", compute) == "from-a"
+        worker_a._release_l2_lock("quote:8", token)
+    
+    def test_product_writes_invalidate_catalog_and_dashboard(self, monkeypatch):
+        """Product CRUD evicts exactly the tags the cached reads are stored under."""
+        from api.routes.products_crud import CATALOG_CACHE_TAGS, _invalidate_product_cache
+        
+        cache = CacheService()
+        monkeypatch.setattr(cache_service, "_cache_service", cache)
+        cache.set("catalog:load_catalog_products:100", [{"id": 1}], tags=CATALOG_CACHE_TAGS)
+        cache.set("dashboard:_dashboard_data:30", {"summary": {}}, tags=["analytics"])
+        
+        _invalidate_product_cache()
+        assert cache.get("catalog:load_catalog_products:100") is None
+        assert cache.get("dashboard:_dashboard_data:30") == {"summary": {}}
+        
+        _invalidate_product_cache(pricing=True, analytics=True)
+        assert cache.get("dashboard:_dashboard_data:30") is None
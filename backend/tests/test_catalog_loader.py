@@ -0,0 +1,261 @@
+"""Tests for the bulk OEM catalog loader."""
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import agents.data_loader as data_loader
+import agents.product_index as product_index
+import agents.product_repository as product_repository
+from agents.catalog_loader import BulkCatalogLoader
+from agents.data_loader import ProductDataLoader
+from agents.product_index import ProductSearchIndex
+from agents.product_repository import ProductRepository
+from db.database import Base
+from db.product_models import OEMProduct
+
+SOURCE_DIR = Path(__file__).parent.parent.parent / "wires_cables_data" / "havells"
+
+pytestmark = pytest.mark.skipif(
+    not list(SOURCE_DIR.glob("havells_complete_products_*.csv")),
+    reason="Havells catalog CSV not available"
+)
+
+
+@pytest.fixture
+def source_csv():
+    """Newest Havells catalog CSV from the repository data."""
+    return max(SOURCE_DIR.glob("havells_complete_products_*.csv"), key=lambda p: p.stat().st_mtime)
+
+
+@pytest.fixture
+def catalog_dir(tmp_path, source_csv):
+    """Data directory containing only the Havells catalog."""
+    target = tmp_path / "data_root" / "wires_cables_data" / "havells"
+    target.mkdir(parents=True)
+    shutil.copy(source_csv, target / source_csv.name)
+    return tmp_path / "data_root"
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    """File-backed SQLite engine with the product schema."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'catalog.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+async def _counts(engine):
+    async with engine.connect() as conn:
+        total = (await conn.execute(select(func.count()).select_from(OEMProduct))).scalar()
+        active = (await conn.execute(
+            select(func.count()).select_from(OEMProduct).where(OEMProduct.is_active.is_(True))
+        )).scalar()
+    return total, active
+
+
+class TestNormalizeFrame:
+    """Test the column-wise CSV normalization."""
+
+    def test_matches_row_wise_extraction(self, source_csv):
+        """normalize_frame yields the same products as the per-row path, chunked or not."""
+        loader = ProductDataLoader()
+        df = pd.read_csv(source_csv)
+        occurrences = {}
+        expected = [
+            loader._extract_product_from_row(row, 'Havells', occurrences)
+            for _, row in df.iterrows()
+        ]
+
+        assert loader.normalize_frame(df, 'Havells') == expected
+        occurrences = {}
+        chunked = [
+            product
+            for _, chunk in loader.iter_csv_chunks(source_csv, chunksize=7)
+            for product in loader.normalize_frame(chunk, 'Havells', occurrences)
+        ]
+        assert chunked == expected
+
+    def test_ids_do_not_depend_on_row_position(self, source_csv):
+        """Inserting or deleting rows mid-file keeps the ids of every other row."""
+        loader = ProductDataLoader()
+        df = pd.read_csv(source_csv)
+        original = loader.normalize_frame(df, 'Havells')
+
+        new_row = df.iloc[[5]].assign(Product_Name='Havells New Variant Cable')
+        edited = pd.concat([df.iloc[:5], new_row, df.iloc[5:10], df.iloc[11:]], ignore_index=True)
+        products = loader.normalize_frame(edited, 'Havells')
+
+        ids = [p['product_id'] for p in products]
+        assert len(set(ids)) == len(ids)
+        assert set(ids) - {p['product_id'] for p in original} == {products[5]['product_id']}
+        assert {p['product_id'] for p in original} - set(ids) == {original[10]['product_id']}
+
+        # Repeated code + name pairs get occurrence suffixes instead of colliding
+        twice = loader.normalize_frame(pd.concat([df.iloc[:1], df.iloc[:1]]), 'Havells')
+        assert twice[1]['product_id'] == twice[0]['product_id'] + '-2'
+
+
+class TestCsvChunks:
+    """Test lazy chunked reads and the encoding fallback."""
+
+    @pytest.fixture
+    def mixed_csv(self, tmp_path):
+        """UTF-8 CSV with one latin-1 byte near the end."""
+        rows = [f"HV-{i},Cable {i}".encode() for i in range(50)]
+        rows[0] = "HV-0,Café".encode('utf-8')
+        rows[40] = b"HV-40,Caf\xe9 40"
+        path = tmp_path / "mixed.csv"
+        path.write_bytes(b"Product_Code,Product_Name\n" + b"\n".join(rows) + b"\n")
+        return path
+
+    @pytest.mark.parametrize("chunksize", [7, 40, None])
+    def test_resumes_as_latin1_after_yielded_rows(self, mixed_csv, monkeypatch, chunksize):
+        """A bad byte past the sample re-reads from the next unyielded row."""
+        monkeypatch.setattr(data_loader, 'ENCODING_SAMPLE_BYTES', 64)
+        chunks = list(ProductDataLoader().iter_csv_chunks(mixed_csv, chunksize=chunksize))
+
+        offsets = [offset for offset, _ in chunks]
+        sizes = [len(chunk) for _, chunk in chunks]
+        assert offsets == [sum(sizes[:i]) for i in range(len(sizes))]
+
+        names = pd.concat([chunk for _, chunk in chunks])['Product_Name'].tolist()
+        assert len(names) == 50
+        assert names[40] == 'Café 40'
+        assert names[1:40] == [f"Cable {i}" for i in range(1, 40)]
+        if chunksize == 7:
+            # Rows yielded before the bad byte were decoded as UTF-8, lazily
+            assert names[0] == 'Café'
+
+    def test_sniffs_latin1_from_head(self, mixed_csv):
+        mixed_csv.write_bytes(mixed_csv.read_bytes().replace("Café".encode('utf-8'), b"Caf\xe9"))
+        chunks = list(ProductDataLoader().iter_csv_chunks(mixed_csv, chunksize=7))
+        assert chunks[0][1]['Product_Name'].iloc[0] == 'Café'
+
+
+class TestBulkCatalogLoader:
+    """Test bulk upserts and manifest-driven incremental loads."""
+
+    async def test_load_then_skip_unchanged(self, engine, catalog_dir, tmp_path, source_csv):
+        """A second run skips files whose checksum is in the manifest."""
+        loader = BulkCatalogLoader(
+            engine=engine,
+            base_path=str(catalog_dir),
+            manifest_path=str(tmp_path / "manifest.json"),
+            batch_size=10
+        )
+        expected_rows = len(pd.read_csv(source_csv))
+
+        first = await loader.load()
+        assert first.files_loaded == [source_csv.name]
+        assert first.rows_upserted == expected_rows
+        assert await _counts(engine) == (expected_rows, expected_rows)
+
+        second = await loader.load()
+        assert second.files_loaded == []
+        assert second.files_skipped == [source_csv.name]
+
+        forced = await loader.load(force=True)
+        assert forced.rows_upserted == expected_rows
+        assert forced.rows_deactivated == 0
+        assert await _counts(engine) == (expected_rows, expected_rows)
+
+    async def test_changed_file_upserts_and_deactivates_removed_rows(
+        self, engine, catalog_dir, tmp_path, source_csv
+    ):
+        """Rows dropped from a changed CSV are deactivated, the rest updated in place."""
+        loader = BulkCatalogLoader(
+            engine=engine,
+            base_path=str(catalog_dir),
+            manifest_path=str(tmp_path / "manifest.json")
+        )
+        await loader.load()
+
+        csv_path = catalog_dir / "wires_cables_data" / "havells" / source_csv.name
+        df = pd.read_csv(csv_path)
+        df.iloc[:-2].to_csv(csv_path, index=False)
+
+        result = await loader.load()
+        assert result.rows_upserted == len(df) - 2
+        assert result.rows_deactivated == 2
+        assert await _counts(engine) == (len(df), len(df) - 2)
+
+        async with engine.connect() as conn:
+            row = (await conn.execute(
+                select(OEMProduct.data_source, OEMProduct.voltage_rating)
+                .where(OEMProduct.is_active.is_(True))
+                .limit(1)
+            )).one()
+        assert row.data_source == f"CSV Import: {source_csv.name}"
+        assert row.voltage_rating
+
+    async def test_mid_file_insert_and_delete(self, engine, catalog_dir, tmp_path, source_csv):
+        """Only the deleted row is deactivated and only the inserted row is new."""
+        loader = BulkCatalogLoader(
+            engine=engine,
+            base_path=str(catalog_dir),
+            manifest_path=str(tmp_path / "manifest.json"),
+            chunksize=7
+        )
+        await loader.load()
+        async with engine.connect() as conn:
+            before = dict((await conn.execute(select(OEMProduct.product_id, OEMProduct.id))).all())
+
+        csv_path = catalog_dir / "wires_cables_data" / "havells" / source_csv.name
+        df = pd.read_csv(csv_path)
+        deleted_name = ProductDataLoader().normalize_frame(df, 'Havells')[10]['product_name']
+        new_row = df.iloc[[5]].assign(Product_Name='Havells New Variant Cable')
+        pd.concat([df.iloc[:5], new_row, df.iloc[5:10], df.iloc[11:]]).to_csv(csv_path, index=False)
+
+        result = await loader.load()
+        assert result.rows_upserted == len(df)
+        assert result.rows_deactivated == 1
+        assert await _counts(engine) == (len(df) + 1, len(df))
+
+        async with engine.connect() as conn:
+            rows = (await conn.execute(
+                select(OEMProduct.product_id, OEMProduct.id, OEMProduct.product_name, OEMProduct.is_active)
+            )).all()
+        inactive = [row for row in rows if not row.is_active]
+        assert [row.product_name for row in inactive] == [deleted_name]
+        new = [row for row in rows if row.product_id not in before]
+        assert [row.product_name for row in new] == ['Havells New Variant Cable']
+        # Every surviving row was updated in place, not re-inserted
+        assert all(before[row.product_id] == row.id for row in rows if row.product_id in before)
+
+    async def test_other_workers_rebuild_index_after_load(
+        self, engine, catalog_dir, tmp_path, source_csv, monkeypatch
+    ):
+        """A worker whose index was built before another process loaded the catalog rebuilds it."""
+        monkeypatch.setattr(product_repository, "AsyncSessionLocal", async_sessionmaker(engine))
+        monkeypatch.setattr(product_repository, "INDEX_VERSION_CHECK_SECONDS", 0)
+        monkeypatch.setattr(product_index, "_product_index", ProductSearchIndex())
+        # The load runs in "another process": its local invalidation never reaches this index
+        monkeypatch.setattr(BulkCatalogLoader, "_invalidate_product_index", lambda self: None)
+
+        loader = BulkCatalogLoader(
+            engine=engine,
+            base_path=str(catalog_dir),
+            manifest_path=str(tmp_path / "manifest.json")
+        )
+        await loader.load()
+        repository = ProductRepository()
+        index = await repository._ensure_index()
+        assert len(index) == len(pd.read_csv(source_csv))
+        version = index.version
+
+        assert (await repository._ensure_index()).version == version
+
+        csv_path = catalog_dir / "wires_cables_data" / "havells" / source_csv.name
+        df = pd.read_csv(csv_path)
+        df.iloc[:-3].to_csv(csv_path, index=False)
+        await loader.load()
+
+        index = await repository._ensure_index()
+        assert len(index) == len(df) - 3
+        assert index.version != version
@@ -0,0 +1,278 @@
+"""Tests for the memory-mapped catalog snapshot and DataService on top of it."""
+import asyncio
+import os
+import shutil
+
+import pytest
+
+from config.settings import BACKEND_DIR, Settings, settings
+from data import PricingDataLoader, ValidatedProductLoader
+from services.catalog_snapshot import CatalogSnapshot, current_snapshot_path, encode_snapshot, write_snapshot
+from services.data_service import DataService
+
+PRODUCTS = [
+    {"name": "Ceiling Fan 1200mm", "category": "Fans", "brand": "Havells", "price": 2450.0,
+     "specifications": {"sweep": "1200 mm", "rpm": 380}},
+    {"name": "LED Batten", "category": "Lighting", "brand": "Polycab", "price": None,
+     "specifications": {}},
+    {"name": "Exhaust fan", "category": "Fans", "brand": "Polycab", "price": 1299.5,
+     "specifications": {"sweep": "250 mm"}, "standard": "IS 374"},
+    {"name": "XLPE Cable", "category": "Cables", "brand": "", "price": 10 ** 20,
+     "specifications": {"cores": [3, 3.5]}, "product_code": "CAB-1", "stock": 12, "active": True},
+]
+
+
+class FakeLoader:
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    async def load(self):
+        self.calls += 1
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def make_service(snapshot_dir, products=PRODUCTS, pricing=None, source_dirs=None):
+    service = DataService(snapshot_dir=snapshot_dir, source_dirs=source_dirs or [snapshot_dir / "sources"])
+    service.product_loader = FakeLoader(products)
+    service.pricing_loader = FakeLoader(pricing or [{"product_code": "CAB-1", "brand": "Polycab", "price": 99.0}])
+    service.testing_loader = FakeLoader({"type_tests": [{"test_name": "Insulation", "cost": 500}]})
+    service.standards_loader = FakeLoader({"indian_standards": [{"standard_code": "IS 374"}]})
+    service.rfp_loader = FakeLoader([{"rfp_id": "RFP-1"}])
+    return service
+
+
+class TestCatalogSnapshot:
+    """Test encoding round trips, filtered views and atomic publishing."""
+
+    def test_rows_round_trip_exactly(self):
+        """Missing keys, None, nested values and out-of-range ints survive encoding."""
+        snapshot = CatalogSnapshot(encode_snapshot({"products": PRODUCTS}, {"meta": {"a": [1, None]}}))
+        products = snapshot.table("products")
+
+        assert list(products) == PRODUCTS
+        assert products[1:3] == PRODUCTS[1:3]
+        assert snapshot.document("meta") == {"a": [1, None]}
+        assert len(snapshot.table("missing")) == 0
+
+    def test_views_match_list_filters(self):
+        snapshot = CatalogSnapshot(encode_snapshot({"products": PRODUCTS}))
+        products = snapshot.table("products")
+
+        fans = products.where(category="Fans")
+        assert fans[:] == [p for p in PRODUCTS if p["category"] == "Fans"]
+        assert fans.where(brand="Polycab")[:] == [PRODUCTS[2]]
+        assert products.where(category="Pumps")[:] == []
+        assert products.search("FAN", ("name",))[:] == [PRODUCTS[0], PRODUCTS[2]]
+        assert products.unique("brand") == ["Havells", "Polycab"]
+        assert products.first("CAB-1", ("product_code", "id")) == PRODUCTS[3]
+        assert products.first("CAB-2", ("product_code", "id")) is None
+
+        # None matches missing keys and explicit nulls only
+        assert products.where(category=None)[:] == []
+        assert products.first(None, ("name",)) is None
+        assert products.where(price=None)[:] == [PRODUCTS[1]]
+        assert products.where(standard=None)[:] == [p for p in PRODUCTS if p.get("standard") is None]
+
+    def test_publish_swaps_pointer_and_keeps_old_mapping_readable(self, tmp_path):
+        first = write_snapshot(tmp_path, {"products": PRODUCTS[:1]})
+        old = CatalogSnapshot.open_current(tmp_path)
+
+        second = write_snapshot(tmp_path, {"products": PRODUCTS})
+        third = write_snapshot(tmp_path, {"products": PRODUCTS[:2]}, keep=2)
+
+        assert current_snapshot_path(tmp_path) == third
+        assert not first.exists() and second.exists()
+        assert not list(tmp_path.glob("*.tmp"))
+        assert list(old.table("products")) == PRODUCTS[:1]
+        assert len(CatalogSnapshot.open_current(tmp_path).table("products")) == 2
+
+
+class TestDataServiceSnapshot:
+    """Test that DataService builds, maps and reloads the shared snapshot."""
+
+    async def test_workers_map_published_snapshot(self, tmp_path):
+        """A second service maps the snapshot instead of re-parsing sources."""
+        builder = make_service(tmp_path)
+        await builder.initialize()
+        assert current_snapshot_path(tmp_path) is not None
+
+        worker = make_service(tmp_path)
+        await worker.initialize()
+        assert worker.product_loader.calls == 0
+        assert worker._snapshot.path == builder._snapshot.path
+
+        assert await worker.get_products(category="Fans", skip=1) == [PRODUCTS[2]]
+        assert await worker.count_products(search="fan") == 2
+        assert await worker.get_product_by_id("CAB-1") == PRODUCTS[3]
+        assert await worker.get_pricing_for_product("CAB-1") == {"product_code": "CAB-1", "brand": "Polycab", "price": 99.0}
+        assert await worker.get_test_by_name("Insulation") == {"test_name": "Insulation", "cost": 500, "category": "type_tests"}
+        assert await worker.get_standard_by_code("IS 374") == {"standard_code": "IS 374", "category": "indian_standards"}
+        assert (await worker.get_statistics())["products"] == {"total": 4, "categories": 3, "brands": 2}
+
+        # Returned rows are copies; the shared snapshot cannot be mutated
+        (await worker.get_products(limit=1))[0]["name"] = "changed"
+        assert (await worker.get_products(limit=1))[0]["name"] == PRODUCTS[0]["name"]
+
+        await make_service(tmp_path, products=PRODUCTS[:1]).build_snapshot()
+        await worker.initialize(force_reload=True)
+        assert await worker.count_products() == 1
+
+    async def test_changed_sources_rebuild_snapshot(self, tmp_path):
+        """Editing, adding or removing a source file invalidates the snapshot."""
+        sources = tmp_path / "sources"
+        sources.mkdir()
+        csv_file = sources / "havells.csv"
+        csv_file.write_text("name,price\nFan,10\n")
+        snapshot_dir = tmp_path / "snapshot"
+        
+        await make_service(snapshot_dir, source_dirs=[sources]).initialize()
+        unchanged = make_service(snapshot_dir, source_dirs=[sources])
+        await unchanged.initialize()
+        assert unchanged.product_loader.calls == 0
+        
+        csv_file.write_text("name,price\nFan,12\nPump,99\n")
+        edited = make_service(snapshot_dir, products=PRODUCTS[:2], source_dirs=[sources])
+        await edited.initialize()
+        assert edited.product_loader.calls == 1
+        assert await edited.count_products() == 2
+        
+        # The rebuilt snapshot is current again for the next worker
+        await unchanged.initialize(force_reload=True)
+        assert unchanged.product_loader.calls == 0
+        assert await unchanged.count_products() == 2
+        
+        csv_file.unlink()
+        removed = make_service(snapshot_dir, source_dirs=[sources])
+        await removed.initialize()
+        assert removed.product_loader.calls == 1
+    
+    async def test_concurrent_workers_build_once(self, tmp_path):
+        """Workers starting together on a stale snapshot share one rebuild."""
+        workers = [make_service(tmp_path) for _ in range(3)]
+        for worker in workers:
+            loader = worker.product_loader
+
+            async def slow_load(loader=loader):
+                await asyncio.sleep(0.05)
+                loader.calls += 1
+                return loader.result
+
+            loader.load = slow_load
+
+        await asyncio.gather(*(worker.initialize() for worker in workers))
+
+        assert sum(worker.product_loader.calls for worker in workers) == 1
+        assert len({worker._snapshot.path for worker in workers}) == 1
+        assert list(tmp_path.glob("catalog-*.snap")) == [workers[0]._snapshot.path]
+
+        # Cursors name the shared snapshot, so any worker can continue a page
+        page = await workers[0].get_products_page(limit=2)
+        resumed = await workers[1].get_products_page(limit=2, cursor=page["next_cursor"])
+        assert resumed["items"] == PRODUCTS[2:4]
+
+    def test_snapshot_dir_resolves_against_backend(self):
+        assert Settings(catalog_snapshot_dir="snap").catalog_snapshot_dir == BACKEND_DIR / "snap"
+        assert Settings(catalog_snapshot_dir=os.sep + "abs").catalog_snapshot_dir.is_absolute()
+    
+    async def test_failed_source_is_not_published(self, tmp_path):
+        service = make_service(tmp_path, products=RuntimeError("CSV missing"))
+        await service.initialize()
+
+        assert current_snapshot_path(tmp_path) is None
+        assert await service.get_products() == []
+        assert await service.count_pricing(brand="Polycab") == 1
+
+
+class TestDataServiceIndexes:
+    """Test indexed lookups and cursor pagination against linear scans."""
+
+    def test_indexed_search_matches_scan(self):
+        """Trigram-backed search agrees with substring scans, including short needles and views."""
+        snapshot = CatalogSnapshot(encode_snapshot({"products": PRODUCTS}))
+        products = snapshot.table("products")
+
+        for text in ("f", "AN", "fan", "ceiling fan", "batten", "zzz", "n 1"):
+            expected = [
+                p for p in PRODUCTS
+                if text.lower() in p["name"].lower() or text.lower() in p["category"].lower()
+            ]
+            assert products.search(text, ("name", "category"))[:] == expected, text
+        assert products.where(brand="Polycab").search("fan", ("name",))[:] == [PRODUCTS[2]]
+        assert products.where(category="Fans").first("Polycab", ("brand",)) == PRODUCTS[2]
+
+    async def test_cursor_pages_are_stable(self, tmp_path):
+        products = [{"name": f"Fan {i}", "category": "Fans" if i % 3 else "Pumps"} for i in range(25)]
+        service = make_service(tmp_path, products=products)
+
+        seen, cursor = [], None
+        while True:
+            page = await service.get_products_page(limit=4, cursor=cursor, category="Fans")
+            seen.extend(page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == [p for p in products if p["category"] == "Fans"]
+
+        page = await service.get_products_page(limit=4, skip=2)
+        assert page["items"] == products[2:6]
+        resumed = await service.get_products_page(limit=4, cursor=page["next_cursor"])
+        assert resumed["items"] == products[6:10]
+
+        with pytest.raises(ValueError):
+            await service.get_products_page(cursor="not-a-cursor")
+        await service.build_snapshot()
+        with pytest.raises(ValueError):
+            await service.get_products_page(cursor=page["next_cursor"])
+
+    async def test_document_lookups_keep_first_match(self, tmp_path):
+        service = make_service(tmp_path)
+        service.testing_loader = FakeLoader({
+            "type_tests": [{"test_name": "Insulation", "cost": 500}],
+            "routine_tests": [{"test_name": "Insulation", "cost": 50}, {"test_name": "Spark"}],
+            "notes": "not a list",
+        })
+        await service.initialize()
+
+        assert await service.get_test_by_name("Insulation") == {"test_name": "Insulation", "cost": 500, "category": "type_tests"}
+        assert await service.get_test_by_name("Spark") == {"test_name": "Spark", "category": "routine_tests"}
+        assert await service.get_test_by_name("Missing") is None
+        assert await service.get_standard_by_code("IS 694") is None
+
+
+class TestDataServiceLoaderKeys:
+    """Test lookups against the records the real loaders emit."""
+
+    async def test_lookups_use_loader_columns(self, tmp_path, monkeypatch):
+        fmeg_dir = tmp_path / "fmeg"
+        cables_dir = tmp_path / "cables"
+        (fmeg_dir / "Polycab").mkdir(parents=True)
+        (cables_dir / "kei").mkdir(parents=True)
+        shutil.copy(BACKEND_DIR.parent / "FMEG_data" / "Polycab" / "Polycab_Fans.csv", fmeg_dir / "Polycab")
+        shutil.copy(
+            BACKEND_DIR.parent / "wires_cables_data" / "kei" / "kei_complete_products_20251207_175536.csv",
+            cables_dir / "kei",
+        )
+        monkeypatch.setattr(settings, "data_dir", str(fmeg_dir))
+        monkeypatch.setattr(settings, "wires_cables_dir", str(cables_dir))
+
+        service = make_service(tmp_path / "snapshot")
+        service.product_loader = ValidatedProductLoader()
+        service.pricing_loader = PricingDataLoader()
+        products = await service.product_loader.load()
+        pricing = await service.pricing_loader.load()
+        await service.initialize()
+
+        fan = next(p for p in products if p["brand"] == "Polycab")
+        cable = next(p for p in products if p["brand"] == "Kei")
+        assert await service.get_product_by_id(fan["model"]) == fan
+        assert await service.get_product_by_id(cable["model"]) == cable
+        assert await service.get_product_by_id("NO-SUCH-MODEL") is None
+
+        fan_price = next(p for p in pricing if p["brand"] == "Polycab")
+        cable_price = next(p for p in pricing if p["brand"] == "Kei")
+        assert await service.get_pricing_for_product(fan_price["product_id"]) == fan_price
+        assert await service.get_pricing_for_product(cable_price["model"]) == cable_price
+        assert await service.get_pricing_for_product("NO-SUCH-ID") is None
@@ -0,0 +1,121 @@
+"""Tests for the persistent RFP duplicate detector."""
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "agents" / "sales_agent"))
+
+from dedupe_store import DedupeStore, MmapBloomFilter
+from config.settings import BACKEND_DIR, Settings
+
+DAY = 86400
+
+
+def _add_keys(path: str, worker: int):
+    bloom = MmapBloomFilter(path, capacity=20_000)
+    for start in range(0, 2000, 50):
+        bloom.add_many(f"worker-{worker}-{i}" for i in range(start, start + 50))
+    bloom.close()
+
+
+class TestDedupeStore:
+    """Test batch checks, persistence, TTL aging and filter rebuilds."""
+
+    def test_batch_check_marks_repeats_within_and_across_pages(self, tmp_path):
+        """Keys repeated later in the same batch or in a later batch are duplicates."""
+        store = DedupeStore(str(tmp_path))
+        assert store.check_and_add(["a", "b", "a"]) == [False, False, True]
+        assert store.check_and_add(["b", "c"]) == [True, False]
+        assert store.size() == 3
+        assert store.get_stats()["duplicates"] == 2
+        store.close()
+
+    def test_seen_keys_survive_restart(self, tmp_path):
+        """Reopening the store keeps both layers; a lost filter file is rebuilt."""
+        store = DedupeStore(str(tmp_path))
+        store.check_and_add([f"rfp-{i}" for i in range(50)])
+        store.close()
+
+        reopened = DedupeStore(str(tmp_path))
+        assert all(reopened.check_and_add([f"rfp-{i}" for i in range(50)]))
+        reopened.close()
+
+        os.remove(tmp_path / "seen.bloom")
+        rebuilt = DedupeStore(str(tmp_path))
+        assert rebuilt.check_and_add(["rfp-7", "rfp-new"]) == [True, False]
+        rebuilt.close()
+
+    def test_keys_age_out_unless_seen_again(self, tmp_path):
+        """Keys still listed are refreshed; keys gone for longer than the TTL are forgotten."""
+        store = DedupeStore(str(tmp_path), ttl_days=30)
+        store.check_and_add(["listed", "delisted"], now=0)
+        store.check_and_add(["listed"], now=20 * DAY)
+
+        assert store.check_and_add(["listed", "delisted"], now=40 * DAY) == [True, False]
+        assert store.purge_expired(now=75 * DAY) == 2
+        assert store.size() == 0
+        store.close()
+
+    def test_saturated_filter_is_rebuilt_larger(self, tmp_path):
+        """Exceeding the filter capacity purges expired keys and regrows the filter."""
+        store = DedupeStore(str(tmp_path), capacity=100)
+        keys = [f"tender-{i}" for i in range(150)]
+        store.check_and_add(keys)
+
+        stats = store.get_stats()
+        assert stats["filter_capacity"] >= 2 * 150 * 0.9
+        assert stats["filter_items"] == 150
+        assert all(store.check_and_add(keys))
+        store.close()
+
+    def test_check_does_not_record(self, tmp_path):
+        """Keys only become duplicates once added, e.g. after a successful emit."""
+        store = DedupeStore(str(tmp_path))
+        assert store.check(["a", "b", "a"]) == [False, False, True]
+        assert store.check(["a"]) == [False]
+        assert store.size() == 0
+
+        store.add(["a"])
+        assert store.check(["a", "b"]) == [True, False]
+        assert store.size() == 1
+        store.close()
+
+    def test_default_directory_comes_from_settings(self):
+        assert Settings().dedupe_store_dir == BACKEND_DIR / "data" / "agent_state" / "dedupe"
+        assert Settings(dedupe_store_dir="state/dedupe").dedupe_store_dir == BACKEND_DIR / "state" / "dedupe"
+
+    def test_processes_sharing_a_filter_lose_no_bits(self, tmp_path):
+        """Concurrent writers serialize their read-modify-writes on the file lock."""
+        path = str(tmp_path / "shared.bloom")
+        MmapBloomFilter(path, capacity=20_000).close()
+
+        workers = [multiprocessing.Process(target=_add_keys, args=(path, w)) for w in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        bloom = MmapBloomFilter(path)
+        assert bloom.count == 4 * 2000
+        assert all(f"worker-{w}-{i}" in bloom for w in range(4) for i in range(2000))
+        bloom.close()
+
+    def test_stores_follow_a_filter_rebuilt_by_another(self, tmp_path):
+        """After one store swaps in a rebuilt filter, keys added by others stay visible to it."""
+        first = DedupeStore(str(tmp_path), capacity=100)
+        second = DedupeStore(str(tmp_path), capacity=100)
+
+        # Saturating the filter makes the first store rebuild and replace the file
+        first.add(f"tender-{i}" for i in range(150))
+        assert second.check(["tender-7"]) == [True]
+
+        second.add(["late"])
+        assert first.check(["late", "never"]) == [True, False]
+
+        # Same after clear(), which also swaps in a fresh file
+        second.clear()
+        first.add(["after-clear"])
+        assert second.check(["after-clear", "late"]) == [True, False]
+        first.close()
+        second.close()
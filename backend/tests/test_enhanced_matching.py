@@ -387,5 +387,67 @@ def test_match_explanation_structure():
     assert 'Coverage' in explanation.confidence_breakdown
 
 
+class TestBatchMatching:
+    """Test columnar batch scoring against the per-product path."""
+    
+    @pytest.fixture
+    def matcher(self):
+        """Create specification matcher."""
+        return SpecificationMatcher()
+    
+    @pytest.fixture
+    def products(self):
+        """Create a small mixed catalog."""
+        voltages = ['1.1 kV', '0.66 kV', '11 kV', 1.1]
+        sizes = ['2.5 sq mm', '4 sq mm', '6 sq mm', 4]
+        materials = ['Copper', 'Cu', 'Aluminium', 'PVC']
+        return [
+            {
+                'product_id': f'P-{i}',
+                'product_name': f'Product {i}',
+                'specifications': {
+                    'voltage_rating': voltages[i % 4],
+                    'conductor_size': sizes[(i // 4) % 4],
+                    'conductor_material': materials[(i // 16) % 4],
+                    **({'cores': (i % 3) + 1} if i % 5 else {})
+                },
+                'standards': ['IS 1554'] if i % 2 else []
+            }
+            for i in range(64)
+        ]
+    
+    @pytest.mark.parametrize('category', ['default', 'cable'])
+    def test_scores_equal_scalar_path(self, matcher, products, category):
+        """Batch scores are bit-exact with match_specifications."""
+        rfp = {
+            'voltage_rating': '1.1 kV',
+            'conductor_size': '4 sq mm',
+            'conductor_material': 'copper',
+            'cores': 3,
+            'standards': ['IS 1554']
+        }
+        batch = matcher.prepare_products(products, category)
+        scores = matcher.score_batch(rfp, batch)
+        
+        expected = [
+            matcher.match_specifications(rfp, product, category).overall_score
+            for product in products
+        ]
+        assert list(scores) == expected
+    
+    def test_batch_match_top_k_order(self, matcher, products):
+        """batch_match returns the same top_k as sorting full results."""
+        rfp = {'voltage_rating': '1.1 kV', 'conductor_size': '6 sq mm'}
+        
+        full = [matcher.match_specifications(rfp, p, 'cable') for p in products]
+        full.sort(key=lambda r: r.overall_score, reverse=True)
+        
+        batch = matcher.prepare_products(products, 'cable')
+        top = matcher.batch_match(rfp, batch, category='cable', top_k=5)
+        
+        assert [r.product_id for r in top] == [r.product_id for r in full[:5]]
+        assert all(r.match_reason for r in top)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, '-v'])
@@ -0,0 +1,105 @@
+"""Tests for incremental bid recomputation."""
+from decimal import Decimal
+
+from pricing import BidGenerator, ProductPricer, ProductPrice
+
+
+CATALOG = {
+    f'P{i}': ProductPrice(
+        f'P{i}', f'Cable {i}', Decimal(1000 + 37 * i) / 10,
+        volume_breaks={100: Decimal('5'), 500: Decimal('7.5')}
+    )
+    for i in range(20)
+}
+
+AMOUNTS = ('product_cost', 'testing_cost', 'logistics_cost', 'overhead_cost', 'margin_amount',
+           'discount_amount', 'tax_amount', 'grand_total')
+
+
+def _generator() -> BidGenerator:
+    return BidGenerator(ProductPricer(dict(CATALOG)))
+
+
+def _assert_matches_full_regeneration(incremental):
+    full = _generator().generate_bid(
+        'RFP-1', incremental.items, incremental.testing_requirements, incremental.logistics_params,
+        incremental.margin_rate, tax_rate=incremental.bid.tax_rate, discount_rate=incremental.bid.discount_rate
+    )
+    for name in AMOUNTS:
+        assert getattr(incremental.bid, name) == getattr(full, name), name
+    assert incremental.bid.items == full.items
+
+
+class TestIncrementalBid:
+    """Test that edits recompute only what they affect and match full regeneration."""
+
+    def _bid(self):
+        items = [{'product_id': f'P{i % 20}', 'quantity': 10 * i + 1} for i in range(60)]
+        tests = [{'test_type': 'type_test_electrical'}, {'test_type': 'routine_test_electrical', 'quantity': 3}]
+        return _generator().create_incremental_bid(
+            'RFP-1', items, tests, {'weight_kg': 250}, Decimal('15'), discount_rate=Decimal('2')
+        )
+
+    def test_quantity_edit_reprices_one_line(self):
+        incremental = self._bid()
+
+        diff = incremental.update_quantity(5, 600)
+
+        assert incremental.stats['lines_repriced'] == 1
+        assert diff.recomputed == ['product_cost', 'logistics_cost', 'margin', 'totals']
+        assert diff.items[5][0]['quantity'] == 51 and diff.items[5][1]['quantity'] == 600
+        old_cost, new_cost = diff.changes['product_cost']
+        assert new_cost - old_cost == Decimal(str(diff.items[5][1]['total'])) - Decimal(str(diff.items[5][0]['total']))
+        _assert_matches_full_regeneration(incremental)
+
+    def test_margin_and_rate_edits_skip_line_pricing(self):
+        incremental = self._bid()
+
+        margin_diff = incremental.update_margin(Decimal('22'))
+        rate_diff = incremental.update_rates(tax_rate=Decimal('12'), discount_rate=Decimal('0'))
+
+        assert margin_diff.recomputed == ['margin', 'totals']
+        assert rate_diff.recomputed == ['totals']
+        assert 'product_cost' not in margin_diff.changes and not margin_diff.items
+        assert incremental.bid.discount_amount == 0
+        assert incremental.stats['lines_repriced'] == 0
+        _assert_matches_full_regeneration(incremental)
+
+    def test_unit_price_override_and_structure_edits(self):
+        incremental = self._bid()
+
+        diff = incremental.update_unit_price(0, Decimal('12.34'))
+        assert diff.items[0][1]['total'] == 12.34
+        incremental.add_item({'product_id': 'UNKNOWN', 'quantity': 1})
+        incremental.add_item({'product_id': 'P3', 'quantity': 150})
+        removed = incremental.remove_item(2)
+        assert removed.items[2][1] is None
+        incremental.update_testing_requirement(1, quantity=1)
+        incremental.update_logistics(delivery_method='express')
+        incremental.update_unit_price(0, None)
+
+        assert len(incremental.bid.items) == 60
+        _assert_matches_full_regeneration(incremental)
+
+    def test_unit_price_override_skips_volume_discount(self):
+        """A negotiated unit price is shown and charged as entered, whatever the quantity."""
+        incremental = self._bid()
+        incremental.update_quantity(0, 200)
+
+        diff = incremental.update_unit_price(0, Decimal('50'))
+
+        row = diff.items[0][1]
+        assert row['unit_price'] == 50.0
+        assert row['total'] == 10000.0
+        assert ProductPricer(dict(CATALOG)).calculate('P0', 200, unit_price=Decimal('50')) == Decimal('10000.00')
+        _assert_matches_full_regeneration(incremental)
+
+    def test_generate_bid_uses_incremental_model(self):
+        incremental = self._bid()
+        bid = _generator().generate_bid(
+            'RFP-1', incremental.items, incremental.testing_requirements, incremental.logistics_params,
+            Decimal('15'), discount_rate=Decimal('2')
+        )
+
+        assert bid.grand_total == incremental.bid.grand_total
+        assert incremental.update_margin(Decimal('15')).is_empty
@@ -0,0 +1,98 @@
+"""Tests for streaming metric histograms and Prometheus exposition."""
+import random
+import threading
+
+import numpy as np
+
+from services import monitoring_service
+from services.monitoring_service import LogHistogram, PerformanceMonitor
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestPerformanceMonitor:
+    """Test quantile accuracy, windows, tag sets and exposition."""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """p50/p95/p99 stay within 1% of the exact sample quantiles in bounded memory."""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(-3, 1.5) for _ in range(100_000)]
+        histogram = LogHistogram(relative_accuracy=0.01)
+        for value in values:
+            histogram.add(value)
+
+        for q in (0.5, 0.95, 0.99):
+            exact = np.quantile(values, q, method='lower')
+            assert abs(histogram.quantile(q) - exact) <= 0.0101 * exact
+        assert len(histogram.buckets) < 2000
+        assert histogram.min == min(values) and histogram.max == max(values)
+
+    def test_stats_per_tag_set_and_window(self, monkeypatch):
+        clock = FakeClock()
+        monkeypatch.setattr(monitoring_service.time, 'time', clock)
+        monitor = PerformanceMonitor(window_seconds=300, slot_seconds=10)
+
+        for i in range(100):
+            monitor.record_metric('stage_duration', 0.1, tags={'stage': 'parsing'})
+            monitor.record_metric('stage_duration', 1.0 + i / 100, tags={'stage': 'pricing'})
+        clock.now += 120
+        monitor.record_metric('stage_duration', 5.0, tags={'stage': 'pricing'})
+
+        pricing = monitor.get_metric_stats('stage_duration', 300, tags={'stage': 'pricing'})
+        assert pricing['count'] == 101
+        assert pricing['last'] == 5.0
+        assert abs(pricing['p50'] - 1.5) < 0.02
+        assert pricing['p99'] >= 1.97
+
+        recent = monitor.get_metric_stats('stage_duration', 60)
+        assert recent['count'] == 1 and recent['max'] == 5.0
+
+        combined = monitor.get_all_metrics()
+        assert combined['metrics']['stage_duration']['count'] == 201
+        assert {s['tags']['stage'] for s in combined['series']['stage_duration']} == {'parsing', 'pricing'}
+
+    def test_concurrent_recording_is_exact(self):
+        monitor = PerformanceMonitor()
+
+        def work(n):
+            for i in range(5000):
+                monitor.record_metric('latency', 0.01, tags={'worker': str(n % 2)})
+                monitor.increment_counter('requests')
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert monitor.get_metric_stats('latency')['count'] == 40000
+        assert monitor.counters['requests'] == 40000
+
+    def test_series_cap(self):
+        monitor = PerformanceMonitor(max_series=2)
+        for i in range(5):
+            monitor.record_metric('latency', 1.0, tags={'path': f'/items/{i}'})
+
+        assert len(monitor.series) == 2
+        assert monitor.dropped_series == 3
+
+    def test_prometheus_exposition(self):
+        monitor = PerformanceMonitor()
+        monitor.increment_counter('api_requests_total', 3)
+        monitor.record_metric('api_request_duration', 0.25, tags={'route': '/api/v1/rfp/{id}', 'method': 'GET'})
+        monitor.record_metric('api_request_duration', 0.5, tags={'route': 'say "hi"', 'method': 'GET'})
+
+        text = monitor.render_prometheus()
+
+        assert '# TYPE api_requests_total counter\napi_requests_total 3\n' in text
+        assert '# TYPE api_request_duration summary' in text
+        assert 'api_request_duration{method="GET",route="/api/v1/rfp/{id}",quantile="0.5"} 0.25' in text
+        assert 'api_request_duration_count{method="GET",route="say \\"hi\\""} 1' in text
+        assert 'api_request_duration_sum{method="GET",route="/api/v1/rfp/{id}"} 0.25' in text
+        assert '# TYPE process_uptime_seconds gauge' in text
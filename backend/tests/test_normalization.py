@@ -1,7 +1,11 @@
 """Tests for specification and unit normalization functionality."""
 import pytest
+import pandas as pd
 from typing import Dict, Any
 
+from utils.specification_normalizer import SpecificationNormalizer
+from utils.unit_converter import UnitConverter
+
 
 class TestSpecificationNormalization:
     """Test specification normalization functionality."""
@@ -158,6 +162,17 @@ class TestUnitConversion:
         result = converter.convert_text('230V', 'kV', 'voltage')
         assert result is not None
         assert 'kV' in result or '0.23' in result
+    
+    def test_clear_cache_picks_up_new_conversions(self):
+        """Test that units added to conversions are recognized after clear_cache."""
+        converter = UnitConverter()
+        assert converter.parse_value_with_unit('2 bar')[2] is None
+        
+        converter.conversions['pressure'] = {'base_unit': 'Pa', 'factors': {'Pa': 1, 'bar': 100000}}
+        converter.clear_cache()
+        
+        assert converter.parse_value_with_unit('2 bar') == (2.0, 'bar', 'pressure')
+        assert converter.convert(2, 'bar', 'Pa') == pytest.approx(200000)
 
 
 class TestStandardNormalization:
@@ -335,6 +350,74 @@ class TestProductSpecificationNormalization:
         assert comparison is not None
 
 
+class TestNormalizationEngine:
+    """Test memoized parsing and DataFrame normalization."""
+    
+    def test_normalize_frame_matches_per_value(self):
+        """Vectorized column normalization agrees with normalize_specifications."""
+        normalizer = SpecificationNormalizer()
+        rows = [
+            {'Voltage': '11 kV', 'Current': '100mA', 'Power': '1.5kW', 'Temp': '158F',
+             'Width': '10 inches', 'Weight': '10 lbs', 'Colour': 'dark GREY', 'Cores': '4 core',
+             'Insulation': '  XLPE   INSULATED '},
+            {'Voltage': '230V', 'Current': '32 Amp', 'Power': '100 Watts', 'Temp': '70°C',
+             'Width': "3'", 'Weight': '2.5kg', 'Colour': 'Teal', 'Cores': 'none',
+             'Insulation': 'PVC'},
+            {'Voltage': 'n/a', 'Current': '', 'Power': None, 'Temp': '343K',
+             'Width': '2.5m', 'Weight': '50mg', 'Colour': 'violet', 'Cores': '3C',
+             'Insulation': ''},
+        ]
+        
+        frame = normalizer.normalize_frame(pd.DataFrame(rows * 50))
+        
+        assert frame['cores'].dtype == 'Int64'
+        for i, row in enumerate(rows * 50):
+            for key, expected in normalizer.normalize_specifications(row).items():
+                if isinstance(expected, dict):
+                    expected = expected.get('value')
+                actual = frame[key].iloc[i]
+                if expected is None:
+                    assert pd.isna(actual), (key, row)
+                else:
+                    assert actual == expected, (key, row)
+    
+    def test_normalize_frame_keeps_unselected_columns(self):
+        """Only the requested columns are renamed and normalized."""
+        df = pd.DataFrame({'Voltage': ['1.1kV'], 'SKU': ['AB-1']})
+        
+        frame = SpecificationNormalizer().normalize_frame(df, columns=['Voltage'])
+        
+        assert list(frame.columns) == ['voltage', 'SKU']
+        assert frame['voltage'].iloc[0] == 1100
+        assert frame['SKU'].iloc[0] == 'AB-1'
+    
+    def test_normalize_value_is_memoized(self):
+        """Repeated values hit the cache and callers get independent results."""
+        normalizer = SpecificationNormalizer(cache_size=8)
+        
+        first = normalizer.normalize_value('230V', 'voltage')
+        first['value'] = 0
+        second = normalizer.normalize_value('230V', 'voltage')
+        
+        assert second['value'] == 230
+        stats = normalizer.cache_info()['normalize_value']
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+    
+    def test_parse_value_with_unit_is_memoized(self):
+        """Unit aliases resolve through the lookup tables and parses are cached."""
+        converter = UnitConverter(cache_size=2)
+        
+        assert converter.parse_value_with_unit('230 volts') == (230.0, 'V', 'voltage')
+        assert converter.parse_value_with_unit('230 volts') == (230.0, 'V', 'voltage')
+        assert converter.parse_value_with_unit('1,000 inches') == (1000.0, 'in', 'length')
+        assert converter.parse_value_with_unit('12') == (12.0, '', None)
+        
+        stats = converter.cache_info()['parse_value_with_unit']
+        assert stats['hits'] == 1
+        assert stats['size'] == 2
+
+
 class TestTextNormalization:
     """Test text normalization and cleaning."""
     
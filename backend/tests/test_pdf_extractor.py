@@ -0,0 +1,126 @@
+"""Tests for parallel and cached PDF extraction."""
+import json
+
+import pytest
+
+import rfp_parsing.pdf_extractor as pdf_extractor
+from rfp_parsing.pdf_extractor import PDFExtractor
+
+PAGES = 6
+
+
+@pytest.fixture(scope="module")
+def sample_pdf(tmp_path_factory):
+    """Small multi-page RFP-like PDF with text and a ruled BOQ table on every page."""
+    canvas_module = pytest.importorskip("reportlab.pdfgen.canvas")
+    path = tmp_path_factory.mktemp("pdf") / "sample_rfp.pdf"
+
+    pdf = canvas_module.Canvas(str(path))
+    pdf.setTitle("Sample RFP")
+    pdf.setAuthor("Procurement Cell")
+    for page in range(1, PAGES + 1):
+        pdf.drawString(72, 780, f"Section {page}: Supply of XLPE power cables")
+        pdf.drawString(72, 760, f"Tender No. RFP-{page:03d} Voltage 1.1 kV")
+        rows = [("Item", "Description", "Qty")] + [
+            (str(i), f"Cable {page}x{i} sq mm", str(i * 100)) for i in range(1, 4)
+        ]
+        for r, row in enumerate(rows):
+            for c, cell in enumerate(row):
+                pdf.drawString(80 + c * 150, 705 - r * 20, cell)
+        for r in range(len(rows) + 1):
+            pdf.line(72, 720 - r * 20, 522, 720 - r * 20)
+        for c in range(4):
+            pdf.line(72 + c * 150, 720, 72 + c * 150, 720 - len(rows) * 20)
+        pdf.showPage()
+    pdf.save()
+    return path
+
+
+@pytest.fixture(scope="module")
+def serial_result(sample_pdf):
+    """Reference extraction using the serial path."""
+    return PDFExtractor(max_workers=1).extract(str(sample_pdf))
+
+
+class PDFName:
+    """Stand-in for the pdfminer objects that can appear in metadata."""
+
+    def __str__(self):
+        return "/Catalog"
+
+
+def assert_same_extraction(result, expected):
+    assert result.total_pages == expected.total_pages
+    assert result.text == expected.text
+    assert result.text_by_page == expected.text_by_page
+    assert result.metadata == expected.metadata
+    assert list(result.tables_by_page) == list(expected.tables_by_page)
+    assert len(result.tables) == len(expected.tables)
+    for table, expected_table in zip(result.tables, expected.tables):
+        assert table.equals(expected_table)
+
+
+class TestPDFExtractor:
+    """Test page-parallel extraction and the result cache."""
+
+    def test_fixture_has_text_and_tables(self, serial_result):
+        assert serial_result.total_pages == PAGES
+        assert "Tender No. RFP-006" in serial_result.text
+        assert sorted(serial_result.tables_by_page) == list(range(1, PAGES + 1))
+        assert serial_result.metadata["Title"] == "Sample RFP"
+
+    def test_serial_by_default(self, sample_pdf, serial_result, monkeypatch):
+        """Without max_workers no process pool is started, whatever the page count."""
+        def no_pool(*args, **kwargs):
+            raise AssertionError("process pool started")
+
+        monkeypatch.setattr(pdf_extractor, "ProcessPoolExecutor", no_pool)
+        extractor = PDFExtractor(parallel_min_pages=1)
+
+        assert extractor.max_workers == 1
+        assert_same_extraction(extractor.extract(str(sample_pdf)), serial_result)
+
+    def test_parallel_matches_serial(self, sample_pdf, serial_result):
+        """Page ranges merge back in document order."""
+        result = PDFExtractor(max_workers=2).extract(str(sample_pdf), parallel=True)
+        assert_same_extraction(result, serial_result)
+
+    def test_cache_hit_rebuilds_same_result(self, sample_pdf, serial_result, tmp_path):
+        """A second extraction of the same file is served from the cache, metadata included."""
+        extractor = PDFExtractor(max_workers=1, cache_dir=str(tmp_path))
+        first = extractor.extract(str(sample_pdf))
+        assert len(list(tmp_path.glob('*.json.gz'))) == 1
+
+        cached = extractor.extract(str(sample_pdf))
+        assert_same_extraction(first, serial_result)
+        assert_same_extraction(cached, serial_result)
+
+    def test_cache_key_includes_settings(self, sample_pdf, tmp_path):
+        """Different table settings do not share a cache entry."""
+        extractor = PDFExtractor(max_workers=1, cache_dir=str(tmp_path))
+        extractor.extract(str(sample_pdf), extract_tables=False)
+        extractor.extract(str(sample_pdf), table_settings={"vertical_strategy": "text"})
+        assert len(list(tmp_path.glob('*.json.gz'))) == 2
+
+
+class TestMetadataNormalization:
+    """Test that metadata survives the cache round trip unchanged."""
+
+    def test_json_safe_matches_json_round_trip(self):
+        metadata = {
+            "Title": b"Tender",
+            "Pages": 3,
+            "Keywords": ("cable", "xlpe"),
+            "Nested": {1: [b"a", None, 2.5]},
+            "Object": PDFName(),
+        }
+        normalized = pdf_extractor._json_safe(metadata)
+
+        assert normalized == {
+            "Title": "Tender",
+            "Pages": 3,
+            "Keywords": ["cable", "xlpe"],
+            "Nested": {"1": ["a", None, 2.5]},
+            "Object": "/Catalog",
+        }
+        assert json.loads(json.dumps(normalized)) == normalized
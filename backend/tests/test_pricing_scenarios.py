@@ -0,0 +1,141 @@
+"""Tests for the vectorized pricing scenario engine."""
+import numpy as np
+import pytest
+
+from agents.pricing_agent.advanced_features import (
+    COPPER_CONDUCTOR_COST_SHARE,
+    ScenarioEngine,
+    SensitivityAnalyzer,
+    WhatIfScenarioGenerator,
+    WinProbabilityEstimator,
+    DEFAULT_SCENARIO_RANGES,
+    PricingAPI,
+    derive_cost_shares,
+)
+
+
+def _bid(grand_total: float = 1000000.0) -> dict:
+    return {
+        'bid_summary': {
+            'grand_total': grand_total,
+            'products_subtotal': 800000.0,
+            'total_discounts': 50000.0,
+            'logistics_total': 20000.0,
+            'installation_total': 30000.0,
+            'testing_costs_total': 25000.0,
+            'cost_base': 700000.0,
+            'margin_percent': 20.0,
+            'margin_amount': 140000.0,
+            'payment_terms': 'Net 30'
+        },
+        'product_pricings': [{'delivery_days': 20}]
+    }
+
+
+class TestScenarioEngine:
+    """Test batch evaluation against the scalar pricing rules."""
+
+    def test_single_parameter_matches_sensitivity_rules(self):
+        engine = ScenarioEngine(_bid())
+
+        results = engine.evaluate({'margin': [-10, 0, 10]})
+        assert results.grand_total.tolist() == [1000000 * (1 + (18.0 - 20) / 100), 1000000.0, 1000000 * (1 + (22.0 - 20) / 100)]
+        assert np.allclose(results.margin_percent[1], 20.0)
+
+        results = engine.evaluate({'discount': 10, 'logistics': -50})
+        assert results.grand_total.tolist() == [1000000 - 5000 - 10000]
+        assert results.margin_amount.tolist() == [140000.0 - 5000]
+
+    def test_copper_pass_through(self):
+        """Cost changes raise the price by the passed-through share and erode margin by the rest."""
+        engine = ScenarioEngine(_bid(), copper_share=0.5, pass_through=0.25)
+
+        results = engine.evaluate({'copper': 10})
+
+        assert results.grand_total[0] == 1000000 + 0.25 * 40000
+        assert results.margin_amount[0] == 140000 - 0.75 * 40000
+
+    def test_win_probabilities_match_scalar_estimator(self):
+        estimator = WinProbabilityEstimator()
+        market, customer = {'market_average': 1000000}, {'type': 'Enterprise', 'existing_customer': True}
+        totals = np.array([850000, 900000, 930000, 950000, 990000, 1000000, 1030000, 1050000, 1200000], dtype=float)
+
+        batch = estimator.estimate_win_probabilities(_bid(), market, customer, totals)
+
+        for total, probability in zip(totals, batch):
+            assert estimator.estimate_win_probability(_bid(total), market, customer).probability == probability
+
+    def test_simulation_grid_and_tornado(self):
+        engine = ScenarioEngine(
+            _bid(), copper_share=0.6, fx_share=0.1,
+            market_data={'market_average': 1000000}, customer_info={'type': 'Enterprise'}
+        )
+
+        results = engine.simulate(n_scenarios=5000, seed=7)
+        summary = results.summary()
+        assert len(results) == 5000
+        assert summary['distributions']['grand_total']['min'] < 1000000 < summary['distributions']['grand_total']['max']
+        assert 'best_scenario' in summary
+        assert all(abs(results.variations['fx']) <= 5)
+
+        assert len(engine.grid({'margin': range(-5, 5), 'discount': range(10)})) == 100
+
+        bars = engine.tornado(DEFAULT_SCENARIO_RANGES)
+        assert [bar['parameter'] for bar in bars][:2] == ['copper', 'margin']
+        assert bars[0]['swing'] >= bars[-1]['swing']
+        assert bars[0]['base_value'] == 1000000.0
+
+    def test_analyzers_delegate_to_engine(self):
+        analysis = SensitivityAnalyzer().analyze_parameter(_bid(), 'discount', [-20, 0, 20])
+        assert analysis.impact_on_total == [10000.0, 0.0, -10000.0]
+        assert analysis.impact_on_margin == [0.0, 0.0, 0.0]
+
+        scenarios = WhatIfScenarioGenerator().generate_scenarios(_bid(), {
+            'Ex-Works': {'remove_installation': True},
+            'Aggressive': {'margin_adjustment': -5, 'additional_discount': 2}
+        })
+        assert [s.new_total for s in scenarios] == [970000.0, 1000000 * 0.95 * 0.98]
+
+
+class TestCostShares:
+    """Test copper/FX shares derived from line items instead of defaulting to zero."""
+
+    def _lined_bid(self) -> dict:
+        bid = _bid()
+        bid['product_pricings'] = [
+            {'subtotal': 400000.0, 'conductor_material': 'Annealed Copper', 'country_of_origin': 'India'},
+            {'subtotal': 300000.0, 'conductor_material': 'Aluminum', 'country_of_origin': 'N/A'},
+            {'subtotal': 100000.0, 'copper_share': 0.2, 'currency': 'USD'},
+        ]
+        return bid
+
+    def test_shares_derived_from_line_items(self):
+        shares = derive_cost_shares(self._lined_bid())
+
+        assert shares['copper'] == pytest.approx((400000 * COPPER_CONDUCTOR_COST_SHARE + 100000 * 0.2) / 800000)
+        assert shares['fx'] == pytest.approx(100000 / 800000)
+        assert derive_cost_shares(_bid()) == {'copper': None, 'fx': None}
+
+    def test_sensitivity_uses_derived_shares(self):
+        bid = self._lined_bid()
+        copper_share = derive_cost_shares(bid)['copper']
+
+        analysis = SensitivityAnalyzer().analyze_parameter(bid, 'copper', [-10, 0, 10])
+        assert analysis.impact_on_total == pytest.approx([-80000 * copper_share, 0.0, 80000 * copper_share])
+
+        bars = SensitivityAnalyzer().tornado(bid)
+        assert {bar['parameter'] for bar in bars} == set(DEFAULT_SCENARIO_RANGES)
+        assert all(bar['swing'] > 0 for bar in bars)
+
+    def test_unknown_shares_raise_or_are_left_out(self):
+        with pytest.raises(ValueError, match="copper"):
+            SensitivityAnalyzer().analyze_parameter(_bid(), 'copper', [-10, 10])
+        with pytest.raises(ValueError, match="fx"):
+            ScenarioEngine(_bid(), copper_share=0.5).tornado(DEFAULT_SCENARIO_RANGES)
+
+        assert SensitivityAnalyzer().analyze_parameter(_bid(), 'fx', [-5, 5], fx_share=0.1).impact_on_total == [-4000.0, 4000.0]
+        bars = SensitivityAnalyzer().tornado(_bid())
+        assert {bar['parameter'] for bar in bars} == {'margin', 'discount', 'logistics'}
+
+        result = PricingAPI(pricing_agent=None).run_scenario_analysis(_bid(), n_scenarios=100, seed=1)
+        assert {bar['parameter'] for bar in result['tornado']} == {'margin', 'discount', 'logistics'}
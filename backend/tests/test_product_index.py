@@ -0,0 +1,180 @@
+"""Tests for the in-process product search index."""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import agents.product_index as product_index
+from agents.product_index import ProductSearchIndex
+from agents.product_repository import ProductRepository
+from db.database import Base
+from db.product_models import OEMProduct
+
+
+@pytest.fixture
+def catalog():
+    """Dummy OEM catalog from the repository fixture data."""
+    return ProductRepository(use_database=False)._products
+
+
+@pytest.fixture
+def index(catalog):
+    """Index built over the dummy catalog."""
+    idx = ProductSearchIndex()
+    idx.build(catalog)
+    return idx
+
+
+class TestProductSearchIndex:
+    """Test keyword postings and numeric range lookups."""
+
+    def test_keyword_search_matches_substring_scan(self, index, catalog):
+        """Keyword lookup returns the same products as an ilike-style scan."""
+        keywords = ['solar', 'xlpe cable', 'hrfr']
+        expected = [
+            p['product_id'] for p in catalog
+            if any(
+                kw in (p.get(field) or '').lower()
+                for kw in keywords
+                for field in ('category', 'product_name', 'model_number')
+            )
+        ]
+        assert index.search_keywords(keywords) == expected
+
+    def test_range_lookup(self, index, catalog):
+        """Numeric spec values are found by range."""
+        hits = index.range_lookup('conductor_size', 5.5, 6.5)
+        expected = {
+            p['product_id'] for p in catalog
+            if p['specifications'].get('conductor_size') == '6 sq mm'
+        }
+        assert expected
+        assert hits == expected
+
+    def test_upsert_and_remove_keep_postings_in_sync(self, index):
+        """Writes update postings and spec arrays."""
+        index.upsert({
+            'product_id': 'TEST-001',
+            'manufacturer': 'Acme',
+            'model_number': 'ZX-99',
+            'product_name': 'Acme Zircon Cable',
+            'category': 'Zircon Cables',
+            'specifications': {'voltage_rating': '33 kV'},
+        })
+        assert index.search_keywords(['zircon']) == ['TEST-001']
+        assert 'TEST-001' in index.range_lookup('voltage_rating', 32, 34)
+
+        index.upsert({
+            'product_id': 'TEST-001',
+            'manufacturer': 'Acme',
+            'model_number': 'ZX-99',
+            'product_name': 'Acme Basalt Cable',
+            'category': 'Basalt Cables',
+            'specifications': {'voltage_rating': '11 kV'},
+        })
+        assert index.search_keywords(['zircon']) == []
+        assert 'TEST-001' not in index.range_lookup('voltage_rating', 32, 34)
+
+        index.remove('TEST-001')
+        assert index.search_keywords(['basalt']) == []
+        assert index.get('TEST-001') is None
+
+    def test_products_are_copies(self, index, catalog):
+        """Annotating returned products does not mutate the index."""
+        product = index.products([catalog[0]['product_id']])[0]
+        product['_match_score'] = 100
+        assert '_match_score' not in index.get(catalog[0]['product_id'])
+
+    async def test_fallback_scan_keeps_descriptive_spec_matches(self, index, monkeypatch):
+        """Products matching only on non-numeric specs survive the no-category fallback."""
+        async def ensure_index():
+            return index
+
+        repository = ProductRepository(use_database=False)
+        specs = {'conductor_size': '185 sq mm', 'insulation': 'PVC', 'sheath': 'PVC'}
+        scanned = await repository.search_products(specifications=specs)
+
+        repository.use_database = True
+        monkeypatch.setattr(repository, '_ensure_index', ensure_index)
+        indexed = await repository.search_products(specifications=specs)
+
+        assert 'HAV-SIG-021' in [p['product_id'] for p in indexed]
+        assert [p['product_id'] for p in indexed] == [p['product_id'] for p in scanned]
+
+    async def test_fallback_scan_keeps_partial_key_matches(self, monkeypatch):
+        """A product matching on a partially matching spec key survives the fallback."""
+        index = ProductSearchIndex()
+        index.build([{
+            'product_id': 'TEST-002',
+            'manufacturer': 'Acme',
+            'model_number': 'AC-11',
+            'product_name': 'Acme Control Cable',
+            'category': 'Control Cables',
+            'specifications': {'voltage_rating': '1100'},
+        }, {
+            'product_id': 'TEST-003',
+            'manufacturer': 'Acme',
+            'model_number': 'AC-04',
+            'product_name': 'Acme Power Cable',
+            'category': 'Power Cables',
+            'specifications': {'conductor_size': '4 sq mm'},
+        }])
+
+        async def ensure_index():
+            return index
+
+        repository = ProductRepository(use_database=True)
+        monkeypatch.setattr(repository, '_ensure_index', ensure_index)
+        results = await repository.search_products(
+            specifications={'conductor_size': '4', 'voltage': '1100'}
+        )
+
+        assert sorted(p['product_id'] for p in results) == ['TEST-002', 'TEST-003']
+
+
+class TestIndexTransactionSync:
+    """Test that ORM writes reach the index only when they commit."""
+
+    @pytest.fixture
+    def session(self, monkeypatch, index):
+        monkeypatch.setattr(product_index, '_product_index', index)
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            yield session
+        engine.dispose()
+
+    @staticmethod
+    def _product(product_id='TEST-TX-1'):
+        return OEMProduct(
+            product_id=product_id,
+            manufacturer='Acme',
+            model_number='ZX-1',
+            product_name='Acme Zircon Cable',
+            category='Zircon Cables',
+            specifications={'voltage_rating': '33 kV'},
+            is_active=True,
+        )
+
+    def test_rolled_back_writes_are_not_indexed(self, session, index):
+        session.add(self._product())
+        session.flush()
+        assert index.get('TEST-TX-1') is None
+
+        session.rollback()
+        session.commit()
+        assert index.get('TEST-TX-1') is None
+
+    def test_committed_writes_and_deletes_are_indexed(self, session, index):
+        product = self._product()
+        session.add(product)
+        session.commit()
+        assert index.search_keywords(['zircon']) == ['TEST-TX-1']
+
+        session.delete(product)
+        session.flush()
+        session.rollback()
+        assert index.get('TEST-TX-1') is not None
+
+        product.is_active = False
+        session.commit()
+        assert index.get('TEST-TX-1') is None
@@ -0,0 +1,151 @@
+"""Tests for the indexed OEMProduct text search."""
+import pytest
+from sqlalchemy import event, select, delete, text, update
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+from db.product_models import Base, OEMProduct
+from db import optimization
+from db.optimization import create_product_search_index
+from db.product_search import (
+    apply_product_search,
+    detect_search_backend,
+    reset_search_backend,
+)
+
+
+PRODUCTS = [
+    ("P1", "Polycab", "PC-XLPE-4C", "XLPE Armoured Power Cable 4 Core", "Power Cable"),
+    ("P2", "Havells", "HV-PVC-1", "PVC Insulated House Wire", "Building Wire"),
+    ("P3", "KEI", "XLPE-CTRL-12", "Control Cable 12 Core", "Control Cable"),
+    ("P4", "Finolex", "FX-FLEX-2", "Flexible Copper Wire", "XLPE Accessories"),
+    ("P5", "RR Kabel", "RR-SOLAR-6", "Solar DC Cable 6 sq mm", "Solar Cable"),
+]
+
+
+async def _make_engine(tmp_path, with_index: bool):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'products.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        if with_index:
+            await conn.run_sync(create_product_search_index)
+        await conn.execute(OEMProduct.__table__.insert(), [
+            {'product_id': pid, 'manufacturer': mfr, 'model_number': model,
+             'product_name': name, 'category': category, 'is_active': True}
+            for pid, mfr, model, name, category in PRODUCTS
+        ])
+    reset_search_backend()
+    return engine
+
+
+async def _search(session, query, columns=None, backend=None):
+    backend = backend or await detect_search_backend(session)
+    stmt = apply_product_search(select(OEMProduct.product_id), backend, query, columns)
+    return list((await session.execute(stmt)).scalars())
+
+
+@pytest.fixture
+async def indexed_engine(tmp_path):
+    engine = await _make_engine(tmp_path, with_index=True)
+    yield engine
+    await engine.dispose()
+    reset_search_backend()
+
+
+class TestProductSearch:
+    """Test FTS5 search parity, ranking and trigger sync."""
+
+    @pytest.mark.parametrize("query", ["xlpe", "Cable", "wire", "RR-SOL", "core", "zzz"])
+    async def test_fts_matches_same_rows_as_ilike(self, indexed_engine, query):
+        """The index returns exactly the rows the substring scan returns."""
+        async with AsyncSession(indexed_engine) as session:
+            assert await detect_search_backend(session) == 'fts5'
+            indexed = await _search(session, query)
+            scanned = await _search(session, query, backend='like')
+            assert sorted(indexed) == sorted(scanned)
+
+            indexed_names = await _search(session, query, columns=['product_name'])
+            scanned_names = await _search(session, query, columns=['product_name'], backend='like')
+            assert sorted(indexed_names) == sorted(scanned_names)
+
+    async def test_name_matches_rank_first(self, indexed_engine):
+        """Hits in product_name outrank hits only in category or model number."""
+        async with AsyncSession(indexed_engine) as session:
+            results = await _search(session, "xlpe")
+            assert results[0] == "P1"
+            assert set(results) == {"P1", "P3", "P4"}
+
+    async def test_triggers_keep_index_in_sync(self, indexed_engine):
+        """Updates and deletes on oem_products are reflected in search results."""
+        async with AsyncSession(indexed_engine) as session:
+            await session.execute(
+                update(OEMProduct).where(OEMProduct.product_id == "P2")
+                .values(product_name="Fire Survival Cable")
+            )
+            await session.execute(delete(OEMProduct).where(OEMProduct.product_id == "P5"))
+            await session.commit()
+
+            assert await _search(session, "Fire Surv") == ["P2"]
+            assert await _search(session, "House Wire") == []
+            assert await _search(session, "Solar") == []
+
+    async def test_short_queries_and_missing_index_fall_back_to_ilike(self, tmp_path):
+        """Without the index (or below trigram length) the substring scan is used."""
+        engine = await _make_engine(tmp_path, with_index=False)
+        try:
+            async with AsyncSession(engine) as session:
+                assert await detect_search_backend(session) == 'like'
+                assert sorted(await _search(session, "xlpe")) == ["P1", "P3", "P4"]
+                assert sorted(await _search(session, "dc", backend='fts5')) == ["P5"]
+        finally:
+            await engine.dispose()
+            reset_search_backend()
+
+    async def test_index_populated_only_when_created(self, tmp_path):
+        """Existing rows are indexed on first creation; later startups skip the rebuild."""
+        engine = await _make_engine(tmp_path, with_index=False)
+        statements = []
+        event.listen(
+            engine.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement)
+        )
+        try:
+            async with engine.begin() as conn:
+                assert await conn.run_sync(create_product_search_index)
+            assert any("'rebuild'" in statement for statement in statements)
+
+            statements.clear()
+            async with engine.begin() as conn:
+                assert await conn.run_sync(create_product_search_index)
+            assert not any("'rebuild'" in statement for statement in statements)
+
+            async with AsyncSession(engine) as session:
+                assert sorted(await _search(session, "xlpe")) == ["P1", "P3", "P4"]
+        finally:
+            await engine.dispose()
+            reset_search_backend()
+
+    async def test_failed_index_ddl_keeps_transaction_usable(self, tmp_path, monkeypatch):
+        """A failing DDL statement is rolled back to its savepoint only."""
+        engine = await _make_engine(tmp_path, with_index=False)
+        monkeypatch.setattr(
+            optimization, "_sqlite_product_search_ddl",
+            lambda populate=True: ["CREATE TABLE broken_idx (x)", "CREATE VIRTUAL TABLE broken USING nope()"]
+        )
+        try:
+            async with engine.begin() as conn:
+                assert not await conn.run_sync(create_product_search_index)
+                await conn.execute(OEMProduct.__table__.insert(), [
+                    {'product_id': 'P6', 'manufacturer': 'KEI', 'model_number': 'K-1',
+                     'product_name': 'Halogen Free Cable', 'category': 'Power Cable', 'is_active': True}
+                ])
+
+            async with AsyncSession(engine) as session:
+                assert await detect_search_backend(session) == 'like'
+                assert await _search(session, "Halogen") == ["P6"]
+                partial = await session.execute(
+                    text("SELECT name FROM sqlite_master WHERE name = 'broken_idx'")
+                )
+                assert partial.first() is None
+        finally:
+            await engine.dispose()
+            reset_search_backend()
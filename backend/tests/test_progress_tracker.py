@@ -0,0 +1,79 @@
+"""Tests for the shared progress store and event streaming."""
+import asyncio
+
+import pytest
+
+from services.progress_tracker import (
+    ProgressTracker,
+    SQLiteProgressBackend,
+    MemoryProgressBackend,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "progress.db")
+
+
+@pytest.fixture
+def tracker(db_path):
+    """ProgressTracker bound to a temporary SQLite store."""
+    backend = SQLiteProgressBackend(db_path)
+    ProgressTracker.configure(backend)
+    yield ProgressTracker
+    ProgressTracker.configure(MemoryProgressBackend())
+
+
+class TestProgressTracker:
+    """Test cross-worker visibility, sequencing and streaming."""
+
+    def test_progress_visible_to_other_workers(self, tracker, db_path):
+        """A second connection (another worker) sees the same state and events."""
+        tracker.start_processing(7)
+        tracker.update_stage(7, "Matching Products", 40)
+        tracker.update_agent_status(7, "Matching", "running", "Finding matching products...")
+
+        other_worker = SQLiteProgressBackend(db_path)
+        state = other_worker.get(7)
+        assert state["current_stage"] == "Matching Products"
+        assert state["agents_status"]["Matching"]["status"] == "running"
+        assert state["seq"] == 3
+
+        events = other_worker.events_since(7, 1)
+        assert [e["type"] for e in events] == ["stage", "agent_status"]
+        assert [e["seq"] for e in events] == [2, 3]
+        other_worker.close()
+
+    def test_updates_before_start_are_ignored(self, tracker):
+        """Stage updates for unknown RFPs do not create progress."""
+        tracker.update_stage(99, "Extracting Data", 10)
+        assert tracker.get_progress(99)["status"] == "not_started"
+        assert tracker.get_events(99) == []
+
+    async def test_stream_resumes_and_ends_on_completion(self, tracker, db_path):
+        """Streaming resumes after a sequence number and stops at the terminal event."""
+        tracker.start_processing(3)
+        tracker.update_stage(3, "Extracting Data", 10)
+
+        async def finish_elsewhere():
+            await asyncio.sleep(0.05)
+            other_worker = SQLiteProgressBackend(db_path)
+            ProgressTracker.configure(other_worker)
+            tracker.update_stage(3, "Finalizing", 95)
+            tracker.complete_processing(3, success=True)
+
+        writer = asyncio.create_task(finish_elsewhere())
+        received = []
+        async for event in tracker.stream(3, since=1, poll_interval=0.01, heartbeat=5):
+            if event is not None:
+                received.append((event["seq"], event["type"]))
+        await writer
+
+        assert received == [(2, "stage"), (3, "stage"), (4, "completed")]
+        assert tracker.get_progress(3)["progress"] == 100
+
+    async def test_long_poll_times_out_empty(self, tracker):
+        """Long-polling with no new events returns an empty list after the timeout."""
+        tracker.start_processing(5)
+        events = await tracker.wait_for_events(5, since=1, timeout=0.05, poll_interval=0.01)
+        assert events == []
@@ -0,0 +1,214 @@
+"""Tests for rate limit algorithms, stores and middleware."""
+import multiprocessing
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+
+import api.rate_limit as rate_limit
+from api.rate_limit import (
+    GCRA,
+    SlidingWindow,
+    MemoryStore,
+    SharedMemoryStore,
+    RedisStore,
+    RateLimiter,
+    RateLimitMiddleware,
+    EndpointRateLimiter,
+)
+from config.settings import Settings
+
+
+def _count_allowed(path: str, requests: int) -> int:
+    store = SharedMemoryStore(path, slots=64)
+    allowed = sum(store.hit("client", GCRA(50, 60), now=1000.0).allowed for _ in range(requests))
+    store.close()
+    return allowed
+
+
+class TestRateLimitAlgorithms:
+    """Test GCRA and sliding window decisions against explicit clocks."""
+
+    def test_gcra_allows_burst_then_spaces_requests(self):
+        """A full bucket admits `calls` requests, then one per period / calls."""
+        store, gcra = MemoryStore(), GCRA(calls=10, period=60)
+
+        decisions = [store.hit("k", gcra, now=100.0) for _ in range(11)]
+
+        assert [d.remaining for d in decisions[:10]] == list(range(9, -1, -1))
+        assert not decisions[10].allowed
+        assert abs(decisions[10].retry_after - 6.0) < 1e-6
+        assert not store.hit("k", gcra, now=105.9).allowed
+        assert store.hit("k", gcra, now=106.0).allowed
+
+    def test_sliding_window_weights_previous_window(self):
+        """Half way into a window, half of the previous window's requests still count."""
+        store, window = MemoryStore(), SlidingWindow(calls=10, period=60)
+        for _ in range(10):
+            assert store.hit("k", window, now=0.0).allowed
+        assert not store.hit("k", window, now=59.0).allowed
+
+        allowed = sum(store.hit("k", window, now=90.0).allowed for _ in range(10))
+
+        assert allowed == 5
+
+    def test_timing_wheel_reclaims_idle_keys(self):
+        """Keys are dropped once their state has expired, as the wheel passes them."""
+        store, gcra = MemoryStore(tick=1.0), GCRA(calls=10, period=10)
+        for i in range(100):
+            store.hit(f"client-{i}", gcra, now=0.0)
+        for _ in range(5):
+            store.hit("active", gcra, now=0.5)
+        assert len(store) == 101
+
+        store.hit("active", gcra, now=2.0)
+
+        assert len(store) == 1
+        assert store.stats['expired'] == 100
+
+
+class TestSharedMemoryStore:
+    """Test that workers sharing the table share one limit."""
+
+    def test_limit_is_shared_across_processes(self, tmp_path):
+        path = str(tmp_path / "limits.table")
+        SharedMemoryStore(path, slots=64).close()
+
+        with multiprocessing.get_context("fork").Pool(4) as pool:
+            allowed = pool.starmap(_count_allowed, [(path, 30)] * 4)
+
+        assert sum(allowed) == 50
+
+    def test_expired_slots_are_reused(self, tmp_path):
+        store = SharedMemoryStore(str(tmp_path / "limits.table"), slots=4, max_probe=2)
+        gcra = GCRA(calls=1, period=10)
+        for i in range(50):
+            assert store.hit(f"client-{i}", gcra, now=i * 20.0).allowed
+        assert store.stats['overflow'] == 0
+        store.close()
+
+
+class TestRateLimitMiddleware:
+    """Test headers and 429 responses through an application."""
+
+    def _app(self, **kwargs) -> FastAPI:
+        app = FastAPI()
+        app.add_middleware(RateLimitMiddleware, store=MemoryStore(), **kwargs)
+        endpoint_limit = EndpointRateLimiter(calls=1, period=60, store=MemoryStore())
+
+        @app.get("/items")
+        async def items():
+            return {"ok": True}
+
+        @app.post("/export", dependencies=[Depends(endpoint_limit)])
+        async def export():
+            return {"ok": True}
+
+        return app
+
+    async def test_standard_headers_and_429(self):
+        transport = httpx.ASGITransport(app=self._app(calls=2, period=60))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.get("/items")
+            await client.get("/items")
+            limited = await client.get("/items")
+            health = await client.get("/health")
+
+        assert first.headers["RateLimit-Limit"] == "2"
+        assert first.headers["RateLimit-Remaining"] == "1"
+        assert first.headers["RateLimit-Policy"] == "2;w=60"
+        assert first.headers["X-RateLimit-Remaining"] == "1"
+        assert limited.status_code == 429
+        assert limited.headers["Retry-After"] == "30"
+        assert limited.headers["RateLimit-Remaining"] == "0"
+        assert health.status_code == 404 and "RateLimit-Limit" not in health.headers
+
+    async def test_endpoint_limiter(self):
+        transport = httpx.ASGITransport(app=self._app(calls=100, period=60))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            assert (await client.post("/export")).status_code == 200
+            limited = await client.post("/export")
+
+        assert limited.status_code == 429
+        assert limited.headers["RateLimit-Limit"] == "1"
+        assert int(limited.headers["Retry-After"]) == 60
+
+    def test_limiters_share_a_store_without_sharing_keys(self):
+        store = MemoryStore()
+        strict = RateLimiter(1, 60, store=store, namespace="strict")
+        loose = RateLimiter(5, 60, store=store, namespace="loose")
+
+        assert strict.check("client", now=0.0).allowed
+        assert not strict.check("client", now=0.0).allowed
+        assert loose.check("client", now=0.0).remaining == 4
+
+
+@pytest.fixture
+async def fake_redis():
+    """In-process Redis with Lua scripting (needs lupa)."""
+    pytest.importorskip("lupa")
+    import fakeredis
+
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+class TestRedisStore:
+    """Test the Lua scripts against the Python algorithms and the async store."""
+
+    @pytest.mark.parametrize("algorithm", [GCRA(5, 10), SlidingWindow(5, 10)], ids=["gcra", "sliding_window"])
+    async def test_lua_matches_python(self, fake_redis, algorithm):
+        """Every decision of the server-side script equals MemoryStore's."""
+        redis_store = RedisStore(redis_client=fake_redis)
+        memory_store = MemoryStore()
+        times = [0.0] * 7 + [1.0, 2.5, 2.5, 9.9, 10.0, 10.1, 14.0, 19.5, 19.5, 19.5, 31.0]
+
+        for now in times:
+            expected = memory_store.hit("client", algorithm, now)
+            decision = await redis_store.hit("client", algorithm, now)
+            assert decision.allowed == expected.allowed, now
+            assert decision.remaining == expected.remaining, now
+            assert decision.reset_after == pytest.approx(expected.reset_after, abs=1e-5), now
+            assert decision.retry_after == pytest.approx(expected.retry_after, abs=1e-5), now
+
+        assert redis_store.stats == {'checks': len(times), 'errors': 0}
+
+    async def test_reset_and_key_isolation(self, fake_redis):
+        store = RedisStore(redis_client=fake_redis)
+        strict = RateLimiter(1, 60, store=store, namespace="strict")
+        loose = RateLimiter(5, 60, store=store, namespace="loose")
+
+        assert (await strict.acheck("client", now=0.0)).allowed
+        assert not (await strict.acheck("client", now=0.0)).allowed
+        assert (await loose.acheck("client", now=0.0)).remaining == 4
+
+        await store.reset("strict:client")
+        assert (await strict.acheck("client", now=0.0)).allowed
+        await store.reset()
+        assert await fake_redis.keys("ratelimit:*") == []
+
+    async def test_unreachable_redis_allows_requests(self):
+        """A store that cannot reach Redis fails open instead of failing the request."""
+        store = RedisStore(redis_url="redis://127.0.0.1:1/0")
+        limiter = RateLimiter(1, 60, store=store)
+
+        decisions = [await limiter.acheck("client", now=0.0) for _ in range(3)]
+        await store.close()
+
+        assert all(decision.allowed for decision in decisions)
+        assert store.stats == {'checks': 3, 'errors': 3}
+        with pytest.raises(TypeError):
+            limiter.check("client")
+
+    def test_store_selection_comes_from_settings(self, monkeypatch):
+        assert Settings().rate_limit_store == "memory"
+        monkeypatch.setattr(rate_limit, "_store", None)
+        monkeypatch.setattr(rate_limit.settings, "rate_limit_store", "redis")
+        monkeypatch.setattr(rate_limit.settings, "redis_url", "redis://cache.internal:6380/2")
+
+        store = rate_limit.get_rate_limit_store()
+
+        assert isinstance(store, RedisStore)
+        assert store.redis_client.connection_pool.connection_kwargs["host"] == "cache.internal"
+        assert store.redis_client.connection_pool.connection_kwargs["db"] == 2
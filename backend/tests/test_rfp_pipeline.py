@@ -0,0 +1,115 @@
+"""Tests for concurrent RFP batch processing."""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+import rfp_parsing.rfp_pipeline as rfp_pipeline
+from rfp_parsing import RFPPipeline, RFPDocument, BatchItemResult
+
+
+def _die_on_crash(pdf_path, index):
+    """Worker task that kills its process for 'crash' documents."""
+    if 'crash' in pdf_path:
+        os._exit(1)
+    time.sleep(0.2)
+    return BatchItemResult(file_path=pdf_path, index=index, document=RFPDocument(file_path=pdf_path, total_pages=1))
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """Pipeline whose per-document processing is stubbed out."""
+    pipeline = RFPPipeline()
+
+    def fake_process(pdf_path):
+        if 'bad' in str(pdf_path):
+            raise ValueError(f"cannot parse {pdf_path}")
+        return RFPDocument(file_path=str(pdf_path), total_pages=1)
+
+    monkeypatch.setattr(pipeline, 'process', fake_process)
+    return pipeline
+
+
+class TestBatchProcessing:
+    """Test streaming batch results and failure reporting."""
+
+    def test_iter_batch_reports_failures(self, pipeline):
+        """Failed documents are yielded as results instead of aborting the batch."""
+        results = list(pipeline.iter_batch(['a.pdf', 'bad.pdf', 'c.pdf'], max_workers=1))
+
+        assert [item.index for item in results] == [0, 1, 2]
+        assert [item.success for item in results] == [True, False, True]
+        assert results[1].error_type == 'ValueError'
+        assert all(item.elapsed_seconds >= 0 for item in results)
+        assert 'processing_seconds' in results[0].document.stats
+
+    def test_process_batch_keeps_input_order(self, pipeline):
+        """process_batch returns successful documents in input order."""
+        docs = pipeline.process_batch(['a.pdf', 'bad.pdf', 'c.pdf'], max_workers=1)
+        assert [doc.file_path for doc in docs] == ['a.pdf', 'c.pdf']
+
+    def test_in_process_by_default(self, pipeline, monkeypatch):
+        """Without max_workers no process pool is started."""
+        def no_pool(*args, **kwargs):
+            raise AssertionError("process pool started")
+
+        monkeypatch.setattr(rfp_pipeline, 'ProcessPoolExecutor', no_pool)
+        docs = pipeline.process_batch(['a.pdf', 'b.pdf', 'c.pdf'])
+        assert [doc.file_path for doc in docs] == ['a.pdf', 'b.pdf', 'c.pdf']
+
+    def test_pool_reports_missing_files(self):
+        """Worker processes report per-document errors."""
+        pipeline = RFPPipeline()
+        results = list(pipeline.iter_batch(['missing_1.pdf', 'missing_2.pdf'], max_workers=2))
+
+        assert sorted(item.index for item in results) == [0, 1]
+        assert all(item.error_type == 'FileNotFoundError' for item in results)
+
+    @pytest.mark.skipif(multiprocessing.get_start_method() != 'fork', reason="needs forked workers")
+    def test_killed_worker_fails_remaining_documents(self, monkeypatch):
+        """A worker dying mid-batch reports every document instead of raising."""
+        monkeypatch.setattr(rfp_pipeline, '_process_in_worker', _die_on_crash)
+        paths = ['a.pdf', 'crash.pdf', 'c.pdf', 'd.pdf', 'e.pdf', 'f.pdf']
+        results = list(RFPPipeline().iter_batch(paths, max_workers=2, max_in_flight=2))
+
+        assert sorted(item.index for item in results) == list(range(len(paths)))
+        by_path = {item.file_path: item for item in results}
+        assert by_path['crash.pdf'].error_type == 'BrokenProcessPool'
+        assert by_path['f.pdf'].error_type == 'BrokenProcessPool'
+        assert all(item.success or item.error_type == 'BrokenProcessPool' for item in results)
+
+    @pytest.mark.asyncio
+    async def test_aiter_batch(self, pipeline):
+        """The async iterator yields every document."""
+        paths = ['a.pdf', 'b.pdf']
+        results = [item async for item in pipeline.aiter_batch(paths, max_workers=1)]
+        assert [item.file_path for item in results] == paths
+
+    @pytest.mark.asyncio
+    async def test_aiter_batch_cancelled_mid_document(self, pipeline, monkeypatch):
+        """Cancelling a consumer while a document is in flight closes the batch cleanly."""
+        started, release = threading.Event(), threading.Event()
+
+        def slow_process(pdf_path):
+            if pdf_path == 'slow.pdf':
+                started.set()
+                release.wait(5)
+            return RFPDocument(file_path=str(pdf_path), total_pages=1)
+
+        monkeypatch.setattr(pipeline, 'process', slow_process)
+        batch = pipeline.aiter_batch(['a.pdf', 'slow.pdf', 'c.pdf'], max_workers=1)
+
+        async def consume():
+            return [item.file_path async for item in batch]
+
+        task = asyncio.create_task(consume())
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        task.cancel()
+        asyncio.get_running_loop().call_later(0.05, release.set)
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert release.is_set()
@@ -188,6 +188,11 @@ async def test_workflow_timing_metrics(setup_system):
         'document': 'Test Document',
         'document_type': 'pdf'
     }
+    completed = {}
+    orchestrator.add_event_listener(
+        lambda event, payload: completed.update({payload['stage']: payload})
+        if event == 'stage_completed' else None
+    )
     
     result = await orchestrator.process_rfp(rfp_data)
     
@@ -203,6 +208,11 @@ async def test_workflow_timing_metrics(setup_system):
     for stage, duration in stage_durations.items():
         assert duration >= 0
         assert duration < 10  # Each stage should complete quickly in test
+        assert completed[stage]['duration'] == duration
+    
+    # Every stage announces its completion, review included
+    assert set(completed) == set(stage_durations) | {'review'}
+    assert all(payload['status'] == 'success' for payload in completed.values())
 
 
 @pytest.mark.asyncio
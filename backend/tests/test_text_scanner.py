@@ -0,0 +1,80 @@
+"""Tests for the single-pass multi-pattern text scanner."""
+import re
+
+from utils.text_scanner import TextScanner, ScanRule, build_rfp_rules, keyword_rule
+from utils.standard_mapper import StandardMapper
+from rfp_parsing.spec_parser import SpecificationParser
+from rfp_parsing.testing_extractor import TestingRequirementExtractor
+
+
+TENDER_TEXT = """Technical Specification
+Rated Voltage: 1100 V
+Cables shall comply with IS 694 and IEC 60227-1; BS7846 is acceptable.
+Type test reports and routine test certificates are required as per IS:1554.
+Partial Discharge Test shall be witnessed. Products must be ISI marked and UL 44 listed.
+Factory acceptance test (FAT) may be waived. 5 star rating preferred.
+"""
+
+
+class TestTextScanner:
+    """Test scanning semantics and the extractors built on the shared scan."""
+
+    def test_rules_keep_finditer_semantics(self):
+        """Each rule sees exactly its own finditer matches, overlaps between rules included."""
+        rules = [
+            ScanRule('standard', 'is', r'IS[\s:-]*(\d+)', triggers=('is',)),
+            ScanRule('standard', 'bis', r'BIS[\s:-]*(\d+)', triggers=('bis',)),
+            ScanRule('spec', 'rating', r'(\d+)\s*star', start_chars='0123456789'),
+            ScanRule('custom_spec', 'kv', r'([A-Z][A-Za-z\s]+?)[:\-]\s*(.+?)(?:\n|$)',
+                     start_chars='ABCDEFGHIJKLMNOPQRSTUVWXYZ', flags=re.MULTILINE),
+            keyword_rule('test', 'type test'),
+            keyword_rule('test', 'type testing'),
+        ]
+        text = "This 12 star. BIS 302 and IS-694\nType testing: per BIS 1554\n15 star, TYPE TEST done"
+
+        result = TextScanner(rules).scan(text)
+
+        for rule in rules:
+            expected = [m.span() for m in rule.compiled.finditer(text)]
+            assert [hit.match.span() for hit in result.hits(rule.kind, rule.name)] == expected
+
+    def test_extractors_share_one_scan(self):
+        """Standards, testing and spec extraction over one document scan it once."""
+        scanner = TextScanner(build_rfp_rules())
+        TestingRequirementExtractor(scanner).extract_testing_requirements(TENDER_TEXT)
+        TestingRequirementExtractor(scanner).extract_standards(TENDER_TEXT)
+        SpecificationParser(scanner).parse(TENDER_TEXT)
+        StandardMapper(scanner).extract_standards_from_text(TENDER_TEXT)
+
+        assert scanner.stats['scans'] == 1
+        assert scanner.stats['cache_hits'] >= 3
+
+    def test_testing_requirements_from_hits(self):
+        """Keyword hits become one requirement per line, with the line's standard and catalogue tests."""
+        scanner = TextScanner(build_rfp_rules(
+            catalog_standards=['IS 1554', 'UL 44'], catalog_tests=['Partial Discharge Test']
+        ))
+        extractor = TestingRequirementExtractor(scanner)
+
+        requirements = extractor.extract_testing_requirements(TENDER_TEXT)
+        tests = {req.description: req for req in requirements if req.requirement_type == 'test'}
+
+        assert tests['type test'].standard == 'IS:1554'
+        assert tests['type test'].source_text == tests['routine test'].source_text
+        assert 'acceptance test' in tests
+        assert extractor.extract_certifications(TENDER_TEXT) == ['ISI mark']
+        assert extractor.extract_catalog_tests(TENDER_TEXT) == ['Partial Discharge Test']
+        assert 'UL 44' in extractor.extract_standards(TENDER_TEXT)
+
+        inspections = [req for req in requirements if req.requirement_type == 'inspection']
+        assert {req.description for req in inspections} == {'factory acceptance test', 'FAT'}
+        assert all(not req.is_mandatory for req in inspections)
+
+    def test_standard_mapper_includes_catalogue_codes(self):
+        """Catalogue codes outside the IS/IEC/BS/EN patterns are reported too."""
+        mapper = StandardMapper(TextScanner(build_rfp_rules(catalog_standards=['UL 44', 'VDE 0250'])))
+
+        standards = mapper.extract_standards_from_text(TENDER_TEXT)
+
+        assert {'IS 694', 'IEC 60227', 'BS 7846', 'UL 44'} <= set(standards)
+        assert 'VDE 0250' not in standards
@@ -0,0 +1,137 @@
+"""Tests for the shared /ws/updates broadcaster."""
+import asyncio
+
+from services.update_broadcaster import UpdateBroadcaster, metrics_delta
+
+
+class FakeWebSocket:
+    """Minimal accepted WebSocket recording sent messages."""
+
+    def __init__(self, block_sends: bool = False):
+        self.sent = []
+        self.closed = False
+        self.unblock = asyncio.Event()
+        if not block_sends:
+            self.unblock.set()
+        self._disconnect = asyncio.Event()
+
+    async def send_json(self, message):
+        await self.unblock.wait()
+        self.sent.append(message)
+
+    async def receive_text(self):
+        await self._disconnect.wait()
+        raise ConnectionError("client disconnected")
+
+    async def close(self):
+        self.closed = True
+
+    def disconnect(self):
+        self._disconnect.set()
+
+
+class CountingProvider:
+    """Metrics provider returning scripted snapshots."""
+
+    def __init__(self):
+        self.calls = 0
+        self.snapshot = {'active_workflows': 0, 'recent_errors_5m': 0, 'timestamp': 't0'}
+
+    async def __call__(self):
+        self.calls += 1
+        return dict(self.snapshot)
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestUpdateBroadcaster:
+    """Test fan-out, deltas and backpressure."""
+
+    async def test_metrics_computed_once_and_sent_as_deltas(self):
+        """One computation per tick serves every subscriber; later ticks send only changes."""
+        provider = CountingProvider()
+        broadcaster = UpdateBroadcaster(metrics_provider=provider, interval=3600)
+        clients = [FakeWebSocket() for _ in range(3)]
+        tasks = [asyncio.create_task(broadcaster.serve(ws)) for ws in clients]
+        await _settle()
+
+        assert provider.calls == 1
+        for ws in clients:
+            assert ws.sent == [{'type': 'metrics_snapshot', 'data': provider.snapshot}]
+
+        # Only a timestamp change: nothing is pushed
+        provider.snapshot['timestamp'] = 't1'
+        await broadcaster.refresh_metrics()
+        await _settle()
+        assert all(len(ws.sent) == 1 for ws in clients)
+
+        provider.snapshot.update(active_workflows=2, timestamp='t2')
+        await broadcaster.refresh_metrics()
+        await _settle()
+        for ws in clients:
+            assert ws.sent[-1] == {
+                'type': 'metrics_delta',
+                'data': {'changed': {'active_workflows': 2, 'timestamp': 't2'}, 'removed': []}
+            }
+        assert provider.calls == 3
+
+        for ws in clients:
+            ws.disconnect()
+        await asyncio.gather(*tasks)
+        assert not broadcaster.subscribers
+        await broadcaster.stop()
+
+    async def test_events_pushed_immediately(self):
+        """Published events reach subscribers without waiting for a tick."""
+        broadcaster = UpdateBroadcaster(interval=3600)
+        ws = FakeWebSocket()
+        task = asyncio.create_task(broadcaster.serve(ws))
+        await _settle()
+
+        broadcaster.publish('workflow_completed', 'Workflow completed: wf-1', {'workflow_id': 'wf-1'})
+        await _settle()
+        assert ws.sent[-1]['type'] == 'workflow_completed'
+        assert ws.sent[-1]['data'] == {'workflow_id': 'wf-1'}
+
+        ws.disconnect()
+        await task
+        await broadcaster.stop()
+
+    async def test_slow_client_gets_coalesced_metrics_and_is_dropped_on_overflow(self):
+        """Pending deltas merge into one message; a full event buffer disconnects the client."""
+        provider = CountingProvider()
+        broadcaster = UpdateBroadcaster(metrics_provider=provider, interval=3600, max_pending=2)
+        await broadcaster.refresh_metrics()
+
+        slow = FakeWebSocket(block_sends=True)
+        task = asyncio.create_task(broadcaster.serve(slow))
+        await _settle()
+        subscriber = next(iter(broadcaster.subscribers))
+
+        # The connect snapshot is stuck in send; later updates fold into one pending message
+        provider.snapshot.update(active_workflows=1)
+        await broadcaster.refresh_metrics()
+        provider.snapshot.update(active_workflows=4, recent_errors_5m=1)
+        await broadcaster.refresh_metrics()
+        assert subscriber.pending_metrics['data']['changed'] == {
+            'active_workflows': 4, 'recent_errors_5m': 1
+        }
+
+        for i in range(3):
+            broadcaster.publish('stage_started', f'stage {i}')
+        assert subscriber.closed
+        assert broadcaster.stats['slow_disconnects'] == 1
+
+        slow.unblock.set()
+        await task
+        assert slow.closed
+        await broadcaster.stop()
+
+
+def test_metrics_delta_reports_changed_and_removed_keys():
+    """Deltas carry new values and dropped keys."""
+    delta = metrics_delta({'a': 1, 'b': 2, 'c': 3}, {'a': 1, 'b': 5, 'd': 0})
+    assert delta == {'changed': {'b': 5, 'd': 0}, 'removed': ['c']}
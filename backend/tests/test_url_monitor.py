@@ -0,0 +1,163 @@
+"""Tests for concurrent URLMonitor sweeps against local mock portals."""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "agents" / "sales_agent"))
+
+from url_monitor_v2 import URLMonitor, MonitoredSite
+from dedupe_store import DedupeStore
+from agents.mock_procurement_sites import get_all_mock_websites
+
+
+class MockPortalServer:
+    """Serves the mock procurement sites as tender listing pages."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.sites = {site.base_url: site for site in get_all_mock_websites()}
+        self.slow_hosts = set()
+        self.versions = {url: 1 for url in self.sites}
+        self.requests = []
+
+    def listing(self, base_url: str) -> str:
+        items = "".join(
+            f'<div class="tender"><a href="/tender/{rfp["rfp_id"]}">{rfp["title"]}</a></div>'
+            for rfp in self.sites[base_url].rfps
+        )
+        return f"<html><body>{items}</body></html>"
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        base_url = f"{request.url.scheme}://{request.url.host}"
+        self.requests.append((request.url.host, time.monotonic(), dict(request.headers)))
+        await asyncio.sleep(60 if request.url.host in self.slow_hosts else self.latency)
+
+        etag = f'"v{self.versions[base_url]}"'
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, headers={"ETag": etag}, text=self.listing(base_url))
+
+
+def _monitor(server: MockPortalServer, state_dir: Path, **kwargs) -> URLMonitor:
+    monitor = URLMonitor(
+        transport=httpx.MockTransport(server), dedupe_store=DedupeStore(str(state_dir)), **kwargs
+    )
+    for base_url, site in server.sites.items():
+        monitor.add_site(MonitoredSite(
+            name=site.name, url=base_url, site_type="portal", rate_limit_seconds=0
+        ))
+    return monitor
+
+
+def _all(results):
+    return [rfp for rfps in results.values() for rfp in rfps]
+
+
+def _urls(rfps):
+    return [rfp["url"] for rfp in rfps]
+
+
+class TestURLMonitorSweep:
+    """Test concurrency, conditional requests, host scheduling and the deadline."""
+
+    async def test_sweep_checks_portals_concurrently(self, tmp_path):
+        """A sweep takes about one portal's latency, not the sum over portals."""
+        server = MockPortalServer(latency=0.3)
+        monitor = _monitor(server, tmp_path)
+
+        started = time.monotonic()
+        results = await monitor.sweep()
+        elapsed = time.monotonic() - started
+
+        assert elapsed < 0.3 * len(server.sites) / 2
+        assert set(results) == {site.name for site in server.sites.values()}
+        assert len(results["eProcure"]) == len(server.sites["https://eprocure.gov.in"].rfps)
+        assert monitor.last_sweep["completed"] == len(server.sites)
+
+    async def test_restart_does_not_reemit_seen_tenders(self, tmp_path):
+        """A new monitor on the same state directory treats emitted tenders as seen."""
+        server = MockPortalServer()
+        monitor = _monitor(server, tmp_path)
+        first = await monitor.sweep()
+        assert _all(first)
+        monitor.mark_emitted(_all(first))
+
+        restarted = _monitor(MockPortalServer(), tmp_path)
+        second = await restarted.sweep()
+        assert all(not rfps for rfps in second.values())
+
+    async def test_unacknowledged_tenders_are_returned_again(self, tmp_path):
+        """Tenders whose emit failed come back on the next sweep and after a restart."""
+        server = MockPortalServer()
+        monitor = _monitor(server, tmp_path)
+        first = await monitor.sweep()
+
+        # The listing is refetched in full instead of revalidated into a 304
+        again = await monitor.sweep()
+        assert _urls(_all(again)) == _urls(_all(first))
+        assert monitor.fetch_stats["not_modified"] == 0
+        restarted = await _monitor(MockPortalServer(), tmp_path).sweep()
+        assert _urls(_all(restarted)) == _urls(_all(first))
+
+        emitted = first["eProcure"]
+        monitor.mark_emitted(emitted)
+        third = await monitor.sweep()
+        assert third["eProcure"] == []
+        assert _urls(_all(third)) == [url for url in _urls(_all(first)) if url not in _urls(emitted)]
+        assert monitor.fetch_stats["not_modified"] == 1
+
+    async def test_unchanged_listings_cost_a_304(self, tmp_path):
+        """Second sweep revalidates with ETags; only the changed portal is re-parsed."""
+        server = MockPortalServer()
+        monitor = _monitor(server, tmp_path)
+        monitor.mark_emitted(_all(await monitor.sweep()))
+
+        server.sites["https://eprocure.gov.in"].rfps.append({
+            "rfp_id": "EPRO-2025-099", "title": "Supply of 33 kV XLPE Cables"
+        })
+        server.versions["https://eprocure.gov.in"] += 1
+        results = await monitor.sweep()
+
+        assert all("if-none-match" in headers for _, _, headers in server.requests[len(server.sites):])
+        assert monitor.fetch_stats["not_modified"] == len(server.sites) - 1
+        assert [rfp["title"] for rfp in results["eProcure"]] == ["Supply of 33 kV XLPE Cables"]
+        assert all(not rfps for name, rfps in results.items() if name != "eProcure")
+
+    async def test_rate_limit_spaces_requests_per_host_only(self, tmp_path):
+        """Sites sharing a host are spaced by rate_limit_seconds; other hosts are not delayed."""
+        server = MockPortalServer()
+        monitor = URLMonitor(
+            transport=httpx.MockTransport(server), dedupe_store=DedupeStore(str(tmp_path))
+        )
+        for i in range(3):
+            monitor.add_site(MonitoredSite(
+                name=f"eprocure-{i}", url=f"https://eprocure.gov.in/list?page={i}",
+                site_type="government", rate_limit_seconds=0.2
+            ))
+        monitor.add_site(MonitoredSite(
+            name="gem", url="https://gem.gov.in", site_type="government", rate_limit_seconds=0.2
+        ))
+
+        await monitor.sweep()
+
+        starts = sorted(t for host, t, _ in server.requests if host == "eprocure.gov.in")
+        assert all(b - a >= 0.19 for a, b in zip(starts, starts[1:]))
+        gem_start = next(t for host, t, _ in server.requests if host == "gem.gov.in")
+        assert gem_start - starts[0] < 0.1
+
+    async def test_deadline_cancels_slow_portals(self, tmp_path):
+        """A hung portal is cut off at the deadline without losing the other results."""
+        server = MockPortalServer()
+        server.slow_hosts.add("gem.gov.in")
+        monitor = _monitor(server, tmp_path, sweep_deadline_seconds=0.3)
+
+        started = time.monotonic()
+        results = await monitor.sweep()
+
+        assert time.monotonic() - started < 1
+        assert monitor.last_sweep["timed_out"] == 1
+        assert results["GEM"] == []
+        assert results["eProcure"]
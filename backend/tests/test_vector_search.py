@@ -0,0 +1,211 @@
+"""Tests for the embedding cache, FAISS index manager and hybrid matcher behind vector search."""
+import numpy as np
+import pytest
+
+from agents.technical_agent.vector_search import EmbeddingStore, FaissIndexManager, HybridMatcher
+
+
+DIM = 16
+
+
+def _unit_rows(count: int, seed: int = 0) -> np.ndarray:
+    rows = np.random.default_rng(seed).normal(size=(count, DIM)).astype('float32')
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+class CountingEncoder:
+    """Deterministic text encoder that records which texts it was asked for."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return np.stack([_unit_rows(1, seed=sum(map(ord, text)))[0] for text in texts])
+
+
+class TestEmbeddingStore:
+    """Test cache round trips, incremental encoding and compaction."""
+
+    def test_round_trip_encodes_nothing_on_reload(self, tmp_path):
+        encoder = CountingEncoder()
+        store = EmbeddingStore(str(tmp_path), "model-a")
+        first = store.embed(["cable 4 core", "fan 1200mm", "cable 4 core"], encoder)
+
+        reloaded = EmbeddingStore(str(tmp_path), "model-a")
+        again = reloaded.embed(["fan 1200mm", "cable 4 core"], encoder)
+
+        assert encoder.calls == [["cable 4 core", "fan 1200mm"]]
+        assert np.array_equal(again, first[[1, 0]])
+        assert len(reloaded) == 2
+
+        # Keys include the model, so another model re-encodes
+        EmbeddingStore(str(tmp_path), "model-b").embed(["fan 1200mm"], encoder)
+        assert encoder.calls[-1] == ["fan 1200mm"]
+
+    def test_incremental_add_and_compact(self, tmp_path):
+        encoder = CountingEncoder()
+        store = EmbeddingStore(str(tmp_path), "model-a")
+        store.embed(["a", "b"], encoder)
+        store.embed(["b", "c"], encoder)
+
+        assert encoder.calls == [["a", "b"], ["c"]]
+        assert len(store) == 3
+
+        store.compact([store.key_for("c"), store.key_for("a")])
+        reloaded = EmbeddingStore(str(tmp_path), "model-a")
+        assert len(reloaded) == 2
+        assert np.array_equal(reloaded.embed(["a", "c"], encoder), store.embed(["a", "c"], encoder))
+        assert encoder.calls == [["a", "b"], ["c"]]
+
+        store.compact([])
+        assert len(EmbeddingStore(str(tmp_path), "model-a")) == 0
+
+
+class TestFaissIndexManager:
+    """Test index types, persistence and filter push-down."""
+
+    @pytest.mark.parametrize("index_type", FaissIndexManager.INDEX_TYPES)
+    def test_each_vector_finds_itself(self, index_type):
+        embeddings = _unit_rows(200)
+        manager = FaissIndexManager(DIM, index_type=index_type, nlist=4, nprobe=4)
+        manager.build(embeddings)
+
+        scores, ids = manager.search(embeddings[:20], top_k=3)
+
+        assert manager.ntotal == 200
+        assert ids[:, 0].tolist() == list(range(20))
+        assert np.all(scores[:, 0] >= scores[:, 1])
+
+    def test_save_load_round_trip(self, tmp_path):
+        embeddings = _unit_rows(100)
+        manager = FaissIndexManager(DIM, index_type='hnsw', ef_search=32)
+        manager.build(embeddings)
+        manager.save(tmp_path)
+
+        loaded = FaissIndexManager(DIM)
+        loaded.load(tmp_path)
+
+        assert loaded.index_type == 'hnsw' and loaded.ef_search == 32
+        assert np.array_equal(loaded.embeddings, embeddings)
+        assert np.array_equal(loaded.search(embeddings[:5], 4)[1], manager.search(embeddings[:5], 4)[1])
+
+    @pytest.mark.parametrize("exact_filter_threshold", [0, 2048])
+    def test_filtered_search_only_returns_subset(self, exact_filter_threshold):
+        """Both the exact and the ID-selector paths honour the filter and still fill top_k."""
+        embeddings = _unit_rows(300)
+        manager = FaissIndexManager(DIM, index_type='flat', exact_filter_threshold=exact_filter_threshold)
+        manager.build(embeddings)
+        subset = np.arange(1, 300, 7)
+
+        scores, ids = manager.search(embeddings[:3], top_k=5, id_subset=subset)
+
+        assert ids.shape == (3, 5)
+        assert set(ids.ravel()) <= set(subset.tolist())
+        expected = np.argsort(-(embeddings[:3] @ embeddings[subset].T), axis=1)[:, :5]
+        assert ids.tolist() == subset[expected].tolist()
+
+        _, empty = manager.search(embeddings[:1], top_k=2, id_subset=np.array([], dtype='int64'))
+        assert empty.tolist() == [[-1, -1]]
+
+
+CATALOG = [
+    {"product_id": "P1", "category": "Cables", "specifications": {"cores": "4", "voltage": "1.1 kV"},
+     "standards_compliance": ["IS 7098", "IS 8130"]},
+    {"product_id": "P2", "category": "Cables", "specifications": {"cores": "3.5"},
+     "standards_compliance": ["is 7098"]},
+    {"product_id": "P3", "category": "Fans", "specifications": {"sweep": "1200 mm"}},
+    {"product_id": "P4", "category": "", "specifications": {"cores": 4}, "standards_compliance": []},
+    {"product_id": "P5", "category": "Lighting", "specifications": {}},
+]
+
+
+class FakeVectorEngine:
+    """Vector engine returning fixed per-query hits, including products outside the catalog."""
+
+    def __init__(self):
+        self.calls = []
+
+    def search_many(self, queries, top_k=10, filters=None):
+        self.calls.append(list(queries))
+        products = CATALOG + [{"product_id": "X1", "category": "Cables"}]
+        results = []
+        for query in queries:
+            seed = sum(map(ord, query))
+            scores = np.random.default_rng(seed).random(len(products))
+            order = np.argsort(-scores)[:top_k]
+            results.append([(products[i], float(scores[i])) for i in order])
+        return results
+
+
+def _reference_rule_score(requirement, product):
+    """Per-product rule score, computed the way the original loop did."""
+    score, count = 0.0, 1
+    req_category = requirement.get('item_name', '').lower()
+    prod_category = product.get('category', '').lower()
+    if req_category in prod_category or prod_category in req_category:
+        score += 1.0
+
+    req_specs = requirement.get('specifications', {})
+    prod_specs = product.get('specifications', {})
+    if req_specs:
+        matched = sum(
+            1 for k, v in req_specs.items()
+            if k in prod_specs and str(v).lower() in str(prod_specs[k]).lower()
+        )
+        score += matched / len(req_specs)
+        count += 1
+
+    req_standards = set(s.upper() for s in requirement.get('required_standards', []))
+    prod_standards = set(s.upper() for s in product.get('standards_compliance', []))
+    if req_standards:
+        score += len(req_standards & prod_standards) / len(req_standards)
+        count += 1
+    return score / count
+
+
+class TestHybridMatcher:
+    """Test that batched matching agrees with matching one requirement at a time."""
+
+    REQUIREMENTS = [
+        {"item_name": "Cables", "specifications": {"cores": "4"}, "required_standards": ["IS 7098"]},
+        {"item_name": "ceiling fan", "description": "1200mm sweep", "specifications": {"sweep": "1200"}},
+        {"item_name": "Cable", "specifications": {"cores": "3", "voltage": "1.1"},
+         "required_standards": ["IS 7098", "IS 1554"]},
+        {"item_name": ""},
+        {"item_name": "Pump", "required_standards": ["is 8130"]},
+    ]
+
+    def test_match_many_equals_per_item_match(self):
+        matcher = HybridMatcher(FakeVectorEngine())
+        batched = matcher.match_many(self.REQUIREMENTS, CATALOG, top_k=4, alpha=0.6)
+
+        assert batched == [matcher.match(r, CATALOG, top_k=4, alpha=0.6) for r in self.REQUIREMENTS]
+        assert matcher.vector_engine.calls[0] == [
+            matcher._create_requirement_query(r) for r in self.REQUIREMENTS
+        ]
+
+        for requirement, matches in zip(self.REQUIREMENTS, batched):
+            query = matcher._create_requirement_query(requirement)
+            vector = {p["product_id"]: s for p, s in FakeVectorEngine().search_many([query], top_k=8)[0]}
+            assert len(matches) == 4
+            assert [s for _, s in matches] == sorted((s for _, s in matches), reverse=True)
+            for product, score in matches:
+                rule = next(
+                    (_reference_rule_score(requirement, p) for p in CATALOG
+                     if p["product_id"] == product["product_id"]),
+                    0.0,
+                )
+                expected = 0.6 * vector.get(product["product_id"], 0.0) + 0.4 * rule
+                assert score == pytest.approx(expected)
+
+    def test_empty_inputs(self):
+        matcher = HybridMatcher(FakeVectorEngine())
+
+        assert matcher.match_many([], CATALOG) == []
+        assert matcher.vector_engine.calls == []
+
+        empty_catalog = matcher.match_many(self.REQUIREMENTS[:2], [], top_k=3)
+        assert empty_catalog == [matcher.match(r, [], top_k=3) for r in self.REQUIREMENTS[:2]]
+        # Vector hits still rank, with no rule score to add
+        assert [len(m) for m in empty_catalog] == [3, 3]
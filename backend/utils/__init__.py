@@ -4,6 +4,7 @@ from .standards_checker import StandardsChecker
 from .specification_normalizer import SpecificationNormalizer, get_normalizer
 from .unit_converter import UnitConverter, get_converter
 from .standard_mapper import StandardMapper, get_standard_mapper
+from .text_scanner import TextScanner, ScanRule, ScanHit, get_rfp_scanner
 from .text_processor import TextProcessor, get_text_processor
 from .validation_helpers import ValidationHelpers, get_validation_helpers
 from .error_handlers import (
@@ -30,6 +31,10 @@ __all__ = [
     "get_converter",
     "StandardMapper",
     "get_standard_mapper",
+    "TextScanner",
+    "ScanRule",
+    "ScanHit",
+    "get_rfp_scanner",
     "TextProcessor",
     "get_text_processor",
     "ValidationHelpers",
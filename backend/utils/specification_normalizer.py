@@ -1,18 +1,134 @@
 """Specification normalization utilities for standardizing product specifications."""
 from typing import Dict, Any, Optional, List, Union
+from functools import lru_cache
 import re
 from decimal import Decimal, InvalidOperation
+import pandas as pd
 import structlog
 
 logger = structlog.get_logger()
 
+# Map common key variations to standard names
+KEY_ALIASES = {
+    'volt': 'voltage',
+    'volts': 'voltage',
+    'amp': 'amperage',
+    'amps': 'amperage',
+    'ampere': 'amperage',
+    'amperes': 'amperage',
+    'current': 'amperage',
+    'watt': 'wattage',
+    'watts': 'wattage',
+    'power': 'wattage',
+    'freq': 'frequency',
+    'hz': 'frequency',
+    'temp': 'temperature',
+    'conductor': 'conductors',
+    'core': 'cores',
+    'diameter': 'dia',
+    'length': 'len',
+    'weight': 'wt',
+    'colour': 'color',
+    'colour_code': 'color_code',
+    'insulation': 'insulation_material',
+    'sheath': 'sheath_material',
+}
+
+# Value kind selected by substrings of the normalized key, checked in order
+VALUE_KINDS = [
+    ('voltage', ('voltage', 'volt')),
+    ('amperage', ('amperage', 'current', 'amp')),
+    ('wattage', ('wattage', 'power', 'watt')),
+    ('frequency', ('frequency', 'freq')),
+    ('temperature', ('temperature', 'temp')),
+    ('dimension', ('length', 'width', 'height', 'depth', 'diameter', 'dia')),
+    ('weight', ('weight', 'wt')),
+    ('color', ('color', 'colour')),
+]
+COUNT_KEYS = {'conductors', 'cores', 'poles', 'ways'}
+
+# Substring -> color name, first match wins
+COLOR_ALIASES = {
+    'red': 'red',
+    'blue': 'blue',
+    'green': 'green',
+    'yellow': 'yellow',
+    'black': 'black',
+    'white': 'white',
+    'brown': 'brown',
+    'grey': 'gray',
+    'gray': 'gray',
+    'orange': 'orange',
+    'purple': 'purple',
+    'violet': 'purple',
+    'pink': 'pink',
+}
+
+# Number, optional SI prefix, unit: (pattern, prefix multipliers)
+PREFIXED_UNITS = {
+    'voltage': (re.compile(r'([\d.]+)\s*([kKmM]?)[vV]?'), {'K': 1000, 'M': 1000000, '': 1}),
+    'amperage': (re.compile(r'([\d.]+)\s*([mM]?)[aA](?:mp)?'), {'M': 0.001, '': 1}),
+    'wattage': (re.compile(r'([\d.]+)\s*([kKmM]?)[wW](?:att)?s?'), {'K': 1000, 'M': 0.001, '': 1}),
+    'frequency': (re.compile(r'([\d.]+)\s*([kKmMgG]?)[hH][zZ]?'), {'K': 1000, 'M': 1000000, 'G': 1000000000, '': 1}),
+}
+
+TEMPERATURE_PATTERN = re.compile(r'([\d.]+)\s*°?([CcFfKk])')
+
+# Tried in order, first match wins: (pattern, factor to mm)
+DIMENSION_PATTERNS = [
+    (re.compile(r'([\d.]+)\s*mm', re.IGNORECASE), 1),
+    (re.compile(r'([\d.]+)\s*cm', re.IGNORECASE), 10),
+    (re.compile(r'([\d.]+)\s*m(?!m)', re.IGNORECASE), 1000),
+    (re.compile(r'([\d.]+)\s*inch(?:es)?', re.IGNORECASE), 25.4),
+    (re.compile(r'([\d.]+)\s*ft', re.IGNORECASE), 304.8),
+    (re.compile(r'([\d.]+)\s*\'', re.IGNORECASE), 304.8),
+    (re.compile(r'([\d.]+)\s*"', re.IGNORECASE), 25.4),
+]
+
+# Tried in order, first match wins: (pattern, factor to kg)
+WEIGHT_PATTERNS = [
+    (re.compile(r'([\d.]+)\s*kg', re.IGNORECASE), 1),
+    (re.compile(r'([\d.]+)\s*g(?!s)', re.IGNORECASE), 0.001),
+    (re.compile(r'([\d.]+)\s*mg', re.IGNORECASE), 0.000001),
+    (re.compile(r'([\d.]+)\s*lbs?', re.IGNORECASE), 0.453592),
+    (re.compile(r'([\d.]+)\s*oz', re.IGNORECASE), 0.0283495),
+]
+
+COUNT_PATTERN = re.compile(r'(\d+)')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+KEY_INVALID_CHARS_PATTERN = re.compile(r'[^\w\s-]')
+KEY_SEPARATORS_PATTERN = re.compile(r'[-\s]+')
+KEY_UNDERSCORES_PATTERN = re.compile(r'_+')
+
 
 class SpecificationNormalizer:
     """Normalize and standardize product specifications."""
     
-    def __init__(self):
-        """Initialize normalizer."""
+    def __init__(self, cache_size: int = 4096):
+        """Initialize normalizer.
+        
+        Args:
+            cache_size: Maximum number of distinct keys/values memoized
+        """
         self.logger = logger.bind(component="SpecificationNormalizer")
+        
+        self._value_normalizers = {
+            'voltage': self._normalize_voltage,
+            'amperage': self._normalize_amperage,
+            'wattage': self._normalize_wattage,
+            'frequency': self._normalize_frequency,
+            'temperature': self._normalize_temperature,
+            'dimension': self._normalize_dimension,
+            'weight': self._normalize_weight,
+            'color': self._normalize_color,
+            'count': self._normalize_count,
+            'text': self._normalize_text,
+        }
+        
+        # Bounded memo caches; catalogs repeat the same few hundred strings
+        self._normalize_key_cached = lru_cache(maxsize=cache_size)(self._normalize_key_uncached)
+        self._value_kind = lru_cache(maxsize=cache_size)(self._detect_value_kind)
+        self._normalize_value_cached = lru_cache(maxsize=cache_size)(self._normalize_string_value)
     
     def normalize_specifications(
         self,
@@ -49,48 +165,42 @@ class SpecificationNormalizer:
         if not isinstance(key, str):
             return str(key)
         
+        return self._normalize_key_cached(key)
+    
+    def _normalize_key_uncached(self, key: str) -> str:
+        """Normalize a key string without consulting the memo cache."""
         # Convert to lowercase
         key = key.lower().strip()
         
         # Remove special characters except underscore
-        key = re.sub(r'[^\w\s-]', '', key)
+        key = KEY_INVALID_CHARS_PATTERN.sub('', key)
         
         # Replace spaces and hyphens with underscores
-        key = re.sub(r'[-\s]+', '_', key)
+        key = KEY_SEPARATORS_PATTERN.sub('_', key)
         
         # Remove multiple underscores
-        key = re.sub(r'_+', '_', key)
+        key = KEY_UNDERSCORES_PATTERN.sub('_', key)
         
         # Remove leading/trailing underscores
         key = key.strip('_')
         
-        # Map common variations to standard names
-        key_mappings = {
-            'volt': 'voltage',
-            'volts': 'voltage',
-            'amp': 'amperage',
-            'amps': 'amperage',
-            'ampere': 'amperage',
-            'amperes': 'amperage',
-            'current': 'amperage',
-            'watt': 'wattage',
-            'watts': 'wattage',
-            'power': 'wattage',
-            'freq': 'frequency',
-            'hz': 'frequency',
-            'temp': 'temperature',
-            'conductor': 'conductors',
-            'core': 'cores',
-            'diameter': 'dia',
-            'length': 'len',
-            'weight': 'wt',
-            'colour': 'color',
-            'colour_code': 'color_code',
-            'insulation': 'insulation_material',
-            'sheath': 'sheath_material',
-        }
+        return KEY_ALIASES.get(key, key)
+    
+    def _detect_value_kind(self, key: str) -> str:
+        """Pick the value normalizer for a normalized key.
         
-        return key_mappings.get(key, key)
+        Args:
+            key: Normalized key name
+            
+        Returns:
+            Kind name (e.g. 'voltage', 'dimension', 'count', 'text')
+        """
+        for kind, fragments in VALUE_KINDS:
+            if any(fragment in key for fragment in fragments):
+                return kind
+        if key in COUNT_KEYS:
+            return 'count'
+        return 'text'
     
     def normalize_value(
         self,
@@ -100,6 +210,8 @@ class SpecificationNormalizer:
     ) -> Any:
         """Normalize specification values.
         
+        String values are memoized per (value, key).
+        
         Args:
             value: Original value
             key: Normalized key name
@@ -115,50 +227,176 @@ class SpecificationNormalizer:
         if not isinstance(value, str):
             return value
         
-        value = value.strip()
-        
-        # Normalize based on key type
-        if any(k in key for k in ['voltage', 'volt']):
-            return self._normalize_voltage(value)
-        elif any(k in key for k in ['amperage', 'current', 'amp']):
-            return self._normalize_amperage(value)
-        elif any(k in key for k in ['wattage', 'power', 'watt']):
-            return self._normalize_wattage(value)
-        elif any(k in key for k in ['frequency', 'freq']):
-            return self._normalize_frequency(value)
-        elif any(k in key for k in ['temperature', 'temp']):
-            return self._normalize_temperature(value)
-        elif any(k in key for k in ['length', 'width', 'height', 'depth', 'diameter', 'dia']):
-            return self._normalize_dimension(value)
-        elif any(k in key for k in ['weight', 'wt']):
-            return self._normalize_weight(value)
-        elif any(k in key for k in ['color', 'colour']):
-            return self._normalize_color(value)
-        elif key in ['conductors', 'cores', 'poles', 'ways']:
-            return self._normalize_count(value)
-        else:
-            return self._normalize_text(value)
+        result = self._normalize_value_cached(value, key)
+        # Cached dicts are shared between callers, so hand out copies
+        return dict(result) if isinstance(result, dict) else result
     
-    def _normalize_voltage(self, value: str) -> Dict[str, Any]:
-        """Normalize voltage values.
+    def _normalize_string_value(self, value: str, key: str) -> Any:
+        """Normalize a string value without consulting the memo cache."""
+        return self._value_normalizers[self._value_kind(key)](value.strip())
+    
+    def cache_info(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss statistics of the memo caches.
+        
+        Returns:
+            Dictionary of cache name to hits, misses, and current size
+        """
+        caches = {
+            'normalize_key': self._normalize_key_cached,
+            'normalize_value': self._normalize_value_cached,
+            'value_kind': self._value_kind,
+        }
+        return {
+            name: {'hits': info.hits, 'misses': info.misses, 'size': info.currsize}
+            for name, info in ((name, cache.cache_info()) for name, cache in caches.items())
+        }
+    
+    def clear_cache(self):
+        """Drop all memoized keys and values."""
+        self._normalize_key_cached.cache_clear()
+        self._value_kind.cache_clear()
+        self._normalize_value_cached.cache_clear()
+    
+    def normalize_frame(
+        self,
+        df: pd.DataFrame,
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Normalize whole specification columns of a DataFrame.
+        
+        Column-wise equivalent of normalize_specifications: column names go
+        through normalize_key and each distinct cell is parsed once with
+        pandas string/regex operations. Measurement columns hold the
+        normalized numeric value (the 'value' of normalize_value's dict,
+        NaN when unparseable) instead of the dict itself.
         
         Args:
-            value: Voltage string (e.g., '230V', '415V', '11kV')
+            df: DataFrame with one specification per column
+            columns: Columns to normalize (default: all); others are copied as-is
             
         Returns:
-            Normalized voltage dict with value and unit
+            New DataFrame with normalized column names and values
         """
-        # Extract numeric value and unit
-        match = re.search(r'([\d.]+)\s*([kKmM]?)[vV]?', value)
+        columns = list(df.columns) if columns is None else list(columns)
+        normalized = df.copy()
+        
+        for column in columns:
+            normalized[column] = self.normalize_series(df[column], self.normalize_key(column))
+        
+        return normalized.rename(columns={column: self.normalize_key(column) for column in columns})
+    
+    def normalize_series(self, series: pd.Series, key: str) -> pd.Series:
+        """Normalize one specification column.
+        
+        Args:
+            series: Raw values
+            key: Normalized key name
+            
+        Returns:
+            Normalized values (numeric for measurements) on the same index
+        """
+        kind = self._value_kind(key)
+        codes, uniques = pd.factorize(series)
+        uniques = pd.Series(uniques, dtype=object)
+        
+        # Only strings are parsed; other values pass through as in normalize_value
+        is_string = uniques.map(lambda value: isinstance(value, str)).astype(bool)
+        normalized = uniques
+        if is_string.any():
+            strings = uniques[is_string].astype(str)
+            values = self._normalize_strings(strings.str.strip(), kind)
+            values[strings == ''] = None
+            normalized = values if is_string.all() else uniques.where(~is_string, values)
+        
+        # Missing cells have code -1 and come back as NA
+        result = normalized.reindex(codes)
+        result.index = series.index
+        result.name = series.name
+        return result
+    
+    def _normalize_strings(self, values: pd.Series, kind: str) -> pd.Series:
+        """Vectorized counterpart of the per-value normalizers.
+        
+        Args:
+            values: Stripped, non-missing strings
+            kind: Value kind from _detect_value_kind
+            
+        Returns:
+            Normalized values on the same index
+        """
+        if kind in PREFIXED_UNITS:
+            pattern, multipliers = PREFIXED_UNITS[kind]
+            parts = values.str.extract(pattern)
+            factor = parts[1].fillna('').str.upper().map(multipliers).fillna(1)
+            return pd.to_numeric(parts[0], errors='coerce') * factor
+        
+        if kind == 'temperature':
+            parts = values.str.extract(TEMPERATURE_PATTERN)
+            number = pd.to_numeric(parts[0], errors='coerce')
+            unit = parts[1].str.upper()
+            celsius = number.where(unit != 'F', (number - 32) * 5/9)
+            return celsius.where(unit != 'K', number - 273.15)
+        
+        if kind in ('dimension', 'weight'):
+            patterns = DIMENSION_PATTERNS if kind == 'dimension' else WEIGHT_PATTERNS
+            result = pd.Series(float('nan'), index=values.index)
+            for pattern, factor in patterns:
+                pending = result.isna()
+                if not pending.any():
+                    break
+                number = pd.to_numeric(values[pending].str.extract(pattern)[0], errors='coerce')
+                result[pending] = number * factor
+            return result
+        
+        if kind == 'count':
+            number = pd.to_numeric(values.str.extract(COUNT_PATTERN)[0], errors='coerce')
+            return number.astype('Int64')
+        
+        if kind == 'color':
+            lowered = values.str.lower()
+            result = values.str.title().astype(object)
+            matched = pd.Series(False, index=values.index)
+            for fragment, color in COLOR_ALIASES.items():
+                hit = ~matched & lowered.str.contains(fragment, regex=False)
+                result[hit] = color
+                matched |= hit
+            return result
+        
+        collapsed = values.str.replace(WHITESPACE_PATTERN, ' ', regex=True).str.strip()
+        long_upper = collapsed.str.isupper() & (collapsed.str.len() > 5)
+        return collapsed.where(~long_upper, collapsed.str.title()).astype(object)
+    
+    def _normalize_prefixed(self, value: str, kind: str) -> Optional[float]:
+        """Parse a number with optional SI prefix into the base unit.
+        
+        Args:
+            value: Value string
+            kind: Key of PREFIXED_UNITS
+            
+        Returns:
+            Value in base unit, or None if no number was found
+        """
+        pattern, multipliers = PREFIXED_UNITS[kind]
+        match = pattern.search(value)
         if not match:
-            return {'raw': value, 'normalized': None}
+            return None
         
         num_value = float(match.group(1))
         unit_prefix = match.group(2).upper() if match.group(2) else ''
+        return num_value * multipliers.get(unit_prefix, 1)
+    
+    def _normalize_voltage(self, value: str) -> Dict[str, Any]:
+        """Normalize voltage values.
         
-        # Convert to base unit (Volts)
-        multipliers = {'K': 1000, 'M': 1000000, '': 1}
-        base_value = num_value * multipliers.get(unit_prefix, 1)
+        Args:
+            value: Voltage string (e.g., '230V', '415V', '11kV')
+            
+        Returns:
+            Normalized voltage dict with value and unit
+        """
+        base_value = self._normalize_prefixed(value, 'voltage')
+        if base_value is None:
+            return {'raw': value, 'normalized': None}
         
         return {
             'value': base_value,
@@ -176,17 +414,10 @@ class SpecificationNormalizer:
         Returns:
             Normalized current dict
         """
-        match = re.search(r'([\d.]+)\s*([mM]?)[aA](?:mp)?', value)
-        if not match:
+        base_value = self._normalize_prefixed(value, 'amperage')
+        if base_value is None:
             return {'raw': value, 'normalized': None}
         
-        num_value = float(match.group(1))
-        unit_prefix = match.group(2).upper() if match.group(2) else ''
-        
-        # Convert to base unit (Amperes)
-        multipliers = {'M': 0.001, '': 1}
-        base_value = num_value * multipliers.get(unit_prefix, 1)
-        
         return {
             'value': base_value,
             'unit': 'A',
@@ -203,17 +434,10 @@ class SpecificationNormalizer:
         Returns:
             Normalized power dict
         """
-        match = re.search(r'([\d.]+)\s*([kKmM]?)[wW](?:att)?s?', value)
-        if not match:
+        base_value = self._normalize_prefixed(value, 'wattage')
+        if base_value is None:
             return {'raw': value, 'normalized': None}
         
-        num_value = float(match.group(1))
-        unit_prefix = match.group(2).upper() if match.group(2) else ''
-        
-        # Convert to base unit (Watts)
-        multipliers = {'K': 1000, 'M': 1000000, 'M': 0.001, '': 1}
-        base_value = num_value * multipliers.get(unit_prefix, 1)
-        
         return {
             'value': base_value,
             'unit': 'W',
@@ -230,16 +454,10 @@ class SpecificationNormalizer:
         Returns:
             Normalized frequency dict
         """
-        match = re.search(r'([\d.]+)\s*([kKmMgG]?)[hH][zZ]?', value)
-        if not match:
+        base_value = self._normalize_prefixed(value, 'frequency')
+        if base_value is None:
             return {'raw': value, 'normalized': None}
         
-        num_value = float(match.group(1))
-        unit_prefix = match.group(2).upper() if match.group(2) else ''
-        
-        multipliers = {'K': 1000, 'M': 1000000, 'G': 1000000000, '': 1}
-        base_value = num_value * multipliers.get(unit_prefix, 1)
-        
         return {
             'value': base_value,
             'unit': 'Hz',
@@ -256,8 +474,7 @@ class SpecificationNormalizer:
         Returns:
             Normalized temperature dict in Celsius
         """
-        # Try different patterns
-        match = re.search(r'([\d.]+)\s*°?([CcFfKk])', value)
+        match = TEMPERATURE_PATTERN.search(value)
         if not match:
             return {'raw': value, 'normalized': None}
         
@@ -288,36 +505,10 @@ class SpecificationNormalizer:
         Returns:
             Normalized dimension dict in millimeters
         """
-        # Try various patterns
-        patterns = [
-            r'([\d.]+)\s*mm',
-            r'([\d.]+)\s*cm',
-            r'([\d.]+)\s*m(?!m)',
-            r'([\d.]+)\s*inch(?:es)?',
-            r'([\d.]+)\s*ft',
-            r'([\d.]+)\s*\'',
-            r'([\d.]+)\s*"',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, value, re.IGNORECASE)
+        for pattern, factor in DIMENSION_PATTERNS:
+            match = pattern.search(value)
             if match:
-                num_value = float(match.group(1))
-                matched_text = match.group(0).lower()
-                
-                # Convert to mm
-                if 'mm' in matched_text:
-                    mm_value = num_value
-                elif 'cm' in matched_text:
-                    mm_value = num_value * 10
-                elif 'm' in matched_text and 'mm' not in matched_text:
-                    mm_value = num_value * 1000
-                elif 'inch' in matched_text or '"' in matched_text:
-                    mm_value = num_value * 25.4
-                elif 'ft' in matched_text or "'" in matched_text:
-                    mm_value = num_value * 304.8
-                else:
-                    mm_value = num_value
+                mm_value = float(match.group(1)) * factor
                 
                 return {
                     'value': mm_value,
@@ -337,19 +528,10 @@ class SpecificationNormalizer:
         Returns:
             Normalized weight dict in kilograms
         """
-        patterns = [
-            (r'([\d.]+)\s*kg', 1),
-            (r'([\d.]+)\s*g(?!s)', 0.001),
-            (r'([\d.]+)\s*mg', 0.000001),
-            (r'([\d.]+)\s*lbs?', 0.453592),
-            (r'([\d.]+)\s*oz', 0.0283495),
-        ]
-        
-        for pattern, multiplier in patterns:
-            match = re.search(pattern, value, re.IGNORECASE)
+        for pattern, multiplier in WEIGHT_PATTERNS:
+            match = pattern.search(value)
             if match:
-                num_value = float(match.group(1))
-                kg_value = num_value * multiplier
+                kg_value = float(match.group(1)) * multiplier
                 
                 return {
                     'value': kg_value,
@@ -369,24 +551,8 @@ class SpecificationNormalizer:
         Returns:
             Normalized color name
         """
-        color_map = {
-            'red': 'red',
-            'blue': 'blue',
-            'green': 'green',
-            'yellow': 'yellow',
-            'black': 'black',
-            'white': 'white',
-            'brown': 'brown',
-            'grey': 'gray',
-            'gray': 'gray',
-            'orange': 'orange',
-            'purple': 'purple',
-            'violet': 'purple',
-            'pink': 'pink',
-        }
-        
         value_lower = value.lower().strip()
-        for key, normalized in color_map.items():
+        for key, normalized in COLOR_ALIASES.items():
             if key in value_lower:
                 return normalized
         
@@ -402,7 +568,7 @@ class SpecificationNormalizer:
             Integer count
         """
         # Extract first number
-        match = re.search(r'(\d+)', value)
+        match = COUNT_PATTERN.search(value)
         if match:
             return int(match.group(1))
         return None
@@ -417,7 +583,7 @@ class SpecificationNormalizer:
             Normalized text
         """
         # Remove extra whitespace
-        value = re.sub(r'\s+', ' ', value).strip()
+        value = WHITESPACE_PATTERN.sub(' ', value).strip()
         
         # Capitalize appropriately
         if len(value) > 0 and value.isupper():
@@ -3,15 +3,22 @@ from typing import Dict, List, Optional, Set, Any
 import re
 import structlog
 
+from .text_scanner import TextScanner, get_rfp_scanner
+
 logger = structlog.get_logger()
 
 
 class StandardMapper:
     """Map and compare electrical and industrial standards."""
     
-    def __init__(self):
-        """Initialize standard mapper."""
+    def __init__(self, scanner: Optional[TextScanner] = None):
+        """Initialize standard mapper.
+        
+        Args:
+            scanner: Shared text scanner (defaults to the global RFP scanner)
+        """
         self.logger = logger.bind(component="StandardMapper")
+        self.scanner = scanner or get_rfp_scanner()
         
         # Indian Standards (IS) to IEC mappings
         self.is_to_iec_map = {
@@ -285,26 +292,25 @@ class StandardMapper:
             return []
         
         standards = []
+        scan = self.scanner.scan(text)
+        
+        # IS/IEC/BS/EN references (see STANDARD_REFERENCE_PATTERNS)
+        for hit in scan.hits('standard_reference'):
+            match = hit.match
+            prefix = match.group(1).upper()
+            number = match.group(2)
+            part = match.group(3) if len(match.groups()) > 2 else None
+            
+            if part:
+                standard = f"{prefix} {number}-{part}"
+            else:
+                standard = f"{prefix} {number}"
+            
+            standards.append(self.normalize_standard(standard))
         
-        # Pattern for IS/IEC/BS/EN standards
-        patterns = [
-            r'\b(IS|IEC|BS|EN)\s*[-/]?\s*(\d+)(?:\s*[-:]\s*(\d+))?\b',
-            r'\b(IS|IEC|BS|EN)(\d+)\b',
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                prefix = match.group(1).upper()
-                number = match.group(2)
-                part = match.group(3) if len(match.groups()) > 2 else None
-                
-                if part:
-                    standard = f"{prefix} {number}-{part}"
-                else:
-                    standard = f"{prefix} {number}"
-                
-                standards.append(self.normalize_standard(standard))
+        # Codes from the standards catalogue (e.g. UL 44, ASTM B3)
+        for hit in scan.hits('catalog_standard'):
+            standards.append(self.normalize_standard(hit.name))
         
         return list(set(standards))  # Remove duplicates
     
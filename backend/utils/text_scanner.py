@@ -0,0 +1,426 @@
+"""
+Text Scanner - Single-pass multi-pattern scanning of RFP documents.
+
+Every rule (standard codes, certifications, test names, specification
+patterns) declares the trigger words or characters its matches start
+with. All triggers are compiled into one combined regex; a single pass
+over the document finds every trigger position, and only the rules
+triggered there are confirmed with an anchored match. Each rule keeps
+finditer semantics (leftmost, non-overlapping within the rule) while
+different rules may overlap, so consumers see the same matches as when
+every pattern ran its own pass.
+
+Scan results are memoized per document, so the standards, testing and
+specification extractors share one pass over the same tender text.
+"""
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+import csv
+import re
+import threading
+import structlog
+
+from config.settings import settings
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class ScanRule:
+    """A pattern compiled into the scanner."""
+    kind: str  # standard, standard_reference, catalog_standard, certification, test, inspection, catalog_test, spec, custom_spec
+    name: str
+    pattern: str
+    triggers: Tuple[str, ...] = ()  # case-insensitive words every match starts with
+    start_chars: str = ""  # case-sensitive characters a match may start with
+    flags: int = re.IGNORECASE
+    compiled: Pattern = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        self.compiled = re.compile(self.pattern, self.flags)
+
+
+@dataclass
+class ScanHit:
+    """A confirmed rule match with its offsets."""
+    rule: ScanRule
+    order: int  # index of the rule in the scanner
+    match: re.Match
+    
+    @property
+    def kind(self) -> str:
+        return self.rule.kind
+    
+    @property
+    def name(self) -> str:
+        return self.rule.name
+    
+    @property
+    def start(self) -> int:
+        return self.match.start()
+    
+    @property
+    def end(self) -> int:
+        return self.match.end()
+    
+    @property
+    def text(self) -> str:
+        return self.match.group(0)
+
+
+class ScanResult:
+    """Hits of one scan, grouped per rule in rule order."""
+    
+    def __init__(self, rules: List[ScanRule], rule_hits: List[List[ScanHit]]):
+        self._rules = rules
+        self._rule_hits = rule_hits
+        self._by_position: Dict[str, Tuple[List[int], List[ScanHit]]] = {}
+    
+    def hits(self, kind: str, name: Optional[str] = None) -> List[ScanHit]:
+        """Hits of one kind, ordered by rule then by position.
+        
+        Args:
+            kind: Rule kind
+            name: Optional rule name within the kind
+        
+        Returns:
+            List of hits
+        """
+        return [
+            hit
+            for rule, hits in zip(self._rules, self._rule_hits)
+            if rule.kind == kind and (name is None or rule.name == name)
+            for hit in hits
+        ]
+    
+    def hits_between(self, kind: str, start: int, end: int) -> List[ScanHit]:
+        """Hits of one kind lying entirely within [start, end), ordered by rule then position.
+        
+        Args:
+            kind: Rule kind
+            start: Start offset
+            end: End offset
+        
+        Returns:
+            List of hits
+        """
+        if kind not in self._by_position:
+            ordered = sorted(self.hits(kind), key=lambda hit: hit.start)
+            self._by_position[kind] = ([hit.start for hit in ordered], ordered)
+        starts, ordered = self._by_position[kind]
+        
+        selected = ordered[bisect_left(starts, start):bisect_left(starts, end)]
+        return sorted((hit for hit in selected if hit.end <= end), key=lambda hit: (hit.order, hit.start))
+    
+    def count(self) -> int:
+        """Total number of hits."""
+        return sum(len(hits) for hits in self._rule_hits)
+
+
+class TextScanner:
+    """Scan text for many rules in one pass over the document."""
+    
+    def __init__(self, rules: Iterable[ScanRule], cache_size: int = 8):
+        """Compile the rules into one trigger automaton.
+        
+        Args:
+            rules: Rules to scan for; each needs triggers or start_chars
+            cache_size: Number of recently scanned documents to keep
+        """
+        self.logger = logger.bind(component="TextScanner")
+        self.rules = list(rules)
+        self.cache_size = cache_size
+        
+        self._word_rules: Dict[str, List[int]] = {}
+        self._char_rules: Dict[str, List[int]] = {}
+        for index, rule in enumerate(self.rules):
+            if not rule.triggers and not rule.start_chars:
+                raise ValueError(f"Scan rule {rule.kind}/{rule.name} has no triggers")
+            for trigger in rule.triggers:
+                self._word_rules.setdefault(trigger.lower(), []).append(index)
+            for char in rule.start_chars:
+                self._char_rules.setdefault(char, []).append(index)
+        
+        # Words bucketed by their first two characters, so a trigger position
+        # only tests the few words that can start there
+        self._word_prefixes: Dict[str, List[Tuple[str, List[int]]]] = {}
+        for word, indices in self._word_rules.items():
+            self._word_prefixes.setdefault(word[:2], []).append((word, indices))
+        self._longest_word = max((len(word) for word in self._word_rules), default=0)
+        self._has_short_words = any(len(word) < 2 for word in self._word_rules)
+        
+        alternatives = []
+        if self._word_rules:
+            words = sorted(self._word_rules, key=len, reverse=True)
+            alternatives.append('(?i:' + '|'.join(re.escape(word) for word in words) + ')')
+        if self._char_rules:
+            alternatives.append('[' + ''.join(re.escape(char) for char in sorted(self._char_rules)) + ']')
+        # Zero-width, so every position where any trigger begins is reported
+        self._automaton = re.compile('(?=' + '|'.join(alternatives) + ')')
+        
+        self._recent: "OrderedDict[str, ScanResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'scans': 0, 'cache_hits': 0}
+    
+    def scan(self, text: str) -> ScanResult:
+        """Scan a document, reusing the result for a recently scanned text.
+        
+        Args:
+            text: Document text
+        
+        Returns:
+            ScanResult with the hits of every rule
+        """
+        with self._lock:
+            cached = self._recent.get(text)
+            if cached is not None:
+                self._recent.move_to_end(text)
+                self.stats['cache_hits'] += 1
+                return cached
+        
+        result = self._scan(text)
+        
+        with self._lock:
+            self.stats['scans'] += 1
+            self._recent[text] = result
+            while len(self._recent) > self.cache_size:
+                self._recent.popitem(last=False)
+        
+        return result
+    
+    def _scan(self, text: str) -> ScanResult:
+        """One pass over text: find trigger positions, confirm triggered rules."""
+        rules = self.rules
+        matchers = [rule.compiled.match for rule in rules]
+        rule_hits: List[List[ScanHit]] = [[] for _ in rules]
+        # Per rule, where its next match may start (finditer never overlaps its own matches)
+        resume_at = [0] * len(rules)
+        
+        char_rules = self._char_rules.get
+        word_prefixes = self._word_prefixes.get
+        longest_word = self._longest_word
+        has_short_words = self._has_short_words
+        no_rules: List[int] = []
+        
+        for trigger in self._automaton.finditer(text):
+            pos = trigger.start()
+            candidates = char_rules(text[pos], no_rules)
+            
+            words = word_prefixes(text[pos:pos + 2].lower())
+            if has_short_words:
+                words = (words or []) + word_prefixes(text[pos].lower(), [])
+            if words:
+                window = text[pos:pos + longest_word].lower()
+                for word, indices in words:
+                    if window.startswith(word):
+                        candidates = candidates + indices
+            
+            for index in candidates:
+                if pos < resume_at[index]:
+                    continue
+                match = matchers[index](text, pos)
+                if match:
+                    rule_hits[index].append(ScanHit(rules[index], index, match))
+                    resume_at[index] = max(match.end(), pos + 1)
+        
+        return ScanResult(rules, rule_hits)
+    
+    def clear_cache(self):
+        """Forget memoized scan results."""
+        with self._lock:
+            self._recent.clear()
+
+
+def line_bounds(text: str, position: int) -> Tuple[int, int]:
+    """Start and end offsets of the line containing position."""
+    start = text.rfind('\n', 0, position) + 1
+    end = text.find('\n', position)
+    return start, len(text) if end == -1 else end
+
+
+def keyword_rule(kind: str, keyword: str) -> ScanRule:
+    """Rule matching a literal keyword anywhere (case-insensitive), named by the keyword."""
+    return ScanRule(kind, keyword, re.escape(keyword), triggers=(keyword,))
+
+
+def phrase_rule(kind: str, phrase: str) -> ScanRule:
+    """Rule matching a catalogue phrase as whole words, tolerating spacing variants."""
+    tokens = phrase.split()
+    pattern = r'(?<!\w)' + r'[\s:-]*'.join(re.escape(token) for token in tokens)
+    if phrase[-1].isalnum():
+        pattern += r'(?!\w)'
+    return ScanRule(kind, phrase, pattern, triggers=(tokens[0],))
+
+
+# Standards referenced in testing clauses (prefix, identifier)
+STANDARD_PATTERNS = {
+    'is': (r'IS[\s:-]*(\d+(?:\.\d+)?)', ('is',)),  # Indian Standards
+    'iec': (r'IEC[\s:-]*(\d+(?:\.\d+)?)', ('iec',)),  # International Electrotechnical Commission
+    'ieee': (r'IEEE[\s:-]*(\d+(?:\.\d+)?)', ('ieee',)),  # IEEE Standards
+    'iso': (r'ISO[\s:-]*(\d+(?:\.\d+)?)', ('iso',)),  # ISO Standards
+    'bis': (r'BIS[\s:-]*(\d+(?:\.\d+)?)', ('bis',)),  # Bureau of Indian Standards
+    'astm': (r'ASTM[\s:-]*([A-Z]?\d+)', ('astm',)),  # ASTM Standards
+    'en': (r'EN[\s:-]*(\d+(?:\.\d+)?)', ('en',)),  # European Standards
+}
+
+# Standard references with optional part number (StandardMapper)
+STANDARD_REFERENCE_PATTERNS = [
+    r'\b(IS|IEC|BS|EN)\s*[-/]?\s*(\d+)(?:\s*[-:]\s*(\d+))?\b',
+    r'\b(IS|IEC|BS|EN)(\d+)\b',
+]
+STANDARD_REFERENCE_TRIGGERS = ('is', 'iec', 'bs', 'en')
+
+CERTIFICATION_PATTERNS = [
+    (r'(?:CE|ce)\s*(?:marked|certification|certified)', ('ce',)),
+    (r'(?:UL|ul)\s*(?:listed|certification|certified)', ('ul',)),
+    (r'(?:RoHS|rohs)\s*(?:compliant|compliance)', ('rohs',)),
+    (r'(?:FCC|fcc)\s*(?:certified|certification)', ('fcc',)),
+    (r'(?:ISI|isi)\s*(?:mark|marked|certification)', ('isi',)),
+]
+
+TESTING_KEYWORDS = {
+    'type_test': ['type test', 'type testing', 'prototype test'],
+    'routine_test': ['routine test', 'production test', 'acceptance test'],
+    'sample_test': ['sample testing', 'sample test'],
+    'field_test': ['field test', 'site test', 'installation test'],
+    'performance_test': ['performance test', 'performance testing'],
+    'quality_test': ['quality test', 'quality assurance test'],
+}
+
+INSPECTION_KEYWORDS = [
+    'inspection', 'factory acceptance test', 'FAT', 'SAT',
+    'site acceptance test', 'witness test', 'third party inspection'
+]
+
+# Specification parameters (value, unit)
+SPEC_PATTERNS = {
+    'voltage': (r'(?:voltage|rated\s*voltage)[:\s]*(\d+)\s*(V|volts?)', ('voltage', 'rated')),
+    'power': (r'(?:power|wattage)[:\s]*(\d+\.?\d*)\s*(W|KW|watts?|kilowatts?)', ('power', 'wattage')),
+    'current': (r'(?:current|amperage)[:\s]*(\d+\.?\d*)\s*(A|amps?)', ('current', 'amperage')),
+    'frequency': (r'(?:frequency)[:\s]*(\d+)\s*(Hz)', ('frequency',)),
+    'capacity': (r'(?:capacity|volume)[:\s]*(\d+\.?\d*)\s*(L|litre|liter|ton)', ('capacity', 'volume')),
+    'size': (r'(?:size|dimensions?)[:\s]*(\d+\.?\d*)\s*(?:x\s*\d+\.?\d*)?\s*(mm|cm|m|inch)', ('size', 'dimension')),
+    'temperature': (r'(?:temperature|temp)[:\s]*(-?\d+\.?\d*)\s*(?:to\s*-?\d+\.?\d*)?\s*(°C|C|celsius)', ('temp',)),
+    'pressure': (r'(?:pressure)[:\s]*(\d+\.?\d*)\s*(bar|psi|kpa)', ('pressure',)),
+    'rating': (r'(\d+)\s*star\s*rating', ()),
+    'efficiency': (r'(?:efficiency)[:\s]*(\d+\.?\d*)\s*(%|percent)', ('efficiency',)),
+}
+
+# "Parameter: Value" or "Parameter - Value" lines
+CUSTOM_SPEC_PATTERN = r'([A-Z][A-Za-z\s]+?)[:\-]\s*(.+?)(?:\n|$)'
+
+DIGITS = '0123456789'
+UPPERCASE = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def build_rfp_rules(
+    catalog_standards: Iterable[str] = (),
+    catalog_tests: Iterable[str] = ()
+) -> List[ScanRule]:
+    """Rules used by the RFP extractors, plus catalogue standards and tests.
+    
+    Args:
+        catalog_standards: Known standard codes (e.g. 'IS 694', 'UL 44')
+        catalog_tests: Known test names (e.g. 'Partial Discharge Test')
+    
+    Returns:
+        List of ScanRule
+    """
+    rules = []
+    
+    for name, (pattern, triggers) in STANDARD_PATTERNS.items():
+        rules.append(ScanRule('standard', name, pattern, triggers=triggers))
+    
+    for index, pattern in enumerate(STANDARD_REFERENCE_PATTERNS):
+        rules.append(ScanRule('standard_reference', str(index), pattern, triggers=STANDARD_REFERENCE_TRIGGERS))
+    
+    for index, (pattern, triggers) in enumerate(CERTIFICATION_PATTERNS):
+        rules.append(ScanRule('certification', str(index), pattern, triggers=triggers))
+    
+    for keywords in TESTING_KEYWORDS.values():
+        for keyword in keywords:
+            rules.append(keyword_rule('test', keyword))
+    
+    for keyword in INSPECTION_KEYWORDS:
+        rules.append(keyword_rule('inspection', keyword))
+    
+    for name, (pattern, triggers) in SPEC_PATTERNS.items():
+        rules.append(ScanRule('spec', name, pattern, triggers=triggers, start_chars='' if triggers else DIGITS))
+    
+    rules.append(ScanRule(
+        'custom_spec', 'key_value', CUSTOM_SPEC_PATTERN, start_chars=UPPERCASE, flags=re.MULTILINE
+    ))
+    
+    seen = set()
+    for kind, phrases in (('catalog_standard', catalog_standards), ('catalog_test', catalog_tests)):
+        for phrase in phrases:
+            phrase = ' '.join(str(phrase).split())
+            if phrase and (kind, phrase.lower()) not in seen:
+                seen.add((kind, phrase.lower()))
+                rules.append(phrase_rule(kind, phrase))
+    
+    return rules
+
+
+def load_catalog_vocabulary(
+    standards_dir: Optional[Path] = None,
+    testing_dir: Optional[Path] = None
+) -> Tuple[List[str], List[str]]:
+    """Read standard codes and test names from the standards/testing CSVs.
+    
+    Args:
+        standards_dir: wires_cables_standards directory (default from settings)
+        testing_dir: testing_data directory (default from settings)
+    
+    Returns:
+        Tuple of (standard codes, test names); empty when the files are missing
+    """
+    standards_dir = Path(standards_dir or settings.standards_dir)
+    testing_dir = Path(testing_dir or settings.testing_data_dir)
+    
+    sources = [
+        (standards_dir, '*indian_standards_*.csv', 'standard_code'),
+        (standards_dir, '*international_standards_*.csv', 'standard_code'),
+        (testing_dir, 'standards_*.csv', 'standard_code'),
+        (testing_dir, '*tests_*.csv', 'test_name'),
+    ]
+    vocabulary = {'standard_code': [], 'test_name': []}
+    
+    for directory, glob, column in sources:
+        for path in sorted(directory.glob(glob)):
+            try:
+                with open(path, newline='', encoding='utf-8-sig') as f:
+                    for row in csv.DictReader(f):
+                        value = (row.get(column) or '').strip()
+                        if value:
+                            vocabulary[column].append(value)
+            except (OSError, csv.Error) as e:
+                logger.warning("Could not read scanner vocabulary", file=str(path), error=str(e))
+    
+    return vocabulary['standard_code'], vocabulary['test_name']
+
+
+# Global instance
+_rfp_scanner_instance = None
+
+
+def get_rfp_scanner() -> TextScanner:
+    """Get global RFP scanner with the catalogue vocabulary.
+    
+    Returns:
+        TextScanner instance
+    """
+    global _rfp_scanner_instance
+    if _rfp_scanner_instance is None:
+        standards, tests = load_catalog_vocabulary()
+        _rfp_scanner_instance = TextScanner(build_rfp_rules(standards, tests))
+        logger.info(
+            "RFP scanner compiled",
+            rules=len(_rfp_scanner_instance.rules),
+            catalog_standards=len(standards),
+            catalog_tests=len(tests)
+        )
+    return _rfp_scanner_instance
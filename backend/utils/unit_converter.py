@@ -1,17 +1,57 @@
 """Unit conversion utilities for various measurement types."""
 from typing import Dict, Optional, Tuple
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 import re
 import structlog
 
 logger = structlog.get_logger()
 
+# Number with optional unit (e.g. "230V", "2.5 kg", "1,000 W")
+VALUE_WITH_UNIT_PATTERN = re.compile(r'([\d.,]+)\s*([a-zA-Z°Ωµ]+)?')
+
+# Common spellings mapped to canonical unit symbols (keys are lowercase)
+UNIT_ALIASES = {
+    'volt': 'V',
+    'volts': 'V',
+    'amp': 'A',
+    'amps': 'A',
+    'ampere': 'A',
+    'amperes': 'A',
+    'watt': 'W',
+    'watts': 'W',
+    'hertz': 'Hz',
+    'meter': 'm',
+    'meters': 'm',
+    'metre': 'm',
+    'metres': 'm',
+    'kilogram': 'kg',
+    'kilograms': 'kg',
+    'gram': 'g',
+    'grams': 'g',
+    'celsius': 'C',
+    'fahrenheit': 'F',
+    'kelvin': 'K',
+    'inch': 'in',
+    'inches': 'in',
+    'foot': 'ft',
+    'pound': 'lb',
+    'pounds': 'lbs',
+    'ω': 'ohm',
+    '°c': 'C',
+    '°f': 'F',
+}
+
 
 class UnitConverter:
     """Convert between different units of measurement."""
     
-    def __init__(self):
-        """Initialize converter with conversion factors."""
+    def __init__(self, cache_size: int = 4096):
+        """Initialize converter with conversion factors.
+        
+        Args:
+            cache_size: Maximum number of distinct texts/unit pairs memoized
+        """
         self.logger = logger.bind(component="UnitConverter")
         
         # Conversion factors to base units
@@ -119,6 +159,13 @@ class UnitConverter:
                 }
             }
         }
+        
+        self._unit_types = self._build_unit_types()
+        
+        # Bounded memo caches; catalogs repeat the same few hundred strings
+        self._normalize_unit_cached = lru_cache(maxsize=cache_size)(self._normalize_unit_uncached)
+        self._detect_type_cached = lru_cache(maxsize=cache_size)(self._detect_measurement_type_uncached)
+        self._parse_cached = lru_cache(maxsize=cache_size)(self._parse_value_with_unit_uncached)
     
     def convert(
         self,
@@ -249,6 +296,14 @@ class UnitConverter:
         Returns:
             Measurement type or None
         """
+        return self._detect_type_cached(from_unit, to_unit)
+    
+    def _detect_measurement_type_uncached(
+        self,
+        from_unit: str,
+        to_unit: str
+    ) -> Optional[str]:
+        """Scan the conversion tables for a type containing both units."""
         from_unit = self._normalize_unit(from_unit)
         to_unit = self._normalize_unit(to_unit)
         
@@ -268,43 +323,13 @@ class UnitConverter:
         Returns:
             Normalized unit
         """
+        return self._normalize_unit_cached(unit)
+    
+    def _normalize_unit_uncached(self, unit: str) -> str:
+        """Strip spaces and resolve aliases."""
         # Remove spaces and special characters
         unit = unit.strip().replace(' ', '')
-        
-        # Handle common variations
-        unit_map = {
-            'volt': 'V',
-            'volts': 'V',
-            'amp': 'A',
-            'amps': 'A',
-            'ampere': 'A',
-            'amperes': 'A',
-            'watt': 'W',
-            'watts': 'W',
-            'hertz': 'Hz',
-            'meter': 'm',
-            'meters': 'm',
-            'metre': 'm',
-            'metres': 'm',
-            'kilogram': 'kg',
-            'kilograms': 'kg',
-            'gram': 'g',
-            'grams': 'g',
-            'celsius': 'C',
-            'fahrenheit': 'F',
-            'kelvin': 'K',
-            'inch': 'in',
-            'inches': 'in',
-            'foot': 'ft',
-            'pound': 'lb',
-            'pounds': 'lbs',
-            'ω': 'ohm',
-            '°c': 'C',
-            '°f': 'F',
-        }
-        
-        unit_lower = unit.lower()
-        return unit_map.get(unit_lower, unit)
+        return UNIT_ALIASES.get(unit.lower(), unit)
     
     def parse_value_with_unit(
         self,
@@ -312,15 +337,19 @@ class UnitConverter:
     ) -> Optional[Tuple[float, str, str]]:
         """Parse text to extract value, unit, and measurement type.
         
+        Results are memoized per distinct text.
+        
         Args:
             text: Text containing value and unit (e.g., "230V", "2.5 kg")
             
         Returns:
             Tuple of (value, unit, measurement_type) or None
         """
-        # Pattern to match number with optional unit
-        pattern = r'([\d.,]+)\s*([a-zA-Z°Ωµ]+)?'
-        match = re.search(pattern, str(text))
+        return self._parse_cached(str(text))
+    
+    def _parse_value_with_unit_uncached(self, text: str) -> Optional[Tuple[float, str, str]]:
+        """Parse text without consulting the memo cache."""
+        match = VALUE_WITH_UNIT_PATTERN.search(text)
         
         if not match:
             return None
@@ -332,19 +361,47 @@ class UnitConverter:
             if not unit:
                 return (value, '', None)
             
-            # Normalize unit
             normalized_unit = self._normalize_unit(unit)
-            
-            # Detect measurement type
-            for mtype, info in self.conversions.items():
-                if normalized_unit in info['factors']:
-                    return (value, normalized_unit, mtype)
-            
-            return (value, normalized_unit, None)
+            return (value, normalized_unit, self._unit_types.get(normalized_unit))
             
         except ValueError:
             return None
     
+    def cache_info(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss statistics of the memo caches.
+        
+        Returns:
+            Dictionary of cache name to hits, misses, and current size
+        """
+        caches = {
+            'parse_value_with_unit': self._parse_cached,
+            'normalize_unit': self._normalize_unit_cached,
+            'detect_measurement_type': self._detect_type_cached,
+        }
+        return {
+            name: {'hits': info.hits, 'misses': info.misses, 'size': info.currsize}
+            for name, info in ((name, cache.cache_info()) for name, cache in caches.items())
+        }
+    
+    def clear_cache(self):
+        """Drop all memoized results and re-read self.conversions (e.g. after editing it)."""
+        self._unit_types = self._build_unit_types()
+        self._parse_cached.cache_clear()
+        self._normalize_unit_cached.cache_clear()
+        self._detect_type_cached.cache_clear()
+    
+    def _build_unit_types(self) -> Dict[str, str]:
+        """Map each unit to its measurement type.
+        
+        The first type listing a unit wins, as in parse_value_with_unit's
+        scan over self.conversions.
+        """
+        unit_types: Dict[str, str] = {}
+        for mtype, info in self.conversions.items():
+            for unit in info['factors']:
+                unit_types.setdefault(unit, mtype)
+        return unit_types
+    
     def convert_text(
         self,
         text: str,
@@ -6,7 +6,7 @@ including all agent interactions, data flows, and error handling.
 import asyncio
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
 from enum import Enum
 from dataclasses import dataclass, field
 import structlog
@@ -87,6 +87,9 @@ class RFPWorkflowOrchestrator:
         self.template_manager = WorkflowTemplateManager()
         self.enable_visualization = enable_visualization
         
+        # Callbacks notified of workflow lifecycle events (e.g. dashboards)
+        self.event_listeners: List[Callable[[str, Dict[str, Any]], Any]] = []
+        
         logger.info("Initialized RFPWorkflowOrchestrator",
                    approvals=enable_approvals,
                    visualization=enable_visualization)
@@ -118,6 +121,52 @@ class RFPWorkflowOrchestrator:
         
         logger.info("RFPWorkflowOrchestrator initialized and registered")
     
+    def add_event_listener(self, listener: Callable[[str, Dict[str, Any]], Any]):
+        """Register a callback for workflow events.
+        
+        The listener is called as ``listener(event, payload)`` for
+        workflow_started, stage_started, stage_completed (with the
+        stage's status and duration), workflow_completed and
+        workflow_failed. Coroutine listeners are awaited.
+        """
+        self.event_listeners.append(listener)
+    
+    async def _notify(self, event: str, payload: Dict[str, Any]):
+        """Deliver an event to all listeners; listener errors never fail a workflow."""
+        for listener in self.event_listeners:
+            try:
+                result = listener(event, payload)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.warning("Workflow event listener failed", event=event, error=str(e))
+    
+    async def _enter_stage(self, context: WorkflowContext, stage: WorkflowStage):
+        """Move a workflow to a new stage and announce it."""
+        context.current_stage = stage
+        await self.comm_manager.set_agent_state(
+            self.agent_id,
+            "current_stage",
+            stage.value
+        )
+        await self._notify('stage_started', {
+            'workflow_id': context.workflow_id,
+            'rfp_id': context.rfp_id,
+            'stage': stage.value
+        })
+    
+    async def _run_stage(self, context: WorkflowContext, stage_coro) -> StageResult:
+        """Await a stage and announce its outcome and duration."""
+        result = await stage_coro
+        await self._notify('stage_completed', {
+            'workflow_id': context.workflow_id,
+            'rfp_id': context.rfp_id,
+            'stage': result.stage.value,
+            'status': result.status,
+            'duration': result.duration
+        })
+        return result
+    
     async def process_rfp(self, rfp_data: Dict[str, Any],
                          template_id: Optional[str] = None) -> Dict[str, Any]:
         """Process RFP through complete workflow.
@@ -164,6 +213,11 @@ class RFPWorkflowOrchestrator:
         )
         
         self.active_workflows[workflow_id] = context
+        await self._notify('workflow_started', {
+            'workflow_id': workflow_id,
+            'rfp_id': context.rfp_id,
+            'template_id': template_id
+        })
         
         logger.info("Starting RFP workflow",
                    workflow_id=workflow_id,
@@ -184,45 +238,47 @@ class RFPWorkflowOrchestrator:
         
         try:
             # Stage 1: RFP Identification & Parsing
-            parsing_result = await self._stage_parsing(context, rfp_data)
+            parsing_result = await self._run_stage(context, self._stage_parsing(context, rfp_data))
             if parsing_result.status == "failed":
                 return await self._handle_workflow_failure(context, parsing_result)
             
             # Stage 2: Sales Analysis
-            sales_result = await self._stage_sales_analysis(context, parsing_result.data)
+            sales_result = await self._run_stage(
+                context, self._stage_sales_analysis(context, parsing_result.data)
+            )
             if sales_result.status == "failed":
                 return await self._handle_workflow_failure(context, sales_result)
             
             # Stage 3: Technical Validation
-            technical_result = await self._stage_technical_validation(
+            technical_result = await self._run_stage(context, self._stage_technical_validation(
                 context,
                 sales_result.data
-            )
+            ))
             if technical_result.status == "failed":
                 return await self._handle_workflow_failure(context, technical_result)
             
             # Stage 4: Pricing Calculation
-            pricing_result = await self._stage_pricing_calculation(
+            pricing_result = await self._run_stage(context, self._stage_pricing_calculation(
                 context,
                 sales_result.data,
                 technical_result.data
-            )
+            ))
             if pricing_result.status == "failed":
                 return await self._handle_workflow_failure(context, pricing_result)
             
             # Stage 5: Response Generation
-            response_result = await self._stage_response_generation(
+            response_result = await self._run_stage(context, self._stage_response_generation(
                 context,
                 parsing_result.data,
                 sales_result.data,
                 technical_result.data,
                 pricing_result.data
-            )
+            ))
             if response_result.status == "failed":
                 return await self._handle_workflow_failure(context, response_result)
             
             # Stage 6: Review & Finalization
-            final_result = await self._stage_review(context, response_result.data)
+            final_result = await self._run_stage(context, self._stage_review(context, response_result.data))
             
             # Mark workflow as completed
             context.status = WorkflowStatus.COMPLETED
@@ -230,15 +286,14 @@ class RFPWorkflowOrchestrator:
             context.end_time = datetime.utcnow()
             
             # Broadcast completion
-            await self.comm_manager.broadcast(
-                self.agent_id,
-                {
-                    'event': 'workflow_completed',
-                    'workflow_id': workflow_id,
-                    'rfp_id': context.rfp_id,
-                    'duration': (context.end_time - context.start_time).total_seconds()
-                }
-            )
+            completion = {
+                'event': 'workflow_completed',
+                'workflow_id': workflow_id,
+                'rfp_id': context.rfp_id,
+                'duration': (context.end_time - context.start_time).total_seconds()
+            }
+            await self.comm_manager.broadcast(self.agent_id, completion)
+            await self._notify('workflow_completed', completion)
             
             logger.info("RFP workflow completed",
                        workflow_id=workflow_id,
@@ -273,12 +328,7 @@ class RFPWorkflowOrchestrator:
         import time
         start_time = time.time()
         
-        context.current_stage = WorkflowStage.PARSING
-        await self.comm_manager.set_agent_state(
-            self.agent_id,
-            "current_stage",
-            WorkflowStage.PARSING.value
-        )
+        await self._enter_stage(context, WorkflowStage.PARSING)
         
         logger.info("Stage 1: Parsing RFP", workflow_id=context.workflow_id)
         
@@ -340,12 +390,7 @@ class RFPWorkflowOrchestrator:
         import time
         start_time = time.time()
         
-        context.current_stage = WorkflowStage.SALES_ANALYSIS
-        await self.comm_manager.set_agent_state(
-            self.agent_id,
-            "current_stage",
-            WorkflowStage.SALES_ANALYSIS.value
-        )
+        await self._enter_stage(context, WorkflowStage.SALES_ANALYSIS)
         
         # Check if approval required (for complex RFP template)
         if self.approval_manager and context.metadata.get('template_id') == 'complex_rfp':
@@ -435,12 +480,7 @@ class RFPWorkflowOrchestrator:
         import time
         start_time = time.time()
         
-        context.current_stage = WorkflowStage.TECHNICAL_VALIDATION
-        await self.comm_manager.set_agent_state(
-            self.agent_id,
-            "current_stage",
-            WorkflowStage.TECHNICAL_VALIDATION.value
-        )
+        await self._enter_stage(context, WorkflowStage.TECHNICAL_VALIDATION)
         
         logger.info("Stage 3: Technical Validation", workflow_id=context.workflow_id)
         
@@ -502,12 +542,7 @@ class RFPWorkflowOrchestrator:
         import time
         start_time = time.time()
         
-        context.current_stage = WorkflowStage.PRICING_CALCULATION
-        await self.comm_manager.set_agent_state(
-            self.agent_id,
-            "current_stage",
-            WorkflowStage.PRICING_CALCULATION.value
-        )
+        await self._enter_stage(context, WorkflowStage.PRICING_CALCULATION)
         
         logger.info("Stage 4: Pricing Calculation", workflow_id=context.workflow_id)
         
@@ -577,12 +612,7 @@ class RFPWorkflowOrchestrator:
         import time
         start_time = time.time()
         
-        context.current_stage = WorkflowStage.RESPONSE_GENERATION
-        await self.comm_manager.set_agent_state(
-            self.agent_id,
-            "current_stage",
-            WorkflowStage.RESPONSE_GENERATION.value
-        )
+        await self._enter_stage(context, WorkflowStage.RESPONSE_GENERATION)
         
         logger.info("Stage 5: Response Generation", workflow_id=context.workflow_id)
         
@@ -651,12 +681,7 @@ class RFPWorkflowOrchestrator:
         import time
         start_time = time.time()
         
-        context.current_stage = WorkflowStage.REVIEW
-        await self.comm_manager.set_agent_state(
-            self.agent_id,
-            "current_stage",
-            WorkflowStage.REVIEW.value
-        )
+        await self._enter_stage(context, WorkflowStage.REVIEW)
         
         logger.info("Stage 6: Final Review", workflow_id=context.workflow_id)
         
@@ -735,16 +760,15 @@ class RFPWorkflowOrchestrator:
             context.errors.append(f"Stage {failed_stage.stage.value} failed: {failed_stage.error}")
         
         # Broadcast failure
-        await self.comm_manager.broadcast(
-            self.agent_id,
-            {
-                'event': 'workflow_failed',
-                'workflow_id': context.workflow_id,
-                'rfp_id': context.rfp_id,
-                'failed_stage': context.current_stage.value,
-                'errors': context.errors
-            }
-        )
+        failure = {
+            'event': 'workflow_failed',
+            'workflow_id': context.workflow_id,
+            'rfp_id': context.rfp_id,
+            'failed_stage': context.current_stage.value,
+            'errors': context.errors
+        }
+        await self.comm_manager.broadcast(self.agent_id, failure)
+        await self._notify('workflow_failed', failure)
         
         logger.error("Workflow failed",
                     workflow_id=context.workflow_id,